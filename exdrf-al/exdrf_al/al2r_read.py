@@ -13,11 +13,22 @@ from dataclasses import dataclass
 from typing import Any, Sequence, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import Select, and_, func, select
+from sqlalchemy import Select, and_, func, or_, select
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 
 from exdrf.sa_filter_op import filter_op_registry
+from exdrf_al.counting import CountStrategy
+from exdrf_al.keyset import (
+    KeysetAnchorCache,
+    KeysetAnchors,
+    decode_cursor,
+    encode_cursor,
+    fill_keyset_anchors,
+    keyset_after_clause,
+    keyset_keys_from_order_by,
+    nulls_sort_high,
+)
 from exdrf_pd.filter_item import FilterItem
 from exdrf_pd.paged import PagedList
 from exdrf_pd.sort_item import SortItem
@@ -202,12 +213,12 @@ def filter_items_to_clauses(model: type[Any], items: list[FilterItem]) -> list[A
     return out
 
 
-def sort_items_to_order_by(
+def sort_item_keys(
     model: type[Any],
     sort_items: list[SortItem],
     pk_names: Sequence[str],
-) -> list[Any]:
-    """Build SQLAlchemy ``ORDER BY`` with stable PK tie-breakers.
+) -> list[tuple[str, bool]]:
+    """Return the attribute names and directions that define a list order.
 
     When ``sort_items`` is empty, order by ``pk_names`` ascending only. When it
     is non-empty, apply requested columns first, then append any PK columns not
@@ -219,34 +230,66 @@ def sort_items_to_order_by(
         pk_names: ORM attribute names forming the default / tie-break order.
 
     Returns:
-        List of unary ``asc()`` / ``desc()`` column clauses.
+        ``(attribute_name, descending)`` pairs in ``ORDER BY`` order.
 
     Raises:
         ValueError: If a sort field is not a mapped column on ``model``.
     """
 
-    cols: list[Any] = []
-
-    # Default path: no explicit sort, use primary key columns only.
-    if not sort_items:
-        for pk in pk_names:
-            cols.append(getattr(model, pk).asc())
-        return cols
+    keys: list[tuple[str, bool]] = []
 
     # Explicit sort keys first, then any PK columns not already listed.
     seen: set[str] = set()
     for s in sort_items:
         if not hasattr(model, s.attr):
             raise ValueError("unknown sort field %r on %s" % (s.attr, model.__name__))
-        c = getattr(model, s.attr)
-        cols.append(c.asc() if s.order == "asc" else c.desc())
+        keys.append((s.attr, s.order != "asc"))
         seen.add(s.attr)
     for pk in pk_names:
         if pk not in seen:
-            cols.append(getattr(model, pk).asc())
+            keys.append((pk, False))
+    return keys
+
+
+def sort_items_to_order_by(
+    model: type[Any],
+    sort_items: list[SortItem],
+    pk_names: Sequence[str],
+) -> list[Any]:
+    """Build SQLAlchemy ``ORDER BY`` with stable PK tie-breakers.
+
+    See :func:`sort_item_keys` for how the keys are chosen.
+
+    Args:
+        model: ORM mapped class providing column descriptors.
+        sort_items: Client sort directives (may be empty).
+        pk_names: ORM attribute names forming the default / tie-break order.
+
+    Returns:
+        List of unary ``asc()`` / ``desc()`` column clauses.
+
+    Raises:
+        ValueError: If a sort field is not a mapped column on ``model``.
+    """
+
+    cols: list[Any] = []
+    for attr, desc in sort_item_keys(model, sort_items, pk_names):
+        c = getattr(model, attr)
+        cols.append(c.desc() if desc else c.asc())
     return cols
 
 
+def _listing_key(
+    model: type[Any], filters: list[FilterItem], sort: list[SortItem]
+) -> tuple[Any, ...]:
+    """Identify one filtered, sorted listing for :class:`KeysetAnchorCache`."""
+    return (
+        model,
+        tuple(f.model_dump_json() for f in filters),
+        tuple(s.model_dump_json() for s in sort),
+    )
+
+
 def select_paged_rows(
     db: Session,
     model: type[Any],
@@ -256,9 +299,20 @@ def select_paged_rows(
     pk_names: Sequence[str],
     offset: int,
     limit: int,
+    anchors: KeysetAnchorCache | None = None,
+    anchor_spacing: int = 1000,
+    counter: CountStrategy | None = None,
 ) -> tuple[int, list[Any]]:
     """Return total row count and one page of ORM instances for a root list.
 
+    Without ``anchors`` the page is read with ``OFFSET`` / ``LIMIT``. With
+    ``anchors`` the page seeks after the nearest cached keyset anchor (see
+    :mod:`exdrf_al.keyset`) and only skips the rows between that anchor and
+    ``offset``; the last row of every page becomes a new anchor so walking
+    pages forward never re-reads earlier rows. The first jump farther than
+    ``anchor_spacing`` rows from any anchor collects one anchor every
+    ``anchor_spacing`` rows in a single pass over the sort keys.
+
     Args:
         db: Open SQLAlchemy session.
         model: Root ORM mapped class.
@@ -267,34 +321,136 @@ def select_paged_rows(
         pk_names: PK column names on ``model`` for ordering.
         offset: Zero-based row offset.
         limit: Maximum rows to return (page size).
+        anchors: Optional process-wide cache of keyset anchors.
+        anchor_spacing: Distance between anchors collected for random jumps.
+        counter: Optional counting strategy (see :mod:`exdrf_al.counting`);
+            by default the matching rows are counted exactly on every call.
 
     Returns:
-        ``(total, rows)`` where ``total`` counts matching rows and ``rows`` is
-        the current page.
+        ``(total, rows)`` where ``total`` counts matching rows (or is the
+        approximation returned by ``counter``) and ``rows`` is the current
+        page.
     """
 
     clauses = filter_items_to_clauses(model, filters)
-
+    keys = sort_item_keys(model, sort, pk_names)
+    order_by = sort_items_to_order_by(model, sort, pk_names)
+
+    if counter is not None:
+        stmt: Select[Any] = select(model)
+        if clauses:
+            stmt = stmt.where(and_(*clauses))
+        total = counter.count(db, stmt).value
     # With filters: count and select under the same WHERE.
-    if clauses:
+    elif clauses:
         where = and_(*clauses)
         total = int(
             db.scalar(select(func.count()).select_from(model).where(where)) or 0
         )
-        order_by = sort_items_to_order_by(model, sort, pk_names)
-        stmt: Select[Any] = (
-            select(model).where(where).order_by(*order_by).offset(offset).limit(limit)
-        )
+        stmt = select(model).where(where)
     else:
         # No filters: full-table count, ordered scan with offset/limit.
         total = int(db.scalar(select(func.count()).select_from(model)) or 0)
-        order_by = sort_items_to_order_by(model, sort, pk_names)
-        stmt = select(model).order_by(*order_by).offset(offset).limit(limit)
-
+        stmt = select(model)
+
+    # Seek after the closest known anchor instead of skipping ``offset`` rows.
+    skip = offset
+    listing: KeysetAnchors | None = None
+    if anchors is not None:
+        listing = anchors.for_listing(_listing_key(model, filters, sort))
+        ks_keys = keyset_keys_from_order_by(order_by)
+        near = listing.nearest_before(offset)
+        if (
+            not listing.complete
+            and offset >= anchor_spacing
+            and (near is None or offset - near[0] > anchor_spacing)
+        ):
+            fill_keyset_anchors(db, stmt, ks_keys, listing, anchor_spacing)
+            near = listing.nearest_before(offset)
+        if near is not None:
+            nulls_high = nulls_sort_high(db.get_bind().dialect)
+            after = keyset_after_clause(ks_keys, near[1], nulls_high)
+            stmt = stmt.where(after)
+            skip = offset - near[0] - 1
+
+    stmt = stmt.order_by(*order_by).offset(skip).limit(limit)
     rows = list(db.scalars(stmt).unique().all())
+
+    # The last row of the page anchors the next one.
+    if listing is not None and rows:
+        listing.add(
+            offset + len(rows) - 1,
+            tuple(getattr(rows[-1], attr) for attr, _d in keys),
+        )
     return total, rows
 
 
+def select_keyset_rows(
+    db: Session,
+    model: type[Any],
+    *,
+    filters: list[FilterItem],
+    sort: list[SortItem],
+    pk_names: Sequence[str],
+    limit: int,
+    after: str | None = None,
+    with_total: bool = True,
+) -> tuple[int | None, list[Any], str | None]:
+    """Return one page of a root list addressed by an opaque keyset cursor.
+
+    The cursor encodes the sort key of the last row of the previous page
+    (PK tie-breakers included), so every page costs the same no matter how
+    deep the client has walked.
+
+    Args:
+        db: Open SQLAlchemy session.
+        model: Root ORM mapped class.
+        filters: Parsed filter list (may be empty).
+        sort: Parsed sort list (may be empty; PK tie-break still applied).
+        pk_names: PK column names on ``model`` for ordering.
+        limit: Maximum rows to return (page size).
+        after: Cursor returned with the previous page; ``None`` for the first
+            page.
+        with_total: Also count the matching rows.
+
+    Returns:
+        ``(total, rows, next_cursor)``; ``total`` is ``None`` when
+        ``with_total`` is off and ``next_cursor`` is ``None`` on the last page.
+
+    Raises:
+        ValueError: If ``after`` is malformed or does not match the ordering.
+    """
+
+    clauses = filter_items_to_clauses(model, filters)
+    keys = sort_item_keys(model, sort, pk_names)
+    order_by = sort_items_to_order_by(model, sort, pk_names)
+
+    stmt: Select[Any] = select(model)
+    if clauses:
+        stmt = stmt.where(and_(*clauses))
+    total: int | None = None
+    if with_total:
+        total = int(db.scalar(select(func.count()).select_from(stmt.subquery())) or 0)
+
+    if after is not None:
+        values = decode_cursor(after)
+        after_clause = keyset_after_clause(
+            keyset_keys_from_order_by(order_by),
+            values,
+            nulls_sort_high(db.get_bind().dialect),
+        )
+        stmt = stmt.where(after_clause)
+
+    # Read one extra row to learn whether another page exists.
+    rows = list(db.scalars(stmt.order_by(*order_by).limit(limit + 1)).unique().all())
+    next_cursor: str | None = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = tuple(getattr(rows[-1], attr) for attr, _d in keys)
+        next_cursor = encode_cursor(last)
+    return total, rows, next_cursor
+
+
 def list_relation_subresource_page(
     db: Session,
     *,
@@ -397,6 +553,163 @@ def list_relation_subresource_page(
     )
 
 
+def _parent_key(parent_row: Any, spec: RelationListSpec) -> tuple[Any, ...]:
+    """Return the parent PK values of ``parent_row`` as seen by ``spec``.
+
+    Args:
+        parent_row: ORM instance of the parent resource.
+        spec: Relation metadata naming the parent PK attributes.
+
+    Returns:
+        Tuple of PK values in ``spec.parent_pk_attrs`` order.
+    """
+
+    return tuple(getattr(parent_row, pa) for pa in spec.parent_pk_attrs)
+
+
+def _parent_keys_clause(cols: Sequence[Any], keys: Sequence[tuple[Any, ...]]) -> Any:
+    """Build a predicate matching any of ``keys`` on the parent key ``cols``.
+
+    Single-column keys use ``IN``; composite keys fall back to an ``OR`` of
+    ``AND`` groups, which every backend understands.
+
+    Args:
+        cols: Columns holding the parent key (FK columns on the child or the
+            junction table).
+        keys: Distinct parent key tuples, one value per column.
+
+    Returns:
+        SQLAlchemy boolean expression.
+    """
+
+    if len(cols) == 1:
+        return cols[0].in_([k[0] for k in keys])
+    return or_(*[and_(*[c == v for c, v in zip(cols, k)]) for k in keys])
+
+
+def list_relation_subresource_pages(
+    db: Session,
+    *,
+    parent_rows: Sequence[Any],
+    spec: RelationListSpec,
+    filters: list[FilterItem],
+    sort: list[SortItem],
+    offset: int,
+    limit: int,
+) -> dict[tuple[Any, ...], PagedList[BaseModel]]:
+    """Load one page of related rows for many parents in two queries.
+
+    Batched counterpart of :func:`list_relation_subresource_page`: instead of
+    a ``COUNT`` plus a ``SELECT`` per parent, one grouped ``COUNT`` returns
+    the totals for every parent and one ``SELECT`` ranks related rows with
+    ``ROW_NUMBER() OVER (PARTITION BY <parent key> ORDER BY ...)`` so each
+    parent receives its own ``offset`` / ``limit`` window.
+
+    Args:
+        db: Open SQLAlchemy session.
+        parent_rows: ORM instances of the parent resource.
+        spec: Frozen relation metadata including ORM and Pydantic types.
+        filters: Filter items scoped to ``spec.related_model``.
+        sort: Sort items scoped to ``spec.related_model``.
+        offset: Zero-based offset within each related set.
+        limit: Maximum related rows per parent (inner list page size).
+
+    Returns:
+        Mapping from parent key (values of ``spec.parent_pk_attrs``) to the
+        :class:`PagedList` for that parent. Every parent in ``parent_rows``
+        has an entry, empty when it has no related rows.
+
+    Raises:
+        ValueError: If ``spec`` is inconsistent with ``kind`` or ``kind`` is
+            unsupported.
+    """
+
+    rel = spec.related_model
+    schema = spec.related_schema
+    pkc = spec.related_pk_col
+    pk_order = spec.related_pk_order if spec.related_pk_order else (pkc,)
+
+    # Distinct parent keys, in the order the parents were given.
+    keys = list(dict.fromkeys(_parent_key(r, spec) for r in parent_rows))
+    if not keys:
+        return {}
+
+    # Resolve the columns that carry the parent key and the FROM clause.
+    if spec.kind in ("o2m_fk", "o2m_child_rows"):
+        if spec.child_fk_col is None or len(spec.parent_pk_attrs) != 1:
+            raise ValueError("invalid %s RelationListSpec" % (spec.kind,))
+        key_cols = [getattr(rel, spec.child_fk_col)]
+        base_stmt: Select[Any] = select(rel)
+    elif spec.kind in ("m2m", "o2m_bridge"):
+        if (
+            spec.assoc_model is None
+            or spec.parent_fk_cols is None
+            or spec.related_fk_col is None
+        ):
+            raise ValueError("invalid m2m RelationListSpec")
+        assoc = spec.assoc_model
+        key_cols = [getattr(assoc, pc) for pc in spec.parent_fk_cols]
+        join_on = getattr(assoc, spec.related_fk_col) == getattr(rel, pkc)
+        base_stmt = select(rel).join(assoc, join_on)
+    else:
+        raise ValueError("unsupported kind %r" % (spec.kind,))
+
+    where = and_(
+        _parent_keys_clause(key_cols, keys),
+        *filter_items_to_clauses(rel, filters),
+    )
+
+    # Totals for every parent in one grouped query.
+    totals: dict[tuple[Any, ...], int] = {}
+    count_stmt = (
+        base_stmt.with_only_columns(*key_cols, func.count())
+        .where(where)
+        .group_by(*key_cols)
+    )
+    for row in db.execute(count_stmt):
+        totals[tuple(row[:-1])] = int(row[-1] or 0)
+
+    # Rank related rows inside each parent partition, keep the page window.
+    order_by = sort_items_to_order_by(rel, sort, pk_order)
+    key_labels = ["_exdrf_pk_%d" % i for i in range(len(key_cols))]
+    rn = (
+        func.row_number()
+        .over(partition_by=key_cols, order_by=order_by)
+        .label("_exdrf_rn")
+    )
+    ranked = (
+        base_stmt.add_columns(
+            *[c.label(lbl) for c, lbl in zip(key_cols, key_labels)], rn
+        )
+        .where(where)
+        .subquery()
+    )
+    rel_alias = aliased(rel, ranked)
+    r_keys = [ranked.c[lbl] for lbl in key_labels]
+    stmt = (
+        select(rel_alias, *r_keys)
+        .where(ranked.c._exdrf_rn > offset, ranked.c._exdrf_rn <= offset + limit)
+        .order_by(*r_keys, ranked.c._exdrf_rn)
+    )
+
+    # Group the page rows by parent and map them to the list item schema.
+    items: dict[tuple[Any, ...], list[BaseModel]] = {k: [] for k in keys}
+    for row in db.execute(stmt):
+        bucket = items.get(tuple(row[1:]))
+        if bucket is not None:
+            bucket.append(schema.model_validate(column_values_for_ex(row[0])))
+
+    return {
+        k: PagedList(
+            total=totals.get(k, 0),
+            offset=offset,
+            page_size=limit,
+            items=items[k],
+        )
+        for k in keys
+    }
+
+
 def hydrate_ex_inner_lists(
     db: Session,
     *,
@@ -459,6 +772,70 @@ def hydrate_ex_inner_lists(
     return ex.model_copy(update=updates) if updates else ex
 
 
+def hydrate_ex_inner_lists_batch(
+    db: Session,
+    *,
+    parent_rows: Sequence[Any],
+    exs: Sequence[TEx],
+    inner_page: int,
+    inner_filters: dict[str, list[FilterItem]],
+    inner_sort: dict[str, list[SortItem]],
+    inner_specs: Sequence[tuple[str, RelationListSpec]],
+) -> list[TEx]:
+    """Populate ``PagedList`` fields on a page of ``*Ex`` models at once.
+
+    Batched counterpart of :func:`hydrate_ex_inner_lists`: each
+    ``(attr, spec)`` pair costs two queries for the whole page (see
+    :func:`list_relation_subresource_pages`) instead of two per parent row.
+
+    Args:
+        db: Open SQLAlchemy session.
+        parent_rows: ORM rows, one per entry in ``exs`` and in the same order.
+        exs: Partial ``*Ex`` models built from ``parent_rows`` scalars only.
+        inner_page: Maximum rows per nested list (``<= 0`` disables hydration).
+        inner_filters: Per-relation filter lists keyed by ``attr`` name.
+        inner_sort: Per-relation sort lists keyed by ``attr`` name.
+        inner_specs: Ordered ``(relation_field_name, RelationListSpec)`` pairs.
+
+    Returns:
+        List aligned with ``exs`` holding copies with nested ``PagedList``
+        fields set (or the original models if nothing was loaded).
+
+    Raises:
+        ValueError: Re-raised after logging if a nested list query is invalid.
+    """
+
+    if inner_page <= 0 or not inner_specs or not parent_rows:
+        return list(exs)
+
+    # One batched load per relation; collect the per-row updates.
+    updates: list[dict[str, Any]] = [{} for _ in parent_rows]
+    for attr, rspec in inner_specs:
+        try:
+            pages = list_relation_subresource_pages(
+                db,
+                parent_rows=parent_rows,
+                spec=rspec,
+                filters=inner_filters.get(attr, []),
+                sort=inner_sort.get(attr, []),
+                offset=0,
+                limit=inner_page,
+            )
+        except ValueError as exc:
+            logger.error(
+                "inner list %s failed for %d parents: %s",
+                attr,
+                len(parent_rows),
+                exc,
+                exc_info=True,
+            )
+            raise
+        for i, row in enumerate(parent_rows):
+            updates[i][attr] = pages[_parent_key(row, rspec)]
+
+    return [ex.model_copy(update=upd) if upd else ex for ex, upd in zip(exs, updates)]
+
+
 def list_root_ex_page(
     db: Session,
     orm_model: type[Any],
@@ -473,12 +850,14 @@ def list_root_ex_page(
     inner_filters: dict[str, list[FilterItem]],
     inner_sort: dict[str, list[SortItem]],
     inner_specs: Sequence[tuple[str, RelationListSpec]],
+    inner_batched: bool = True,
 ) -> PagedList[TEx]:
     """List root resources as ``PagedList`` of ``*Ex`` with optional inner pages.
 
     Loads one page of ``orm_model`` rows, maps each to ``ex_model``, then when
     ``inner_page > 0`` fills nested relation lists via
-    :func:`hydrate_ex_inner_lists`.
+    :func:`hydrate_ex_inner_lists_batch` (or, with ``inner_batched`` off,
+    :func:`hydrate_ex_inner_lists` for each row).
 
     Args:
         db: Open SQLAlchemy session.
@@ -493,6 +872,8 @@ def list_root_ex_page(
         inner_filters: Nested list filters keyed by relation attribute name.
         inner_sort: Nested list sorts keyed by relation attribute name.
         inner_specs: Nested list specs in field order.
+        inner_batched: Load each nested relation for the whole page in one
+            windowed query instead of one count and one select per row.
 
     Returns:
         :class:`PagedList` of hydrated ``ex_model`` instances.
@@ -510,6 +891,23 @@ def list_root_ex_page(
 
     # Build each Ex from ORM columns, optionally attaching inner PagedLists.
     items: list[TEx] = []
+    if inner_batched:
+        items = hydrate_ex_inner_lists_batch(
+            db,
+            parent_rows=rows,
+            exs=[ex_model_from_orm_columns(row, ex_model) for row in rows],
+            inner_page=inner_page,
+            inner_filters=inner_filters,
+            inner_sort=inner_sort,
+            inner_specs=inner_specs,
+        )
+        return PagedList(
+            total=total,
+            offset=offset,
+            page_size=page_size,
+            items=items,
+        )
+
     for row in rows:
         ex = ex_model_from_orm_columns(row, ex_model)
         if inner_page > 0 and inner_specs:
@@ -7,7 +7,13 @@ from sqlalchemy import Engine, Select, create_engine, event
 from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
-from sqlalchemy.pool import NullPool, StaticPool
+from sqlalchemy.pool import (
+    NullPool,
+    Pool,
+    QueuePool,
+    SingletonThreadPool,
+    StaticPool,
+)
 
 from exdrf_al.db_ver.db_ver import DbVer
 
@@ -19,6 +25,10 @@ DEFAULT_MAX_OVERFLOW = 10
 DEFAULT_POOL_RECYCLE = 3600  # 1 hour in seconds
 DEFAULT_POOL_TIMEOUT = 30  # seconds
 
+# Background worker threads (each one keeps a pooled connection checked out).
+DEFAULT_WORKER_THREADS = 4
+MAX_WORKER_THREADS = 8
+
 
 @define
 class AutoCacheEntry:
@@ -56,6 +66,27 @@ def react_on_c_string(instance, attribute, value):
     return value
 
 
+def worker_threads_for_pool(pool: Pool) -> int:
+    """Compute how many background worker threads a pool can feed.
+
+    Each worker keeps one connection for its whole life, so a bounded
+    pool is split between the workers and one connection is left for the
+    sessions of the main thread. Pools that hand out a single shared
+    connection get one worker; pools without a bound get the default.
+
+    Args:
+        pool: The pool of the engine.
+
+    Returns:
+        The number of worker threads, at least one.
+    """
+    if isinstance(pool, (StaticPool, SingletonThreadPool)):
+        return 1
+    if isinstance(pool, QueuePool):
+        return max(1, min(MAX_WORKER_THREADS, pool.size() - 1))
+    return DEFAULT_WORKER_THREADS
+
+
 @define
 class DbConn:
     """Holds information about the connection to a database.
@@ -67,6 +98,9 @@ class DbConn:
         cache: A general-purpose cache.
         auto_cache: A cache where the information about how to retrieve
             them is stored along with the value.
+        threads_count: The number of background worker threads that should
+            use this connection. If not set, `connect()` computes it from
+            the connection pool of the engine.
     """
 
     c_string: str = field(on_setattr=react_on_c_string)
@@ -77,6 +111,7 @@ class DbConn:
     auto_cache: Dict[str, AutoCacheEntry] = field(factory=dict, repr=False)
     db_version: Optional[str] = None
     auto_migrate: Optional[bool] = False
+    threads_count: Optional[int] = None
 
     def connect(self, **kwargs) -> Engine:
         """Connect to the database."""
@@ -126,6 +161,8 @@ class DbConn:
         engine_kwargs = {k: v for k, v in engine_kwargs.items() if v is not None}
 
         self.engine = create_engine(self.c_string, **engine_kwargs)
+        if self.threads_count is None:
+            self.threads_count = worker_threads_for_pool(self.engine.pool)
         dialect_name = self.engine.dialect.name
         supports_schema = dialect_name in dialects_with_schema
         if supports_schema:
@@ -179,11 +216,19 @@ class DbConn:
             s.close()
         self.s_stack = []
 
-    def new_session(self, add_to_stack: bool = True):
-        """Create a new session."""
-        self.connect()
+    def new_session(self, add_to_stack: bool = True, own_connection: bool = False):
+        """Create a new session.
+
+        Args:
+            add_to_stack: Push the session on the internal stack so that
+                `same_session()` finds it.
+            own_connection: Bind the session to a connection that is checked
+                out of the pool now and kept until the session is closed,
+                instead of checking one out for each transaction.
+        """
+        engine = self.connect()
         Session = sessionmaker(
-            bind=self.engine,
+            bind=engine.connect() if own_connection else engine,
             # Ensures that changes are not automatically committed.
             autocommit=False,
             # Allows automatic flush before a query execution.
@@ -205,15 +250,26 @@ class DbConn:
         return s
 
     @contextmanager
-    def session(self, auto_commit=False, add_to_stack: bool = True):
+    def session(
+        self,
+        auto_commit=False,
+        add_to_stack: bool = True,
+        own_connection: bool = False,
+    ):
         """Creates a new session which it then closed after use.
 
         The session is added to the internal stack on creation and removed on
         closing. If auto_commit is True, the session is committed after use.
 
         If the inner code raises an exception, the session is rolled back.
+
+        With `own_connection` the session keeps one connection for its whole
+        life (see `new_session()`), which is returned to the pool on exit.
+        This suits long-lived sessions like the ones of worker threads.
         """
-        session = self.new_session(add_to_stack=add_to_stack)
+        session = self.new_session(
+            add_to_stack=add_to_stack, own_connection=own_connection
+        )
         try:
             yield session
         except Exception:
@@ -223,7 +279,10 @@ class DbConn:
             if session.is_active and auto_commit:
                 session.commit()
         finally:
+            bind = session.bind
             session.close()
+            if own_connection:
+                bind.close()  # type: ignore[union-attr]
             if add_to_stack:
                 self.s_stack.pop()
 
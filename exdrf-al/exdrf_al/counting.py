@@ -0,0 +1,292 @@
+"""Strategies for counting the rows of a selection.
+
+``SELECT count(*) FROM (<selection>)`` walks every matching row, which is the
+slowest query a list view issues and usually the least interesting one: the
+number only sizes a scroll bar. The strategies in this module trade accuracy
+or freshness for speed:
+
+- :class:`ExactCount` always counts (the historical behaviour);
+- :class:`CachedCount` remembers the count of each normalized selection
+  (``ORDER BY``, ``LIMIT`` and ``OFFSET`` are ignored, so re-sorting is free)
+  until a write to one of its tables invalidates it;
+- :class:`EstimatedCount` asks the PostgreSQL planner (``pg_class.reltuples``
+  for a whole table, ``EXPLAIN`` otherwise) and counts exactly on other
+  backends or when the estimate is small;
+- :class:`DeferredCount` counts at most ``probe`` rows and reports
+  "at least ``probe``" for bigger selections.
+
+Results that are not exact can be completed later, usually from a background
+thread, with :meth:`CountStrategy.refine`.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable
+
+from sqlalchemy import Select, Table, func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+
+@dataclass(frozen=True)
+class CountResult:
+    """The outcome of counting a selection.
+
+    Attributes:
+        value: The number of rows (or the best known approximation).
+        exact: True if ``value`` is the exact number of rows.
+        lower_bound: True if the selection has *at least* ``value`` rows
+            (only meaningful when ``exact`` is False).
+    """
+
+    value: int
+    exact: bool = True
+    lower_bound: bool = False
+
+
+def normalize_count_statement(stmt: Select[Any]) -> Select[Any]:
+    """Drop the parts of a selection that do not change its row count."""
+    if stmt._limit_clause is not None or stmt._offset_clause is not None:
+        # The page is part of the row set; keep the ordering that defines it.
+        return stmt
+    return stmt.order_by(None)
+
+
+def exact_count(session: Session, stmt: Select[Any]) -> int:
+    """Count the rows of ``stmt`` with ``SELECT count(*)``."""
+    query = select(func.count()).select_from(normalize_count_statement(stmt).subquery())
+    return int(session.scalar(query) or 0)
+
+
+def count_statement_key(
+    session: Session, stmt: Select[Any]
+) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """Compute a key that is equal for selections with the same row set.
+
+    The key is the SQL text of the normalized statement in the dialect of the
+    session plus its parameter values, so two selections built from equal
+    filters but different sorting share the key.
+    """
+    compiled = normalize_count_statement(stmt).compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"render_postcompile": True},
+    )
+    params = tuple(sorted((k, repr(v)) for k, v in compiled.params.items()))
+    return str(compiled), params
+
+
+def statement_table_names(stmt: Select[Any]) -> frozenset[str]:
+    """Names of the tables a selection reads from, joins included."""
+    return frozenset(
+        t.name
+        for t in find_tables(stmt, check_columns=True, include_joins=True)
+        if isinstance(t, Table)
+    )
+
+
+class CountStrategy:
+    """Base class for counting strategies; counts exactly.
+
+    Attributes:
+        refine_in_background: Hint for callers that own a background worker:
+            results that are not exact should be completed with
+            :meth:`refine`.
+    """
+
+    refine_in_background: bool = False
+
+    def count(self, session: Session, stmt: Select[Any]) -> CountResult:
+        """Count the rows of ``stmt``, possibly approximately."""
+        return CountResult(exact_count(session, stmt))
+
+    def refine(self, session: Session, stmt: Select[Any]) -> CountResult:
+        """Count the rows of ``stmt`` exactly.
+
+        Safe to call from a worker thread with its own session.
+        """
+        return CountResult(exact_count(session, stmt))
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> None:
+        """Forget remembered counts that read from ``tables`` (or all)."""
+
+
+class ExactCount(CountStrategy):
+    """Always run ``SELECT count(*)``."""
+
+
+class EstimatedCount(CountStrategy):
+    """Use the PostgreSQL planner estimate for big selections.
+
+    A selection of a whole table reads ``pg_class.reltuples``; any other
+    selection reads the ``Plan Rows`` of ``EXPLAIN``. Other backends (SQLite
+    has no useful estimate) and estimates below ``exact_below`` are counted
+    exactly.
+
+    Args:
+        exact_below: Estimates under this value are replaced by an exact
+            count, which is cheap at that size.
+        refine_in_background: See :class:`CountStrategy`.
+    """
+
+    def __init__(self, exact_below: int = 10_000, refine_in_background: bool = True):
+        self.exact_below = exact_below
+        self.refine_in_background = refine_in_background
+
+    def estimate(self, session: Session, stmt: Select[Any]) -> int | None:
+        """Return the planner estimate or None if there is none."""
+        bind = session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+
+        stmt = normalize_count_statement(stmt)
+        froms = stmt.get_final_froms()
+        if (
+            stmt.whereclause is None
+            and len(froms) == 1
+            and isinstance(froms[0], Table)
+            and not stmt._group_by_clauses
+            and not stmt._distinct
+            and stmt._limit_clause is None
+        ):
+            table = froms[0]
+            name = f"{table.schema}.{table.name}" if table.schema else table.name
+            value = session.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:name)"
+                ),
+                {"name": name},
+            )
+            # Tables that were never analyzed report -1.
+            return int(value) if value is not None and value >= 0 else None
+
+        compiled = stmt.compile(
+            dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+        )
+        row = (
+            session.connection()
+            .exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params)
+            .first()
+        )
+        if row is None:
+            return None
+        plan = row[0] if not isinstance(row[0], str) else json.loads(row[0])
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def count(self, session: Session, stmt: Select[Any]) -> CountResult:
+        value = self.estimate(session, stmt)
+        if value is None or value < self.exact_below:
+            return CountResult(exact_count(session, stmt))
+        return CountResult(value, exact=False)
+
+
+class DeferredCount(CountStrategy):
+    """Count at most ``probe`` rows now; the rest is left for later.
+
+    Selections with more rows report ``CountResult(probe, exact=False,
+    lower_bound=True)`` after reading only ``probe + 1`` rows.
+
+    Args:
+        probe: Number of rows to count synchronously.
+        refine_in_background: See :class:`CountStrategy`.
+    """
+
+    def __init__(self, probe: int = 10_000, refine_in_background: bool = True):
+        self.probe = probe
+        self.refine_in_background = refine_in_background
+
+    def count(self, session: Session, stmt: Select[Any]) -> CountResult:
+        limited = normalize_count_statement(stmt).limit(self.probe + 1)
+        value = exact_count(session, limited)
+        if value <= self.probe:
+            return CountResult(value)
+        return CountResult(self.probe, exact=False, lower_bound=True)
+
+
+class CachedCount(CountStrategy):
+    """Remember the counts of another strategy per normalized selection.
+
+    Only exact counts are remembered, so approximate results are asked again
+    until :meth:`refine` (or the inner strategy) produces an exact one. An
+    instance can be shared by several models over the same tables; writes
+    must be reported with :meth:`invalidate`.
+
+    Args:
+        inner: Strategy that computes the counts on a miss (exact by default).
+        max_entries: Maximum number of selections to remember.
+        ttl: Seconds after which a remembered count is computed again;
+            ``None`` keeps counts until they are invalidated or evicted.
+    """
+
+    def __init__(
+        self,
+        inner: CountStrategy | None = None,
+        max_entries: int = 256,
+        ttl: float | None = None,
+    ):
+        self.inner = inner if inner is not None else ExactCount()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[int, float, frozenset[str]]] = (
+            OrderedDict()
+        )
+
+    @property
+    def refine_in_background(self) -> bool:  # type: ignore[override]
+        return self.inner.refine_in_background
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Hashable) -> int | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _put(self, key: Hashable, value: int, stmt: Select[Any]) -> None:
+        tables = statement_table_names(stmt)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), tables)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, session: Session, stmt: Select[Any]) -> CountResult:
+        key = count_statement_key(session, stmt)
+        value = self._get(key)
+        if value is not None:
+            return CountResult(value)
+        result = self.inner.count(session, stmt)
+        if result.exact:
+            self._put(key, result.value, stmt)
+        return result
+
+    def refine(self, session: Session, stmt: Select[Any]) -> CountResult:
+        key = count_statement_key(session, stmt)
+        result = self.inner.refine(session, stmt)
+        self._put(key, result.value, stmt)
+        return result
+
+    def invalidate(self, tables: Iterable[str] | None = None) -> None:
+        self.inner.invalidate(tables)
+        with self._lock:
+            if tables is None:
+                self._entries.clear()
+                return
+            names = set(tables)
+            for key in [
+                k for k, e in self._entries.items() if not names.isdisjoint(e[2])
+            ]:
+                del self._entries[key]
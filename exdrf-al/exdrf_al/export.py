@@ -1,8 +1,21 @@
-from typing import TYPE_CHECKING, Any, Generator, List, Literal, Optional, Tuple
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Generator,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    get_args,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from sqlalchemy import Connection
+
     from exdrf_al.connection import DbConn
 
 
@@ -38,7 +51,11 @@ def get_format_extension(file_format: FormatType) -> str:
 def dump_database(
     cn: "DbConn", file_format: FormatType = "pickle"
 ) -> Generator[Tuple[str, List[str], List[Any], Any], None, None]:
-    """Export the content of the database as raw data."""
+    """Export the content of the database as raw data.
+
+    Each table is read and serialized in memory; use `write_db_to_file()`
+    to dump large databases with bounded memory.
+    """
     from io import StringIO
 
     from sqlalchemy import inspect, text
@@ -94,29 +111,277 @@ def dump_database(
                 raise ValueError(f"Invalid file format: {file_format}")
 
 
+ArchiveType = Literal["zip", "tar", "tar.gz", "tar.bz2"]
+
+# Serialized tables larger than this are moved from memory to disk while
+# they wait to be added to an archive.
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def iter_table_chunks(
+    conn: "Connection", table: str, chunk_size: int = 1000
+) -> Tuple[List[str], Iterator[List[Any]]]:
+    """Read the rows of a table in chunks.
+
+    The query uses a server-side cursor where the driver supports one, so
+    only a chunk of rows is held in memory at a time.
+
+    Args:
+        conn: The connection to read from.
+        table: The name of the table.
+        chunk_size: The number of rows in a chunk.
+
+    Returns:
+        The names of the columns and an iterator over lists of rows.
+    """
+    from sqlalchemy import literal_column, select
+    from sqlalchemy import table as table_clause
+
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+        select(literal_column("*")).select_from(table_clause(table))
+    )
+    return list(result.keys()), result.partitions()
+
+
+def write_table(
+    stream: IO[bytes],
+    columns: List[str],
+    chunks: Iterator[List[Any]],
+    file_format: FormatType,
+    encoding: str = "utf-8",
+) -> int:
+    """Serialize the rows of a table to a binary stream, chunk by chunk.
+
+    The formats are the ones of `dump_database()` with these differences:
+
+    - `json` and `dict` write values that JSON does not know as strings;
+    - `pickle` writes one pickled list of rows per chunk; read them back
+      with `load_pickled_rows()`;
+    - `plain` writes a tab-separated line per row, after the column names.
+
+    Args:
+        stream: The binary stream to write to.
+        columns: The names of the columns.
+        chunks: Lists of rows, as returned by `iter_table_chunks()`.
+        file_format: The format of the output.
+        encoding: The encoding of the text formats.
+
+    Returns:
+        The number of rows that were written.
+    """
+    import json
+
+    file_format_lower = file_format.lower()
+    count = 0
+
+    if file_format_lower == "pickle":
+        import pickle
+
+        for chunk in chunks:
+            pickle.dump([tuple(row) for row in chunk], stream)
+            count += len(chunk)
+        return count
+
+    def put(text: str) -> None:
+        stream.write(text.encode(encoding))
+
+    if file_format_lower == "csv":
+        import csv
+        from io import StringIO
+
+        sio = StringIO()
+        writer = csv.writer(sio)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            put(sio.getvalue())
+            sio.seek(0)
+            sio.truncate()
+            count += len(chunk)
+        put(sio.getvalue())
+    elif file_format_lower == "plain":
+        put("\t".join(columns) + "\n")
+        for chunk in chunks:
+            put("".join("\t".join(map(str, row)) + "\n" for row in chunk))
+            count += len(chunk)
+    elif file_format_lower in ("json", "dict"):
+        put("[")
+        for chunk in chunks:
+            if file_format_lower == "dict":
+                items = [dict(zip(columns, row)) for row in chunk]
+            else:
+                items = [list(row) for row in chunk]
+            text = ",\n".join(json.dumps(item, default=str) for item in items)
+            if text:
+                put((",\n" if count else "\n") + text)
+            count += len(chunk)
+        put("\n]" if count else "]")
+    elif file_format_lower == "yaml":
+        import yaml
+
+        for chunk in chunks:
+            # Block sequences written one after the other form one sequence.
+            put(yaml.safe_dump([list(row) for row in chunk], default_flow_style=False))
+            count += len(chunk)
+        if not count:
+            put("[]\n")
+    else:
+        raise ValueError(f"Invalid file format: {file_format}")
+    return count
+
+
+def load_pickled_rows(stream: IO[bytes]) -> Iterator[Any]:
+    """Read back the rows of a table written in the `pickle` format.
+
+    Args:
+        stream: The binary stream to read from.
+
+    Yields:
+        The rows, as tuples.
+    """
+    import pickle
+
+    while True:
+        try:
+            chunk = pickle.load(stream)
+        except EOFError:
+            return
+        yield from chunk
+
+
+def _spool_table(
+    cn: "DbConn",
+    table: str,
+    file_format: FormatType,
+    encoding: str,
+    chunk_size: int,
+) -> IO[bytes]:
+    """Serialize a table to a temporary file, used by parallel dumps."""
+    from tempfile import SpooledTemporaryFile
+
+    assert cn.engine is not None, "Engine is not connected."
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    try:
+        with cn.engine.connect() as conn:
+            columns, chunks = iter_table_chunks(conn, table, chunk_size)
+            write_table(spool, columns, chunks, file_format, encoding)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool  # type: ignore[return-value]
+
+
+def _iter_spooled_tables(
+    cn: "DbConn",
+    tables: List[str],
+    file_format: FormatType,
+    encoding: str,
+    chunk_size: int,
+    workers: int,
+) -> Generator[Tuple[str, IO[bytes]], None, None]:
+    """Serialize tables in parallel, yielding them in the original order.
+
+    At most `workers` tables are read at the same time and at most twice as
+    many wait to be consumed, so the memory stays bounded.
+    """
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        remaining = iter(tables)
+
+        def submit_next() -> None:
+            table = next(remaining, None)
+            if table is not None:
+                pending.append(
+                    (
+                        table,
+                        executor.submit(
+                            _spool_table,
+                            cn,
+                            table,
+                            file_format,
+                            encoding,
+                            chunk_size,
+                        ),
+                    )
+                )
+
+        for _ in range(workers * 2):
+            submit_next()
+        try:
+            while pending:
+                table, future = pending.popleft()
+                submit_next()
+                with future.result() as spool:
+                    yield table, spool
+        finally:
+            for _table, future in pending:
+                future.cancel()
+                if not future.cancelled() and future.exception() is None:
+                    future.result().close()
+
+
 def write_db_to_file(
     cn: "DbConn",
     output_path: "Path | str",
     file_format: FormatType = "pickle",
-    archive_format: Optional[Literal["zip", "tar", "tar.gz", "tar.bz2"]] = "zip",
+    archive_format: Optional[ArchiveType] = "zip",
     date_in_name: bool = False,
     time_in_name: bool = False,
     encoding: str = "utf-8",
-):
-    """Write the content of the database to a file."""
-    import csv
+    chunk_size: int = 1000,
+    workers: int = 1,
+) -> "Path":
+    """Write the content of the database to a file.
+
+    The rows are streamed from the database straight into the output, so
+    the memory needed does not depend on the size of the database.
+
+    In the `dict` format the whole database is a single JSON document that
+    maps table names to lists of rows. In the other formats each table is
+    written to its own file named after the table.
+
+    Args:
+        cn: The connection to the database.
+        output_path: Where to write. The name (without extensions) becomes
+            the name of the archive. Without an archive this is the file
+            of the `dict` format or the directory for the other formats.
+        file_format: The format of the tables.
+        archive_format: The kind of archive to create or None to write
+            plain files.
+        date_in_name: Add the current date to the name of the archive.
+        time_in_name: Add the current time to the name of the archive.
+        encoding: The encoding of the text formats.
+        chunk_size: The number of rows read from the database at a time.
+        workers: The number of tables that are read in parallel, each on
+            its own connection. Tables are still written in order; pools
+            that share a single connection are always read sequentially.
+
+    Returns:
+        The path of the archive, file or directory that was written.
+    """
     import json
-    import pickle
     import tarfile
     import zipfile
+    from contextlib import ExitStack, contextmanager
     from datetime import datetime
-    from io import BytesIO, StringIO
     from pathlib import Path
+    from shutil import copyfileobj
+    from tempfile import SpooledTemporaryFile
 
-    import yaml
+    from sqlalchemy import inspect
+
+    from exdrf_al.connection import worker_threads_for_pool
+
+    assert cn.engine is not None, "Engine is not connected."
 
     output_path = Path(output_path)
     file_format_lower = file_format.lower()
+    if file_format_lower not in get_args(FormatType):
+        raise ValueError(f"Invalid file format: {file_format}")
 
     # Get base name without any extensions for archive filename
     base_name = output_path.name
@@ -142,105 +407,87 @@ def write_db_to_file(
         archive_ext = ".tar.gz"
     elif archive_format == "tar.bz2":
         archive_ext = ".tar.bz2"
-    else:
+    elif archive_format is None:
         archive_ext = ""
+    else:
+        raise ValueError(f"Invalid archive format: {archive_format}")
 
     # Ensure output_path has the correct archive extension
-    original_output_path = output_path
     if archive_ext:
-        # Reconstruct path with archive extension
         output_path = output_path.parent / (base_name + archive_ext)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Handle dict format specifically
-    if file_format_lower == "dict":
-        # Collect all tables into a dictionary
-        db_dict = {}
-        for table, _, _, list_of_rows in dump_database(cn, file_format="dict"):
-            db_dict[table] = list_of_rows
-
-        # Serialize as JSON (dict format is typically JSON-serializable)
-        if file_format == "pickle":
-            content_bytes = pickle.dumps(db_dict)
-        elif file_format == "json":
-            content_str = json.dumps(db_dict, indent=2)
-            content_bytes = content_str.encode(encoding)
-        elif file_format == "yaml":
-            content_str = yaml.dump(db_dict, default_flow_style=False)
-            content_bytes = content_str.encode(encoding)
-        elif file_format == "csv":
-            for t_name, t_data in db_dict.items():
-                if not archive_format:
-                    with open(
-                        original_output_path / f"{t_name}.csv",
-                        "w",
-                        encoding=encoding,
-                    ) as f:
-                        writer = csv.writer(f)
-                        columns = list(t_data[0].keys())
-                        writer.writerow(columns)
-                        for row in t_data:
-                            writer.writerow([row[col] for col in columns])
-                    return
-                else:
-                    # Collect a mapping of table name -> CSV bytes
-                    table_csv_bytes = {}
-                    for t_name, t_data in db_dict.items():
-                        if not t_data:
-                            # If table data is empty, skip writing
-                            continue
-
-                        # Prepare a CSV string using StringIO
-                        csv_buffer = StringIO()
-                        writer = csv.writer(csv_buffer)
-                        columns = list(t_data[0].keys())
-                        writer.writerow(columns)
-                        for row in t_data:
-                            writer.writerow([row[col] for col in columns])
-                        csv_str = csv_buffer.getvalue()
-                        csv_bytes = csv_str.encode(encoding)
-                        table_csv_bytes[t_name] = csv_bytes
-
-        # At this point table_csv_bytes acts as {table_name: csv_bytes}
-        # These should be written to the archive in the surrounding code
-        else:
-            content_str = json.dumps(db_dict, indent=2)
-            content_bytes = content_str.encode(encoding)
-
-        # Get format extension for file inside archive
-        format_ext = get_format_extension(file_format)
-        archive_filename = base_name + format_ext
+    tables = inspect(cn.engine).get_table_names()
+    workers = max(1, min(workers, len(tables), worker_threads_for_pool(cn.engine.pool)))
 
-        # Write to archive or file
+    with ExitStack() as stack:
+        # Opens a member of the output for writing; tar members need their
+        # size up front so they are spooled first.
         if archive_format == "zip":
-            if file_format == "csv":
-                pass
+            zf = stack.enter_context(
+                zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED)
+            )
+
+            def open_member(name: str) -> IO[bytes]:
+                return zf.open(name, "w", force_zip64=True)
+
+        elif archive_format is not None:
+            mode = {"tar": "w", "tar.gz": "w:gz", "tar.bz2": "w:bz2"}
+            tf = stack.enter_context(tarfile.open(output_path, mode[archive_format]))
+
+            @contextmanager
+            def tar_member(name: str) -> Iterator[IO[bytes]]:
+                with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+                    yield spool  # type: ignore[misc]
+                    info = tarfile.TarInfo(name=name)
+                    info.size = spool.tell()
+                    info.mtime = int(datetime.now().timestamp())
+                    spool.seek(0)
+                    tf.addfile(info, spool)
+
+            open_member = tar_member  # type: ignore[assignment]
+        else:
+            if file_format_lower != "dict":
+                output_path.mkdir(parents=True, exist_ok=True)
+
+            def open_member(name: str) -> IO[bytes]:
+                if file_format_lower == "dict":
+                    return open(output_path, "wb")
+                return open(output_path / name, "wb")
+
+        # The sources of the serialized tables.
+        def sequential() -> Generator[Tuple[str, Any], None, None]:
+            with cn.engine.connect() as conn:  # type: ignore[union-attr]
+                for table in tables:
+                    yield table, iter_table_chunks(conn, table, chunk_size)
+
+        if workers > 1:
+            sources: Generator[Tuple[str, Any], None, None] = _iter_spooled_tables(
+                cn, tables, file_format, encoding, chunk_size, workers
+            )
+        else:
+            sources = sequential()
+        stack.callback(sources.close)
+
+        def emit(stream: IO[bytes], source: Any) -> None:
+            if workers > 1:
+                copyfileobj(source, stream, 1024 * 1024)
             else:
-                with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                    zf.writestr(archive_filename, content_bytes)
-        elif archive_format == "tar":
-            with tarfile.open(output_path, "w") as tf:
-                info = tarfile.TarInfo(name=archive_filename)
-                info.size = len(content_bytes)
-                tf.addfile(info, BytesIO(content_bytes))
-        elif archive_format == "tar.gz":
-            with tarfile.open(output_path, "w:gz") as tf:
-                info = tarfile.TarInfo(name=archive_filename)
-                info.size = len(content_bytes)
-                tf.addfile(info, BytesIO(content_bytes))
-        elif archive_format == "tar.bz2":
-            with tarfile.open(output_path, "w:bz2") as tf:
-                info = tarfile.TarInfo(name=archive_filename)
-                info.size = len(content_bytes)
-                tf.addfile(info, BytesIO(content_bytes))
-        elif file_format == "pickle":
-            with open(output_path, "wb") as f:
-                f.write(content_bytes)
+                columns, chunks = source
+                write_table(stream, columns, chunks, file_format, encoding)
+
+        if file_format_lower == "dict":
+            with open_member(base_name + get_format_extension("dict")) as out:
+                out.write(b"{")
+                for i, (table, source) in enumerate(sources):
+                    out.write(b"," if i else b"")
+                    out.write(("\n" + json.dumps(table) + ": ").encode(encoding))
+                    emit(out, source)
+                out.write(b"\n}" if tables else b"}")
         else:
-            # Write directly to file if no archive format
-            with open(output_path, "w", encoding=encoding) as f:
-                f.write(content_str)
-    else:
-        # Handle other formats (existing implementation would go here)
-        raise NotImplementedError(
-            f"Format {file_format} not yet implemented in write_db_to_file"
-        )
+            ext = get_format_extension(file_format)
+            for table, source in sources:
+                with open_member(table + ext) as out:
+                    emit(out, source)
+
+    return output_path
@@ -0,0 +1,439 @@
+"""Keyset (seek) pagination helpers.
+
+``OFFSET n`` makes the database walk and discard ``n`` rows, so the cost of a
+page grows with its position. Keyset pagination instead remembers the sort key
+of the last row that was shown (the *cursor*) and asks for the rows that come
+after it::
+
+    WHERE (k1 > :v1) OR (k1 = :v1 AND k2 > :v2) ... ORDER BY k1, k2 ...
+
+With an index on the sort keys this costs about the same on page 1 and on
+page 100 000. The ordering must be total, which is why callers append the
+primary key columns as tie-breakers (see
+:func:`exdrf_al.al2r_read.sort_items_to_order_by`).
+
+``NULL`` never compares with ``>`` or ``<``, so nullable keys get explicit
+``IS NULL`` / ``IS NOT NULL`` branches placed where the backend sorts
+``NULL`` (see :func:`nulls_sort_high`).
+
+Random jumps (a scroll bar dragged to 90%, a client asking for
+``offset=4_000_000``) are served from :class:`KeysetAnchors`: sparse
+``offset -> cursor`` pairs recorded while pages are loaded (or collected in one
+pass over the key columns), so a jump only seeks to the nearest anchor and
+skips the few rows in between.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import datetime
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Hashable, Sequence
+
+from sqlalchemy import Select, and_, false, func, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+KeysetKeys = list[tuple[Any, bool]]
+
+# Backends that sort NULL after every value in ascending order (and first in
+# descending order); the others sort it before every value.
+NULLS_HIGH_DIALECTS = frozenset({"oracle", "postgresql"})
+
+
+def nulls_sort_high(dialect: Any) -> bool:
+    """Tell if ``NULL`` sorts after every value in ascending order.
+
+    Args:
+        dialect: SQLAlchemy dialect, or its name.
+
+    Returns:
+        ``True`` for PostgreSQL and Oracle, ``False`` for SQLite, MySQL,
+        SQL Server and unknown backends.
+    """
+    return getattr(dialect, "name", dialect) in NULLS_HIGH_DIALECTS
+
+
+def keyset_keys_from_order_by(clauses: Sequence[Any]) -> KeysetKeys:
+    """Split ``ORDER BY`` clauses into ``(expression, descending)`` pairs.
+
+    Args:
+        clauses: Clauses as produced by ``column.asc()`` / ``column.desc()``
+            or bare column expressions (ascending).
+
+    Returns:
+        One ``(expression, descending)`` pair per clause.
+
+    Raises:
+        ValueError: If a clause uses a modifier that keyset comparisons cannot
+            express (for example ``NULLS FIRST``).
+    """
+
+    keys: KeysetKeys = []
+    for clause in clauses:
+        if isinstance(clause, UnaryExpression) and clause.modifier in (
+            operators.asc_op,
+            operators.desc_op,
+        ):
+            keys.append((clause.element, clause.modifier is operators.desc_op))
+        elif isinstance(clause, UnaryExpression):
+            raise ValueError("unsupported ORDER BY clause for keyset: %s" % clause)
+        else:
+            keys.append((clause, False))
+    return keys
+
+
+def keyset_after_clause(
+    keys: KeysetKeys, values: Sequence[Any], nulls_high: bool = False
+) -> Any:
+    """Build the predicate selecting the rows that sort after ``values``.
+
+    Args:
+        keys: ``(expression, descending)`` pairs in ``ORDER BY`` order.
+        values: The sort key of the last row already seen, one value per key;
+            any of them may be ``NULL``.
+        nulls_high: Whether the backend sorts ``NULL`` after every value in
+            ascending order (see :func:`nulls_sort_high`).
+
+    Returns:
+        SQLAlchemy boolean expression.
+
+    Raises:
+        ValueError: If ``values`` does not match ``keys`` in length.
+    """
+
+    if len(keys) != len(values):
+        raise ValueError(
+            "keyset cursor has %d values, ordering has %d keys"
+            % (len(values), len(keys))
+        )
+
+    # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... with per-key direction.
+    branches = []
+    eq: list[Any] = []
+    for (expr, desc), value in zip(keys, values):
+        nulls_last = nulls_high != desc
+        if value is None:
+            # Only non-NULL keys can follow a NULL, and only if NULLs come
+            # first in this direction.
+            step = None if nulls_last else expr.is_not(None)
+            same = expr.is_(None)
+        else:
+            step = expr < value if desc else expr > value
+            if nulls_last:
+                step = or_(step, expr.is_(None))
+            same = expr == value
+        if step is not None:
+            branches.append(and_(*eq, step) if eq else step)
+        eq.append(same)
+    if not branches:
+        return false()
+    return or_(*branches)
+
+
+def keyset_anchor_statement(stmt: Select[Any], keys: KeysetKeys, spacing: int) -> Any:
+    """Build a query returning the sort key of every ``spacing``-th row.
+
+    The query numbers the rows of ``stmt`` with ``ROW_NUMBER()`` in keyset
+    order and keeps those at offsets ``spacing - 1``, ``2 * spacing - 1``, ...
+    so a page starting at a multiple of ``spacing`` seeks with no skipped
+    rows. Only the key columns are read, which lets the database answer from
+    an index.
+
+    Args:
+        stmt: The filtered selection (its own ordering and paging are
+            dropped).
+        keys: ``(expression, descending)`` pairs in ``ORDER BY`` order.
+        spacing: Distance between anchors, in rows.
+
+    Returns:
+        Select yielding ``(row_number, key_1, ..., key_n)`` ordered by row
+        number.
+    """
+
+    order = [k.desc() if desc else k.asc() for k, desc in keys]
+    rn = func.row_number().over(order_by=order).label("_exdrf_rn")
+    inner = (
+        stmt.with_only_columns(
+            *[k.label("_exdrf_k%d" % i) for i, (k, _d) in enumerate(keys)],
+            rn,
+            maintain_column_froms=True,
+        )
+        .order_by(None)
+        .limit(None)
+        .offset(None)
+        .subquery()
+    )
+    key_cols = [inner.c["_exdrf_k%d" % i] for i in range(len(keys))]
+    return (
+        select(inner.c._exdrf_rn, *key_cols)
+        .where(inner.c._exdrf_rn % spacing == 0)
+        .order_by(inner.c._exdrf_rn)
+    )
+
+
+def _encode_value(value: Any) -> list[Any]:
+    """Tag a cursor value so it decodes back to the same Python type."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return ["", value]
+    if isinstance(value, datetime.datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ["d", value.isoformat()]
+    if isinstance(value, datetime.time):
+        return ["t", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    if isinstance(value, uuid.UUID):
+        return ["uuid", str(value)]
+    if isinstance(value, bytes):
+        return ["b", base64.b64encode(value).decode("ascii")]
+    raise ValueError("cannot encode %r in a keyset cursor" % (value,))
+
+
+def _decode_value(tag: str, value: Any) -> Any:
+    """Reverse :func:`_encode_value`."""
+    if tag == "":
+        return value
+    if tag == "dt":
+        return datetime.datetime.fromisoformat(value)
+    if tag == "d":
+        return datetime.date.fromisoformat(value)
+    if tag == "t":
+        return datetime.time.fromisoformat(value)
+    if tag == "dec":
+        return Decimal(value)
+    if tag == "uuid":
+        return uuid.UUID(value)
+    if tag == "b":
+        return base64.b64decode(value)
+    raise ValueError("unknown keyset cursor tag %r" % (tag,))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode a sort-key tuple as an opaque, URL-safe cursor string.
+
+    Args:
+        values: Sort key of the last row of a page.
+
+    Returns:
+        Cursor string suitable for query parameters.
+    """
+
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[Any, ...]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+
+    Args:
+        cursor: Opaque cursor string.
+
+    Returns:
+        The sort-key tuple.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return tuple(_decode_value(tag, v) for tag, v in raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("invalid keyset cursor %r" % (cursor,)) from exc
+
+
+class KeysetAnchors:
+    """Sparse ``offset -> sort key`` map for one ordered, filtered listing.
+
+    The sort key stored at ``offset`` belongs to the row at that zero-based
+    position. A page starting at ``start`` is then loaded by seeking after
+    the nearest anchor below ``start`` and skipping ``start - anchor - 1``
+    rows.
+
+    Anchors go stale when rows are inserted or deleted before them, so owners
+    clear them whenever the listing changes; ``ttl`` bounds the staleness for
+    shared caches that cannot observe writes.
+
+    Attributes:
+        max_entries: Upper bound on stored anchors; the ones farthest from
+            the most recently added anchor are dropped first.
+        ttl: Seconds after which the whole map is discarded (``None`` keeps
+            anchors until :meth:`clear`).
+        complete: Set once :func:`fill_keyset_anchors` covered the whole
+            listing, so callers do not scan it again.
+    """
+
+    max_entries: int
+    ttl: float | None
+    complete: bool
+    _offsets: list[int]
+    _values: dict[int, tuple[Any, ...]]
+    _created: float
+    _lock: threading.Lock
+
+    def __init__(self, max_entries: int = 4096, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.complete = False
+        self._offsets = []
+        self._values = {}
+        self._created = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _expire(self) -> None:
+        """Drop every anchor if the map outlived ``ttl``."""
+        if self.ttl is not None and time.monotonic() - self._created > self.ttl:
+            self._offsets.clear()
+            self._values.clear()
+            self._created = time.monotonic()
+            self.complete = False
+
+    def clear(self) -> None:
+        """Forget all anchors."""
+        with self._lock:
+            self._offsets.clear()
+            self._values.clear()
+            self._created = time.monotonic()
+            self.complete = False
+
+    def add(self, offset: int, values: Sequence[Any]) -> None:
+        """Record the sort key of the row at ``offset``.
+
+        Args:
+            offset: Zero-based position of the row in the listing.
+            values: The row's sort key, in ``ORDER BY`` order.
+        """
+        if offset < 0:
+            return
+        with self._lock:
+            self._expire()
+            if offset not in self._values:
+                bisect.insort(self._offsets, offset)
+            self._values[offset] = tuple(values)
+
+            # Keep the map bounded, dropping the anchor farthest away.
+            while len(self._offsets) > self.max_entries:
+                first, last = self._offsets[0], self._offsets[-1]
+                drop = first if offset - first > last - offset else last
+                self._offsets.remove(drop)
+                del self._values[drop]
+
+    def nearest_before(self, start: int) -> tuple[int, tuple[Any, ...]] | None:
+        """Return the closest anchor strictly before ``start``.
+
+        Args:
+            start: Zero-based position of the first wanted row.
+
+        Returns:
+            ``(anchor_offset, values)`` or ``None`` when no anchor precedes
+            ``start``.
+        """
+        with self._lock:
+            self._expire()
+            i = bisect.bisect_left(self._offsets, start)
+            if i == 0:
+                return None
+            offset = self._offsets[i - 1]
+            return offset, self._values[offset]
+
+    def remove_from(self, start: int) -> None:
+        """Drop anchors at or after ``start`` (rows there have shifted)."""
+        with self._lock:
+            i = bisect.bisect_left(self._offsets, start)
+            for offset in self._offsets[i:]:
+                del self._values[offset]
+            del self._offsets[i:]
+            self.complete = False
+
+
+def fill_keyset_anchors(
+    session: Session,
+    stmt: Select[Any],
+    keys: KeysetKeys,
+    anchors: KeysetAnchors,
+    spacing: int = 1000,
+) -> int:
+    """Record an anchor every ``spacing`` rows of ``stmt`` in ``anchors``.
+
+    Args:
+        session: Open SQLAlchemy session.
+        stmt: The filtered selection.
+        keys: ``(expression, descending)`` pairs in ``ORDER BY`` order.
+        anchors: Destination map.
+        spacing: Distance between anchors, in rows.
+
+    Returns:
+        Number of anchors recorded.
+    """
+
+    count = 0
+    for row in session.execute(keyset_anchor_statement(stmt, keys, spacing)):
+        anchors.add(int(row[0]) - 1, tuple(row[1:]))
+        count += 1
+    anchors.complete = True
+    return count
+
+
+class KeysetAnchorCache:
+    """Bounded LRU of :class:`KeysetAnchors`, one per listing signature.
+
+    Intended for stateless callers such as API routes, where the listing is
+    identified by its model, filters and sort rather than by an object that
+    lives across requests.
+
+    Attributes:
+        max_listings: Maximum number of listings kept.
+        ttl: Passed to each :class:`KeysetAnchors`.
+        max_entries: Passed to each :class:`KeysetAnchors`.
+    """
+
+    max_listings: int
+    ttl: float | None
+    max_entries: int
+    _items: OrderedDict[Hashable, KeysetAnchors]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        max_listings: int = 256,
+        ttl: float | None = 60.0,
+        max_entries: int = 1024,
+    ):
+        self.max_listings = max_listings
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def for_listing(self, key: Hashable) -> KeysetAnchors:
+        """Return (creating if needed) the anchors for listing ``key``."""
+        with self._lock:
+            anchors = self._items.get(key)
+            if anchors is None:
+                anchors = KeysetAnchors(max_entries=self.max_entries, ttl=self.ttl)
+                self._items[key] = anchors
+                while len(self._items) > self.max_listings:
+                    self._items.popitem(last=False)
+            else:
+                self._items.move_to_end(key)
+            return anchors
+
+    def clear(self) -> None:
+        """Forget every listing (for example after bulk writes)."""
+        with self._lock:
+            self._items.clear()
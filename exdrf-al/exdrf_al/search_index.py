@@ -0,0 +1,418 @@
+"""Index-backed quick search.
+
+Quick search turns the text the user types into ``ILIKE '%term%'``
+conditions over the quick-search columns of a table and their ``ua_*``
+companions. A pattern that starts with a wildcard cannot use a b-tree index,
+so every keystroke scans the whole table. This module keeps a trigram index
+over those columns:
+
+- on SQLite, an FTS5 table with the ``trigram`` tokenizer that mirrors the
+  table through triggers. :meth:`SearchIndex.prefilter` turns a group of
+  ``ILIKE`` conditions into an index lookup that selects a superset of the
+  matching rows; the original conditions then only look at those rows;
+- on PostgreSQL, ``pg_trgm`` GIN indexes, which the planner already uses for
+  ``ILIKE``, so the conditions are left as they are.
+
+Tables without an index are searched with the plain ``ILIKE`` conditions.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Integer,
+    Table,
+    column,
+    inspect,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.engine import Connection, Engine
+
+if TYPE_CHECKING:
+    from exdrf.resource import ExResource
+
+logger = logging.getLogger(__name__)
+
+# The name of the index of a table is the table name with this suffix.
+INDEX_SUFFIX = "_qs"
+
+# The trigram tokenizer cannot look up shorter terms.
+MIN_TERM_LENGTH = 3
+
+_WILDCARDS = re.compile(r"[%_]+")
+
+
+@dataclass(frozen=True)
+class SearchIndexSpec:
+    """The columns of a table that the quick search index covers.
+
+    Attributes:
+        table: The indexed table.
+        key: The integer primary key of the table; SQLite needs it to
+            link the index rows to the table rows.
+        columns: The indexed columns.
+    """
+
+    table: Table
+    key: Column[Any] | None
+    columns: tuple[Column[Any], ...]
+
+    @property
+    def name(self) -> str:
+        """The name of the index table (SQLite) or the index name prefix."""
+        return f"{self.table.name}{INDEX_SUFFIX}"
+
+    @classmethod
+    def from_model(cls, db_model: Any, attributes: Iterable[str]) -> SearchIndexSpec:
+        """Create the specification for some attributes of a mapped class.
+
+        Args:
+            db_model: The SQLAlchemy mapped class.
+            attributes: The names of the mapped attributes to index.
+
+        Returns:
+            The specification.
+        """
+        mapper = inspect(db_model)
+        local = mapper.local_table
+        if not isinstance(local, Table):
+            raise ValueError(f"{db_model.__name__} is not mapped to a table")
+
+        columns: list[Column[Any]] = []
+        for name in attributes:
+            col = mapper.columns[name]
+            if col not in columns:
+                columns.append(col)
+        if not columns:
+            raise ValueError(f"{db_model.__name__}: nothing to index")
+
+        pk = list(local.primary_key.columns)
+        key = pk[0] if len(pk) == 1 and isinstance(pk[0].type, Integer) else None
+        return cls(table=local, key=key, columns=tuple(columns))
+
+    @classmethod
+    def from_resource(cls, resource: ExResource) -> SearchIndexSpec | None:
+        """Create the specification from a resource definition.
+
+        The index covers the string fields in the quick search set of the
+        resource (see ``ExField.qsearch``) and the ``ua_*`` fields derived
+        from them.
+
+        Args:
+            resource: A resource whose ``src`` is a SQLAlchemy mapped class.
+
+        Returns:
+            The specification, or None if the resource has nothing to index.
+        """
+        from exdrf.constants import FIELD_TYPE_STRING
+        from exdrf.field import NO_DIACRITICS
+
+        mapped = inspect(resource.src).columns
+        attributes: list[str] = []
+        for fld in resource.fields:
+            if fld.type_name != FIELD_TYPE_STRING or fld.derived:
+                continue
+            if not fld.qsearch or fld.name not in mapped:
+                continue
+            attributes.append(fld.name)
+            for other in resource.fields:
+                if other.derived == (fld.name, NO_DIACRITICS):
+                    if other.name in mapped:
+                        attributes.append(other.name)
+        if not attributes:
+            return None
+        return cls.from_model(resource.src, attributes)
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """An existing SQLite index, as found in the database.
+
+    Attributes:
+        name: The name of the FTS5 table.
+        key: The primary key column of the indexed table.
+        columns: Maps the mapped attribute names to the names of the index
+            columns.
+    """
+
+    name: str
+    key: ColumnElement[Any]
+    columns: Mapping[str, str]
+
+    def prefilter(
+        self, conditions: Iterable[tuple[str, Any]], escape: str | None = None
+    ) -> ColumnElement[bool] | None:
+        """Narrow a group of ``ILIKE`` conditions joined by ``OR``.
+
+        The result selects every row that matches at least one of the
+        conditions and, usually, few others, so it is meant to be added to
+        the conditions, not to replace them.
+
+        Args:
+            conditions: ``(attribute, pattern)`` pairs, one for each
+                ``attribute ILIKE pattern`` condition of the group.
+            escape: The ``ESCAPE`` character of the conditions, if any.
+
+        Returns:
+            The condition that looks the rows up in the index or None when
+            the index cannot answer the group: a column is not indexed or a
+            pattern has no literal part long enough.
+        """
+        by_terms: dict[tuple[str, ...], list[str]] = {}
+        for attribute, pattern in conditions:
+            index_column = self.columns.get(attribute)
+            if index_column is None or not isinstance(pattern, str):
+                return None
+            terms = like_terms(pattern, escape)
+            if not terms:
+                return None
+            group = by_terms.setdefault(terms, [])
+            if index_column not in group:
+                group.append(index_column)
+        if not by_terms:
+            return None
+
+        query = " OR ".join(
+            "{%s}: (%s)"
+            % (
+                " ".join(_fts_string(c) for c in columns),
+                " AND ".join(_fts_string(t) for t in terms),
+            )
+            for terms, columns in by_terms.items()
+        )
+        rows = (
+            select(column("rowid"))
+            .select_from(table(self.name))
+            .where(column(self.name).match(query))
+        )
+        return self.key.in_(rows)
+
+
+def like_terms(pattern: str, escape: str | None = None) -> tuple[str, ...]:
+    """The literal parts of a ``LIKE`` pattern that the index can look up.
+
+    Every string the pattern matches contains all of these parts. Parts
+    shorter than :data:`MIN_TERM_LENGTH` are left out.
+
+    Args:
+        pattern: The pattern.
+        escape: The ``ESCAPE`` character of the pattern, if any. The
+            character that follows it is part of the literal, even if it
+            is a wildcard or the escape character itself.
+    """
+    if not escape:
+        parts = _WILDCARDS.split(pattern)
+    else:
+        parts = []
+        literal: list[str] = []
+        chars = iter(pattern)
+        for char in chars:
+            if char == escape:
+                literal.append(next(chars, char))
+            elif char in "%_":
+                parts.append("".join(literal))
+                literal = []
+            else:
+                literal.append(char)
+        parts.append("".join(literal))
+    return tuple(part for part in parts if len(part) >= MIN_TERM_LENGTH)
+
+
+def _fts_string(value: str) -> str:
+    """Quote a value as an FTS5 string."""
+    return '"%s"' % value.replace('"', '""')
+
+
+def _sqlite_statements(conn: Connection, spec: SearchIndexSpec) -> list[str]:
+    """The statements that create the SQLite index and its triggers."""
+    if spec.key is None:
+        raise ValueError(
+            f"{spec.table.name}: SQLite search indexes need a single "
+            "integer primary key"
+        )
+    q = conn.dialect.identifier_preparer.quote
+    name = q(spec.name)
+    tbl = q(spec.table.name)
+    key = q(spec.key.name)
+    cols = ", ".join(q(c.name) for c in spec.columns)
+    new = ", ".join(f"new.{q(c.name)}" for c in spec.columns)
+    old = ", ".join(f"old.{q(c.name)}" for c in spec.columns)
+    delete = (
+        f"INSERT INTO {name}({name}, rowid, {cols}) "
+        f"VALUES ('delete', old.{key}, {old});"
+    )
+    insert = f"INSERT INTO {name}(rowid, {cols}) VALUES (new.{key}, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE {name} USING fts5({cols}, "
+        f"content='{spec.table.name}', content_rowid='{spec.key.name}', "
+        "tokenize='trigram')",
+        f"CREATE TRIGGER {q(spec.name + '_ai')} AFTER INSERT ON {tbl} "
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER {q(spec.name + '_ad')} AFTER DELETE ON {tbl} "
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER {q(spec.name + '_au')} AFTER UPDATE ON {tbl} "
+        f"BEGIN {delete} {insert} END",
+        f"INSERT INTO {name}({name}) VALUES ('rebuild')",
+    ]
+
+
+def _pg_index_names(spec: SearchIndexSpec) -> list[str]:
+    """The names of the PostgreSQL indexes, one for each column."""
+    return [f"{spec.table.name}_{c.name}{INDEX_SUFFIX}" for c in spec.columns]
+
+
+def create_search_index(conn: Connection, spec: SearchIndexSpec) -> bool:
+    """Create (or re-create) the quick search index of a table.
+
+    An existing index is dropped first, so the function also applies a
+    changed list of columns. On SQLite the new index is filled from the
+    table; later writes reach it through triggers.
+
+    Args:
+        conn: The connection to use; the caller commits.
+        spec: What to index.
+
+    Returns:
+        True if the index was created, False if the database has no
+        supported index type.
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        statements = _sqlite_statements(conn, spec)
+    elif dialect == "postgresql":
+        q = conn.dialect.identifier_preparer
+        tbl = q.format_table(spec.table)
+        statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+        statements.extend(
+            f"CREATE INDEX {q.quote(idx)} ON {tbl} "
+            f"USING gin ({q.quote(c.name)} gin_trgm_ops)"
+            for idx, c in zip(_pg_index_names(spec), spec.columns)
+        )
+    else:
+        logger.warning("No quick search index for %s on %s", spec.table.name, dialect)
+        return False
+
+    drop_search_index(conn, spec)
+    for statement in statements:
+        conn.execute(text(statement))
+    forget_search_indexes(conn.engine)
+    return True
+
+
+def drop_search_index(conn: Connection, spec: SearchIndexSpec) -> None:
+    """Remove the quick search index of a table, if it exists.
+
+    Args:
+        conn: The connection to use; the caller commits.
+        spec: The index to remove.
+    """
+    dialect = conn.dialect.name
+    q = conn.dialect.identifier_preparer
+    if dialect == "sqlite":
+        statements = [
+            f"DROP TRIGGER IF EXISTS {q.quote(spec.name + suffix)}"
+            for suffix in ("_ai", "_ad", "_au")
+        ]
+        statements.append(f"DROP TABLE IF EXISTS {q.quote(spec.name)}")
+    elif dialect == "postgresql":
+        schema = f"{q.quote_schema(spec.table.schema)}." if spec.table.schema else ""
+        statements = [
+            f"DROP INDEX IF EXISTS {schema}{q.quote(idx)}"
+            for idx in _pg_index_names(spec)
+        ]
+    else:
+        return
+
+    for statement in statements:
+        conn.execute(text(statement))
+    forget_search_indexes(conn.engine)
+
+
+_found: weakref.WeakKeyDictionary[Engine, dict[str, SearchIndex | None]] = (
+    weakref.WeakKeyDictionary()
+)
+_found_lock = threading.Lock()
+
+
+def forget_search_indexes(engine: Engine | None = None) -> None:
+    """Look the indexes up again on the next :func:`find_search_index`.
+
+    Args:
+        engine: The engine whose indexes changed; None forgets all.
+    """
+    with _found_lock:
+        if engine is None:
+            _found.clear()
+        else:
+            _found.pop(engine, None)
+
+
+def find_search_index(engine: Engine, db_model: Any) -> SearchIndex | None:
+    """Find the SQLite index of the table of a mapped class.
+
+    The answer is remembered for each engine, so the database is asked once.
+    On other databases the function returns None: their indexes are used by
+    the planner without any help.
+
+    Args:
+        engine: The engine that reads the table.
+        db_model: The SQLAlchemy mapped class.
+
+    Returns:
+        The index, or None if the table has none.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+
+    mapper = inspect(db_model)
+    local = mapper.local_table
+    if not isinstance(local, Table):
+        return None
+
+    with _found_lock:
+        known = _found.setdefault(engine, {})
+        if local.name in known:
+            return known[local.name]
+
+    result: SearchIndex | None = None
+    name = f"{local.name}{INDEX_SUFFIX}"
+    pk = list(local.primary_key.columns)
+    try:
+        with engine.connect() as conn:
+            found = conn.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+                ),
+                {"name": name},
+            ).first()
+            if found is not None and len(pk) == 1:
+                quoted = conn.dialect.identifier_preparer.quote(name)
+                indexed = {
+                    row[1]
+                    for row in conn.exec_driver_sql(f"PRAGMA table_info({quoted})")
+                }
+                result = SearchIndex(
+                    name=name,
+                    key=pk[0],
+                    columns={
+                        key: col.name
+                        for key, col in mapper.columns.items()
+                        if col.table is local and col.name in indexed
+                    },
+                )
+    except Exception as e:
+        logger.warning("Failed to look up the search index %s: %s", name, e)
+
+    with _found_lock:
+        _found.setdefault(engine, {})[local.name] = result
+    return result
@@ -0,0 +1,251 @@
+"""Tests for batched nested list loading in :mod:`exdrf_al.al2r_read`."""
+
+from __future__ import annotations
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import ForeignKey, Integer, String, create_engine, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from exdrf_al.al2r_read import (
+    RelationListSpec,
+    hydrate_ex_inner_lists,
+    list_relation_subresource_page,
+    list_relation_subresource_pages,
+    list_root_ex_page,
+)
+from exdrf_pd.filter_item import FilterItem
+from exdrf_pd.paged import PagedList
+from exdrf_pd.sort_item import SortItem
+
+
+class ChildOut(BaseModel):
+    id: int
+    parent_id: int | None = None
+    name: str
+
+
+class TagOut(BaseModel):
+    id: int
+    name: str
+
+
+class ParentEx(BaseModel):
+    id: int
+    name: str
+    children: PagedList[ChildOut] = PagedList[ChildOut]()
+    tags: PagedList[TagOut] = PagedList[TagOut]()
+
+
+@pytest.fixture
+def rel_pack(LocalBase):
+    """Parents with FK children and m2m tags, populated unevenly."""
+
+    class Parent(LocalBase):
+        __tablename__ = "parents_read"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String(20))
+
+    class Child(LocalBase):
+        __tablename__ = "children_read"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        parent_id: Mapped[int | None] = mapped_column(
+            Integer, ForeignKey("parents_read.id"), nullable=True
+        )
+        name: Mapped[str] = mapped_column(String(20))
+
+    class Tag(LocalBase):
+        __tablename__ = "tags_read"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String(20))
+
+    class ParentTag(LocalBase):
+        __tablename__ = "parent_tags_read"
+
+        parent_id: Mapped[int] = mapped_column(
+            Integer, ForeignKey("parents_read.id"), primary_key=True
+        )
+        tag_id: Mapped[int] = mapped_column(
+            Integer, ForeignKey("tags_read.id"), primary_key=True
+        )
+
+    eng = create_engine("sqlite:///:memory:")
+    LocalBase.metadata.create_all(eng)
+    with Session(eng) as s:
+        for p in range(1, 6):
+            s.add(Parent(id=p, name="p%d" % p))
+        s.add_all(Tag(id=t, name="t%d" % (10 - t)) for t in range(1, 8))
+        s.flush()
+        cid = 1
+        for p in range(1, 6):
+            # Parent ``p`` gets ``(p - 1) * 2`` children and ``p`` tags.
+            for _ in range((p - 1) * 2):
+                s.add(Child(id=cid, parent_id=p, name="c%02d" % (cid % 7)))
+                cid += 1
+            for t in range(1, p + 1):
+                s.add(ParentTag(parent_id=p, tag_id=t))
+        s.commit()
+
+    children = RelationListSpec(
+        kind="o2m_fk",
+        parent_pk_attrs=("id",),
+        related_model=Child,
+        related_schema=ChildOut,
+        related_pk_col="id",
+        child_fk_col="parent_id",
+    )
+    tags = RelationListSpec(
+        kind="m2m",
+        parent_pk_attrs=("id",),
+        related_model=Tag,
+        related_schema=TagOut,
+        related_pk_col="id",
+        assoc_model=ParentTag,
+        parent_fk_cols=("parent_id",),
+        related_fk_col="tag_id",
+    )
+    yield eng, Parent, children, tags
+
+
+def _count_selects(eng):
+    """Attach a counter of executed statements to ``eng``."""
+    counter = {"n": 0}
+
+    def _on_exec(*_args, **_kwargs):
+        counter["n"] += 1
+
+    event.listen(eng, "before_cursor_execute", _on_exec)
+    return counter
+
+
+@pytest.mark.parametrize(
+    "sort, filters, offset, limit",
+    [
+        ([], [], 0, 3),
+        ([SortItem(attr="name", order="desc")], [], 0, 2),
+        ([SortItem(attr="name", order="asc")], [], 1, 2),
+        ([], [FilterItem(fld="name", op="ilike", vl="%t%")], 0, 10),
+    ],
+)
+def test_batched_pages_match_per_parent_pages(rel_pack, sort, filters, offset, limit):
+    """Batched pages equal the per-parent pages for o2m and m2m relations."""
+    eng, Parent, children, tags = rel_pack
+    with Session(eng) as s:
+        parents = list(s.query(Parent).order_by(Parent.id))
+        for spec in (children, tags):
+            if filters and spec is children:
+                continue
+            batched = list_relation_subresource_pages(
+                s,
+                parent_rows=parents,
+                spec=spec,
+                filters=filters,
+                sort=sort,
+                offset=offset,
+                limit=limit,
+            )
+            assert set(batched) == {(p.id,) for p in parents}
+            for p in parents:
+                single = list_relation_subresource_page(
+                    s,
+                    parent_row=p,
+                    spec=spec,
+                    filters=filters,
+                    sort=sort,
+                    offset=offset,
+                    limit=limit,
+                )
+                assert batched[(p.id,)] == single
+
+
+def test_list_root_ex_page_batched_equals_per_row(rel_pack):
+    """Batched hydration yields the same DTOs as the per-row path."""
+    eng, Parent, children, tags = rel_pack
+    specs = (("children", children), ("tags", tags))
+    kwargs = dict(
+        pk_names=("id",),
+        offset=0,
+        page_size=10,
+        filters=[],
+        sort=[],
+        inner_page=2,
+        inner_filters={},
+        inner_sort={},
+        inner_specs=specs,
+    )
+    with Session(eng) as s:
+        counter = _count_selects(eng)
+        batched = list_root_ex_page(s, Parent, ParentEx, **kwargs)
+        batched_queries = counter["n"]
+
+        counter["n"] = 0
+        per_row = list_root_ex_page(
+            s,
+            Parent,
+            ParentEx,
+            inner_batched=False,
+            **kwargs,  # type: ignore
+        )
+        per_row_queries = counter["n"]
+
+    assert batched == per_row
+    assert batched.items[0].children.total == 0
+    assert batched.items[4].children.total == 8
+    assert len(batched.items[4].children.items) == 2
+    assert batched.items[2].tags.total == 3
+
+    # Count + page for the root, plus two queries per relation.
+    assert batched_queries == 2 + 2 * len(specs)
+    assert per_row_queries == 2 + 2 * len(specs) * len(batched.items)
+
+
+def test_batched_empty_parents_and_bad_kind(rel_pack):
+    """No parents means no queries; unknown kinds are rejected."""
+    eng, Parent, children, _tags = rel_pack
+    with Session(eng) as s:
+        assert (
+            list_relation_subresource_pages(
+                s,
+                parent_rows=[],
+                spec=children,
+                filters=[],
+                sort=[],
+                offset=0,
+                limit=5,
+            )
+            == {}
+        )
+        parent = s.get(Parent, 1)
+        bad = RelationListSpec(
+            kind="nope",
+            parent_pk_attrs=("id",),
+            related_model=children.related_model,
+            related_schema=ChildOut,
+            related_pk_col="id",
+        )
+        with pytest.raises(ValueError):
+            list_relation_subresource_pages(
+                s,
+                parent_rows=[parent],
+                spec=bad,
+                filters=[],
+                sort=[],
+                offset=0,
+                limit=5,
+            )
+        ex = ParentEx(id=1, name="p1")
+        assert (
+            hydrate_ex_inner_lists(
+                s,
+                parent_row=parent,
+                ex=ex,
+                inner_page=0,
+                inner_filters={},
+                inner_sort={},
+                inner_specs=(("children", children),),
+            )
+            is ex
+        )
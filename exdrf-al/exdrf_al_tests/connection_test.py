@@ -1,10 +1,15 @@
 from unittest.mock import MagicMock
 
 import pytest
-from sqlalchemy import Engine, Integer, inspect
+from sqlalchemy import Engine, Integer, create_engine, inspect, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from exdrf_al.connection import DbConn
+from exdrf_al.connection import (
+    DEFAULT_WORKER_THREADS,
+    MAX_WORKER_THREADS,
+    DbConn,
+    worker_threads_for_pool,
+)
 
 
 class TestDbConnConnect:
@@ -22,6 +27,40 @@ class TestDbConnConnect:
         engine = db_conn.connect()
         assert db_conn.engine is engine
 
+    def test_threads_count_from_pool(self):
+        db_conn = DbConn(c_string="sqlite:///:memory:")
+        db_conn.connect()
+        # A single shared in-memory connection feeds one worker.
+        assert db_conn.threads_count == 1
+
+        db_conn = DbConn(c_string="sqlite:///:memory:", threads_count=6)
+        db_conn.connect()
+        assert db_conn.threads_count == 6
+
+
+class TestWorkerThreadsForPool:
+    @pytest.mark.parametrize(
+        "pool_size, expected",
+        [(1, 1), (2, 1), (5, 4), (100, MAX_WORKER_THREADS)],
+    )
+    def test_queue_pool(self, tmp_path, pool_size, expected):
+        from sqlalchemy.pool import QueuePool
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'db.sqlite'}",
+            poolclass=QueuePool,
+            pool_size=pool_size,
+        )
+        assert worker_threads_for_pool(engine.pool) == expected
+
+    def test_unbounded_pool(self, tmp_path):
+        from sqlalchemy.pool import NullPool
+
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=NullPool
+        )
+        assert worker_threads_for_pool(engine.pool) == DEFAULT_WORKER_THREADS
+
 
 class TestDbConnClose:
     def test_no_engine(
@@ -101,6 +140,22 @@ class TestDbConnSession:
         assert len(session.new) == 0
         assert len(db_conn.s_stack) == 0
 
+    def test_own_connection(self, tmp_path):
+        from sqlalchemy.pool import QueuePool
+
+        db_conn = DbConn(c_string=f"sqlite:///{tmp_path / 'db.sqlite'}")
+        engine = db_conn.connect(poolclass=QueuePool)
+        with db_conn.session(add_to_stack=False, own_connection=True) as s:
+            assert len(db_conn.s_stack) == 0
+            conn = s.connection()
+            s.execute(text("SELECT 1"))
+            s.rollback()
+            # The connection survives the end of the transaction.
+            assert s.connection() is conn
+            assert not conn.closed
+        assert conn.closed
+        assert engine.pool.checkedout() == 0
+
 
 class TestDbConnSameSession:
     def test_existing_session_no_commit(self):
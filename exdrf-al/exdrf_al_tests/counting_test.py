@@ -0,0 +1,131 @@
+"""Tests for :mod:`exdrf_al.counting`."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import Integer, create_engine, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from exdrf_al.al2r_read import select_paged_rows
+from exdrf_al.counting import (
+    CachedCount,
+    CountResult,
+    DeferredCount,
+    EstimatedCount,
+    ExactCount,
+    count_statement_key,
+)
+from exdrf_pd.filter_item import FilterItem
+from exdrf_pd.sort_item import SortItem
+
+
+@pytest.fixture
+def items_pack(LocalBase):
+    """A table with 120 rows spread over four groups."""
+
+    class Item(LocalBase):
+        __tablename__ = "counting_items"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        grp: Mapped[int] = mapped_column(Integer)
+
+    eng = create_engine("sqlite:///:memory:")
+    LocalBase.metadata.create_all(eng)
+    with Session(eng) as s:
+        s.add_all(Item(id=i, grp=i % 4) for i in range(1, 121))
+        s.commit()
+
+    counter = {"n": 0}
+
+    def _on_exec(_conn, _cursor, statement, *_args, **_kwargs):
+        if "count(" in statement:
+            counter["n"] += 1
+
+    event.listen(eng, "before_cursor_execute", _on_exec)
+    yield eng, Item, counter
+
+
+def test_exact_and_estimated_on_sqlite(items_pack):
+    """SQLite has no planner estimate, so estimation counts exactly."""
+    eng, Item, _counter = items_pack
+    stmt = select(Item).where(Item.grp == 1).order_by(Item.id.desc())
+    with Session(eng) as s:
+        assert ExactCount().count(s, stmt) == CountResult(30)
+        assert EstimatedCount(exact_below=0).count(s, stmt) == CountResult(30)
+
+
+def test_deferred_reports_lower_bound(items_pack):
+    """Big selections are reported as "at least probe" until refined."""
+    eng, Item, _counter = items_pack
+    with Session(eng) as s:
+        strategy = DeferredCount(probe=50)
+        assert strategy.count(s, select(Item)) == CountResult(
+            50, exact=False, lower_bound=True
+        )
+        assert strategy.count(s, select(Item).where(Item.grp == 0)) == (CountResult(30))
+        assert strategy.refine(s, select(Item)) == CountResult(120)
+
+
+def test_cached_ignores_order_and_invalidates(items_pack):
+    """Re-sorting hits the cache; writes to the table invalidate it."""
+    eng, Item, counter = items_pack
+    strategy = CachedCount()
+    with Session(eng) as s:
+        base = select(Item).where(Item.grp == 2)
+        assert count_statement_key(s, base.order_by(Item.id)) == (
+            count_statement_key(s, base.order_by(Item.grp.desc()))
+        )
+        assert count_statement_key(s, base) != count_statement_key(
+            s, select(Item).where(Item.grp == 3)
+        )
+
+        assert strategy.count(s, base.order_by(Item.id)).value == 30
+        assert strategy.count(s, base.order_by(Item.id.desc())).value == 30
+        assert counter["n"] == 1
+
+        strategy.invalidate(["other_table"])
+        assert strategy.count(s, base).value == 30
+        assert counter["n"] == 1
+
+        s.add(Item(id=500, grp=2))
+        s.commit()
+        strategy.invalidate(["counting_items"])
+        assert strategy.count(s, base).value == 31
+        assert counter["n"] == 2
+
+
+def test_cached_keeps_only_exact_results(items_pack):
+    """Approximate counts are asked again until refined."""
+    eng, Item, counter = items_pack
+    strategy = CachedCount(DeferredCount(probe=10), max_entries=1)
+    assert strategy.refine_in_background
+    with Session(eng) as s:
+        assert not strategy.count(s, select(Item)).exact
+        assert not strategy.count(s, select(Item)).exact
+        assert counter["n"] == 2
+        assert strategy.refine(s, select(Item)) == CountResult(120)
+        assert strategy.count(s, select(Item)) == CountResult(120)
+        assert counter["n"] == 3
+        assert len(strategy) == 1
+
+
+def test_select_paged_rows_uses_counter(items_pack):
+    """Listing pages with a cached counter counts each filter once."""
+    eng, Item, counter = items_pack
+    strategy = CachedCount()
+    filters = [FilterItem(fld="grp", op="eq", vl=1)]
+    with Session(eng) as s:
+        for order in ("asc", "desc", "asc"):
+            total, rows = select_paged_rows(
+                s,
+                Item,
+                filters=filters,
+                sort=[SortItem(attr="id", order=order)],
+                pk_names=("id",),
+                offset=0,
+                limit=5,
+                counter=strategy,
+            )
+            assert total == 30
+            assert len(rows) == 5
+    assert counter["n"] == 1
@@ -0,0 +1,166 @@
+"""Tests for :mod:`exdrf_al.export`."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import tarfile
+import zipfile
+from datetime import date
+
+import pytest
+from sqlalchemy import Date, Integer, String, create_engine
+from sqlalchemy.orm import Mapped, Session, mapped_column
+from sqlalchemy.pool import QueuePool
+
+from exdrf_al.connection import DbConn
+from exdrf_al.export import (
+    iter_table_chunks,
+    load_pickled_rows,
+    write_db_to_file,
+    write_table,
+)
+
+
+@pytest.fixture
+def db_pack(LocalBase, tmp_path):
+    """A file database with a big table, a small one and an empty one."""
+
+    class Big(LocalBase):
+        __tablename__ = "export_big"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String)
+
+    class Small(LocalBase):
+        __tablename__ = "export_small"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        born: Mapped[date] = mapped_column(Date)
+
+    class Empty(LocalBase):
+        __tablename__ = "export_empty"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", poolclass=QueuePool)
+    LocalBase.metadata.create_all(engine)
+    with Session(engine) as s:
+        s.add_all(Big(id=i, name=f"n{i}") for i in range(1, 251))
+        s.add_all(Small(id=i, born=date(2020, 1, i)) for i in range(1, 4))
+        s.commit()
+
+    cn = DbConn(c_string=str(engine.url), engine=engine)
+    yield cn, tmp_path
+    engine.dispose()
+
+
+def test_table_is_read_in_chunks(db_pack):
+    """Rows arrive in chunks of the requested size."""
+    cn, _tmp = db_pack
+    with cn.engine.connect() as conn:
+        columns, chunks = iter_table_chunks(conn, "export_big", chunk_size=100)
+        assert columns == ["id", "name"]
+        assert [len(c) for c in chunks] == [100, 100, 50]
+
+
+@pytest.mark.parametrize("file_format", ["json", "dict", "yaml", "csv"])
+def test_write_table_formats(db_pack, file_format):
+    """Chunked output parses back to the whole table."""
+    cn, _tmp = db_pack
+    stream = io.BytesIO()
+    with cn.engine.connect() as conn:
+        columns, chunks = iter_table_chunks(conn, "export_big", chunk_size=7)
+        assert write_table(stream, columns, chunks, file_format) == 250
+
+    text = stream.getvalue().decode("utf-8")
+    expected = [[i, f"n{i}"] for i in range(1, 251)]
+    if file_format == "json":
+        assert json.loads(text) == expected
+    elif file_format == "dict":
+        assert json.loads(text) == [dict(zip(columns, r)) for r in expected]
+    elif file_format == "yaml":
+        yaml = pytest.importorskip("yaml")
+        assert yaml.safe_load(text) == expected
+    else:
+        rows = list(csv.reader(io.StringIO(text)))
+        assert rows[0] == columns
+        assert rows[1:] == [[str(a), b] for a, b in expected]
+
+
+@pytest.mark.parametrize("file_format", ["json", "dict", "yaml"])
+def test_write_empty_table(db_pack, file_format):
+    """An empty table is written as an empty list."""
+    if file_format == "yaml":
+        pytest.importorskip("yaml")
+    cn, _tmp = db_pack
+    stream = io.BytesIO()
+    with cn.engine.connect() as conn:
+        columns, chunks = iter_table_chunks(conn, "export_empty")
+        write_table(stream, columns, chunks, file_format)
+    assert json.loads(stream.getvalue()) == []
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_zip_per_table(db_pack, workers):
+    """Each table becomes a member; parallel dumps keep the same content."""
+    cn, tmp = db_pack
+    path = write_db_to_file(
+        cn,
+        tmp / "out" / "dump.zip",
+        file_format="pickle",
+        chunk_size=30,
+        workers=workers,
+    )
+    assert path == tmp / "out" / "dump.zip"
+    with zipfile.ZipFile(path) as zf:
+        assert sorted(zf.namelist()) == [
+            "export_big.pkl",
+            "export_empty.pkl",
+            "export_small.pkl",
+        ]
+        with zf.open("export_big.pkl") as member:
+            rows = list(load_pickled_rows(member))
+        assert rows == [(i, f"n{i}") for i in range(1, 251)]
+        with zf.open("export_empty.pkl") as member:
+            assert list(load_pickled_rows(member)) == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_tar_dict(db_pack, workers):
+    """The dict format is a single JSON document with all the tables."""
+    cn, tmp = db_pack
+    path = write_db_to_file(
+        cn,
+        tmp / "dump",
+        file_format="dict",
+        archive_format="tar.gz",
+        chunk_size=64,
+        workers=workers,
+    )
+    assert path.name == "dump.tar.gz"
+    with tarfile.open(path) as tf:
+        member = tf.extractfile("dump.json")
+        assert member is not None
+        data = json.load(member)
+
+    assert list(data) == ["export_big", "export_empty", "export_small"]
+    assert len(data["export_big"]) == 250
+    assert data["export_empty"] == []
+    assert data["export_small"][0] == {"id": 1, "born": "2020-01-01"}
+
+
+def test_plain_files(db_pack):
+    """Without an archive the tables are files in a directory."""
+    cn, tmp = db_pack
+    path = write_db_to_file(
+        cn, tmp / "plain", file_format="csv", archive_format=None, chunk_size=40
+    )
+    assert sorted(p.name for p in path.iterdir()) == [
+        "export_big.csv",
+        "export_empty.csv",
+        "export_small.csv",
+    ]
+    with open(path / "export_big.csv", newline="") as f:
+        assert len(list(csv.reader(f))) == 251
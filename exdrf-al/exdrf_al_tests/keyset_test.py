@@ -0,0 +1,313 @@
+"""Tests for :mod:`exdrf_al.keyset` and keyset paging in ``al2r_read``."""
+
+from __future__ import annotations
+
+import datetime
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Integer, String, create_engine, event, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from exdrf_al.al2r_read import select_keyset_rows, select_paged_rows
+from exdrf_al.keyset import (
+    KeysetAnchorCache,
+    KeysetAnchors,
+    decode_cursor,
+    encode_cursor,
+    fill_keyset_anchors,
+    keyset_after_clause,
+    keyset_keys_from_order_by,
+    nulls_sort_high,
+)
+from exdrf_pd.sort_item import SortItem
+
+
+@pytest.fixture
+def items_pack(LocalBase):
+    """A table with a low-cardinality sort column and 257 rows."""
+
+    class Item(LocalBase):
+        __tablename__ = "keyset_items"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        grp: Mapped[int] = mapped_column(Integer)
+        name: Mapped[str] = mapped_column(String(20))
+
+    eng = create_engine("sqlite:///:memory:")
+    LocalBase.metadata.create_all(eng)
+    with Session(eng) as s:
+        s.add_all(
+            Item(id=i, grp=(i * 7) % 5, name="n%03d" % ((i * 13) % 101))
+            for i in range(1, 258)
+        )
+        s.commit()
+    yield eng, Item
+
+
+@pytest.fixture
+def people_pack(LocalBase):
+    """Ten rows, four of which have a NULL ``name``."""
+
+    class Person(LocalBase):
+        __tablename__ = "keyset_people"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+    eng = create_engine("sqlite:///:memory:")
+    LocalBase.metadata.create_all(eng)
+    names = ["d", None, "a", "c", None, "b", None, "a", None, "e"]
+    with Session(eng) as s:
+        s.add_all(Person(id=i, name=n) for i, n in enumerate(names, 1))
+        s.commit()
+    yield eng, Person
+
+
+def _statements(eng):
+    """Collect the SQL text of every statement executed on ``eng``."""
+    seen: list[str] = []
+
+    def _on_exec(_conn, _cursor, statement, *_args, **_kwargs):
+        seen.append(statement)
+
+    event.listen(eng, "before_cursor_execute", _on_exec)
+    return seen
+
+
+def test_cursor_round_trip():
+    """Cursors preserve the Python types of the sort values."""
+    values = (
+        1,
+        "x",
+        2.5,
+        True,
+        datetime.datetime(2024, 1, 2, 3, 4, 5),
+        datetime.date(2024, 1, 2),
+        datetime.time(3, 4),
+        Decimal("1.10"),
+        uuid.UUID(int=5),
+        b"\x00\x01",
+    )
+    assert decode_cursor(encode_cursor(values)) == values
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_after_clause_mismatch(items_pack):
+    """Wrong arity is an error."""
+    _eng, Item = items_pack
+    keys = keyset_keys_from_order_by([Item.grp.desc(), Item.id.asc()])
+    assert [d for _k, d in keys] == [True, False]
+    with pytest.raises(ValueError):
+        keyset_after_clause(keys, (1,))
+    assert nulls_sort_high("postgresql")
+    assert not nulls_sort_high("sqlite")
+
+
+@pytest.mark.parametrize("desc", [False, True])
+@pytest.mark.parametrize("nulls_high", [False, True])
+def test_after_clause_with_nulls(people_pack, desc, nulls_high):
+    """Every row follows the cursor of the row before it, NULLs included."""
+    eng, Person = people_pack
+    keys = [(Person.name, desc), (Person.id, False)]
+
+    # Emulate the NULL placement of the backend on SQLite.
+    name = Person.name.desc() if desc else Person.name.asc()
+    name = name.nulls_last() if nulls_high != desc else name.nulls_first()
+    order = [name, Person.id.asc()]
+    with Session(eng) as s:
+        rows = list(s.execute(select(Person.name, Person.id).order_by(*order)))
+        for i, row in enumerate(rows):
+            after = keyset_after_clause(keys, tuple(row), nulls_high)
+            got = s.scalars(select(Person.id).where(after).order_by(*order))
+            assert list(got) == [r.id for r in rows[i + 1 :]]
+
+
+def test_anchors_nearest_and_bounds():
+    """Anchors are looked up below the requested start and stay bounded."""
+    anchors = KeysetAnchors(max_entries=3)
+    assert anchors.nearest_before(10) is None
+    anchors.add(9, (1,))
+    anchors.add(19, (2,))
+    assert anchors.nearest_before(10) == (9, (1,))
+    assert anchors.nearest_before(9) is None
+    anchors.add(29, (3,))
+    anchors.add(39, (4,))
+    assert len(anchors) == 3
+    assert anchors.nearest_before(10) is None
+    anchors.remove_from(20)
+    assert anchors.nearest_before(100) == (19, (2,))
+
+    cache = KeysetAnchorCache(max_listings=1)
+    first = cache.for_listing("a")
+    assert cache.for_listing("a") is first
+    cache.for_listing("b")
+    assert len(cache) == 1
+    assert cache.for_listing("a") is not first
+
+
+def test_fill_anchors_positions(items_pack):
+    """Anchor scan records the key of every ``spacing``-th row."""
+    eng, Item = items_pack
+    order = [Item.grp.asc(), Item.id.asc()]
+    keys = keyset_keys_from_order_by(order)
+    with Session(eng) as s:
+        expected = list(s.execute(select(Item.grp, Item.id).order_by(*order)))
+        anchors = KeysetAnchors()
+        assert fill_keyset_anchors(s, select(Item), keys, anchors, 50) == 5
+    assert anchors.complete
+    assert anchors.nearest_before(100) == (99, tuple(expected[99]))
+
+
+@pytest.mark.parametrize(
+    "sort",
+    [
+        [],
+        [SortItem(attr="grp", order="desc")],
+        [SortItem(attr="grp", order="asc"), SortItem(attr="name", order="desc")],
+    ],
+)
+def test_anchored_pages_match_offset_pages(items_pack, sort):
+    """Pages read through anchors equal plain OFFSET pages."""
+    eng, Item = items_pack
+    cache = KeysetAnchorCache()
+    with Session(eng) as s:
+        for offset in (0, 10, 20, 200, 120, 121, 250, 30):
+            plain = select_paged_rows(
+                s,
+                Item,
+                filters=[],
+                sort=sort,
+                pk_names=("id",),
+                offset=offset,
+                limit=10,
+            )
+            anchored = select_paged_rows(
+                s,
+                Item,
+                filters=[],
+                sort=sort,
+                pk_names=("id",),
+                offset=offset,
+                limit=10,
+                anchors=cache,
+                anchor_spacing=50,
+            )
+            assert anchored[0] == plain[0] == 257
+            assert [r.id for r in anchored[1]] == [r.id for r in plain[1]]
+
+
+def test_sequential_pages_seek(items_pack):
+    """Walking forward seeks after the previous page instead of skipping."""
+    eng, Item = items_pack
+    cache = KeysetAnchorCache()
+    with Session(eng) as s:
+        select_paged_rows(
+            s,
+            Item,
+            filters=[],
+            sort=[],
+            pk_names=("id",),
+            offset=0,
+            limit=10,
+            anchors=cache,
+        )
+        seen = _statements(eng)
+        _total, rows = select_paged_rows(
+            s,
+            Item,
+            filters=[],
+            sort=[],
+            pk_names=("id",),
+            offset=10,
+            limit=10,
+            anchors=cache,
+        )
+    assert [r.id for r in rows] == list(range(11, 21))
+    page_sql = seen[-1]
+    assert "keyset_items.id >" in page_sql
+    assert "OFFSET ?" in page_sql
+
+
+def test_select_keyset_rows_walks_everything(items_pack):
+    """Following ``next_cursor`` visits every row once, in order."""
+    eng, Item = items_pack
+    sort = [SortItem(attr="name", order="asc")]
+    with Session(eng) as s:
+        expected = [r.id for r in s.scalars(select(Item).order_by(Item.name, Item.id))]
+        got: list[int] = []
+        cursor = None
+        while True:
+            total, rows, cursor = select_keyset_rows(
+                s,
+                Item,
+                filters=[],
+                sort=sort,
+                pk_names=("id",),
+                limit=40,
+                after=cursor,
+                with_total=not got,
+            )
+            if not got:
+                assert total == 257
+            else:
+                assert total is None
+            got.extend(r.id for r in rows)
+            if cursor is None:
+                break
+    assert got == expected
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+def test_null_sort_keys_are_not_lost(people_pack, order):
+    """Cursor and anchored pages keep the rows with a NULL sort key."""
+    eng, Person = people_pack
+    sort = [SortItem(attr="name", order=order)]
+    cache = KeysetAnchorCache()
+    with Session(eng) as s:
+        _total, every = select_paged_rows(
+            s,
+            Person,
+            filters=[],
+            sort=sort,
+            pk_names=("id",),
+            offset=0,
+            limit=100,
+        )
+        expected = [r.id for r in every]
+        assert len(expected) == 10
+
+        got: list[int] = []
+        cursor = None
+        while True:
+            _total, rows, cursor = select_keyset_rows(
+                s,
+                Person,
+                filters=[],
+                sort=sort,
+                pk_names=("id",),
+                limit=3,
+                after=cursor,
+                with_total=False,
+            )
+            got.extend(r.id for r in rows)
+            if cursor is None:
+                break
+        assert got == expected
+
+        anchored: list[int] = []
+        for offset in range(0, 10, 3):
+            _total, rows = select_paged_rows(
+                s,
+                Person,
+                filters=[],
+                sort=sort,
+                pk_names=("id",),
+                offset=offset,
+                limit=3,
+                anchors=cache,
+            )
+            anchored.extend(r.id for r in rows)
+        assert anchored == expected
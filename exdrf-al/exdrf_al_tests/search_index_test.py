@@ -0,0 +1,132 @@
+"""Tests for :mod:`exdrf_al.search_index`."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import Integer, String, create_engine, or_, select
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from exdrf_al.search_index import (
+    SearchIndexSpec,
+    create_search_index,
+    drop_search_index,
+    find_search_index,
+    like_terms,
+)
+
+NAMES = ["Ștefan cel Mare", "Mircea cel Bătrân", "Vlad Țepeș", "Stefan Lazar"]
+
+
+@pytest.fixture
+def people(LocalBase):
+    """A table of people with a ``ua_name`` companion column."""
+
+    class Person(LocalBase):
+        __tablename__ = "si_people"
+
+        id: Mapped[int] = mapped_column(Integer, primary_key=True)
+        name: Mapped[str] = mapped_column(String(100))
+        ua_name: Mapped[str] = mapped_column(String(100))
+        note: Mapped[str] = mapped_column(String(100), nullable=True)
+
+    eng = create_engine("sqlite:///:memory:")
+    LocalBase.metadata.create_all(eng)
+    with Session(eng) as s:
+        s.add_all(Person(id=i, name=n, ua_name=n) for i, n in enumerate(NAMES, 1))
+        s.commit()
+    yield eng, Person
+    eng.dispose()
+
+
+def _ids(eng, stmt):
+    with Session(eng) as s:
+        return sorted(s.scalars(stmt))
+
+
+def test_like_terms():
+    """Only the literal parts long enough for trigrams are kept."""
+    assert like_terms("%ste%mar%") == ("ste", "mar")
+    assert like_terms("%st%") == ()
+    assert like_terms("a_bcd%") == ("bcd",)
+
+
+def test_like_terms_escape():
+    """Escaped wildcards and escape characters are literal."""
+    assert like_terms(r"%50\%\_ok%", "\\") == ("50%_ok",)
+    assert like_terms(r"%a\\b%cde%", "\\") == ("a\\b", "cde")
+    assert like_terms("%ab!%%xyz!", "!") == ("ab%", "xyz!")
+    assert like_terms(r"%50\%\_ok%") == ("50\\",)
+
+
+def test_prefilter_matches_ilike(people):
+    """The index selects every row the ILIKE conditions select."""
+    eng, Person = people
+    assert find_search_index(eng, Person) is None
+
+    spec = SearchIndexSpec.from_model(Person, ["name", "ua_name"])
+    with eng.begin() as conn:
+        assert create_search_index(conn, spec)
+
+    index = find_search_index(eng, Person)
+    assert index is not None
+    assert dict(index.columns) == {"name": "name", "ua_name": "ua_name"}
+
+    for pattern in ("%stef%", "%cel%mare%", "%ȚEP%", "%ircea%"):
+        exact = or_(Person.name.ilike(pattern), Person.ua_name.ilike(pattern))
+        prefilter = index.prefilter([("name", pattern), ("ua_name", pattern)])
+        assert prefilter is not None
+        assert _ids(eng, select(Person.id).where(prefilter, exact)) == (
+            _ids(eng, select(Person.id).where(exact))
+        )
+
+    # Only the indexed columns and long enough terms can be answered.
+    assert index.prefilter([("note", "%stef%")]) is None
+    assert index.prefilter([("name", "%st%")]) is None
+
+
+def test_prefilter_honours_escape(people):
+    """Escaped wildcards are looked up as part of the terms."""
+    eng, Person = people
+    with Session(eng) as s:
+        s.add(Person(id=10, name="Reducere 50%_ok", ua_name="x"))
+        s.commit()
+    with eng.begin() as conn:
+        create_search_index(conn, SearchIndexSpec.from_model(Person, ["name"]))
+    index = find_search_index(eng, Person)
+    assert index is not None
+
+    pattern = r"%50\%\_ok%"
+    exact = Person.name.ilike(pattern, escape="\\")
+    prefilter = index.prefilter([("name", pattern)], escape="\\")
+    assert prefilter is not None
+    assert _ids(eng, select(Person.id).where(exact)) == [10]
+    assert _ids(eng, select(Person.id).where(prefilter, exact)) == [10]
+
+
+def test_index_follows_writes(people):
+    """Inserts, updates and deletes reach the index through triggers."""
+    eng, Person = people
+    with eng.begin() as conn:
+        create_search_index(
+            conn, SearchIndexSpec.from_model(Person, ["name", "ua_name"])
+        )
+    index = find_search_index(eng, Person)
+    assert index is not None
+
+    with Session(eng) as s:
+        s.add(Person(id=10, name="Basarab", ua_name="basarab"))
+        s.get(Person, 1).name = "Petru Rareș"
+        s.delete(s.get(Person, 4))
+        s.commit()
+
+    def found(pattern):
+        cond = index.prefilter([("name", pattern)])
+        return _ids(eng, select(Person.id).where(cond))
+
+    assert found("%sarab%") == [10]
+    assert found("%rareș%") == [1]
+    assert found("%lazar%") == []
+
+    with eng.begin() as conn:
+        drop_search_index(conn, SearchIndexSpec.from_model(Person, ["name", "ua_name"]))
+    assert find_search_index(eng, Person) is None
@@ -63,7 +63,7 @@ class Al2pdSchemaResFile(Base):
             # Jinja context: partition kwargs, resource aliases, al2pd extras,
             # emitting module for template source comments.
             pd_kwargs = build_al2pd_template_kwargs(res)
-            r_args = resource_to_args(res)
+            r_args = resource_to_args(res, kwargs.get("gen_run"))
             args = {
                 **base,
                 **r_args,
@@ -254,7 +254,7 @@ class Al2rRouterResFile(Base):
         base = {**self.extra, **kwargs}
         for resource in kwargs["resources"]:
             res = cast("ExResource", resource)
-            rargs = resource_to_args(res)
+            rargs = resource_to_args(res, kwargs.get("gen_run"))
             orm_name = res.src.__name__ if res.src is not None else res.name
             pk_names = primary_key_names_for_routes(res)
             cats_t = tuple(res.categories or ())
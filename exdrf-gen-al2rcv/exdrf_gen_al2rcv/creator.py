@@ -102,7 +102,7 @@ class Al2rcvResourcePathFile(Base):
         # One ``*_rcv_paths.py`` per resource, under its category path (or out).
         for resource in kwargs["resources"]:
             res = cast("ExResource", resource)
-            r_args = resource_to_args(res)
+            r_args = resource_to_args(res, kwargs.get("gen_run"))
             cats_t = tuple(res.categories or ())
 
             # Precompute validated field dicts and their Python literal for
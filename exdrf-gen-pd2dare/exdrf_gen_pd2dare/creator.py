@@ -61,7 +61,7 @@ class Pd2dareExInterfaceFile(Base):
                     if f.type_name in type_to_field_class
                 }
             )
-            rargs = resource_to_args(resource)
+            rargs = resource_to_args(resource, kwargs.get("gen_run"))
             args = {
                 **base,
                 **rargs,
@@ -18,6 +18,7 @@ from exdrf_al.calc_q import (
     all_related_models,
     all_related_paths,
 )
+from exdrf_gen.gen_run import GenRun, incremental_from_env
 
 if TYPE_CHECKING:
     from exdrf.dataset import ExDataset  # noqa: F401
@@ -37,15 +38,26 @@ PER_REGEX = re.compile(rf"^.*{GUARD_START}\s+([_a-zA-Z0-9]+).*")
 @define
 class Base:
     def create_file(
-        self, env: Environment, path: str, name: str, src: str, **kwargs
+        self,
+        env: Environment,
+        path: str,
+        name: str,
+        src: str,
+        gen_run: Optional[GenRun] = None,
+        **kwargs,
     ) -> str:
         """Creates a file from the template.
 
+        The file is only written if its content changed. In an incremental
+        run the file is not even rendered if its fingerprint is the one
+        recorded last time and the file was not touched since.
+
         Args:
             env: The Jinja2 environment to use for rendering the template.
             path: The path to the directory where the file will be created.
             name: The name of the file to be created. Can be a template string.
             src: The name of the template file to be used.
+            gen_run: The state of the run, if any.
             **kwargs: Additional keyword arguments to pass to the template
                 rendering function and the file name.
 
@@ -55,10 +67,16 @@ class Base:
         assert hasattr(self, "extra"), "extra attribute not set"
         mapping = {**self.extra, **kwargs}  # type: ignore
 
-        template = env.get_template(src)
         os.makedirs(path, exist_ok=True)
         result_file = os.path.join(path, name.format(**mapping))
 
+        fingerprint: Optional[str] = None
+        if gen_run is not None:
+            fingerprint = gen_run.fingerprint(env, src, mapping)
+            if gen_run.is_fresh(result_file, fingerprint):
+                return result_file
+        template = env.get_template(src)
+
         # Read the content of the file and look for parts that should be
         # preserved.
         def to_str(value: List[str]) -> str:
@@ -73,14 +91,14 @@ class Base:
             a: to_str(b) for a, b in self.read_preserved(result_file).items()
         }
 
-        with open(result_file, "w", encoding="utf-8") as f:
-            f.write(
-                template.render(
-                    source_templ=src,
-                    **mapping,
-                    **preserved_str,
-                )
-            )
+        content = template.render(
+            source_templ=src,
+            **mapping,
+            **preserved_str,
+        )
+        written = write_if_changed(result_file, content)
+        if gen_run is not None:
+            gen_run.record(result_file, fingerprint, written)
         return result_file
 
     def read_preserved(self, result_file: str) -> Dict[str, List[str]]:
@@ -188,6 +206,31 @@ class Dir(Base):
             comp.generate(c_path, **mapping)
 
 
+def write_if_changed(path: str, content: str) -> bool:
+    """Writes the content to a file unless the file already has it.
+
+    Leaving identical files alone keeps their modification time, so the tools
+    that watch the output do not see a change.
+
+    Args:
+        path: The path to the file.
+        content: The text to write; new lines are translated as in text mode.
+
+    Returns:
+        True if the file was written.
+    """
+    data = content.replace("\n", os.linesep).encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+    return True
+
+
 def field_base_class(fld: "ExField"):
     f_base_class = "".join([c.title() for c in fld.type_name.split("-")])
     if "To" in f_base_class:
@@ -263,7 +306,18 @@ class FieldDir(Dir):
                 comp.generate(c_path, **args)
 
 
-def resource_to_args(resource: "ExResource"):
+def resource_to_args(
+    resource: "ExResource", gen_run: Optional[GenRun] = None
+) -> Dict[str, Any]:
+    """Computes the template arguments of a resource.
+
+    Args:
+        resource: The resource.
+        gen_run: The state of the run; when given, the arguments are computed
+            only once per resource for the whole run.
+    """
+    if gen_run is not None:
+        return gen_run.resource_args(resource, resource_to_args)
     return {
         "r": resource,
         "fields": resource.sorted_fields,
@@ -305,7 +359,7 @@ class ResFile(File):
             args = {
                 **self.extra,
                 **kwargs,
-                **resource_to_args(resource),
+                **resource_to_args(resource, kwargs.get("gen_run")),
             }
             self.create_file(env, out_path, self.name, self.template, **args)
 
@@ -331,7 +385,7 @@ class ResDir(Dir):
             args = {
                 **self.extra,
                 **kwargs,
-                **resource_to_args(resource),
+                **resource_to_args(resource, kwargs.get("gen_run")),
             }
             c_path = self.create_directory(out_path, self.name, **args)
             for comp in self.comp:
@@ -398,29 +452,46 @@ class TopDir(Base):
     comp: CompList = field(factory=list)
     extra: Dict[str, Any] = field(factory=dict)
 
-    def generate(self, out_path: str, **kwargs) -> None:
+    def generate(
+        self, out_path: str, incremental: Optional[bool] = None, **kwargs
+    ) -> None:
         """Generates the directory structure and files.
 
         Args:
-            d_set: The dataset to generate the structure for.
             out_path: The path to the output directory.
+            incremental: Skip the files whose template and context did not
+                change since the last incremental run. By default this is
+                read from the ``EXDRF_GEN_INCREMENTAL`` environment variable.
             **kwargs: Additional keyword arguments to pass to the template
-                rendering function.
+                rendering function; ``dset`` and ``env`` are required.
         """
         assert "dset" in kwargs, "Dataset not provided in kwargs"
         assert "env" in kwargs, "Environment not provided in kwargs"
         dset: "ExDataset" = kwargs["dset"]
 
-        for comp in self.comp:
-            args = {
-                **self.extra,
-                **kwargs,
-            }
-            comp.generate(
-                out_path,
-                resources=dset.resources,
-                categ_map=dset.category_map,
-                categ_zero=dset.zero_categories(),
-                resources_sd=dset.sorted_by_deps(),
-                **args,
-            )
+        if incremental is None:
+            incremental = incremental_from_env()
+        gen_run = GenRun(out_path=out_path, incremental=incremental)
+        gen_run.load()
+
+        # The dataset-wide values are the same for every child.
+        dset_args = {
+            "resources": dset.resources,
+            "categ_map": dset.category_map,
+            "categ_zero": dset.zero_categories(),
+            "resources_sd": dset.sorted_by_deps(),
+        }
+        try:
+            for comp in self.comp:
+                args = {
+                    **self.extra,
+                    **kwargs,
+                }
+                comp.generate(
+                    out_path,
+                    gen_run=gen_run,
+                    **dset_args,
+                    **args,
+                )
+        finally:
+            gen_run.save()
@@ -0,0 +1,496 @@
+"""State shared by the components of one generation run.
+
+A run caches the per-resource template arguments and, when incremental
+generation is enabled, keeps a manifest in the output directory with a
+fingerprint of each file it wrote. A file whose template and context produce
+the same fingerprint as last time, and which was not touched since, is not
+rendered again. The fingerprints also cover the version and the code of the
+generator packages, so upgrading or editing them renders every file again.
+"""
+
+import hashlib
+import importlib
+import importlib.metadata
+import json
+import logging
+import marshal
+import os
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import attrs
+from attrs import define, field
+from jinja2 import Environment, meta
+
+from exdrf.dataset import ExDataset
+from exdrf.field import ExField
+from exdrf.resource import ExResource
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".exdrf-gen-manifest.json"
+MANIFEST_VERSION = 1
+INCREMENTAL_ENV = "EXDRF_GEN_INCREMENTAL"
+
+# The packages whose code, besides the templates, shapes the output.
+TOOL_PACKAGES = ("exdrf", "exdrf_gen")
+
+
+def incremental_from_env() -> bool:
+    """Tell if the environment asks for incremental generation."""
+    value = os.environ.get(INCREMENTAL_ENV, "")
+    return value.strip().lower() in ("1", "true", "yes")
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _tool_token() -> str:
+    """Digest the version and the Python sources of the generator packages.
+
+    The sources are part of the digest because a development install keeps
+    its version while the code changes.
+    """
+    parts = []
+    for name in TOOL_PACKAGES:
+        try:
+            version = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            version = "?"
+        digest = hashlib.sha1()
+        module = importlib.import_module(name)
+        for root in getattr(module, "__path__", []):
+            for dir_path, dir_names, file_names in os.walk(root):
+                dir_names[:] = sorted(d for d in dir_names if d != "__pycache__")
+                for file_name in sorted(file_names):
+                    if not file_name.endswith(".py"):
+                        continue
+                    path = os.path.join(dir_path, file_name)
+                    digest.update(os.path.relpath(path, root).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+        parts.append(f"{name}={version}:{digest.hexdigest()}")
+    return _sha("\n".join(parts))
+
+
+class _Unstable(Exception):
+    """A value has no representation that is stable between runs."""
+
+
+class _Digester:
+    """Computes stable text tokens for the values in a template context.
+
+    Resources, fields and the dataset are digested once per run. Inside them,
+    references to other resources and fields are reduced to their names so
+    that the graph can be walked without cycles; the token of a resource
+    also covers the resources its fields refer to directly.
+
+    A value whose representation is not stable between runs (it contains a
+    memory address) has no token, which means the file has to be rendered.
+    """
+
+    def __init__(self) -> None:
+        # id -> (value, own token, referenced resources)
+        self._own: Dict[int, Tuple[Any, str, Tuple[ExResource, ...]]] = {}
+        # id -> (value, token)
+        self._full: Dict[int, Tuple[Any, Optional[str]]] = {}
+        self._active: Set[int] = set()
+
+    def token(self, value: Any) -> Optional[str]:
+        """Return the token of a context value or None if it has none."""
+        try:
+            return self._token(value, None)
+        except _Unstable:
+            return None
+
+    def _token(self, value: Any, refs: Optional[List[ExResource]]) -> str:
+        """Return the token of a value or raise _Unstable.
+
+        Args:
+            value: The value to digest.
+            refs: None at the top of the context; inside an entity, the list
+                that collects the resources it refers to. Entities found there
+                are reduced to their names.
+        """
+        if value is None or isinstance(value, (bool, int, float, str, bytes)):
+            return f"{type(value).__name__}:{value!r}"
+
+        if isinstance(value, ExResource):
+            if refs is None:
+                return self._entity_token(value)
+            refs.append(value)
+            return f"res:{value.name}"
+        if isinstance(value, ExField):
+            if refs is None:
+                return self._entity_token(value)
+            owner = value.resource
+            if owner is not None:
+                refs.append(owner)
+            return f"fld:{owner.name if owner else ''}.{value.name}"
+        if isinstance(value, ExDataset):
+            if refs is None:
+                return self._entity_token(value)
+            return "dset"
+
+        if isinstance(value, type):
+            return f"type:{value.__module__}.{value.__qualname__}"
+        if isinstance(value, MethodType):
+            return "method:" + self._token(value.__func__, refs)
+        if isinstance(value, FunctionType):
+            code = hashlib.sha1(marshal.dumps(value.__code__)).hexdigest()
+            return f"fn:{value.__module__}.{value.__qualname__}:{code}"
+        if isinstance(value, (BuiltinFunctionType, ModuleType)):
+            return f"{type(value).__name__}:{value.__name__}"
+
+        key = id(value)
+        if key in self._active:
+            raise _Unstable()
+        self._active.add(key)
+        try:
+            return self._container_token(value, refs)
+        finally:
+            self._active.discard(key)
+
+    def _container_token(self, value: Any, refs: Optional[List[ExResource]]) -> str:
+        if isinstance(value, (list, tuple)):
+            items = [self._token(v, refs) for v in value]
+            return "[" + ",".join(items) + "]"
+        if isinstance(value, (set, frozenset)):
+            items = sorted(self._token(v, refs) for v in value)
+            return "{" + ",".join(items) + "}"
+        if isinstance(value, Mapping):
+            pairs = sorted(
+                f"{self._token(k, refs)}={self._token(v, refs)}"
+                for k, v in value.items()
+            )
+            return "{" + ",".join(pairs) + "}"
+        if attrs.has(type(value)):
+            return self._attrs_token(value, refs)
+        if hasattr(value, "model_dump"):
+            return self._token(value.model_dump(), refs)
+
+        text = repr(value)
+        if " at 0x" in text:
+            raise _Unstable()
+        return f"{type(value).__qualname__}:{text}"
+
+    def _attrs_token(self, value: Any, refs: Optional[List[ExResource]]) -> str:
+        parts = [type(value).__qualname__]
+        for a in attrs.fields(type(value)):
+            if a.eq is False or a.name.startswith("_"):
+                continue
+            token = self._token(getattr(value, a.name), refs)
+            parts.append(f"{a.name}={token}")
+        return "(" + ",".join(parts) + ")"
+
+    def _own_token(self, value: Any) -> Tuple[str, Tuple[ExResource, ...]]:
+        """Digest an entity, reducing its references to names."""
+        cached = self._own.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1], cached[2]
+
+        # The values shared with the context are not cycles.
+        refs: List[ExResource] = []
+        outer, self._active = self._active, set()
+        try:
+            if isinstance(value, ExResource):
+                # The fields are part of the resource, not references.
+                parts = [self._attrs_token(value, refs)]
+                for fld in value.fields:
+                    f_token, f_refs = self._own_token(fld)
+                    parts.append(f_token)
+                    refs.extend(f_refs)
+            elif isinstance(value, ExDataset):
+                parts = [value.name]
+                parts.extend(self._own_token(r)[0] for r in value.resources)
+            else:
+                parts = [self._attrs_token(value, refs)]
+        finally:
+            self._active = outer
+
+        own = _sha("\n".join(parts))
+        unique = tuple({id(r): r for r in refs if r is not value}.values())
+        self._own[id(value)] = (value, own, unique)
+        return own, unique
+
+    def _entity_token(self, value: Any) -> str:
+        """Digest an entity along with the resources it refers to."""
+        cached = self._full.get(id(value))
+        if cached is None or cached[0] is not value:
+            result: Optional[str] = None
+            try:
+                own, refs = self._own_token(value)
+                related = sorted(self._own_token(r)[0] for r in refs)
+                result = f"{type(value).__name__}:{_sha(own + ''.join(related))}"
+            finally:
+                # An unstable entity is remembered as such.
+                self._full[id(value)] = (value, result)
+            cached = (value, result)
+        if cached[1] is None:
+            raise _Unstable()
+        return cached[1]
+
+
+@define
+class GenRun:
+    """The state of one generation run.
+
+    Attributes:
+        out_path: The top output directory; the manifest is stored there and
+            the paths in it are relative to this directory.
+        incremental: Whether files with an unchanged fingerprint are skipped.
+        rendered: The number of files that were rendered.
+        written: The number of files whose content changed on disk.
+        skipped: The number of files that were not rendered at all.
+
+    Private Attributes:
+        _entries: The manifest entries by relative path: the fingerprint,
+            size and modification time of each file.
+        _produced: The relative paths of the files this run rendered or
+            found fresh; the manifest only keeps their entries.
+        _tool: The digest of the generator packages (see `_tool_token`),
+            computed on first use.
+        _args: The memoized resource arguments by the id of the resource.
+        _templates: The digest of each template and its includes, with the
+            names of the variables they use (None when unknown).
+        _env_tokens: The digest of the filters, tests and globals of each
+            environment.
+        _digester: Digests the values of the context.
+    """
+
+    out_path: str
+    incremental: bool = False
+    rendered: int = 0
+    written: int = 0
+    skipped: int = 0
+
+    _entries: Dict[str, Dict[str, Any]] = field(factory=dict, repr=False)
+    _produced: Set[str] = field(factory=set, repr=False)
+    _tool: Optional[str] = field(default=None, repr=False)
+    _args: Dict[int, Tuple[Any, Dict[str, Any]]] = field(factory=dict, repr=False)
+    _templates: Dict[Tuple[int, str], Tuple[str, Optional[FrozenSet[str]]]] = field(
+        factory=dict, repr=False
+    )
+    _env_tokens: Dict[int, str] = field(factory=dict, repr=False)
+    _digester: _Digester = field(factory=_Digester, repr=False)
+
+    @property
+    def manifest_path(self) -> str:
+        """The path of the manifest file."""
+        return os.path.join(self.out_path, MANIFEST_NAME)
+
+    def load(self) -> None:
+        """Read the manifest left by the previous incremental run."""
+        if not self.incremental:
+            return
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring manifest %s: %s", self.manifest_path, e)
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self._entries = dict(data.get("files", {}))
+
+    def save(self) -> None:
+        """Write the manifest for the next incremental run.
+
+        The entries of the files that this run did not produce are dropped.
+        """
+        if not self.incremental:
+            return
+        os.makedirs(self.out_path, exist_ok=True)
+        files = {
+            rel: entry
+            for rel, entry in sorted(self._entries.items())
+            if rel in self._produced
+        }
+        data = {"version": MANIFEST_VERSION, "files": files}
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        logger.debug(
+            "Generated %d files, %d changed, %d skipped",
+            self.rendered,
+            self.written,
+            self.skipped,
+        )
+
+    def resource_args(
+        self, resource: Any, build: Callable[[Any], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Return the arguments of a resource, computing them once per run.
+
+        Args:
+            resource: The resource.
+            build: Computes the arguments when they are not cached.
+
+        Returns:
+            A copy of the cached arguments.
+        """
+        cached = self._args.get(id(resource))
+        if cached is None or cached[0] is not resource:
+            cached = (resource, build(resource))
+            self._args[id(resource)] = cached
+        return dict(cached[1])
+
+    def fingerprint(
+        self, env: Environment, src: str, mapping: Mapping[str, Any]
+    ) -> Optional[str]:
+        """Compute the fingerprint of a file.
+
+        The fingerprint covers the generator packages, the source of the
+        template and of the templates it includes, the filters and globals of
+        the environment and the values of the context variables the templates
+        use. The preserved
+        blocks live in the output file, so they are covered by its size and
+        modification time.
+
+        Args:
+            env: The environment used to render the template.
+            src: The name of the template.
+            mapping: The context of the template.
+
+        Returns:
+            The fingerprint or None if the context can not be digested.
+        """
+        templ_digest, names = self._template_info(env, src)
+        if names is None:
+            names = frozenset(mapping)
+        if self._tool is None:
+            self._tool = _tool_token()
+        parts = [self._tool, self._env_token(env), templ_digest]
+        for name in sorted(names):
+            if name not in mapping:
+                continue
+            token = self._digester.token(mapping[name])
+            if token is None:
+                return None
+            parts.append(f"{name}={token}")
+        return _sha("\n".join(parts))
+
+    def is_fresh(self, path: str, fingerprint: Optional[str]) -> bool:
+        """Tell if a file can be left as it is.
+
+        Args:
+            path: The path of the file.
+            fingerprint: Its fingerprint in this run.
+
+        Returns:
+            True if incremental generation is on, the fingerprint is the one
+            from the manifest and the file was not changed since.
+        """
+        if not self.incremental or fingerprint is None:
+            return False
+        rel = self._rel(path)
+        entry = self._entries.get(rel)
+        if entry is None or entry.get("fp") != fingerprint:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry.get("size") or (st.st_mtime_ns != entry.get("mtime_ns")):
+            return False
+        self._produced.add(rel)
+        self.skipped += 1
+        return True
+
+    def record(self, path: str, fingerprint: Optional[str], written: bool) -> None:
+        """Remember the fingerprint of a file that was rendered.
+
+        Args:
+            path: The path of the file.
+            fingerprint: Its fingerprint, or None if it has none.
+            written: Whether the content on disk changed.
+        """
+        self.rendered += 1
+        if written:
+            self.written += 1
+        if not self.incremental:
+            return
+        rel = self._rel(path)
+        self._produced.add(rel)
+        if fingerprint is None:
+            self._entries.pop(rel, None)
+            return
+        st = os.stat(path)
+        self._entries[rel] = {
+            "fp": fingerprint,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(path, self.out_path).replace(os.sep, "/")
+
+    def _env_token(self, env: Environment) -> str:
+        token = self._env_tokens.get(id(env))
+        if token is None:
+            digester = _Digester()
+            parts = []
+            for name, group in (
+                ("filters", env.filters),
+                ("tests", env.tests),
+                ("globals", env.globals),
+            ):
+                value = digester.token(dict(group))
+                # Unstable globals do not make every file unstable.
+                parts.append(f"{name}={value if value is not None else '?'}")
+            token = _sha("\n".join(parts))
+            self._env_tokens[id(env)] = token
+        return token
+
+    def _template_info(
+        self, env: Environment, src: str
+    ) -> Tuple[str, Optional[FrozenSet[str]]]:
+        """Digest a template and the templates it includes or imports.
+
+        Returns:
+            The digest and the names of the variables the templates use, or
+            None instead of the names if some include is computed at run time.
+        """
+        key = (id(env), src)
+        cached = self._templates.get(key)
+        if cached is not None:
+            return cached
+
+        assert env.loader is not None, "Environment has no loader"
+        sources: List[str] = []
+        names: Optional[Set[str]] = set()
+        pending = [src]
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            source, _, _ = env.loader.get_source(env, name)
+            sources.append(f"{name}\n{source}")
+            ast = env.parse(source)
+            if names is not None:
+                names.update(meta.find_undeclared_variables(ast))
+            for ref in meta.find_referenced_templates(ast):
+                if ref is None:
+                    names = None
+                else:
+                    pending.append(ref)
+
+        result = (
+            _sha("\n".join(sorted(sources))),
+            frozenset(names) if names is not None else None,
+        )
+        self._templates[key] = result
+        return result
@@ -0,0 +1,148 @@
+"""Tests for the incremental generation in ``exdrf_gen.fs_support``."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from jinja2 import DictLoader, Environment
+
+from exdrf.field_types.int_field import IntField
+from exdrf.field_types.str_field import StrField
+from exdrf.resource import ExResource
+from exdrf_gen import gen_run
+from exdrf_gen.fs_support import File, ResFile, TopDir
+from exdrf_gen.gen_run import MANIFEST_NAME
+
+TEMPLATES = {
+    "res.j2": (
+        "{% include 'head.j2' %}\n"
+        "class {{ ResPascal }}:\n"
+        "{% for f in fields %}    {{ f.name }}: {{ f.title }}\n{% endfor %}"
+        "    # exdrf-keep-start body\n"
+        "{{ body }}\n"
+        "    # exdrf-keep-end\n"
+    ),
+    "head.j2": "# {{ res_snake }}",
+    "all.j2": "{% for r in resources %}{{ r.name }}\n{% endfor %}",
+}
+
+
+def _dataset(title: str = "Title", names: tuple = ("Alpha", "Beta")) -> SimpleNamespace:
+    resources = [
+        ExResource(
+            name=name,
+            fields=[
+                IntField(name="id", primary=True, nullable=False),
+                StrField(name="title", title=title),
+            ],
+        )
+        for name in names
+    ]
+    return SimpleNamespace(
+        resources=resources,
+        category_map={},
+        zero_categories=lambda: [],
+        sorted_by_deps=lambda: resources,
+    )
+
+
+def _generate(out: Path, d_set, env: Environment) -> dict:
+    TopDir(
+        comp=[
+            ResFile(name="{res_snake}.py", template="res.j2"),
+            File(name="all.txt", template="all.j2"),
+        ]
+    ).generate(str(out), incremental=True, dset=d_set, env=env)
+    return {
+        name: os.stat(out / name).st_mtime_ns
+        for name in os.listdir(out)
+        if name != MANIFEST_NAME
+    }
+
+
+def _touch_back(out: Path) -> None:
+    """Move the files in the past so that a rewrite shows in the mtime."""
+    for name in os.listdir(out):
+        os.utime(out / name, ns=(1_000_000_000, 1_000_000_000))
+
+
+def test_unchanged_files_are_not_rendered(tmp_path: Path) -> None:
+    env = Environment(loader=DictLoader(dict(TEMPLATES)))
+    _generate(tmp_path, _dataset(), env)
+    assert (tmp_path / MANIFEST_NAME).is_file()
+    assert "title: Title" in (tmp_path / "alpha.py").read_text()
+
+    # A later run over an equal dataset leaves every file alone.
+    _touch_back(tmp_path)
+    times = _generate(tmp_path, _dataset(), env)
+    assert set(times.values()) == {1_000_000_000}
+
+
+def test_changes_are_detected(tmp_path: Path) -> None:
+    env = Environment(loader=DictLoader(dict(TEMPLATES)))
+    _generate(tmp_path, _dataset(), env)
+    _touch_back(tmp_path)
+
+    # The field titles only reach the per-resource files.
+    times = _generate(tmp_path, _dataset("Other"), env)
+    assert times["alpha.py"] != 1_000_000_000
+    assert times["beta.py"] != 1_000_000_000
+    assert times["all.txt"] == 1_000_000_000
+    assert "title: Other" in (tmp_path / "beta.py").read_text()
+
+    # So does a change in an included template.
+    _touch_back(tmp_path)
+    templates = {**TEMPLATES, "head.j2": "# module {{ res_snake }}"}
+    env = Environment(loader=DictLoader(templates))
+    times = _generate(tmp_path, _dataset("Other"), env)
+    assert (tmp_path / "alpha.py").read_text().startswith("# module alpha")
+    assert times["all.txt"] == 1_000_000_000
+
+
+def test_edited_files_keep_their_blocks(tmp_path: Path) -> None:
+    env = Environment(loader=DictLoader(dict(TEMPLATES)))
+    _generate(tmp_path, _dataset(), env)
+
+    path = tmp_path / "alpha.py"
+    text = path.read_text().replace(
+        "# exdrf-keep-start body\n", "# exdrf-keep-start body\n    x = 1\n"
+    )
+    path.write_text(text)
+    _generate(tmp_path, _dataset(), env)
+
+    assert "    x = 1\n" in path.read_text()
+
+
+def test_generator_changes_render_everything(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env = Environment(loader=DictLoader(dict(TEMPLATES)))
+    _generate(tmp_path, _dataset(), env)
+
+    rendered = []
+    record = gen_run.GenRun.record
+
+    def spy(self, path, fingerprint, written):
+        rendered.append(os.path.basename(path))
+        record(self, path, fingerprint, written)
+
+    monkeypatch.setattr(gen_run.GenRun, "record", spy)
+    _generate(tmp_path, _dataset(), env)
+    assert rendered == []
+
+    monkeypatch.setattr(gen_run, "_tool_token", lambda: "newer")
+    _generate(tmp_path, _dataset(), env)
+    assert sorted(rendered) == ["all.txt", "alpha.py", "beta.py"]
+
+
+def test_manifest_forgets_files_not_produced(tmp_path: Path) -> None:
+    env = Environment(loader=DictLoader(dict(TEMPLATES)))
+    _generate(tmp_path, _dataset(), env)
+    _generate(tmp_path, _dataset(names=("Alpha",)), env)
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert sorted(manifest["files"]) == ["all.txt", "alpha.py"]
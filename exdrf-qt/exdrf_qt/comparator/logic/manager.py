@@ -1,4 +1,16 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, cast
+import heapq
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 
 from attrs import define, field
 
@@ -74,79 +86,17 @@ class ComparatorManager:
                         children.append({s_i: child})
                 else:
                     # Other sources must either match one of the existing
-                    # children or create a new child.
-
-                    # We start by creating a matrix of scores, one for each
-                    # child and source.
-                    len_c = len(children)
-                    scores = [[0] * len_c for _ in range(len(source.children))]
-                    for o_i, other_data in enumerate(children):
-                        # Get the data from the first source that provided data
-                        # for this child.
-                        other = other_data[min(other_data.keys())]
-                        # Now go through the current source's children and
-                        # compare them to the other child.
-                        for crt_i, current in enumerate(source.children):
-                            scores[crt_i][o_i] = (
-                                0
-                                if (other.is_leaf != current.is_leaf)
-                                else source.compare(other, current)
-                            )
-
-                    # Now we need to find the best match for each child in the
-                    # order of the score, while making sure that we don't match
-                    # the same child to multiple sources. -1 means a perfect
-                    # match and is evaluated first, 0 means never match,
-                    # others are evaluated in order of similarity but the
-                    # order is absolute across the board., so the highest
-                    # score left on the board should be pulled, make that
-                    # association and repeat until there are no more matches.
-
-                    # Prepare greedy matching with priority:
-                    # 1) Perfect matches (-1) first
-                    # 2) Then scores in descending order
-                    row_count = len(source.children)
-                    col_count = len_c
-
-                    # Track used rows/cols to avoid duplicate matches.
-                    used_rows: set[int] = set()
-                    used_cols: set[int] = set()
-
-                    # First, take all perfect matches.
-                    for r in range(row_count):
-                        for c in range(col_count):
-                            if (
-                                scores[r][c] == -1
-                                and r not in used_rows
-                                and c not in used_cols
-                            ):
-                                # Assign this perfect pair.
-                                children[c][s_i] = source.children[r]
-                                used_rows.add(r)
-                                used_cols.add(c)
-
-                    # Next, consider all scores and pick highest first.
-                    candidates: List[tuple[int, int, int]] = []
-                    for r in range(row_count):
-                        for c in range(col_count):
-                            sc = scores[r][c]
-                            if sc != 0 and sc != -1:
-                                candidates.append((sc, r, c))
-
-                    # Sort by score descending.
-                    candidates.sort(key=lambda t: t[0], reverse=True)
-
-                    for sc, r, c in candidates:
-                        if r in used_rows or c in used_cols:
-                            continue
+                    # children (as seen by the first source that provided
+                    # data for it) or create a new child.
+                    others = [c_data[min(c_data.keys())] for c_data in children]
+                    matched = self.match_children(source, others)
+                    for r, c in matched.items():
                         children[c][s_i] = source.children[r]
-                        used_rows.add(r)
-                        used_cols.add(c)
 
-                    # Finally, any row not matched creates a new child entry.
-                    for r in range(row_count):
-                        if r not in used_rows:
-                            children.append({s_i: source.children[r]})
+                    # Any child not matched creates a new child entry.
+                    for r, current in enumerate(source.children):
+                        if r not in matched:
+                            children.append({s_i: current})
             assert not is_first, "At least one source must be provided."
 
             # At this point for each children all values are either leafs or
@@ -208,6 +158,101 @@ class ComparatorManager:
                     )
                 destination.add_child(new_node)
 
+    @staticmethod
+    def match_children(
+        source: "ParentNode", others: List["BaseNode"]
+    ) -> Dict[int, int]:
+        """Pair the children of a source with the nodes already collected.
+
+        Children are first paired by their match key. The ones left are
+        scored with ``source.compare`` only against the nodes that share a
+        match token with them, and the pairs are taken from a heap: perfect
+        matches (-1) first, then the highest scores. A node is never paired
+        with a node of the other kind (leaf and parent).
+
+        Args:
+            source: The parent whose children are matched; its compare(),
+                match_key() and match_tokens() drive the matching.
+            others: The nodes the children may be paired with.
+
+        Returns:
+            A map from the index of a child of the source to the index of
+            its pair in ``others``.
+        """
+        rows = source.children
+        matched: Dict[int, int] = {}
+        used_cols: set[int] = set()
+
+        # Exact keys: each child takes the first free node with its key.
+        by_key: Dict[Hashable, Deque[int]] = {}
+        for c, other in enumerate(others):
+            key = source.match_key(other)
+            if key is not None:
+                by_key.setdefault((other.is_leaf, key), deque()).append(c)
+        if by_key:
+            for r, current in enumerate(rows):
+                key = source.match_key(current)
+                if key is None:
+                    continue
+                cols = by_key.get((current.is_leaf, key))
+                if cols:
+                    c = cols.popleft()
+                    matched[r] = c
+                    used_cols.add(c)
+
+        free_rows = [r for r in range(len(rows)) if r not in matched]
+        free_cols = [c for c in range(len(others)) if c not in used_cols]
+        if not free_rows or not free_cols:
+            return matched
+
+        # Bucket the free nodes by token; the ones without tokens are
+        # candidates for every child.
+        buckets: Dict[Hashable, List[int]] = {}
+        wildcards: List[int] = []
+        for c in free_cols:
+            tokens = source.match_tokens(others[c])
+            if tokens is None:
+                wildcards.append(c)
+                continue
+            for token in set(tokens):
+                buckets.setdefault(token, []).append(c)
+
+        # Score the candidate pairs; 0 means never match.
+        heap: List[Tuple[int, int, int, int]] = []
+        for r in free_rows:
+            current = rows[r]
+            tokens = source.match_tokens(current)
+            if tokens is None:
+                candidates = free_cols
+            else:
+                found = set(wildcards)
+                for token in tokens:
+                    found.update(buckets.get(token, ()))
+                if not found:
+                    continue
+                candidates = sorted(found)
+            for c in candidates:
+                other = others[c]
+                if other.is_leaf != current.is_leaf:
+                    continue
+                score = source.compare(other, current)
+                if score == -1:
+                    heap.append((0, 0, r, c))
+                elif score != 0:
+                    heap.append((1, -score, r, c))
+
+        # Greedy assignment, best pair first; ties go to the earlier child.
+        heapq.heapify(heap)
+        used_rows: set[int] = set()
+        while heap:
+            _, _, r, c = heapq.heappop(heap)
+            if r in used_rows or c in used_cols:
+                continue
+            matched[r] = c
+            used_rows.add(r)
+            used_cols.add(c)
+        return matched
+
     # Merge mode helpers (no-op if merge not used).
     # -------------------------------------------------------------------------
 
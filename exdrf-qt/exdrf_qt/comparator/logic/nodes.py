@@ -1,7 +1,7 @@
 import html
 import logging
 from difflib import SequenceMatcher
-from typing import TYPE_CHECKING, Any, List, Optional
+from typing import TYPE_CHECKING, Any, Hashable, Iterable, List, Optional, Set
 
 from attrs import define, field
 
@@ -14,6 +14,26 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def ngram_tokens(text: str, n: int = 3) -> Set[str]:
+    """Return the lower-case character n-grams of a text.
+
+    Strings that are similar enough for ``SequenceMatcher`` almost always
+    share some n-grams, so these make good :meth:`ParentNode.match_tokens`.
+    Texts shorter than ``n`` yield themselves as the only token.
+
+    Args:
+        text: The text to split.
+        n: The length of the n-grams.
+
+    Returns:
+        The set of n-grams.
+    """
+    text = str(text).lower()
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
 @define(eq=False)
 class BaseNode:
     """Represents the common base class for all nodes in the comparator.
@@ -88,6 +108,39 @@ class ParentNode(BaseNode):
         """
         return -1 if first.key == second.key else 0
 
+    def match_key(self, node: "BaseNode") -> Optional[Hashable]:
+        """Return the key that pairs a node without calling compare().
+
+        Nodes with equal match keys are taken as perfect matches, so
+        compare() must return -1 for them. None keeps the node out of the
+        exact pairing.
+
+        Args:
+            node: A child of this parent or of its peers in other sources.
+
+        Returns:
+            The key of the node by default.
+        """
+        return node.key
+
+    def match_tokens(self, node: "BaseNode") -> Optional[Iterable[Hashable]]:
+        """Return the tokens that select the nodes compare() is called for.
+
+        Nodes left over by the exact pairing are only scored against the
+        nodes that share at least one token with them; ngram_tokens() is one
+        way to build them. None makes the node a candidate for every other.
+
+        Args:
+            node: A child of this parent or of its peers in other sources.
+
+        Returns:
+            No tokens when compare() is the exact key check of this class,
+            since it can not score anything above 0; None otherwise.
+        """
+        if type(self).compare is ParentNode.compare:
+            return ()
+        return None
+
     @property
     def mismatch_count(self) -> int:
         if self.mismatch_count_value == -1:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import sys
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Hashable, List, Optional, Set
 
 from PyQt5.QtWidgets import (
     QAction,
@@ -302,20 +302,21 @@ class FuzzyParentNode(ParentNode):
       - 0: not similar
     """
 
+    @staticmethod
+    def _norm(s: str) -> str:
+        return "".join(ch for ch in str(s).lower() if ch.isalnum())
+
     def compare(self, first: "BaseNode", second: "BaseNode") -> int:
         if first.key == second.key:
             return -1
 
-        def norm(s: str) -> str:
-            return "".join(ch for ch in str(s).lower() if ch.isalnum())
-
-        k1 = norm(first.key)
-        k2 = norm(second.key)
+        k1 = self._norm(first.key)
+        k2 = self._norm(second.key)
         if k1 and k1 == k2:
             return 80
 
-        l1 = norm(first.label)
-        l2 = norm(second.label)
+        l1 = self._norm(first.label)
+        l2 = self._norm(second.label)
         if l1 and l1 == l2:
             return 50
 
@@ -328,6 +329,17 @@ class FuzzyParentNode(ParentNode):
                 break
         return common
 
+    def match_tokens(self, node: "BaseNode") -> List[Hashable]:
+        # A score above 0 needs the same first key character or label.
+        key = self._norm(node.key)
+        label = self._norm(node.label)
+        tokens: List[Hashable] = []
+        if key:
+            tokens.append(("key", key[0]))
+        if label:
+            tokens.append(("label", label))
+        return tokens
+
 
 class _MockAdapter(ComparatorAdapter):
     """Simple in-memory adapter for demo purposes."""
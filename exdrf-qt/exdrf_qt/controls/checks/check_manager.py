@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import hashlib
 import inspect
 import logging
 import multiprocessing as mp
+import os
 import sys
 from collections import OrderedDict, defaultdict
 from html import escape as html_escape
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import (
     QEvent,
@@ -51,8 +53,10 @@ from exdrf_qt.controls.checks.available_model import AvailableChecksModel
 from exdrf_qt.controls.checks.check_manager_ui import Ui_ChecksManager
 from exdrf_qt.controls.checks.checks_model_base import ChecksViewMode
 from exdrf_qt.controls.checks.mp_executor import (
+    CheckWorkerPool,
+    JobDict,
+    ResultsMessage,
     WorkerMessage,
-    run_check_task_in_process,
 )
 from exdrf_qt.controls.checks.results_model import ResultsModel, ResultsViewMode
 from exdrf_qt.controls.checks.selected_delegate import SelectedChecksDelegate
@@ -61,9 +65,7 @@ from exdrf_qt.controls.param_controls import TaskParameterControlsMixin
 from exdrf_qt.controls.seldb.choose_db import ChooseDb
 
 if TYPE_CHECKING:
-    from multiprocessing.context import SpawnContext, SpawnProcess
-    from multiprocessing.queues import Queue
-    from multiprocessing.synchronize import Event
+    from multiprocessing.context import SpawnContext
 
     from exdrf_util.check import Check
     from exdrf_util.task import TaskParameter
@@ -97,11 +99,16 @@ class CheckManager(
             target function. Child processes do not inherit the parent's
             memory state; everything must be picklable to cross the process
             boundary.
-        mp_queue: Queue used to receive messages from worker processes.
-        mp_stop: Event used to request worker termination.
-        _mp_processes: Worker processes keyed by check id.
+        mp_pool: Worker processes kept alive between runs, created on the
+            first run.
         mp_poll_timer: Timer polling the worker message queue.
-        _pending_check_ids: Queue of check ids awaiting execution.
+        _pending_jobs: Jobs awaiting execution, in order.
+        _running_jobs: Check id and shard of the jobs handed to the pool.
+        _shards_left: Number of unfinished shards for each check.
+        _split_jobs: First shard job of the checks whose other shards wait
+            for the ranges of keys it finds.
+        _shard_results: Results messages received for each check, by shard.
+        _shard_progress: Progress of each shard of each check.
         _run_had_error: Whether any worker reported an error.
         _run_errors: Errors reported by workers keyed by check id.
         _taskbar_button: Taskbar button wrapper used for Windows progress.
@@ -132,11 +139,14 @@ class CheckManager(
     _results_filter_timer: QTimer
 
     mp_ctx: SpawnContext
-    mp_queue: Optional["Queue[WorkerMessage]"]
-    mp_stop: Optional[Event]
-    _mp_processes: Dict[str, SpawnProcess]
+    mp_pool: Optional[CheckWorkerPool]
     mp_poll_timer: QTimer
-    _pending_check_ids: List[str]
+    _pending_jobs: List[JobDict]
+    _running_jobs: Set[Tuple[str, int]]
+    _shards_left: Dict[str, int]
+    _split_jobs: Dict[str, JobDict]
+    _shard_results: Dict[str, Dict[int, ResultsMessage]]
+    _shard_progress: Dict[str, Dict[int, int]]
     _run_had_error: bool
     _run_errors: Dict[str, str]
     _taskbar_button: Optional[Any]
@@ -167,10 +177,13 @@ class CheckManager(
 
         # Configure multiprocessing.
         self.mp_ctx = mp.get_context("spawn")
-        self.mp_queue = None
-        self.mp_stop = None
-        self._mp_processes = {}
-        self._pending_check_ids = []
+        self.mp_pool = None
+        self._pending_jobs = []
+        self._running_jobs = set()
+        self._shards_left = {}
+        self._split_jobs = {}
+        self._shard_results = {}
+        self._shard_progress = {}
         self._run_had_error = False
         self._run_errors = {}
         self._taskbar_button = None
@@ -179,6 +192,7 @@ class CheckManager(
         self.mp_poll_timer = QTimer(self)
         self.mp_poll_timer.setInterval(POOL_INTERVAL)
         self.mp_poll_timer.timeout.connect(self.on_poll_worker_messages)
+        self.shouldClose.connect(self.shutdown_workers)
 
         # Configure UI wiring.
         self._setup_views()
@@ -937,17 +951,24 @@ class CheckManager(
         self.results_model.clear()
         self.c_result_details.setHtml("")
 
-        self._pending_check_ids = [chk.check_id for chk in checks]
+        self._pending_jobs = self._create_jobs(checks)
+        self._running_jobs = set()
+        self._shard_results = {cid: {} for cid in self._shards_left}
+        self._shard_progress = {
+            cid: {shard: -1 for shard in range(count)}
+            for cid, count in self._shards_left.items()
+        }
         self._run_had_error = False
         self._run_errors = {}
         self._set_state(TaskState.RUNNING)
 
         # Prepare progress bookkeeping.
-        for cid in self._pending_check_ids:
+        for cid in self._shards_left:
             self.selected_model.set_check_progress(cid, -1, indeterminate=False)
 
-        self.mp_queue = self.mp_ctx.Queue()
-        self.mp_stop = self.mp_ctx.Event()
+        if self.mp_pool is None:
+            self.mp_pool = CheckWorkerPool(self.mp_ctx, self._get_pool_size())
+        self.mp_pool.stop_event.clear()
 
         self._start_process_pool()
         self.mp_poll_timer.start()
@@ -961,103 +982,189 @@ class CheckManager(
             value_int = 4
         return max(1, min(value_int, 64))
 
-    def _start_process_pool(self) -> None:
-        """Start as many worker processes as allowed."""
-        if self.mp_queue is None or self.mp_stop is None:
-            return
+    def _get_pool_size(self) -> int:
+        """Get the number of worker processes: one per core, at most."""
+        return max(1, min(self._get_max_workers(), os.cpu_count() or 1))
 
-        max_workers = self._get_max_workers()
-        db_cfg = self._get_db_config()
+    def _create_jobs(self, checks: List["Check"]) -> List[JobDict]:
+        """Create the jobs of a run.
+
+        When there are fewer checks than workers, the checks that iterate
+        over records are split into shards so that all the workers get a
+        part of them. Only the first shard of a check is created here; it
+        finds the ranges of keys of the shards and the other shards are
+        created when it reports them (see `_on_split()`).
 
-        while self._pending_check_ids and len(self._mp_processes) < max_workers:
-            check_id = self._pending_check_ids.pop(0)
+        Args:
+            checks: The checks to run.
+        """
+        db_cfg = self._get_db_config()
+        store = self._get_result_store_path(db_cfg)
+        shards = max(1, self._get_pool_size() // len(checks))
 
+        jobs: List[JobDict] = []
+        self._shards_left = {}
+        self._split_jobs = {}
+        for chk in checks:
             # Snapshot parameter values for this check (inputs are disabled).
             values: Dict[str, Any] = {}
-            chk: Optional["Check"] = None
-            for chk in self.selected_model.get_checks():
-                if chk.check_id != check_id:
-                    continue
-                for p in chk.parameters.values():
-                    values[p.name] = p.value
-            assert chk is not None
+            for p in chk.parameters.values():
+                values[p.name] = p.value
             mod = inspect.getmodule(chk)
             bootstrap_imports = [*self.bootstrap_imports]
             if mod and mod.__name__ not in ("__main__",):
                 bootstrap_imports.append(mod.__name__)
 
-            proc = self.mp_ctx.Process(
-                target=run_check_task_in_process,
-                kwargs={
-                    "check_id": check_id,
-                    "db": db_cfg,
-                    "param_values": values,
-                    "out_q": self.mp_queue,
-                    "stop_event": self.mp_stop,
-                    "bootstrap_imports": bootstrap_imports,
-                },
+            count = 1 if chk.is_global else shards
+            self._shards_left[chk.check_id] = count
+            job: JobDict = {
+                "check_id": chk.check_id,
+                "shard": 0,
+                "shards": count,
+                "db": db_cfg,  # type: ignore[typeddict-item]
+                "param_values": values,
+                "bootstrap_imports": bootstrap_imports,
+            }
+            if store:
+                job["result_store"] = store
+            if count > 1:
+                job["split"] = True
+                self._split_jobs[chk.check_id] = job
+            jobs.append(job)
+        return jobs
+
+    def _on_split(self, check_id: str, bounds: Optional[List[Any]]) -> None:
+        """Create the shards of a check from the ranges its first shard found.
+
+        Args:
+            check_id: Check id.
+            bounds: The keys that end the ranges of the shards, or None when
+                the first shard checks all the records.
+        """
+        first = self._split_jobs.pop(check_id, None)
+        if first is None:
+            return
+        if bounds is None:
+            self._shards_left[check_id] = 1
+            progress = self._shard_progress.get(check_id, {})
+            self._shard_progress[check_id] = {0: progress.get(0, -1)}
+            return
+
+        edges = [None, *bounds, None]
+        jobs: List[JobDict] = []
+        for shard in range(1, first["shards"]):
+            job: JobDict = {
+                **first,
+                "shard": shard,
+                "key_range": [edges[shard], edges[shard + 1]],
+            }
+            job.pop("split", None)
+            jobs.append(job)
+        self._pending_jobs[0:0] = jobs
+
+    def _get_result_store_path(self, db_cfg: Dict[str, Any]) -> Optional[str]:
+        """Get the file that keeps the check results of a database.
+
+        The results are kept next to the settings file, one file for each
+        connection. Reusing them can be turned off through the
+        `exdrf.checks.incremental` setting.
+
+        Args:
+            db_cfg: The DB configuration of the run.
+        """
+        if not self.ctx.stg.get_setting("exdrf.checks.incremental", True):
+            return None
+        try:
+            key = "%s|%s" % (
+                db_cfg.get("c_string", ""),
+                db_cfg.get("schema", "public"),
+            )
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+            folder = os.path.dirname(self.ctx.stg.settings_file())
+            return os.path.join(folder, f"check-results-{digest}.sqlite")
+        except Exception as e:
+            logger.warning(
+                "No location for the check results: %s", e, exc_info=True
             )
-            proc.daemon = True
-            proc.start()
-            self._mp_processes[check_id] = proc
+            return None
+
+    def _start_process_pool(self) -> None:
+        """Hand jobs to the pool, one for each of its workers."""
+        pool = self.mp_pool
+        if pool is None:
+            return
+
+        while self._pending_jobs and len(self._running_jobs) < pool.size:
+            job = self._pending_jobs.pop(0)
+            pool.submit(job)
+            self._running_jobs.add((job["check_id"], job["shard"]))
 
     def _cancel_running_checks(self) -> None:
-        """Stop all running worker processes and clean up resources."""
-        if self.mp_stop is not None:
-            self.mp_stop.set()
+        """Stop all running jobs and clean up resources.
 
-        for proc in list(self._mp_processes.values()):
-            try:
-                if proc.is_alive():
-                    proc.terminate()
-                proc.join(timeout=0.5)
-            except Exception:
-                pass
+        The workers are killed when they are in the middle of a job; an idle
+        pool is kept for the next run.
+        """
+        if self._running_jobs and self.mp_pool is not None:
+            self.mp_pool.shutdown(terminate=True)
+            self.mp_pool = None
 
         self.mp_poll_timer.stop()
-        self._mp_processes = {}
-        self.mp_queue = None
-        self.mp_stop = None
+        self._pending_jobs = []
+        self._running_jobs = set()
+        self._split_jobs = {}
         if self._state == TaskState.RUNNING:
             self._finish_run(success=False)
 
+    def shutdown_workers(self) -> None:
+        """Stop the worker processes, for example when the manager closes."""
+        self._cancel_running_checks()
+        if self.mp_pool is not None:
+            self.mp_pool.shutdown()
+            self.mp_pool = None
+
+    def closeEvent(self, a0) -> None:  # noqa: N802
+        """Stop the worker processes with the widget."""
+        self.shutdown_workers()
+        super().closeEvent(a0)
+
     def on_poll_worker_messages(self) -> None:
         """Poll worker messages from the queue."""
-        q: Optional["Queue[WorkerMessage]"] = self.mp_queue
-        if q is None:
+        pool = self.mp_pool
+        if pool is None:
             return
 
         # Drain queue.
         drained = 0
         while drained < 100:
             try:
-                msg = q.get_nowait()
+                msg = pool.get_message()
             except Exception:
                 break
             drained += 1
             self._handle_worker_message(msg)
 
-        # Reap finished processes.
-        finished: List[str] = []
-        for check_id, proc in list(self._mp_processes.items()):
-            if not proc.is_alive():
-                try:
-                    proc.join(timeout=0.1)
-                except Exception:
-                    pass
-                finished.append(check_id)
-
-        for check_id in finished:
-            self._mp_processes.pop(check_id, None)
+        # Jobs of the workers that died will not report back.
+        for check_id, shard in pool.reap():
+            if (check_id, shard) not in self._running_jobs:
+                continue
+            self._handle_worker_message(
+                {
+                    "type": "error",
+                    "check_id": check_id,
+                    "error": "The worker process exited unexpectedly",
+                }
+            )
+            self._handle_worker_message(
+                {"type": "done", "check_id": check_id, "shard": shard}
+            )
 
-        # Start new workers if needed.
+        # Start new jobs if needed.
         self._start_process_pool()
 
         # If all done, finish run.
-        if not self._pending_check_ids and not self._mp_processes:
+        if not self._pending_jobs and not self._running_jobs:
             self.mp_poll_timer.stop()
-            self.mp_queue = None
-            self.mp_stop = None
             self._finish_run(success=not self._run_had_error)
 
     def _handle_worker_message(self, msg: "WorkerMessage") -> None:
@@ -1068,10 +1175,21 @@ class CheckManager(
         """
         msg_type = msg.get("type")
         check_id = str(msg.get("check_id", "") or "")
+        shard = int(msg.get("shard", 0))
+        if msg_type == "started":
+            return
+
         if msg_type == "progress":
             progress = int(msg.get("progress", -1))
             max_steps = int(msg.get("max_steps", -1))
             indeterminate = progress < 0 or max_steps <= 0
+
+            # The progress of a sharded check is the mean of its shards.
+            shards = self._shard_progress.setdefault(check_id, {})
+            shards[shard] = progress
+            if not indeterminate and len(shards) > 1:
+                total = sum(max(0, p) for p in shards.values())
+                progress = total // len(shards)
             self.selected_model.set_check_progress(
                 check_id,
                 progress,
@@ -1081,44 +1199,26 @@ class CheckManager(
             return
 
         if msg_type == "results":
-            res_list = msg.get("results", [])
-            check_title = str(msg.get("check_title", "") or "")
-            check_desc = str(msg.get("check_description", "") or "")
-            check_cat = str(msg.get("check_category", "") or "")
+            by_shard = self._shard_results.setdefault(check_id, {})
+            by_shard[shard] = msg  # type: ignore[assignment]
+            return
 
-            # Capture parameter values as shown in UI for this check.
-            values: Dict[str, Any] = {}
-            for chk in self.selected_model.get_checks():
-                if chk.check_id != check_id:
-                    continue
-                for p in chk.parameters.values():
-                    values[p.name] = p.value
-
-            results = []
-            for r in res_list:
-                results.append(dict(r))
-
-            # If no results, add a synthetic "passed" entry indicating this.
-            if not results:
-                results.append(
-                    {
-                        "state": "passed",
-                        "t_key": "checks.no_results",
-                        "description": (
-                            "No records were identified by this check"
-                        ),
-                        "params": {},
-                    }
-                )
+        if msg_type == "split":
+            self._on_split(check_id, msg.get("bounds"))
+            return
 
-            self.results_model.add_results(
-                check_id=check_id,
-                check_title=check_title,
-                check_description=check_desc,
-                check_category=check_cat,
-                params_values=values,
-                results=results,
-            )
+        if msg_type == "done":
+            key = (check_id, shard)
+            if key not in self._running_jobs:
+                return
+            self._running_jobs.discard(key)
+            if check_id in self._split_jobs:
+                # The first shard ended before it found the ranges.
+                self._on_split(check_id, None)
+            left = self._shards_left.get(check_id, 1) - 1
+            self._shards_left[check_id] = left
+            if left <= 0:
+                self._add_check_results(check_id)
             return
 
         if msg_type == "error":
@@ -1130,6 +1230,54 @@ class CheckManager(
                 self.selected_model.set_check_failed(check_id)
             return
 
+    def _add_check_results(self, check_id: str) -> None:
+        """Show the results of a check once all its shards are done.
+
+        Args:
+            check_id: Check id.
+        """
+        by_shard = self._shard_results.pop(check_id, {})
+        if not by_shard:
+            return
+        msgs = [by_shard[k] for k in sorted(by_shard)]
+        res_list = [r for m in msgs for r in m.get("results", [])]
+        msg = msgs[0]
+        check_title = str(msg.get("check_title", "") or "")
+        check_desc = str(msg.get("check_description", "") or "")
+        check_cat = str(msg.get("check_category", "") or "")
+
+        # Capture parameter values as shown in UI for this check.
+        values: Dict[str, Any] = {}
+        for chk in self.selected_model.get_checks():
+            if chk.check_id != check_id:
+                continue
+            for p in chk.parameters.values():
+                values[p.name] = p.value
+
+        results = []
+        for r in res_list:
+            results.append(dict(r))
+
+        # If no results, add a synthetic "passed" entry indicating this.
+        if not results:
+            results.append(
+                {
+                    "state": "passed",
+                    "t_key": "checks.no_results",
+                    "description": ("No records were identified by this check"),
+                    "params": {},
+                }
+            )
+
+        self.results_model.add_results(
+            check_id=check_id,
+            check_title=check_title,
+            check_description=check_desc,
+            check_category=check_cat,
+            params_values=values,
+            results=results,
+        )
+
     def _update_total_progress(self) -> None:
         """Update c_progress based on per-check progress."""
         progress_by_id, indeterminate = (
@@ -1171,9 +1319,8 @@ class CheckManager(
     def _finish_run(self, success: bool) -> None:
         """Finalize run and switch to results page."""
         self.mp_poll_timer.stop()
-        self._mp_processes = {}
-        self.mp_queue = None
-        self.mp_stop = None
+        self._pending_jobs = []
+        self._running_jobs = set()
 
         self._set_state(TaskState.COMPLETED if success else TaskState.FAILED)
 
@@ -2,6 +2,13 @@
 
 This module provides a small IPC layer so checks can be executed in a separate
 process while streaming progress/state/results back to the GUI.
+
+The GUI keeps a `CheckWorkerPool` of processes that survive between runs.
+Each worker imports the bootstrap modules, connects to the database and
+discovers the checks once, then executes the jobs it receives. Large checks
+are split into shards, each covering a slice of the records of the check.
+The first shard finds the ranges of keys of all the shards, so the records
+are only counted and cut once, and the other shards read their range.
 """
 
 from __future__ import annotations
@@ -9,6 +16,7 @@ from __future__ import annotations
 import importlib
 import logging
 import multiprocessing as mp
+import os
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -17,12 +25,20 @@ from typing import (
     Literal,
     NotRequired,
     Optional,
+    Set,
+    Tuple,
     TypedDict,
 )
 
 if TYPE_CHECKING:
+    from multiprocessing.context import SpawnContext, SpawnProcess
     from multiprocessing.synchronize import Event
 
+    from exdrf_util.check import Check
+    from exdrf_util.check_store import CheckResultStore
+
+    from exdrf_qt.context import QtMinContext
+
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +55,35 @@ class DbConfigDict(TypedDict, total=False):
     schema: str
 
 
+class JobDict(TypedDict):
+    """A check, or a shard of a check, to be executed by a pool worker.
+
+    Attributes:
+        check_id: Check id to execute.
+        shard: Index of the slice of records to check.
+        shards: Number of slices the records of the check are split into.
+        split: Whether this is the first shard, which finds the ranges of
+            all the shards and reports them in a `split` message.
+        key_range: The (lower, upper] range of keys of a shard, as found by
+            the first shard.
+        db: DB configuration dict.
+        param_values: Parameter values keyed by parameter name.
+        bootstrap_imports: Modules to import before discovery.
+        result_store: Optional path of the file where the results are kept
+            between runs, so that unchanged records are not checked again.
+    """
+
+    check_id: str
+    shard: int
+    shards: int
+    split: NotRequired[bool]
+    key_range: NotRequired[List[Any]]
+    db: DbConfigDict
+    param_values: Dict[str, Any]
+    bootstrap_imports: List[str]
+    result_store: NotRequired[str]
+
+
 class SerializedResultDict(TypedDict):
     """Serialized representation of a CheckResult.
 
@@ -104,7 +149,8 @@ class WorkerMessage(TypedDict):
     """Union of messages exchanged between worker and GUI.
 
     Attributes:
-        type: Message kind (progress, results, error, state, started, done).
+        type: Message kind (progress, results, error, state, started, done,
+            split).
         check_id: Identifier of the check.
         progress: Optional current progress step.
         max_steps: Optional maximum progress steps.
@@ -114,9 +160,16 @@ class WorkerMessage(TypedDict):
         results: Optional list of serialized results.
         error: Optional error message.
         state: Optional state string.
+        shard: Optional index of the shard the message belongs to.
+        pid: Optional process id of the worker that started or finished
+            the job.
+        bounds: Optional keys that end the ranges of the shards of a check,
+            or None if its records cannot be split.
     """
 
-    type: Literal["progress", "results", "error", "state", "started", "done"]
+    type: Literal[
+        "progress", "results", "error", "state", "started", "done", "split"
+    ]
     check_id: str
     progress: NotRequired[int]
     max_steps: NotRequired[int]
@@ -126,6 +179,9 @@ class WorkerMessage(TypedDict):
     results: NotRequired[List[SerializedResultDict]]
     error: NotRequired[str]
     state: NotRequired[str]
+    shard: NotRequired[int]
+    pid: NotRequired[int]
+    bounds: NotRequired[Optional[List[Any]]]
 
 
 def _serialize_result(result) -> SerializedResultDict:
@@ -141,163 +197,550 @@ def _serialize_result(result) -> SerializedResultDict:
     }
 
 
-def run_check_task_in_process(
-    *,
-    check_id: str,
-    db: DbConfigDict,
-    param_values: Dict[str, Any],
-    out_q: "mp.Queue[WorkerMessage]",
-    stop_event: "Event",
-    bootstrap_imports: Optional[List[str]] = None,
-    bootstrap_callables: Optional[List[str]] = None,
-) -> None:
-    """Run one check task in a separate process.
+class _WorkerState:
+    """What a worker process keeps between the jobs it executes.
 
-    Args:
-        check_id: Check id to execute (resolved via get_all_checks in-process).
-        db: DB configuration dict with keys 'c_string' and 'schema'.
-        param_values: Parameter values keyed by parameter name.
+    Attributes:
         out_q: Output queue for status/progress/results messages.
-        stop_event: Stop event signaled by the GUI.
-        bootstrap_imports: Optional list of modules to import before discovery.
-        bootstrap_callables: Optional list of dotted callables to invoke before
-            discovery (for example to register plugins in the worker).
+        imported: Bootstrap modules already imported.
+        called: Bootstrap callables already invoked.
+        contexts: Contexts keyed by connection string and schema.
+        checks: Discovered checks keyed by the key of their context.
+        stores: Result stores keyed by their path.
     """
-    try:
-        from exdrf_util.check import get_all_checks
-        from exdrf_util.task import TaskState
-    except Exception as e:
-        out_q.put(
+
+    out_q: "mp.Queue[WorkerMessage]"
+    imported: Set[str]
+    called: Set[str]
+    contexts: Dict[Tuple[str, str], "QtMinContext"]
+    checks: Dict[Tuple[str, str], Dict[str, "Check"]]
+    stores: Dict[str, "CheckResultStore"]
+
+    def __init__(self, out_q: "mp.Queue[WorkerMessage]") -> None:
+        self.out_q = out_q
+        self.imported = set()
+        self.called = set()
+        self.contexts = {}
+        self.checks = {}
+        self.stores = {}
+
+    def get_store(self, path: str) -> "CheckResultStore":
+        """Get the result store kept in a file, opening it on first use."""
+        store = self.stores.get(path)
+        if store is None:
+            from exdrf_util.check_store import CheckResultStore
+
+            store = CheckResultStore(path)
+            self.stores[path] = store
+        return store
+
+    def error(self, check_id: str, message: str, shard: int = 0) -> None:
+        """Report an error for a job."""
+        self.out_q.put(
             {
                 "type": "error",
                 "check_id": check_id,
-                "error": str(e),
+                "error": message,
+                "shard": shard,
             }
         )
-        return
 
-    # Bootstrap worker process (optional).
-    for mod_name in bootstrap_imports or []:
+    def bootstrap(
+        self,
+        check_id: str,
+        imports: List[str],
+        callables: List[str],
+        shard: int = 0,
+    ) -> None:
+        """Import the modules and call the functions not seen before."""
+        for mod_name in imports:
+            if mod_name in self.imported:
+                continue
+            try:
+                importlib.import_module(mod_name)
+                self.imported.add(mod_name)
+            except Exception as e:
+                self.error(check_id, f"Failed to import {mod_name}: {e}", shard)
+
+        for dotted in callables:
+            if dotted in self.called:
+                continue
+            try:
+                mod_path, attr = dotted.rsplit(".", 1)
+                mod = importlib.import_module(mod_path)
+                fn = getattr(mod, attr)
+                fn()
+                self.called.add(dotted)
+            except Exception as e:
+                self.error(check_id, f"Failed to call {dotted}: {e}", shard)
+
+    def get_checks(
+        self, check_id: str, db: DbConfigDict, shard: int = 0
+    ) -> Optional[Tuple["QtMinContext", Dict[str, "Check"]]]:
+        """Get the context for a database and the checks discovered in it.
+
+        Both are created on first use and reused by the following jobs. The
+        discovery is repeated when the context has no check with the given
+        id, as a new bootstrap module may have registered it.
+        """
         try:
-            importlib.import_module(mod_name)
+            from exdrf_util.check import get_all_checks
+
+            from exdrf_qt.context import QtMinContext
         except Exception as e:
+            self.error(
+                check_id,
+                "Database driver/module missing. "
+                f"Failed to import QtMinContext: {e}",
+                shard,
+            )
+            return None
+
+        key = (db.get("c_string", ""), db.get("schema", "public"))
+        ctx = self.contexts.get(key)
+        if ctx is None:
+            ctx = QtMinContext(c_string=key[0], schema=key[1])
+            ctx.stg.set_read_only(True)
+            self.contexts[key] = ctx
+
+        checks = self.checks.get(key)
+        if checks is None or check_id not in checks:
+            checks = {
+                chk.check_id: chk
+                for chk in get_all_checks(ctx=ctx, for_gui=False)
+            }
+            self.checks[key] = checks
+        return ctx, checks
+
+    def run(
+        self,
+        job: JobDict,
+        stop_event: "Event",
+        bootstrap_callables: Optional[List[str]] = None,
+    ) -> None:
+        """Execute one job and stream its messages.
+
+        The first message of a job is always `started` and the last one is
+        always `done`, both with the id of the process.
+        """
+        check_id = job["check_id"]
+        shard = job.get("shard", 0)
+        shards = job.get("shards", 1)
+        out_q = self.out_q
+        out_q.put(
+            {
+                "type": "started",
+                "check_id": check_id,
+                "shard": shard,
+                "pid": os.getpid(),
+            }
+        )
+        try:
+            self._run(
+                job, check_id, shard, shards, stop_event, bootstrap_callables
+            )
+        finally:
             out_q.put(
                 {
-                    "type": "error",
+                    "type": "done",
                     "check_id": check_id,
-                    "error": f"Failed to import {mod_name}: {e}",
+                    "shard": shard,
+                    "pid": os.getpid(),
                 }
             )
 
-    for dotted in bootstrap_callables or []:
+    def _run(
+        self,
+        job: JobDict,
+        check_id: str,
+        shard: int,
+        shards: int,
+        stop_event: "Event",
+        bootstrap_callables: Optional[List[str]],
+    ) -> None:
+        """Prepare the check of a job and execute its task."""
+        self.bootstrap(
+            check_id,
+            job.get("bootstrap_imports") or [],
+            bootstrap_callables or [],
+            shard,
+        )
+        found = self.get_checks(check_id, job.get("db", {}), shard)
+        if found is None:
+            return
+        ctx, checks = found
+
+        # Resolve check instance.
+        chk = checks.get(check_id)
+        if chk is None:
+            self.error(check_id, f"Check not found: {check_id}", shard)
+            return
+
+        # Apply parameter values. The check is reused by the next jobs, so
+        # its own values are put back afterwards.
+        defaults = {name: p.value for name, p in chk.parameters.items()}
+        for name, value in job.get("param_values", {}).items():
+            if name in chk.parameters:
+                chk.parameters[name].value = value
         try:
-            mod_path, attr = dotted.rsplit(".", 1)
-            mod = importlib.import_module(mod_path)
-            fn = getattr(mod, attr)
-            fn()
+            self._execute(job, ctx, chk, shard, shards, stop_event)
+        finally:
+            for name, value in defaults.items():
+                chk.parameters[name].value = value
+
+    def _execute(
+        self,
+        job: JobDict,
+        ctx: "QtMinContext",
+        chk: "Check",
+        shard: int,
+        shards: int,
+        stop_event: "Event",
+    ) -> None:
+        """Execute the task of a prepared check and stream its messages."""
+        from exdrf_util.task import TaskState
+
+        check_id = chk.check_id
+        out_q = self.out_q
+        task = chk.create_task()
+        if shards > 1:
+            task.shard = (shard, shards)
+        key_range = job.get("key_range")
+        if key_range is not None:
+            task.key_range = (key_range[0], key_range[1])
+        elif job.get("split"):
+
+            def on_split(bounds: Optional[List[Any]]) -> None:
+                out_q.put(
+                    {
+                        "type": "split",
+                        "check_id": check_id,
+                        "shard": shard,
+                        "bounds": bounds,
+                    }
+                )
+
+            task.on_split = on_split
+        store_path = job.get("result_store")
+        if store_path:
+            try:
+                task.store = self.get_store(store_path)
+            except Exception as e:
+                logger.warning(
+                    "Failed to open the result store %s: %s",
+                    store_path,
+                    e,
+                    exc_info=True,
+                )
+
+        # Stream state/progress.
+        def on_state_changed(_task, state: TaskState) -> None:
+            out_q.put(
+                {
+                    "type": "state",
+                    "check_id": check_id,
+                    "state": str(state),
+                    "shard": shard,
+                }
+            )
+
+        def on_progress_changed(_task, progress: int) -> None:
+            if stop_event.is_set():
+                _task.should_stop = True
+            out_q.put(
+                {
+                    "type": "progress",
+                    "check_id": check_id,
+                    "progress": progress,
+                    "max_steps": int(getattr(_task, "max_steps", -1) or -1),
+                    "shard": shard,
+                }
+            )
+
+        task.on_state_changed.append(on_state_changed)
+        task.on_progress_changed.append(on_progress_changed)
+
+        try:
+            task.execute(ctx)  # type: ignore[arg-type]
         except Exception as e:
+            self.error(check_id, str(e), shard)
+        finally:
+            results = getattr(task, "results", [])
             out_q.put(
                 {
-                    "type": "error",
+                    "type": "results",
                     "check_id": check_id,
-                    "error": f"Failed to call {dotted}: {e}",
+                    "check_title": chk.title,
+                    "check_description": chk.description,
+                    "check_category": chk.category,
+                    "results": [_serialize_result(r) for r in results],
+                    "shard": shard,
                 }
             )
 
-    try:
-        from exdrf_qt.context import QtMinContext
-    except Exception as e:
-        out_q.put(
-            {
-                "type": "error",
-                "check_id": check_id,
-                "error": (
-                    "Database driver/module missing. "
-                    f"Failed to import QtMinContext: {e}"
-                ),
-            }
-        )
-        return
 
-    # Create context in the worker.
-    ctx = QtMinContext(
-        c_string=db.get("c_string", ""),
-        schema=db.get("schema", "public"),
+def run_check_task_in_process(
+    *,
+    check_id: str,
+    db: DbConfigDict,
+    param_values: Dict[str, Any],
+    out_q: "mp.Queue[WorkerMessage]",
+    stop_event: "Event",
+    bootstrap_imports: Optional[List[str]] = None,
+    bootstrap_callables: Optional[List[str]] = None,
+) -> None:
+    """Run one check task in a separate process.
+
+    Args:
+        check_id: Check id to execute (resolved via get_all_checks in-process).
+        db: DB configuration dict with keys 'c_string' and 'schema'.
+        param_values: Parameter values keyed by parameter name.
+        out_q: Output queue for status/progress/results messages.
+        stop_event: Stop event signaled by the GUI.
+        bootstrap_imports: Optional list of modules to import before discovery.
+        bootstrap_callables: Optional list of dotted callables to invoke before
+            discovery (for example to register plugins in the worker).
+    """
+    _WorkerState(out_q).run(
+        {
+            "check_id": check_id,
+            "shard": 0,
+            "shards": 1,
+            "db": db,
+            "param_values": param_values,
+            "bootstrap_imports": bootstrap_imports or [],
+        },
+        stop_event,
+        bootstrap_callables,
     )
-    ctx.stg.set_read_only(True)
-
-    # Resolve check instance.
-    checks = {
-        chk.check_id: chk
-        for chk in get_all_checks(
-            ctx=ctx,
-            for_gui=False,
-        )
-    }
-    chk = checks.get(check_id)
-    if chk is None:
-        out_q.put(
-            {
-                "type": "error",
-                "check_id": check_id,
-                "error": f"Check not found: {check_id}",
-            }
-        )
-        return
 
-    # Apply parameter values.
-    for name, value in param_values.items():
-        if name in chk.parameters:
-            chk.parameters[name].value = value
 
-    task = chk.create_task()
+def run_check_worker(
+    *,
+    task_q: "mp.Queue[Optional[JobDict]]",
+    out_q: "mp.Queue[WorkerMessage]",
+    stop_event: "Event",
+    bootstrap_callables: Optional[List[str]] = None,
+) -> None:
+    """Execute jobs until a None job is received.
 
-    # Stream state/progress.
-    def on_state_changed(_task, state: TaskState) -> None:
-        out_q.put(
-            {
-                "type": "state",
-                "check_id": check_id,
-                "state": str(state),
-            }
-        )
+    The imported modules, the database contexts and the discovered checks
+    are kept between the jobs.
 
-    def on_progress_changed(_task, progress: int) -> None:
-        if stop_event.is_set():
-            _task.should_stop = True
-        out_q.put(
-            {
-                "type": "progress",
-                "check_id": check_id,
-                "progress": progress,
-                "max_steps": int(getattr(_task, "max_steps", -1) or -1),
-            }
-        )
+    Args:
+        task_q: Input queue with the jobs.
+        out_q: Output queue for status/progress/results messages.
+        stop_event: Stop event signaled by the GUI.
+        bootstrap_callables: Optional list of dotted callables to invoke
+            once, before the first discovery.
+    """
+    state = _WorkerState(out_q)
+    while True:
+        job = task_q.get()
+        if job is None:
+            break
+        state.run(job, stop_event, bootstrap_callables)
 
-    task.on_state_changed.append(on_state_changed)
-    task.on_progress_changed.append(on_progress_changed)
 
-    try:
-        out_q.put({"type": "started", "check_id": check_id})
-        task.execute(ctx)  # type: ignore[arg-type]
-    except Exception as e:
-        out_q.put(
-            {
-                "type": "error",
-                "check_id": check_id,
-                "error": str(e),
-            }
-        )
-    finally:
-        results = getattr(task, "results", [])
-        out_q.put(
-            {
-                "type": "results",
-                "check_id": check_id,
-                "check_title": chk.title,
-                "check_description": chk.description,
-                "check_category": chk.category,
-                "results": [_serialize_result(r) for r in results],
-            }
+class _PoolWorker:
+    """A worker process of the pool and the job it executes.
+
+    Attributes:
+        process: The worker process.
+        task_q: The queue with the jobs of this worker.
+        job: Check id and shard of the job handed to the worker, if any.
+    """
+
+    process: "SpawnProcess"
+    task_q: "mp.Queue[Optional[JobDict]]"
+    job: Optional[Tuple[str, int]]
+
+    def __init__(
+        self,
+        process: "SpawnProcess",
+        task_q: "mp.Queue[Optional[JobDict]]",
+    ) -> None:
+        self.process = process
+        self.task_q = task_q
+        self.job = None
+
+
+class CheckWorkerPool:
+    """Worker processes that stay alive between check runs.
+
+    Each worker has its own job queue and the pool hands a job to a worker
+    only when it is idle, so the pool always knows which job a worker
+    holds. A worker that dies, even before it reports that it started the
+    job, is noticed through its process object and its job is returned by
+    `reap()`. The workers only start when needed and the pool never grows
+    past `size`.
+
+    Attributes:
+        size: Maximum number of worker processes.
+        out_q: Queue with the messages from the workers.
+        stop_event: Set to ask the running jobs to stop early.
+        bootstrap_callables: Dotted callables invoked once in each worker.
+        workers: The worker processes.
+    """
+
+    size: int
+    out_q: "mp.Queue[WorkerMessage]"
+    stop_event: "Event"
+    bootstrap_callables: List[str]
+    workers: List[_PoolWorker]
+    _mp_ctx: "SpawnContext"
+    _waiting: List[JobDict]
+
+    def __init__(
+        self,
+        mp_ctx: "SpawnContext",
+        size: int,
+        bootstrap_callables: Optional[List[str]] = None,
+    ) -> None:
+        """Create the queues; the processes start with the first jobs.
+
+        Args:
+            mp_ctx: Multiprocessing context used to spawn the workers.
+            size: Maximum number of worker processes.
+            bootstrap_callables: Dotted callables invoked once in each worker.
+        """
+        self.size = max(1, int(size))
+        self._mp_ctx = mp_ctx
+        self.out_q = mp_ctx.Queue()
+        self.stop_event = mp_ctx.Event()
+        self.bootstrap_callables = list(bootstrap_callables or [])
+        self.workers = []
+        self._waiting = []
+
+    @property
+    def pids(self) -> List[int]:
+        """The process ids of the live workers."""
+        return [
+            w.process.pid for w in self.workers if w.process.pid is not None
+        ]
+
+    def submit(self, job: JobDict) -> None:
+        """Queue a job, starting a new worker if all of them are busy.
+
+        The job waits in the pool while all `size` workers are busy.
+
+        Args:
+            job: The job to execute.
+        """
+        self._waiting.append(job)
+        self._dispatch()
+
+    def get_message(self, timeout: Optional[float] = None) -> WorkerMessage:
+        """Take the next message from the workers.
+
+        A `done` message makes its worker idle, so it gets the next job
+        waiting in the pool.
+
+        Args:
+            timeout: How long to wait for a message; by default the call
+                does not wait.
+
+        Raises:
+            queue.Empty: There is no message.
+        """
+        if timeout is None:
+            msg = self.out_q.get_nowait()
+        else:
+            msg = self.out_q.get(timeout=timeout)
+        if msg.get("type") == "done":
+            self._release(msg)
+        return msg
+
+    def _spawn(self) -> _PoolWorker:
+        """Start a worker process."""
+        task_q: "mp.Queue[Optional[JobDict]]" = self._mp_ctx.Queue()
+        proc = self._mp_ctx.Process(
+            target=run_check_worker,
+            kwargs={
+                "task_q": task_q,
+                "out_q": self.out_q,
+                "stop_event": self.stop_event,
+                "bootstrap_callables": self.bootstrap_callables,
+            },
         )
-        out_q.put({"type": "done", "check_id": check_id})
+        proc.daemon = True
+        proc.start()
+        return _PoolWorker(proc, task_q)
+
+    def _dispatch(self) -> None:
+        """Hand the waiting jobs to idle workers, starting new ones."""
+        while self._waiting:
+            worker = next((w for w in self.workers if w.job is None), None)
+            if worker is None:
+                if len(self.workers) >= self.size:
+                    return
+                worker = self._spawn()
+                self.workers.append(worker)
+            job = self._waiting.pop(0)
+            worker.job = (job["check_id"], job.get("shard", 0))
+            worker.task_q.put(job)
+
+    def _release(self, msg: WorkerMessage) -> None:
+        """Mark the worker that sent a `done` message as idle."""
+        key = (msg.get("check_id", ""), msg.get("shard", 0))
+        pid = msg.get("pid")
+        busy = [w for w in self.workers if w.job == key]
+        for worker in busy:
+            if pid is None or worker.process.pid == pid:
+                worker.job = None
+                break
+        self._dispatch()
+
+    def reap(self) -> List[Tuple[str, int]]:
+        """Forget the workers that died and return the jobs they held.
+
+        Returns:
+            The check id and shard of each job that will not report back.
+        """
+        lost = []
+        for worker in list(self.workers):
+            proc = worker.process
+            if proc.is_alive():
+                continue
+            logger.error(
+                "Check worker %s exited with code %s", proc.pid, proc.exitcode
+            )
+            try:
+                proc.join(timeout=0.1)
+            except Exception as e:
+                logger.debug("Failed to join worker: %s", e, exc_info=True)
+            worker.task_q.cancel_join_thread()
+            self.workers.remove(worker)
+            if worker.job is not None:
+                lost.append(worker.job)
+        self._dispatch()
+        return lost
+
+    def shutdown(self, terminate: bool = False, timeout: float = 0.5) -> None:
+        """Stop the workers.
+
+        Args:
+            terminate: Kill the workers instead of letting them finish the
+                jobs already queued.
+            timeout: How long to wait for each worker.
+        """
+        self._waiting = []
+        if terminate:
+            self.stop_event.set()
+            for worker in self.workers:
+                if worker.process.is_alive():
+                    worker.process.terminate()
+        else:
+            for worker in self.workers:
+                worker.task_q.put(None)
+        for worker in self.workers:
+            proc = worker.process
+            try:
+                proc.join(timeout=timeout)
+                if proc.is_alive():
+                    proc.terminate()
+                    proc.join(timeout=timeout)
+            except Exception as e:
+                logger.debug("Failed to stop worker: %s", e, exc_info=True)
+            worker.task_q.cancel_join_thread()
+        self.workers = []
@@ -60,6 +60,10 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
             apply the filter.
         tokenizer: The tokenizer for the filter DSL.
         validator: The validator for the filter DSL.
+
+    Private Attributes:
+        _edits: The (position, removed, added) changes of the document since
+            it was last parsed; a single change is parsed incrementally.
     """
 
     all_field_names_cache: List[str]
@@ -70,6 +74,7 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
     qt_model: "QtModel[DBM]"
     tokenizer: Optional[DSLTokenizer]
     validator: Optional[FieldValidator[DBM, "QtContext"]]
+    _edits: List[Tuple[int, int, int]]
 
     errorChanged = pyqtSignal(bool)
 
@@ -95,6 +100,7 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
         self.parser = None
         self.tokenizer = None
         self.all_field_names_cache = []
+        self._edits = []
 
         # Setup formats
         self._setup_formats()
@@ -102,7 +108,8 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
         # Setup completer
         self._setup_completer()
 
-        # Connect text changed signal
+        # Connect text changed signals
+        self.document().contentsChange.connect(self._on_contents_change)
         self.textChanged.connect(self._on_text_changed)
 
         # Setup tab stop distance
@@ -674,6 +681,12 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
         self.default_format.setBackground(QColor("#FFFFFF"))
         self.default_format.setFontPointSize(default_font_size)
 
+    def _on_contents_change(
+        self, position: int, removed: int, added: int
+    ) -> None:
+        """Remember a change of the document for the next parse."""
+        self._edits.append((position, removed, added))
+
     def _on_text_changed(self) -> None:
         """Handle text changes and update highlighting."""
         self.check_document()
@@ -682,6 +695,8 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
     def check_document(self) -> Union[FilterType, None]:
         """Parse and validate the current document text."""
         full_text = self.toPlainText()
+        edits = self._edits
+        self._edits = []
         if not self.all_field_names_cache and self.qt_model:
             self.all_field_names_cache = sorted(
                 [
@@ -713,17 +728,29 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
             )
         )
 
-        self.parser = DSLParserWithValidation[DBM, "QtContext"](
-            src_text=full_text,
-            tokens=[],
-            index=0,
-            validator=_validator,
+        # A single edit of the text that was parsed before only needs the
+        # elements it touches to be parsed again.
+        incremental = (
+            self.parser is not None
+            and self.parser.validator is _validator
+            and len(edits) == 1
         )
-        self.tokenizer = current_tokenizer
+        if not incremental:
+            self.parser = DSLParserWithValidation[DBM, "QtContext"](
+                src_text=full_text,
+                tokens=[],
+                index=0,
+                validator=_validator,
+            )
+            self.tokenizer = current_tokenizer
 
         try:
-            self.parser.tokens = self.tokenizer.tokenize()
-            result = self.parser.parse()
+            assert self.parser is not None
+            if incremental:
+                result = self.parser.reparse(full_text, *edits[0])
+            else:
+                self.parser.tokens = current_tokenizer.tokenize()
+                result = self.parser.parse()
             self.errorChanged.emit(False)
             self.l_error.setText("")
             self.err_start = -1
@@ -807,6 +834,8 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
 
     def update_highlighting(self) -> None:
         """Update the text highlighting based on current parser state."""
+        # Formatting is reported as a change of the contents; it is not one.
+        edit_count = len(self._edits)
         self.blockSignals(True)
         cursor = self.textCursor()
         cursor.select(QTextCursor.SelectionType.Document)
@@ -841,6 +870,7 @@ class FilterEditor(QPlainTextEdit, QtUseContext, Generic[DBM]):
                     )
                     token_cursor.setCharFormat(self._get_token_format(token))
         self.blockSignals(False)
+        del self._edits[edit_count:]
 
     def _get_token_format(self, token: Token) -> QTextCharFormat:
         """Get the format for a specific token type."""
@@ -9,7 +9,7 @@ other widgets without additional mixins.
 import logging
 from typing import TYPE_CHECKING, Callable, Optional
 
-from PyQt5.QtCore import QPoint, QRect, QSize, Qt
+from PyQt5.QtCore import QPoint, QRect, QSize, Qt, pyqtSignal
 from PyQt5.QtGui import QBrush, QColor, QPainter, QPixmap
 from PyQt5.QtWidgets import QGraphicsView, QRubberBand
 
@@ -29,6 +29,8 @@ class ImageGraphicsView(QGraphicsView):
     - Configurable zoom limits
 
     Attributes:
+        zoomChanged: Signal emitted with the new zoom level after every
+            zoom change.
         _middle_panning: Whether middle mouse button panning is active.
         _last_mouse_pos: Last mouse position during panning.
         _zoom: Current zoom level (1.0 = 100%).
@@ -36,6 +38,8 @@ class ImageGraphicsView(QGraphicsView):
         _zoom_max: Maximum allowed zoom level.
     """
 
+    zoomChanged = pyqtSignal(float)
+
     def __init__(self, parent: Optional["QWidget"] = None):
         """Initialize the graphics view.
 
@@ -123,6 +127,7 @@ class ImageGraphicsView(QGraphicsView):
         factor = zoom / self._zoom
         self.scale(factor, factor)
         self._zoom = zoom
+        self.zoomChanged.emit(zoom)
 
     def zoom_in(self, step: float = 1.25):
         """Zoom in by the specified step factor.
@@ -5,10 +5,19 @@ import os
 import re
 from typing import List, Optional, Set, Tuple
 
+from exdrf_util.merge_pdfs import OutputPage
 from PyQt5.QtCore import QPoint, QRect, Qt
-from PyQt5.QtWidgets import QHBoxLayout, QMenu, QMessageBox, QSplitter, QWidget
+from PyQt5.QtWidgets import (
+    QHBoxLayout,
+    QMenu,
+    QMessageBox,
+    QProgressDialog,
+    QSplitter,
+    QWidget,
+)
 
 from exdrf_qt.controls.pdf_viewer.pdf_image_viewer import PdfImageViewer
+from exdrf_qt.controls.pdf_viewer.pdf_split_worker import PdfSplitWorker
 from exdrf_qt.controls.pdf_viewer.split_entry import SplitEntry
 from exdrf_qt.controls.pdf_viewer.split_plan_panel import SplitPlanPanel
 
@@ -33,6 +42,8 @@ class PdfImageSplitter(PdfImageViewer):
         """
         # Reserve split panel reference so base hooks can run safely.
         self._split_panel: Optional[SplitPlanPanel] = None
+        # The worker writing the split files, while it runs.
+        self._split_worker: Optional[PdfSplitWorker] = None
         # Track hook installation to avoid duplicate signal/event connections.
         self._viewer_hooks_installed = False
         self._split_panel_hooks_installed = False
@@ -521,7 +532,10 @@ class PdfImageSplitter(PdfImageViewer):
         return pages
 
     def _run_split_jobs(self, jobs: List[Tuple[SplitEntry, List[int]]]):
-        """Execute the split operations and save generated PDFs.
+        """Save the generated PDFs in the background.
+
+        The files are written by a pool of processes while a progress dialog
+        lets the user cancel the files that were not started yet.
 
         Args:
             jobs: List of tuples containing split entries and their page lists.
@@ -540,7 +554,7 @@ class PdfImageSplitter(PdfImageViewer):
             )
             return
         try:
-            import fitz  # type: ignore
+            import fitz  # type: ignore  # noqa: F401
         except Exception as exc:  # pragma: no cover - optional dependency
             self.show_error(
                 self.t("pdf.split.fitz_missing", "PyMuPDF is not available."),
@@ -549,48 +563,127 @@ class PdfImageSplitter(PdfImageViewer):
             logger.error("PyMuPDF import failed: %s", exc)
             return
 
-        # Open the document once and accumulate all generated filenames.
-        doc = fitz.open(self._pdf_path)
         base_dir = os.path.dirname(self._pdf_path) or os.getcwd()
+        parts = self._build_split_parts(jobs, self._pdf_path, base_dir)
+        if not parts:
+            self._show_split_result([], base_dir)
+            return
+
+        worker = PdfSplitWorker(parts)
+        # Keep a reference so the thread is not destroyed while running.
+        self._split_worker = worker
+        total = sum(len(pages) for _, pages in parts)
+        dlg = QProgressDialog(
+            self.t("pdf.split.progress.t", "Creating split files..."),
+            self.t("cmn.cancel", "Cancel"),
+            0,
+            total,
+            self,
+        )
+        dlg.setWindowTitle(self.t("pdf.split.t", "Split"))
+        dlg.setAutoReset(False)
+        dlg.setAutoClose(False)
+
+        def _on_progress(done: int, total: int) -> None:
+            """Update the dialog as files are written.
+
+            Args:
+                done: Pages written so far.
+                total: Total pages to write.
+            """
+            dlg.setValue(done)
+            dlg.setLabelText(
+                self.t(
+                    "pdf.split.progress",
+                    "Creating split files... {done}/{total} pages",
+                    done=done,
+                    total=total,
+                )
+            )
+
+        def _on_finished(created: List[str]) -> None:
+            """Close the dialog and report the outcome.
+
+            Args:
+                created: The paths of the files that were created.
+            """
+            dlg.close()
+            self._split_worker = None
+            self._show_split_result(created, base_dir)
+
+        def _on_error(message: str) -> None:
+            """Show the error that stopped the split.
+
+            Args:
+                message: The error message.
+            """
+            self.show_error(
+                message,
+                self.t("pdf.split.error", "Split error"),
+            )
+
+        worker.progress.connect(_on_progress)
+        worker.error.connect(_on_error)
+        worker.finished_all.connect(_on_finished)
+        dlg.canceled.connect(worker.requestInterruption)
+        dlg.show()
+        worker.start()
+
+    def _build_split_parts(
+        self,
+        jobs: List[Tuple[SplitEntry, List[int]]],
+        pdf_path: str,
+        base_dir: str,
+    ) -> List[Tuple[str, List[OutputPage]]]:
+        """Choose the path and the pages of each split file.
+
+        Args:
+            jobs: List of tuples containing split entries and their page lists.
+            pdf_path: The source PDF.
+            base_dir: The directory of the new files.
+
+        Returns:
+            The path and the pages of each file that has pages.
+        """
         split_panel = self._ensure_split_panel()
         prefix_enabled = split_panel.is_prefix_enabled()
         digits = len(str(len(jobs))) if prefix_enabled else 0
-        created: List[str] = []
-        try:
-            # Iterate through each job, copying requested pages into a new PDF.
-            for idx, (entry, pages) in enumerate(jobs, start=1):
-                if not pages:
+        taken: Set[str] = set()
+        parts: List[Tuple[str, List[OutputPage]]] = []
+        for idx, (entry, pages) in enumerate(jobs, start=1):
+            # Copy requested pages, turned as planned; 0 keeps the source.
+            out_pages: List[OutputPage] = []
+            for page_num in pages:
+                page_idx = page_num - 1
+                if not 0 <= page_idx < self._image_total:
                     continue
-                new_doc = fitz.open()
-                for page_num in pages:
-                    page_idx = page_num - 1
-                    if 0 <= page_idx < doc.page_count:
-                        new_doc.insert_pdf(
-                            doc, from_page=page_idx, to_page=page_idx
-                        )
-                        rotation = entry.page_rotations.get(page_num, 0)
-                        if rotation and new_doc.page_count > 0:
-                            target_page = new_doc[-1]
-                            self._apply_export_rotation(target_page, rotation)
-                title = entry.title.strip() or entry.pages_expr.strip()
-                safe_title = self._safe_filename(title or f"part_{idx}")
-                prefix = (
-                    f"{idx:0{digits}d}. " if prefix_enabled and digits else ""
-                )
-                filename = f"{prefix}{safe_title}.pdf"
+                rotation = entry.page_rotations.get(page_num, 0) % 360
+                out_pages.append(OutputPage(pdf_path, page_idx, rotation or -1))
+            if not out_pages:
+                continue
+
+            # Pick a name that is not used on disk or by an earlier file.
+            title = entry.title.strip() or entry.pages_expr.strip()
+            safe_title = self._safe_filename(title or f"part_{idx}")
+            prefix = f"{idx:0{digits}d}. " if prefix_enabled and digits else ""
+            filename = f"{prefix}{safe_title}.pdf"
+            out_path = os.path.join(base_dir, filename)
+            suffix = 1
+            while os.path.exists(out_path) or out_path in taken:
+                filename = f"{prefix}{safe_title}_{suffix}.pdf"
                 out_path = os.path.join(base_dir, filename)
-                suffix = 1
-                while os.path.exists(out_path):
-                    filename = f"{prefix}{safe_title}_{suffix}.pdf"
-                    out_path = os.path.join(base_dir, filename)
-                    suffix += 1
-                new_doc.save(out_path)
-                created.append(out_path)
-                new_doc.close()
-        finally:
-            doc.close()
-
-        # Communicate the outcome with a friendly dialog.
+                suffix += 1
+            taken.add(out_path)
+            parts.append((out_path, out_pages))
+        return parts
+
+    def _show_split_result(self, created: List[str], base_dir: str):
+        """Communicate the outcome of a split with a friendly dialog.
+
+        Args:
+            created: The paths of the files that were created.
+            base_dir: The directory of the new files.
+        """
         if created:
             self._show_info(
                 self.t("pdf.split.success", "Split complete"),
@@ -610,23 +703,6 @@ class PdfImageSplitter(PdfImageViewer):
                 ),
             )
 
-    def _apply_export_rotation(self, page, rotation: int):
-        """Apply rotation to a PyMuPDF page instance.
-
-        Args:
-            page: PyMuPDF page object to rotate.
-            rotation: Rotation angle in degrees (0, 90, 180, or 270).
-        """
-        if rotation % 360 == 0:
-            return
-        setter = getattr(page, "set_rotation", None)
-        if callable(setter):
-            setter(rotation)
-            return
-        legacy = getattr(page, "setRotation", None)
-        if callable(legacy):
-            legacy(rotation)
-
     def _safe_filename(self, name: str) -> str:
         """Return a filesystem-safe filename fragment.
 
@@ -2,18 +2,23 @@
 
 import importlib
 import logging
+import math
 import os
 import re
 import shutil
 import tempfile
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, cast
 
+from appdirs import user_cache_dir  # type: ignore[import-untyped]
+from exdrf_util.pdf_render import TILE_SIZE
 from PyQt5.QtCore import (
     QEvent,
     QPoint,
     QRect,
+    QRectF,
     QSize,
     Qt,
+    QTimer,
     QUrl,
     pyqtSignal,
 )
@@ -44,7 +49,14 @@ from PyQt5.QtWidgets import (
 
 from exdrf_qt.context_use import QtUseContext
 from exdrf_qt.controls.pdf_viewer.image_graphics_view import ImageGraphicsView
-from exdrf_qt.controls.pdf_viewer.pdf_render_worker import PdfRenderService
+from exdrf_qt.controls.pdf_viewer.pdf_render_worker import (
+    PRIORITY_LOOKAHEAD,
+    PRIORITY_VISIBLE,
+    PdfRenderService,
+    TileKey,
+    default_render_processes,
+)
+from exdrf_qt.controls.pdf_viewer.render_cache import PixmapCache, RenderCache
 
 try:  # pragma: no cover - optional dependency
     _paddle_module = importlib.import_module("paddleocr")
@@ -57,6 +69,9 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from exdrf_qt.context import QtContext  # noqa: F401
 
+# The highest resolution of the tiles, as a multiple of the page one.
+MAX_TILE_SCALE = 8
+
 
 class PdfImageViewer(QWidget, QtUseContext):
     """Widget for viewing PDFs (rendered to images) or single images.
@@ -70,6 +85,8 @@ class PdfImageViewer(QWidget, QtUseContext):
     - Rotation (clockwise/counter-clockwise)
     - Multi-page view modes (1-up, 2-up, 4-up)
     - Fit to width/height
+    - Sharp PDF pages when zoomed in, through tiles rendered at the
+      current zoom level over the page, which serves as a preview
     - Open in external viewer/editor
     - OCR capture tool for quickly extracting text snippets
 
@@ -86,12 +103,27 @@ class PdfImageViewer(QWidget, QtUseContext):
         _current_index: Current page/image index (zero-based).
         _dpi: DPI for PDF rendering.
         _lookahead: Number of pages to render ahead of current.
+        _render_processes: Number of processes that render the pages; zero
+            renders them in a thread, through PNG files.
         _rotation: Current rotation in degrees (0, 90, 180, 270).
         _pages_per_view: Number of pages to display simultaneously (1, 2, 4).
         _rendered_pages: Set of rendered page indices.
         _queued_pages: Set of queued page indices awaiting rendering.
         _page_to_path: Mapping of page index to image file path.
-        _pix_cache: Cache of loaded QPixmap objects.
+        _pix_cache: Cache of loaded QPixmap objects, limited to the
+            `exdrf.pdf.pixmap_cache_mb` setting (256 MB by default).
+        _render_cache: Pages rendered in earlier sessions, kept on disk and
+            limited to the `exdrf.pdf.render_cache_mb` setting (1 GB by
+            default); the `exdrf.pdf.render_cache` setting turns it off.
+        _tiles_enabled: Whether tiles are rendered when zoomed in; the
+            `exdrf.pdf.tiles` setting turns them off.
+        _tile_scale: The resolution of the tiles shown, as a multiple of
+            `_dpi`; 1 means no tiles.
+        _tile_cache: Cache of the rendered tiles, limited to the
+            `exdrf.pdf.tile_cache_mb` setting (128 MB by default).
+        _tile_items: The tiles currently in the scene.
+        _tile_timer: Delays the tile requests while the user zooms or
+            scrolls.
         _thread: Worker thread for PDF rendering.
         _worker: PDF render worker instance.
         _scene: Graphics scene for displaying images.
@@ -122,12 +154,27 @@ class PdfImageViewer(QWidget, QtUseContext):
         self._current_index: int = 0
         self._dpi: int = 150
         self._lookahead: int = 4
+        self._render_processes: int = default_render_processes()
         self._rotation: int = 0  # degrees, 0/90/180/270
         self._pages_per_view: int = 1
         self._rendered_pages: Set[int] = set()
         self._queued_pages: Set[int] = set()
         self._page_to_path: Dict[int, str] = {}
-        self._pix_cache: Dict[int, QPixmap] = {}
+        self._pix_cache = PixmapCache(
+            int(self._get_setting("exdrf.pdf.pixmap_cache_mb", 256)) << 20,
+            on_evict=self._on_pixmap_evicted,
+        )
+        self._render_cache: Optional[RenderCache] = None
+        self._tiles_enabled = bool(self._get_setting("exdrf.pdf.tiles", True))
+        self._tile_scale: int = 1
+        self._tile_cache = PixmapCache(
+            int(self._get_setting("exdrf.pdf.tile_cache_mb", 128)) << 20
+        )
+        self._tile_items: Dict[TileKey, QGraphicsPixmapItem] = {}
+        self._tile_timer = QTimer(self)
+        self._tile_timer.setSingleShot(True)
+        self._tile_timer.setInterval(80)
+        self._tile_timer.timeout.connect(self._update_tiles)
 
         # Queue-backed renderer (created on load for PDFs)
         self._worker: Optional[PdfRenderService] = None
@@ -173,6 +220,15 @@ class PdfImageViewer(QWidget, QtUseContext):
     # ---- UI -----------------------------------------------------------------
     def _install_interaction_hooks(self):
         """Install event filters and context menus for shortcuts."""
+        # Zooming and scrolling change the tiles that need to be shown.
+        self._view.zoomChanged.connect(self._schedule_tiles)
+        for bar in (
+            self._view.horizontalScrollBar(),
+            self._view.verticalScrollBar(),
+        ):
+            if bar is not None:
+                bar.valueChanged.connect(self._schedule_tiles)
+
         viewport = self._view.viewport()
         if viewport is not None:
             viewport.installEventFilter(self)
@@ -482,6 +538,7 @@ class PdfImageViewer(QWidget, QtUseContext):
         start_page: int = 0,
         dpi: int = 150,
         lookahead: int = 4,
+        processes: Optional[int] = None,
     ):
         """Load a PDF file for viewing.
 
@@ -490,6 +547,9 @@ class PdfImageViewer(QWidget, QtUseContext):
             start_page: Zero-based index of the page to display initially.
             dpi: Resolution for rendering PDF pages (default 150).
             lookahead: Number of pages to render ahead of current (default 4).
+            processes: Number of render processes; zero renders the pages
+                in a thread. By default a few processes, depending on the
+                number of CPUs, are used.
         """
         # Recreate the temporary workspace so stale renders do not linger.
         self._cleanup_temp_dir()
@@ -502,12 +562,15 @@ class PdfImageViewer(QWidget, QtUseContext):
         self._image_path = None  # Clear image path when loading PDF
         self._dpi = dpi
         self._lookahead = max(0, lookahead)
+        if processes is not None:
+            self._render_processes = max(0, processes)
         self._rotation = 0
         self._pages_per_view = max(1, min(self._pages_per_view, 4))
         self._rendered_pages.clear()
         self._queued_pages.clear()
         self._page_to_path.clear()
         self._pix_cache.clear()
+        self._tile_cache.clear()
 
         # Detect page count and clamp the initial index to the document size.
         total = self._probe_pdf_pages(file_path)
@@ -555,6 +618,7 @@ class PdfImageViewer(QWidget, QtUseContext):
         self._rendered_pages = {0}
         self._queued_pages = set()
         self._pix_cache.clear()
+        self._tile_cache.clear()
 
         self._update_page_label()
         self._update_nav_buttons()
@@ -635,7 +699,7 @@ class PdfImageViewer(QWidget, QtUseContext):
             if index in self._rendered_pages or index in self._queued_pages:
                 continue
             self._queued_pages.add(index)
-            self._worker.submit_pages([index])
+            self._worker.submit_pages([index], PRIORITY_LOOKAHEAD)
 
     def get_cached_pixmap(self, page_number: int) -> Optional[QPixmap]:
         """Return the cached pixmap for the requested 1-based page.
@@ -652,15 +716,30 @@ class PdfImageViewer(QWidget, QtUseContext):
         index = page_number - 1
         if index < 0 or index >= self._image_total:
             return None
+        return self._cached_pixmap(index)
+
+    def _cached_pixmap(self, index: int) -> Optional[QPixmap]:
+        """Return the pixmap of a rendered page, loading it if needed.
+
+        Pages rendered by processes arrive as images and are stored in the
+        cache directly; pages rendered to files are loaded on first use.
+
+        Args:
+            index: Zero-based page index.
+
+        Returns:
+            The pixmap, or None if the page was not rendered yet.
+        """
+        pixmap = self._pix_cache.get(index)
+        if pixmap is not None:
+            return pixmap
         path = self._page_to_path.get(index)
         if not path or not os.path.exists(path):
             return None
-        pixmap = self._pix_cache.get(index)
-        if pixmap is None:
-            pixmap = QPixmap(path)
-            if pixmap.isNull():
-                return None
-            self._pix_cache[index] = pixmap
+        pixmap = QPixmap(path)
+        if pixmap.isNull():
+            return None
+        self._pix_cache[index] = pixmap
         return pixmap
 
     # ---- Transformations -----------------------------------------------------
@@ -1043,12 +1122,53 @@ class PdfImageViewer(QWidget, QtUseContext):
         if self._pdf_path is None or self._temp_dir is None:
             return
         self._worker = PdfRenderService(
-            self._pdf_path, self._temp_dir, self._dpi
+            self._pdf_path,
+            self._temp_dir,
+            self._dpi,
+            processes=self._render_processes,
+            cache=self._get_render_cache(),
         )
         self._worker.pageRendered.connect(self._on_page_rendered)
+        self._worker.imageRendered.connect(self._on_page_image)
+        self._worker.tileRendered.connect(self._on_tile_rendered)
         self._worker.renderFinished.connect(self._on_render_finished)
+        self._worker.renderFailed.connect(self._on_render_failed)
         self._worker.error.connect(self._on_render_error)
 
+    def _get_setting(self, key: str, default: Any) -> Any:
+        """Read a setting, falling back to the default on any problem."""
+        try:
+            return self.ctx.stg.get_setting(key, default)
+        except Exception as e:
+            logger.debug("Failed to read setting %s: %s", key, e)
+            return default
+
+    def _get_render_cache(self) -> Optional[RenderCache]:
+        """Get the persistent cache of rendered pages, if enabled."""
+        if self._render_cache is None:
+            if not self._get_setting("exdrf.pdf.render_cache", True):
+                return None
+            self._render_cache = RenderCache(
+                os.path.join(user_cache_dir("exdrf"), "pdf-pages"),
+                int(self._get_setting("exdrf.pdf.render_cache_mb", 1024)) << 20,
+            )
+        return self._render_cache
+
+    def _on_pixmap_evicted(self, page_index: int):
+        """Forget that a page is rendered once its pixmap is dropped.
+
+        Pages rendered to files are loaded again from there; the others are
+        requested again, which hits the render cache when it is enabled.
+
+        Args:
+            page_index: Zero-based page index that was evicted.
+        """
+        path = self._page_to_path.get(page_index)
+        if path and os.path.exists(path):
+            return
+        self._rendered_pages.discard(page_index)
+        self._queued_pages.discard(page_index)
+
     def _stop_worker(self):
         """Stop and cleanup the PDF rendering worker thread."""
         if self._worker is not None:
@@ -1061,7 +1181,7 @@ class PdfImageViewer(QWidget, QtUseContext):
             return
         pages = self._build_render_window(self._current_index)
         self._queued_pages.update(pages)
-        self._worker.submit_pages(pages)
+        self._worker.submit_pages(pages, PRIORITY_LOOKAHEAD)
         self._render_and_show_current_group()
 
     def _maybe_queue_lookahead(self, center_index: int):
@@ -1081,7 +1201,7 @@ class PdfImageViewer(QWidget, QtUseContext):
         if not pages:
             return
         self._queued_pages.update(pages)
-        self._worker.submit_pages(pages)
+        self._worker.submit_pages(pages, PRIORITY_LOOKAHEAD)
 
     def _build_render_window(self, center: int) -> List[int]:
         """Build a list of page indices to render around a center page.
@@ -1124,6 +1244,35 @@ class PdfImageViewer(QWidget, QtUseContext):
         if page_index in self._visible_indices():
             self._render_and_show_current_group()
 
+    def _on_page_image(self, page_index: int, image: QImage):
+        """Handle a page rendered by the process pool.
+
+        Args:
+            page_index: Zero-based page index that was rendered.
+            image: The rendered page.
+        """
+        self._pix_cache[page_index] = QPixmap.fromImage(image)
+        self._rendered_pages.add(page_index)
+        self.pageImageReady.emit(page_index + 1)
+        if page_index in self._visible_indices():
+            self._render_and_show_current_group()
+
+    def _on_tile_rendered(self, key: TileKey, image: QImage):
+        """Handle a tile rendered by the worker.
+
+        Args:
+            key: The tile that was rendered.
+            image: The rendered tile.
+        """
+        pixmap = QPixmap.fromImage(image)
+        self._tile_cache[key] = pixmap
+        if (
+            key.scale == self._tile_scale
+            and key not in self._tile_items
+            and key.page in self._page_items
+        ):
+            self._show_tile(key, pixmap)
+
     def _on_render_finished(self, rendered: List[int]):
         """Handle render finished signal from worker.
 
@@ -1131,6 +1280,18 @@ class PdfImageViewer(QWidget, QtUseContext):
             rendered: List of rendered page indices.
         """
 
+    def _on_render_failed(self, key: Any):
+        """Handle a page or tile that the worker could not render.
+
+        The page is no longer queued, so that it is requested again the
+        next time it is needed; tiles are requested again on each update.
+
+        Args:
+            key: The page index or the `TileKey` that failed.
+        """
+        if not isinstance(key, TileKey):
+            self._queued_pages.discard(key)
+
     def _on_render_error(self, message: str):
         """Handle render error signal from worker.
 
@@ -1143,6 +1304,7 @@ class PdfImageViewer(QWidget, QtUseContext):
         self._page_items.clear()
         self._item_to_page.clear()
         self._selection_frames.clear()
+        self._tile_items.clear()
         self._active_page_index = None
         self._view.reset_zoom(1.0)
         self.lbl_page.setText(
@@ -1156,27 +1318,21 @@ class PdfImageViewer(QWidget, QtUseContext):
         Args:
             indices: List of page indices to display.
         """
-        # Clear previous items so the scene contains only the current group.
+        # Clear previous items so the scene contains only the current group;
+        # the tiles go away with their pages.
         for it in self._pix_items:
             self._scene.removeItem(it)
         self._pix_items = []
         self._page_items.clear()
         self._item_to_page.clear()
         self._selection_frames.clear()
+        self._tile_items.clear()
 
         # Resolve the pixmap for each requested index, keeping None placeholders
         # for pages that are still rendering.
-        pix_maps: List[Optional[QPixmap]] = []
-        for idx in indices:
-            path = self._page_to_path.get(idx)
-            if path and os.path.exists(path):
-                pix = self._pix_cache.get(idx)
-                if pix is None:
-                    pix = QPixmap(path)
-                    self._pix_cache[idx] = pix
-                pix_maps.append(pix)
-            else:
-                pix_maps.append(None)
+        pix_maps: List[Optional[QPixmap]] = [
+            self._cached_pixmap(idx) for idx in indices
+        ]
 
         # Determine the layout grid — 1x1, 2x1, or 2x2 depending on count.
         n = len(indices)
@@ -1251,6 +1407,7 @@ class PdfImageViewer(QWidget, QtUseContext):
         self._ensure_active_visible(indices)
         self._update_selection_overlay()
         self._fit_if_needed()
+        self._schedule_tiles()
 
     def _ensure_active_visible(self, visible: List[int]):
         """Ensure the current active page index is part of the visible group.
@@ -1370,6 +1527,7 @@ class PdfImageViewer(QWidget, QtUseContext):
             a0: Resize event.
         """
         self._update_pannable_bounds()
+        self._schedule_tiles()
         super().resizeEvent(a0)
 
     # ---- Multi-page helpers --------------------------------------------------
@@ -1413,13 +1571,18 @@ class PdfImageViewer(QWidget, QtUseContext):
     def _render_and_show_current_group(self):
         """Render and display the current page group."""
         vis = self._visible_indices()
-        # Ensure queued
-        for idx in vis:
-            if idx not in self._rendered_pages:
-                if idx not in self._queued_pages:
-                    self._queued_pages.add(idx)
-                    if self._worker is not None:
-                        self._worker.submit_pages([idx])
+        # Keep the pixmaps of the view window while evicting others.
+        window = set(vis)
+        if vis:
+            window.update(self._build_render_window(vis[0]))
+        self._pix_cache.protect(window)
+        # Ensure queued; visible pages go ahead of the lookahead ones, even
+        # if they were already queued as part of the lookahead window.
+        missing = [idx for idx in vis if idx not in self._rendered_pages]
+        if missing:
+            self._queued_pages.update(missing)
+            if self._worker is not None:
+                self._worker.submit_pages(missing, PRIORITY_VISIBLE)
         # Show available items
         self._display_pages(vis)
 
@@ -1442,6 +1605,108 @@ class PdfImageViewer(QWidget, QtUseContext):
         expanded = vr.adjusted(-margin_w, -margin_h, margin_w, margin_h)
         self._scene.setSceneRect(expanded)
 
+    # ---- Tiles ---------------------------------------------------------------
+    def _schedule_tiles(self, *_args):
+        """Update the tiles once the user stops zooming or scrolling."""
+        if self._tiles_enabled and self._source_type == "pdf":
+            self._tile_timer.start()
+
+    def _tile_scale_for_zoom(self) -> int:
+        """Compute the resolution of the tiles for the current zoom level.
+
+        Returns:
+            The smallest power of two that is not below the zoom level,
+            limited to `MAX_TILE_SCALE`; 1 when the pages are sharp enough.
+        """
+        zoom = self._view._zoom
+        if zoom <= 1.0:
+            return 1
+        return min(MAX_TILE_SCALE, 1 << math.ceil(math.log2(zoom)))
+
+    def _update_tiles(self):
+        """Show the tiles over the visible part of the pages.
+
+        The tiles found in the cache are shown right away and the others
+        are requested from the worker, replacing its earlier requests. The
+        pages stay below the tiles as a preview until they arrive.
+        """
+        if not self._tiles_enabled or self._source_type != "pdf":
+            return
+        scale = self._tile_scale_for_zoom()
+        if scale != self._tile_scale:
+            self._clear_tile_items()
+            self._tile_scale = scale
+
+        wanted: List[TileKey] = []
+        viewport = self._view.viewport()
+        if scale > 1 and viewport is not None:
+            visible = self._view.mapToScene(viewport.rect()).boundingRect()
+            for page_index, item in self._page_items.items():
+                for key in self._visible_tiles(page_index, item, visible):
+                    if key in self._tile_items:
+                        continue
+                    pixmap = self._tile_cache.get(key)
+                    if pixmap is None:
+                        wanted.append(key)
+                    else:
+                        self._show_tile(key, pixmap)
+
+        # Also sent when empty, so that the worker drops stale tiles.
+        if self._worker is not None:
+            self._worker.submit_tiles(wanted)
+
+    def _visible_tiles(
+        self, page_index: int, item: QGraphicsPixmapItem, visible: QRectF
+    ) -> List[TileKey]:
+        """Get the tiles of a page that intersect a part of the scene.
+
+        Args:
+            page_index: Zero-based index of the page.
+            item: The item that shows the page.
+            visible: The visible part of the scene.
+
+        Returns:
+            The tiles at the current tile scale, row by row.
+        """
+        pixmap = item.pixmap()
+        bounds = QRectF(0.0, 0.0, pixmap.width(), pixmap.height())
+        area = item.mapFromScene(visible).boundingRect().intersected(bounds)
+        if area.isEmpty():
+            return []
+        step = TILE_SIZE / self._tile_scale
+        cols = range(int(area.left() // step), math.ceil(area.right() / step))
+        rows = range(int(area.top() // step), math.ceil(area.bottom() / step))
+        return [
+            TileKey(page_index, self._tile_scale, col, row)
+            for row in rows
+            for col in cols
+        ]
+
+    def _show_tile(self, key: TileKey, pixmap: QPixmap):
+        """Place a tile over its page.
+
+        Args:
+            key: The tile.
+            pixmap: The rendered tile.
+        """
+        parent = self._page_items.get(key.page)
+        if parent is None:
+            return
+        item = QGraphicsPixmapItem(pixmap, parent)
+        step = TILE_SIZE / key.scale
+        item.setPos(key.col * step, key.row * step)
+        item.setScale(1.0 / key.scale)
+        # Keep the selection frame above the tiles.
+        item.setZValue(0.5)
+        self._tile_items[key] = item
+
+    def _clear_tile_items(self):
+        """Remove the tiles from the scene."""
+        for item in self._tile_items.values():
+            if item.scene() is not None:
+                self._scene.removeItem(item)
+        self._tile_items.clear()
+
     # ---- Interaction helpers -------------------------------------------------
     def _page_index_at_view_pos(self, pos: QPoint) -> Optional[int]:
         """Return the page index under the provided viewport position.
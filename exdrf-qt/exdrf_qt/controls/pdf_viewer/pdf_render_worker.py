@@ -1,37 +1,313 @@
 """Python-thread PDF renderer used by the PDF viewer widget."""
 
+import heapq
+import itertools
 import logging
+import multiprocessing as mp
+import os
 import queue
 import threading
-from typing import List, Optional
+from multiprocessing import shared_memory
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
+from exdrf_util.pdf_render import (
+    RenderJob,
+    RenderResult,
+    pixmap_args,
+    render_pages_process,
+)
 from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from exdrf_qt.controls.pdf_viewer.render_cache import RenderCache, file_digest
 
 logger = logging.getLogger(__name__)
 
+# Priorities for `PdfRenderService.submit_pages`; lower values render first.
+# Tiles come after the visible pages, which serve as their preview.
+PRIORITY_VISIBLE = 0
+PRIORITY_TILE = 1
+PRIORITY_LOOKAHEAD = 2
+
+
+class TileKey(NamedTuple):
+    """Identifies a tile of a page (see `exdrf_util.pdf_render.pixmap_args`).
+
+    Attributes:
+        page: The zero-based index of the page.
+        scale: The resolution of the tile as a multiple of the page one.
+        col: The column of the tile.
+        row: The row of the tile.
+    """
+
+    page: int
+    scale: int
+    col: int
+    row: int
+
+    @property
+    def tile(self) -> Tuple[int, int, int]:
+        """The tile as expected by `RenderJob`."""
+        return (self.scale, self.col, self.row)
+
+
+# What the service renders: a page index or a tile.
+RenderKey = Union[int, TileKey]
+
+
+def default_render_processes() -> int:
+    """Number of render processes to use on this machine."""
+    return max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+def _pixmap_image(pix: Any) -> QImage:
+    """Copy the pixels of a PyMuPDF pixmap into a QImage."""
+    image = QImage(
+        pix.samples,
+        pix.width,
+        pix.height,
+        pix.stride,
+        QImage.Format.Format_RGB888,
+    )
+    return image.copy()
+
+
+class _RenderProcess:
+    """A worker process of the render pool and its shared memory slot.
+
+    Attributes:
+        process: The worker process.
+        task_q: The queue with the jobs of this worker.
+        slot: The shared memory block the worker writes the pixels to. It
+            is created after the first page, once its size is known, and
+            replaced by a larger one when a page does not fit.
+        key: The page or tile the worker is rendering, if any.
+    """
+
+    process: Any
+    task_q: Any
+    slot: Optional[shared_memory.SharedMemory]
+    key: Optional[RenderKey]
+
+    def __init__(self, process: Any, task_q: Any):
+        self.process = process
+        self.task_q = task_q
+        self.slot = None
+        self.key = None
+
+    def job(self, key: RenderKey) -> RenderJob:
+        """Create the job that renders a page or tile into the slot."""
+        self.key = key
+        if isinstance(key, TileKey):
+            page, tile = key.page, key.tile
+        else:
+            page, tile = key, None
+        if self.slot is None:
+            return RenderJob(page=page, slot="", slot_size=0, tile=tile)
+        return RenderJob(
+            page=page,
+            slot=self.slot.name,
+            slot_size=self.slot.size,
+            tile=tile,
+        )
+
+    def take_image(self, result: RenderResult) -> QImage:
+        """Copy the pixels of a result into a QImage."""
+        self.key = None
+        fmt = {
+            1: QImage.Format.Format_Grayscale8,
+            4: QImage.Format.Format_RGBA8888,
+        }.get(result.channels, QImage.Format.Format_RGB888)
+        if result.data is None:
+            assert self.slot is not None
+            view = QImage(
+                self.slot.buf, result.width, result.height, result.stride, fmt
+            )
+        else:
+            view = QImage(
+                result.data, result.width, result.height, result.stride, fmt
+            )
+        image = view.copy()
+        del view
+
+        # Next time the page goes straight into shared memory.
+        if result.data is not None:
+            self.release_slot()
+            self.slot = shared_memory.SharedMemory(
+                create=True, size=result.size + result.size // 4
+            )
+        return image
+
+    def release_slot(self) -> None:
+        """Free the shared memory slot."""
+        slot, self.slot = self.slot, None
+        if slot is not None:
+            slot.close()
+            slot.unlink()
+
+
+class _RenderPool:
+    """Processes that each keep the PDF open and render pages on request."""
+
+    workers: List[_RenderProcess]
+
+    def __init__(self, pdf_path: str, dpi: int, size: int):
+        self._mp = mp.get_context("spawn")
+        self._pdf_path = pdf_path
+        self._dpi = dpi
+        self.out_q = self._mp.Queue()
+        self.workers = [self._spawn(i) for i in range(size)]
+
+    def _spawn(self, index: int) -> _RenderProcess:
+        task_q = self._mp.Queue()
+        process = self._mp.Process(
+            target=render_pages_process,
+            args=(index, self._pdf_path, self._dpi, task_q, self.out_q),
+            name=f"PdfRenderProcess-{index}",
+            daemon=True,
+        )
+        process.start()
+        return _RenderProcess(process, task_q)
+
+    def idle(self) -> List[_RenderProcess]:
+        """The workers that are not rendering a page."""
+        return [w for w in self.workers if w.key is None]
+
+    def busy(self) -> bool:
+        """Whether any worker is rendering a page."""
+        return any(w.key is not None for w in self.workers)
+
+    def submit(self, worker: _RenderProcess, key: RenderKey) -> None:
+        """Ask an idle worker to render a page or tile."""
+        worker.task_q.put(worker.job(key))
+
+    def reap(self) -> List[RenderKey]:
+        """Replace the workers that died; return the keys they lost."""
+        lost = []
+        for index, worker in enumerate(self.workers):
+            if worker.process.is_alive():
+                continue
+            logger.error(
+                "PDF render process %d exited with code %s",
+                index,
+                worker.process.exitcode,
+            )
+            if worker.key is not None:
+                lost.append(worker.key)
+            worker.release_slot()
+            self.workers[index] = self._spawn(index)
+        return lost
+
+    def close(self) -> None:
+        """Stop the workers and free their slots."""
+        for worker in self.workers:
+            try:
+                worker.task_q.put(None)
+            except Exception:
+                pass
+        for worker in self.workers:
+            worker.process.join(timeout=1.0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=1.0)
+            worker.release_slot()
+            worker.task_q.cancel_join_thread()
+        self.out_q.cancel_join_thread()
+        self.workers = []
+
 
 class PdfRenderService(QObject):
-    """Queue-driven renderer that emits Qt signals from Python threads."""
+    """Queue-driven renderer that emits Qt signals from Python threads.
+
+    The pages are rendered in the order of their priority (see
+    `submit_pages`); among pages with the same priority the most recently
+    requested ones go first, so that the pages the user navigated to
+    last are the first to show up.
+
+    With `processes` set to zero the pages are rendered by a Python thread
+    to PNG files in `out_dir` and announced through `pageRendered`.
+    Otherwise a pool of that many processes renders them and the pixels
+    travel back through shared memory; the pages are then announced as
+    images through `imageRendered` and nothing is written to disk.
+
+    With a `cache` the pages found there are loaded instead of being
+    rendered, and announced through `imageRendered` in both modes; the
+    rendered pages are added to it.
+
+    Tiles requested through `submit_tiles` are rendered after the visible
+    pages and announced as images through `tileRendered` in both modes;
+    they are not stored in the cache.
+
+    A page or tile whose render process dies is requested again once, ahead
+    of the other pages; if it fails again, or the renderer reports an error
+    for it, it is announced through `renderFailed`.
+    """
 
     pageRendered = pyqtSignal(int, str)  # page_index, image_path
+    imageRendered = pyqtSignal(int, QImage)  # page_index, image
+    tileRendered = pyqtSignal(object, QImage)  # TileKey, image
     renderFinished = pyqtSignal(object)  # list of rendered page indices
+    renderFailed = pyqtSignal(object)  # page index or TileKey
     error = pyqtSignal(str)
 
     _pdf_path: str
     _out_dir: str
     _dpi: int
+    _processes: int
+    _cache: Optional[RenderCache]
+    _doc_key: Optional[str]
     _thread: Optional[threading.Thread]
     _stop_event: threading.Event
-    _jobs: "queue.Queue[Optional[List[int]]]"
+    _jobs: "queue.Queue[Optional[Tuple[List[RenderKey], int, bool]]]"
+    _heap: List[Tuple[int, int, RenderKey]]
+    _pending: Dict[RenderKey, Tuple[int, int]]
+    _in_flight: Set[RenderKey]
+    _lost: Set[RenderKey]
+    _rendered: List[int]
+
+    def __init__(
+        self,
+        pdf_path: str,
+        out_dir: str,
+        dpi: int = 150,
+        processes: int = 0,
+        cache: Optional[RenderCache] = None,
+    ):
+        """Initialize and start the queue-based renderer thread.
 
-    def __init__(self, pdf_path: str, out_dir: str, dpi: int = 150):
-        """Initialize and start the queue-based renderer thread."""
+        Args:
+            pdf_path: The path of the PDF file.
+            out_dir: The directory for the PNG files of the thread mode.
+            dpi: The resolution of the rendered pages.
+            processes: The number of render processes; zero renders the
+                pages in a thread of this process.
+            cache: The persistent cache of rendered pages, if any.
+        """
         super().__init__()
         self._pdf_path = pdf_path
         self._out_dir = out_dir
         self._dpi = dpi
+        self._processes = max(0, processes)
+        self._cache = cache
+        self._doc_key = None
         self._stop_event = threading.Event()
         self._jobs = queue.Queue()
+        self._heap = []
+        self._pending = {}
+        self._in_flight = set()
+        self._lost = set()
+        self._rendered = []
+        self._seq = itertools.count()
         self._thread = threading.Thread(
             target=self._run_loop,
             name="PdfRenderWorkerThread",
@@ -39,11 +315,33 @@ class PdfRenderService(QObject):
         )
         self._thread.start()
 
-    def submit_pages(self, pages: List[int]) -> None:
-        """Submit one render request from the GUI thread."""
+    def submit_pages(
+        self, pages: List[int], priority: int = PRIORITY_LOOKAHEAD
+    ) -> None:
+        """Submit one render request from the GUI thread.
+
+        Args:
+            pages: The zero-based indices of the pages to render.
+            priority: The priority of the pages; pages with lower values
+                are rendered first. A page that is already waiting is moved
+                up if the new priority is better.
+        """
+        if self._stop_event.is_set():
+            return
+        self._jobs.put((list(pages), priority, False))
+
+    def submit_tiles(self, tiles: Iterable[TileKey]) -> None:
+        """Ask for the tiles of the visible part of the view.
+
+        The tiles of earlier requests that are still waiting are dropped,
+        as the user has since scrolled or zoomed away from them.
+
+        Args:
+            tiles: The tiles to render.
+        """
         if self._stop_event.is_set():
             return
-        self._jobs.put(list(pages))
+        self._jobs.put((list(tiles), PRIORITY_TILE, True))
 
     def stop(self, timeout_ms: int = 1500) -> None:
         """Stop the renderer cooperatively and wait briefly for exit."""
@@ -54,19 +352,107 @@ class PdfRenderService(QObject):
             thread.join(timeout=max(0.0, timeout_ms / 1000.0))
             self._thread = None
 
-    def _run_loop(self) -> None:
-        """Process queued render jobs sequentially."""
-        while not self._stop_event.is_set():
-            try:
-                pages = self._jobs.get(timeout=0.25)
-            except queue.Empty:
-                continue
-            if pages is None:
-                return
-            self._render_pages(pages)
+    # ---- Scheduling (renderer thread) ---------------------------------------
+    def _take_jobs(self, timeout: float) -> bool:
+        """Move the submitted pages and tiles to the heap.
 
-    def _render_pages(self, pages: List[int]) -> None:
-        """Render the specified PDF pages to PNG images."""
+        Args:
+            timeout: How long to wait for the first request.
+
+        Returns:
+            False if the service was asked to stop.
+        """
+        try:
+            if timeout:
+                job = self._jobs.get(timeout=timeout)
+            else:
+                job = self._jobs.get_nowait()
+            while True:
+                if job is not None:
+                    keys, priority, replace = job
+                    if replace:
+                        self._drop_tiles(keys)
+                    seq = -next(self._seq)
+                    for key in keys:
+                        self._push(key, priority, seq)
+                job = self._jobs.get_nowait()
+        except queue.Empty:
+            pass
+        return not self._stop_event.is_set()
+
+    def _push(self, key: RenderKey, priority: int, seq: int) -> None:
+        """Add a page or tile to the heap or move it up.
+
+        A page that is requested again with the same or a better priority
+        counts as a new request; a worse priority leaves it in place.
+        """
+        if key in self._in_flight:
+            return
+        current = self._pending.get(key)
+        if current is not None and current[0] < priority:
+            return
+        self._pending[key] = (priority, seq)
+        heapq.heappush(self._heap, (priority, seq, key))
+
+    def _drop_tiles(self, keep: List[RenderKey]) -> None:
+        """Forget the waiting tiles, except the ones in `keep`.
+
+        Their heap entries are skipped by `_pop`.
+        """
+        wanted = set(keep)
+        for key in [
+            k
+            for k in self._pending
+            if isinstance(k, TileKey) and k not in wanted
+        ]:
+            del self._pending[key]
+
+    def _pop(self) -> Optional[RenderKey]:
+        """Get the page or tile with the best priority, if any."""
+        while self._heap:
+            priority, seq, key = heapq.heappop(self._heap)
+            if self._pending.get(key) == (priority, seq):
+                del self._pending[key]
+                return key
+        return None
+
+    def _next_page(self) -> Optional[RenderKey]:
+        """Get the best page or tile that is not in the render cache.
+
+        The pages found in the cache on the way are announced.
+        """
+        while (key := self._pop()) is not None:
+            if not self._from_cache(key):
+                return key
+        return None
+
+    def _from_cache(self, page: RenderKey) -> bool:
+        """Announce a page from the render cache, if it is there."""
+        if self._cache is None or self._doc_key is None:
+            return False
+        if isinstance(page, TileKey):
+            return False
+        image = self._cache.get(self._doc_key, page, self._dpi)
+        if image is None:
+            return False
+        self.imageRendered.emit(page, image)
+        self._rendered.append(page)
+        return True
+
+    def _to_cache(self, page: int, image: QImage) -> None:
+        """Add a rendered page to the render cache."""
+        if self._cache is None or self._doc_key is None:
+            return
+        self._cache.put(self._doc_key, page, self._dpi, 0, image)
+
+    def _idle(self) -> None:
+        """Report the pages rendered since the queue was last empty."""
+        if self._rendered:
+            self.renderFinished.emit(self._rendered)
+            self._rendered = []
+
+    def _run_loop(self) -> None:
+        """Process the queued pages in the order of their priority."""
         try:
             # Lazily import PyMuPDF so optional dependencies are tolerated.
             try:
@@ -77,32 +463,134 @@ class PdfRenderService(QObject):
                 )
                 return
 
-            # Open the document once per batch and pre-compute the scaling
-            # matrix that controls the output DPI.
-            doc = fitz.open(self._pdf_path)
-            x_zoom = self._dpi / 72.0
-            y_zoom = self._dpi / 72.0
-            mat = fitz.Matrix(x_zoom, y_zoom)
-            rendered: List[int] = []
-            for idx in pages:
-                if self._stop_event.is_set():
-                    break
+            # The cache knows the document by its content.
+            if self._cache is not None:
+                try:
+                    self._doc_key = file_digest(self._pdf_path)
+                except OSError as e:
+                    logger.warning("The render cache is not used: %s", e)
+
+            if self._processes:
+                self._run_pool()
+            else:
+                self._run_thread(fitz)
+        except Exception as e:
+            self.error.emit(str(e))
+
+    def _run_thread(self, fitz: Any) -> None:
+        """Render the pages to PNG images in this thread."""
+        # Open the document once and pre-compute the scaling matrix that
+        # controls the output DPI.
+        doc = fitz.open(self._pdf_path)
+        try:
+            mat = fitz.Matrix(self._dpi / 72.0, self._dpi / 72.0)
+            while True:
+                if not self._take_jobs(0.25 if not self._heap else 0):
+                    return
+                key = self._next_page()
+                if key is None:
+                    self._idle()
+                    continue
+                idx = key.page if isinstance(key, TileKey) else key
                 try:
                     if idx < 0 or idx >= doc.page_count:
                         continue
-
-                    # Render each requested page to PNG and record the output.
                     page = doc.load_page(idx)
+
+                    # Tiles go straight to the viewer.
+                    if isinstance(key, TileKey):
+                        pix = page.get_pixmap(
+                            **pixmap_args(fitz, self._dpi, key.tile)
+                        )
+                        self.tileRendered.emit(key, _pixmap_image(pix))
+                        continue
+
+                    # Render the page to PNG and record the output.
                     pix = page.get_pixmap(matrix=mat, alpha=False)
                     out_path = f"{self._out_dir}/page-{idx + 1:04d}.png"
                     pix.save(out_path)
                     self.pageRendered.emit(idx, out_path)
-                    rendered.append(idx)
+                    self._rendered.append(idx)
+                    if self._cache is not None:
+                        self._to_cache(idx, _pixmap_image(pix))
                 except Exception as e:
                     logger.error("Error rendering page %d: %s", idx, e)
-            self.renderFinished.emit(rendered)
-        except Exception as e:
-            self.error.emit(str(e))
+                    self.renderFailed.emit(key)
+        finally:
+            doc.close()
+
+    def _run_pool(self) -> None:
+        """Render the pages in worker processes."""
+        pool = _RenderPool(self._pdf_path, self._dpi, self._processes)
+        try:
+            while True:
+                busy = pool.busy()
+                wait = 0.0 if (busy or self._heap) else 0.25
+                if not self._take_jobs(wait):
+                    return
+
+                # Keep every worker busy with the best pages.
+                for worker in pool.idle():
+                    key = self._next_page()
+                    if key is None:
+                        break
+                    self._in_flight.add(key)
+                    pool.submit(worker, key)
+
+                if not pool.busy():
+                    self._idle()
+                    continue
+
+                try:
+                    result: RenderResult = pool.out_q.get(timeout=0.05)
+                except queue.Empty:
+                    for key in pool.reap():
+                        self._on_lost(key)
+                    continue
+                self._on_result(pool, result)
+        finally:
+            pool.close()
+
+    def _on_lost(self, key: RenderKey) -> None:
+        """Request again a page or tile whose render process died.
+
+        It goes ahead of the other requests, but only once: a key that
+        is lost a second time is reported through `renderFailed`.
+        """
+        self._in_flight.discard(key)
+        if key in self._lost:
+            self._lost.discard(key)
+            logger.error("Giving up on rendering %s", key)
+            self.renderFailed.emit(key)
+            return
+        self._lost.add(key)
+        priority = (
+            PRIORITY_TILE if isinstance(key, TileKey) else PRIORITY_VISIBLE
+        )
+        self._push(key, priority, -next(self._seq))
+
+    def _on_result(self, pool: _RenderPool, result: RenderResult) -> None:
+        """Convert a result of a worker into an image and announce it."""
+        worker = pool.workers[result.worker]
+        key: RenderKey = result.page
+        if result.tile is not None:
+            key = TileKey(result.page, *result.tile)
+        self._in_flight.discard(key)
+        self._lost.discard(key)
+        if result.error is not None:
+            worker.key = None
+            logger.error(
+                "Error rendering page %d: %s", result.page, result.error
+            )
+            self.renderFailed.emit(key)
+            return
+        image = worker.take_image(result)
+        if isinstance(key, TileKey):
+            self.tileRendered.emit(key, image)
+            return
+        self.imageRendered.emit(result.page, image)
+        self._rendered.append(result.page)
+        self._to_cache(result.page, image)
 
 
 PdfRenderWorker = PdfRenderService
@@ -0,0 +1,67 @@
+"""Background writer of the files planned in the PDF splitter."""
+
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+from exdrf_util.merge_pdfs import OutputPage, split_pdf_file
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from exdrf_qt.utils.native_threads import PythonThread
+
+logger = logging.getLogger(__name__)
+
+
+class PdfSplitWorker(PythonThread):
+    """Write the files of a split in a pool of processes.
+
+    Attributes:
+        progress: Emitted as files are written (pages done, total pages).
+        finished_all: Emitted with the paths of the files that were created
+            when the work ends, including after a cancellation.
+        error: Emitted with the message when the split fails.
+
+    Private Attributes:
+        _parts: The path and the pages of each file.
+        _processes: The number of processes, or None for the default.
+    """
+
+    _parts: List[Tuple[str, Sequence[OutputPage]]]
+    _processes: Optional[int]
+
+    progress = pyqtSignal(int, int)  # done, total
+    finished_all = pyqtSignal(object)  # list of created paths
+    error = pyqtSignal(str)
+
+    def __init__(
+        self,
+        parts: List[Tuple[str, Sequence[OutputPage]]],
+        processes: Optional[int] = None,
+        parent: Optional[QObject] = None,
+    ):
+        """Initialize the worker.
+
+        Args:
+            parts: The path and the pages of each file.
+            processes: The number of processes; by default a few less than
+                the number of CPUs.
+            parent: Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.setObjectName("PdfSplitWorker")
+        self._parts = parts
+        self._processes = processes
+
+    def run(self) -> None:
+        """Write the files, stopping early when interrupted."""
+        created: List[str] = []
+        try:
+            created = split_pdf_file(
+                self._parts,
+                processes=self._processes,
+                progress=self.progress.emit,
+                should_stop=self.isInterruptionRequested,
+            )
+        except Exception as e:
+            logger.error("Failed to split the PDF: %s", e, exc_info=True)
+            self.error.emit(str(e))
+        self.finished_all.emit(created)
@@ -0,0 +1,324 @@
+"""Caches for the pages rendered by the PDF viewer."""
+
+import hashlib
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+from PyQt5.QtGui import QImage, QPixmap
+
+logger = logging.getLogger(__name__)
+
+# Header of a cached page: magic, width, height, bytes per line, format.
+_HEADER = struct.Struct("<4sIIII")
+_MAGIC = b"XPR1"
+
+# Digests of the files hashed by this process, keyed by path, size and
+# modification time, so that reopening a document does not read it again.
+_digests: Dict[Tuple[str, int, int], str] = {}
+_digests_lock = threading.Lock()
+
+
+def file_digest(path: str) -> str:
+    """Compute a digest of the content of a file.
+
+    Args:
+        path: The path of the file.
+
+    Returns:
+        The hexadecimal SHA-1 of the content.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is not None:
+        return digest
+
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _digests_lock:
+        _digests[key] = digest
+    return digest
+
+
+def pixmap_bytes(pixmap: QPixmap) -> int:
+    """The memory used by the pixels of a pixmap."""
+    return pixmap.width() * pixmap.height() * max(1, pixmap.depth()) // 8
+
+
+class PixmapCache:
+    """Decoded pages, kept within a memory budget.
+
+    The least recently used pixmaps are dropped when the budget is
+    exceeded, except for the pages of the current view window (see
+    `protect`): the visible pages and those around them stay, even if
+    that means going over the budget.
+
+    The pixmaps are usually keyed by page index; the viewer also keeps its
+    tiles in a cache of their own, keyed by `TileKey`.
+
+    Attributes:
+        budget: The number of bytes the pixmaps may use.
+        on_evict: Called with the key of each dropped pixmap.
+    """
+
+    budget: int
+    on_evict: Optional[Callable[[Any], None]]
+    _items: "OrderedDict[Hashable, QPixmap]"
+    _protected: Set[Hashable]
+    _size: int
+
+    def __init__(
+        self,
+        budget: int,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        self.budget = budget
+        self.on_evict = on_evict
+        self._items = OrderedDict()
+        self._protected = set()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, index: object) -> bool:
+        return index in self._items
+
+    @property
+    def size(self) -> int:
+        """The number of bytes used by the cached pixmaps."""
+        return self._size
+
+    def get(self, index: Hashable) -> Optional[QPixmap]:
+        """Get the pixmap of a page and mark it as recently used."""
+        pixmap = self._items.get(index)
+        if pixmap is not None:
+            self._items.move_to_end(index)
+        return pixmap
+
+    def __setitem__(self, index: Hashable, pixmap: QPixmap) -> None:
+        old = self._items.pop(index, None)
+        if old is not None:
+            self._size -= pixmap_bytes(old)
+        self._items[index] = pixmap
+        self._size += pixmap_bytes(pixmap)
+        self._evict()
+
+    def protect(self, indices: Iterable[Hashable]) -> None:
+        """Set the pages of the current view window.
+
+        Args:
+            indices: The pages that must not be evicted.
+        """
+        self._protected = set(indices)
+        self._evict()
+
+    def clear(self) -> None:
+        """Forget all the pixmaps, without reporting them as evicted."""
+        self._items.clear()
+        self._protected = set()
+        self._size = 0
+
+    def _evict(self) -> None:
+        """Drop the least recently used pixmaps outside the view window."""
+        if self._size <= self.budget:
+            return
+        for index in list(self._items):
+            if self._size <= self.budget:
+                break
+            if index in self._protected:
+                continue
+            self._size -= pixmap_bytes(self._items.pop(index))
+            if self.on_evict is not None:
+                self.on_evict(index)
+
+
+class RenderCache:
+    """Rendered pages stored on disk, shared by all the viewers.
+
+    The pages are stored as raw pixels, so that loading one is a plain read,
+    under a key made of the digest of the content of the file (see
+    `file_digest`), the page index, the resolution and the rotation. The
+    same document opened from another path or after being copied is found
+    again; a modified one is not.
+
+    When the files take more than `max_bytes` the least recently used ones
+    are removed. Several processes may use the same directory; a file
+    that vanishes is simply a miss.
+
+    Attributes:
+        directory: The directory with the cached pages.
+        max_bytes: The size of the cache on disk.
+    """
+
+    directory: str
+    max_bytes: int
+    _lock: threading.Lock
+    _index: Optional[Dict[str, Tuple[float, int]]]
+    _size: int
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None
+        self._size = 0
+
+    def _path(self, doc_key: str, page: int, dpi: int, rotation: int) -> str:
+        return os.path.join(
+            self.directory, f"{doc_key}-{page}-{dpi}-{rotation % 360}.page"
+        )
+
+    def _load_index(self) -> Dict[str, Tuple[float, int]]:
+        """Scan the directory once to learn the files and their use."""
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._index = {}
+            self._size = 0
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".page"):
+                        continue
+                    st = entry.stat()
+                    self._index[entry.path] = (st.st_mtime, st.st_size)
+                    self._size += st.st_size
+        return self._index
+
+    def get(
+        self, doc_key: str, page: int, dpi: int, rotation: int = 0
+    ) -> Optional[QImage]:
+        """Load a page from the cache.
+
+        Args:
+            doc_key: The digest of the document.
+            page: The zero-based page index.
+            dpi: The resolution of the page.
+            rotation: The rotation of the page in degrees.
+
+        Returns:
+            The image of the page or None if it is not in the cache.
+        """
+        path = self._path(doc_key, page, dpi, rotation)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            magic, width, height, stride, fmt = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                raise ValueError("not a cached page")
+            size = _HEADER.size + stride * height
+            if len(data) != size:
+                raise ValueError("truncated page")
+            view = QImage(
+                memoryview(data)[_HEADER.size :],
+                width,
+                height,
+                stride,
+                QImage.Format(fmt),
+            )
+            image = view.copy()
+            del view
+        except Exception as e:
+            logger.debug("Dropping unreadable cached page %s: %s", path, e)
+            self._remove(path)
+            return None
+
+        # Mark the page as recently used.
+        with self._lock:
+            index = self._load_index()
+            try:
+                os.utime(path)
+                index[path] = (os.path.getmtime(path), len(data))
+            except OSError:
+                pass
+        return image
+
+    def put(
+        self,
+        doc_key: str,
+        page: int,
+        dpi: int,
+        rotation: int,
+        image: QImage,
+    ) -> None:
+        """Store a page in the cache.
+
+        Args:
+            doc_key: The digest of the document.
+            page: The zero-based page index.
+            dpi: The resolution of the page.
+            rotation: The rotation of the page in degrees.
+            image: The image of the page.
+        """
+        path = self._path(doc_key, page, dpi, rotation)
+        stride = image.bytesPerLine()
+        bits = image.constBits()
+        bits.setsize(stride * image.height())
+        header = _HEADER.pack(
+            _MAGIC, image.width(), image.height(), stride, int(image.format())
+        )
+        with self._lock:
+            index = self._load_index()
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(header)
+                    f.write(bits.asstring())
+                os.replace(tmp, path)
+            except OSError as e:
+                logger.debug("Failed to cache page %s: %s", path, e)
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return
+            old = index.get(path)
+            if old is not None:
+                self._size -= old[1]
+            size = len(header) + stride * image.height()
+            index[path] = (os.path.getmtime(path), size)
+            self._size += size
+            self._trim(keep=path)
+
+    def _trim(self, keep: str) -> None:
+        """Remove the least recently used files until the cache fits."""
+        assert self._index is not None
+        if self._size <= self.max_bytes:
+            return
+        for path, (_mtime, size) in sorted(
+            self._index.items(), key=lambda kv: kv[1][0]
+        ):
+            if self._size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug("Failed to remove cached page %s: %s", path, e)
+                continue
+            del self._index[path]
+            self._size -= size
+
+    def _remove(self, path: str) -> None:
+        with self._lock:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            if self._index is not None:
+                old = self._index.pop(path, None)
+                if old is not None:
+                    self._size -= old[1]
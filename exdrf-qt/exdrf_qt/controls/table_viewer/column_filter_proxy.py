@@ -1,9 +1,16 @@
 """Per-column substring filter proxy with numeric-aware sorting."""
 
 import logging
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
-from PyQt5.QtCore import QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtCore import (
+    QAbstractItemModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+)
+
+from exdrf_qt.controls.table_viewer.sql_table_model import SqlTableModel
 
 logger = logging.getLogger(__name__)
 VERBOSE = 1
@@ -12,20 +19,49 @@ VERBOSE = 1
 class ColumnFilterProxy(QSortFilterProxyModel):
     """Proxy model that applies per-column substring filters (case-insensitive).
 
+    When the source is a SqlTableModel the filters and the sort are passed
+    to it, so that the database applies them, and the proxy keeps the rows
+    as they are; other sources are filtered and sorted here.
+
     Attributes:
         _filters: Map from column index to current filter text.
+        _sort: The column and order passed to a SqlTableModel source.
     """
 
     # Private attributes
     _filters: Dict[int, str]
+    _sort: Optional[Tuple[int, Qt.SortOrder]]
 
     def __init__(self) -> None:
         """Initialize the proxy model and filtering behavior."""
         super().__init__()
         self._filters = {}
+        self._sort = None
         self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.setDynamicSortFilter(True)
 
+    def _sql_source(self) -> Optional[SqlTableModel]:
+        """Return the source model if it filters and sorts by itself."""
+        src = self.sourceModel()
+        return src if isinstance(src, SqlTableModel) else None
+
+    def setSourceModel(  # noqa: N802
+        self, model: Optional[QAbstractItemModel]
+    ) -> None:
+        """Set the source model, passing it the current filters and sort.
+
+        Args:
+            model: The new source model.
+        """
+        super().setSourceModel(model)
+        src = self._sql_source()
+        if src is None:
+            return
+        for column, text in self._filters.items():
+            src.set_filter(column, text)
+        if self._sort is not None:
+            src.sort(*self._sort)
+
     def set_filter(self, column: int, text: str) -> None:
         """Set a filter string for a given column.
 
@@ -40,7 +76,29 @@ class ColumnFilterProxy(QSortFilterProxyModel):
             text,
         )
         self._filters[column] = text or ""
-        self.invalidateFilter()
+        src = self._sql_source()
+        if src is not None:
+            src.set_filter(column, text)
+        else:
+            self.invalidateFilter()
+
+    def sort(  # type: ignore[override]
+        self,
+        column: int,
+        order: Qt.SortOrder = Qt.SortOrder.AscendingOrder,
+    ) -> None:
+        """Sort by a column, in the database when the source supports it.
+
+        Args:
+            column: Column index; a negative value restores the source order.
+            order: Ascending or descending.
+        """
+        src = self._sql_source()
+        if src is None:
+            super().sort(column, order)
+            return
+        self._sort = (column, order) if column >= 0 else None
+        src.sort(column, order)
 
     def headerData(
         self,
@@ -76,7 +134,7 @@ class ColumnFilterProxy(QSortFilterProxyModel):
             True if row matches all filters; False otherwise.
         """
         model = self.sourceModel()
-        if model is None:
+        if model is None or isinstance(model, SqlTableModel):
             return True
         for col, pattern in self._filters.items():
             if not pattern:
@@ -0,0 +1,125 @@
+"""Background reader of row blocks for the SQL table model."""
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from exdrf_qt.utils.native_threads import PythonThread
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+VERBOSE = 1
+
+# (generation, block, statement)
+BlockRequest = Tuple[int, int, Any]
+
+
+class SqlBlockFetcher(PythonThread):
+    """Run the block queries of a SqlTableModel away from the GUI thread.
+
+    Requests are served newest first, so the rows the user looks at now come
+    before the ones requested while scrolling past. Requests made for an
+    older generation (before the filters or the sort changed) are dropped.
+
+    Attributes:
+        blockFetched: Emitted with the generation, the block index and the
+            rows of the block.
+        blockFailed: Emitted with the generation, the block index and the
+            error message when a query fails.
+
+    Private Attributes:
+        _engine: The engine to read from.
+        _requests: The requests that were not started yet.
+        _generation: The generation of the requests that are still wanted.
+        _cond: Guards the requests and wakes the thread up.
+        _closed: Set by stop(); later requests are ignored, as starting the
+            thread again would clear the interruption.
+    """
+
+    _engine: "Engine"
+    _requests: List[BlockRequest]
+    _generation: int
+    _cond: threading.Condition
+    _closed: bool
+
+    blockFetched = pyqtSignal(int, int, object)
+    blockFailed = pyqtSignal(int, int, str)
+
+    def __init__(self, engine: "Engine", parent: Optional[QObject] = None):
+        """Initialize the fetcher.
+
+        Args:
+            engine: The engine to read from.
+            parent: Optional Qt parent.
+        """
+        super().__init__(parent)
+        self.setObjectName("SqlBlockFetcher")
+        self._engine = engine
+        self._requests = []
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def request(self, generation: int, block: int, statement: Any) -> None:
+        """Queue the query of a block, starting the thread if needed.
+
+        Nothing happens once the fetcher was stopped.
+
+        Args:
+            generation: The generation of the model when it asked.
+            block: The index of the block.
+            statement: The select statement that reads the block.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            if generation != self._generation:
+                # A new generation makes the waiting requests useless.
+                self._generation = generation
+                self._requests.clear()
+            self._requests.append((generation, block, statement))
+            self._cond.notify()
+        self.start()
+
+    def stop(self) -> None:
+        """Drop the waiting requests and end the thread for good."""
+        with self._cond:
+            self._closed = True
+            self._requests.clear()
+            self.requestInterruption()
+            self._cond.notify()
+
+    def run(self) -> None:
+        """Serve the requests until interrupted."""
+        while True:
+            with self._cond:
+                while not self._requests and not self.isInterruptionRequested():
+                    self._cond.wait()
+                if self.isInterruptionRequested():
+                    return
+                generation, block, statement = self._requests.pop()
+
+            try:
+                with self._engine.connect() as conn:
+                    rows = [list(row) for row in conn.execute(statement)]
+            except Exception as e:
+                logger.debug(
+                    "SqlBlockFetcher: block %d failed: %s",
+                    block,
+                    e,
+                    exc_info=True,
+                )
+                self.blockFailed.emit(generation, block, str(e))
+                continue
+
+            logger.log(
+                VERBOSE,
+                "SqlBlockFetcher: block %d has %d rows",
+                block,
+                len(rows),
+            )
+            self.blockFetched.emit(generation, block, rows)
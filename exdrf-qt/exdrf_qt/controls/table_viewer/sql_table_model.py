@@ -1,15 +1,22 @@
 """Read-only table model that loads rows from a SQL table.
 
+Rows are read in blocks by a background thread as the view scrolls, and only
+a bounded number of blocks is kept in memory. Column filters and the sort
+order are applied by the database.
+
 When used with the table viewer's editing mode, supports setData to persist
 cell changes via UPDATE statements (requires a primary key).
 """
 
 import logging
+from collections import OrderedDict
 from datetime import date, datetime
-from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
 from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
-from sqlalchemy import MetaData, Table, select, update
+from sqlalchemy import JSON, MetaData, String, Table, cast, select, update
+
+from exdrf_qt.controls.table_viewer.sql_block_fetcher import SqlBlockFetcher
 
 if TYPE_CHECKING:
     from sqlalchemy.engine import Engine
@@ -17,6 +24,15 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 VERBOSE = 1
 
+# Rows read by one query.
+BLOCK_SIZE = 256
+
+# Blocks kept in memory; the least recently used one is dropped first.
+MAX_CACHED_BLOCKS = 64
+
+# Blocks read after the one that is needed now.
+READ_AHEAD_BLOCKS = 1
+
 
 def get_foreign_key_columns(
     engine: "Engine",
@@ -73,14 +89,19 @@ def get_foreign_key_columns(
 
 
 class SqlTableModel(QAbstractTableModel):
-    """Simple table model loading rows from a SQL table.
+    """Table model reading the rows of a SQL table in blocks.
+
+    The model starts empty and grows through fetchMore() as the view
+    scrolls to its end. The rows are read by a background thread, BLOCK_SIZE
+    at a time, and at most MAX_CACHED_BLOCKS blocks are kept; a block that
+    was dropped is read again when the view shows it. Filters and the sort
+    order become the WHERE and ORDER BY of the queries.
 
     Stores raw values internally; returns stringified values for display.
     Supports optional editing via setData when the table has a primary key.
 
     Attributes:
         _headers: Column names, in column order.
-        _rows: Table data cached as lists of raw values.
         _column_types: SQLAlchemy type for each column (from reflection).
         _primary_key_names: Column names that form the primary key.
         _engine: Engine used for load and updates.
@@ -88,14 +109,25 @@ class SqlTableModel(QAbstractTableModel):
         _table: Table name.
         _table_obj: Reflected Table object for UPDATE statements.
         _column_nullable: Whether each column accepts NULL (from reflection).
-        _limit: Row limit used for load (for reload when adding join columns).
+        _limit: Maximum number of rows shown; 0 for no limit.
         _base_column_count: Number of base table columns (joined columns are
             read-only and follow).
+        _query: The select of all the columns, base and joined, used as a
+            subquery by the block queries.
+        _filters: The substring filter of each column.
+        _sort: The sorted column and the order, or None for the table order.
+        _row_count: The number of rows the view knows about.
+        _at_end: Whether the last row of the result is known.
+        _blocks: The cached blocks by index, least recently used first.
+        _pending: The blocks requested in the current generation.
+        _fetch_block: The block fetchMore() waits for, if any.
+        _generation: Incremented when the filters or the sort change, so that
+            blocks of the previous result are ignored.
+        _fetcher: The thread that runs the block queries.
     """
 
     # Private attributes
     _headers: List[str]
-    _rows: List[List[Any]]
     _column_types: List[Any]
     _column_nullable: List[bool]
     _primary_key_names: List[str]
@@ -105,6 +137,16 @@ class SqlTableModel(QAbstractTableModel):
     _table_obj: Any
     _limit: int
     _base_column_count: int
+    _query: Any
+    _filters: Dict[int, str]
+    _sort: Optional[Tuple[int, Qt.SortOrder]]
+    _row_count: int
+    _at_end: bool
+    _blocks: "OrderedDict[int, List[List[Any]]]"
+    _pending: Set[int]
+    _fetch_block: Optional[int]
+    _generation: int
+    _fetcher: SqlBlockFetcher
 
     def __init__(
         self,
@@ -112,22 +154,21 @@ class SqlTableModel(QAbstractTableModel):
         engine: "Engine",
         schema: Optional[str],
         table: str,
-        limit: int = 1000000,
+        limit: int = 0,
         extra_columns: Optional[List[Tuple[str, str, str]]] = None,
     ) -> None:
-        """Initialize the table model and load initial data.
+        """Initialize the table model and start reading the first rows.
 
         Args:
             engine: SQLAlchemy engine to query.
             schema: Optional schema name.
             table: Table name to read.
-            limit: Limit number of rows loaded initially.
+            limit: Maximum number of rows shown; 0 for no limit.
             extra_columns: Optional list of (fk_column, target_table,
                 target_column) to add as read-only joined columns.
         """
         super().__init__()
         self._headers = []
-        self._rows = []
         self._column_types = []
         self._column_nullable = []
         self._primary_key_names = []
@@ -137,7 +178,27 @@ class SqlTableModel(QAbstractTableModel):
         self._table_obj = None  # Set in _load
         self._limit = limit
         self._base_column_count = 0
+        self._query = None  # Set in _load
+        self._filters = {}
+        self._sort = None
+        self._row_count = 0
+        self._at_end = False
+        self._blocks = OrderedDict()
+        self._pending = set()
+        self._fetch_block = None
+        self._generation = 0
+        # The thread keeps the fetcher alive until it ends, so it has no
+        # parent that could delete it under the running thread.
+        self._fetcher = SqlBlockFetcher(engine)
+        self._fetcher.blockFetched.connect(self._on_block_fetched)
+        self._fetcher.blockFailed.connect(self._on_block_failed)
+        self.destroyed.connect(self._fetcher.stop)
         self._load(engine, schema, table, limit, extra_columns or [])
+        self.fetchMore(QModelIndex())
+
+    def close(self) -> None:
+        """Stop the background reads; the model keeps the cached rows."""
+        self._fetcher.stop()
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
         """Number of rows in the table model.
@@ -146,9 +207,9 @@ class SqlTableModel(QAbstractTableModel):
             parent: Required by Qt; unused for flat models.
 
         Returns:
-            Number of records (may be truncated by limit).
+            Number of records fetched so far (may be truncated by limit).
         """
-        return 0 if parent.isValid() else len(self._rows)
+        return 0 if parent.isValid() else self._row_count
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: N802
         """Number of columns.
@@ -161,6 +222,33 @@ class SqlTableModel(QAbstractTableModel):
         """
         return 0 if parent.isValid() else len(self._headers)
 
+    def canFetchMore(self, parent: QModelIndex) -> bool:  # noqa: N802
+        """Tell if the result has rows the view does not know about.
+
+        Args:
+            parent: Required by Qt; unused for flat models.
+        """
+        return not parent.isValid() and not self._at_end
+
+    def fetchMore(self, parent: QModelIndex) -> None:  # noqa: N802
+        """Append the next block of rows, reading it if needed.
+
+        The block is appended right away if it was read ahead; otherwise it
+        is requested and appended when it arrives.
+
+        Args:
+            parent: Required by Qt; unused for flat models.
+        """
+        if parent.isValid() or self._at_end:
+            return
+        block = self._row_count // BLOCK_SIZE
+        rows = self._blocks.get(block)
+        if rows is not None:
+            self._append_block(block, rows)
+        else:
+            self._fetch_block = block
+            self._request_block(block)
+
     def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
         """Cell data for requested index/role.
 
@@ -175,7 +263,11 @@ class SqlTableModel(QAbstractTableModel):
             return None
         if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
             try:
-                val = self._rows[index.row()][index.column()]
+                row = self._cached_row(index.row())
+                if row is None:
+                    # The block is on its way; dataChanged will follow.
+                    return ""
+                val = row[index.column()]
                 if val is None:
                     return ""
                 return str(val)
@@ -228,6 +320,46 @@ class SqlTableModel(QAbstractTableModel):
         """Return the row limit used for loading (for reload with new joins)."""
         return self._limit
 
+    def get_filters(self) -> Dict[int, str]:
+        """Return a copy of the filter text of each column."""
+        return dict(self._filters)
+
+    def set_filter(self, column: int, text: str) -> None:
+        """Show only the rows whose column contains the text.
+
+        The match is case-insensitive and runs in the database on the text
+        form of the value. The rows are read again from the start.
+
+        Args:
+            column: Column index.
+            text: Substring to match; empty to remove the filter.
+        """
+        text = text or ""
+        if self._filters.get(column, "") == text:
+            return
+        if text:
+            self._filters[column] = text
+        else:
+            self._filters.pop(column, None)
+        self._restart()
+
+    def sort(  # type: ignore[override]
+        self,
+        column: int,
+        order: Qt.SortOrder = Qt.SortOrder.AscendingOrder,
+    ) -> None:
+        """Sort the rows in the database and read them again from the start.
+
+        Args:
+            column: Column index; a negative value restores the table order.
+            order: Ascending or descending.
+        """
+        new_sort = (column, order) if 0 <= column < len(self._headers) else None
+        if new_sort == self._sort:
+            return
+        self._sort = new_sort
+        self._restart()
+
     def raw_headers(self) -> List[str]:
         """Return a copy of the column headers list."""
         return list(self._headers)
@@ -259,10 +391,33 @@ class SqlTableModel(QAbstractTableModel):
         return False
 
     def raw_row(self, row: int) -> Optional[List[Any]]:
-        """Return the raw row values for a given row index, if present."""
-        if 0 <= row < len(self._rows):
-            return self._rows[row]
-        return None
+        """Return the raw row values for a given row index, if present.
+
+        A row whose block is not in memory is read right away.
+        """
+        if not 0 <= row < self._row_count:
+            return None
+        values = self._cached_row(row, request=False)
+        if values is not None:
+            return values
+
+        block = row // BLOCK_SIZE
+        try:
+            with self._engine.connect() as conn:
+                rows = [
+                    list(r) for r in conn.execute(self._block_statement(block))
+                ]
+        except Exception as e:
+            logger.debug(
+                "SqlTableModel.raw_row: read block %d: %s",
+                block,
+                e,
+                exc_info=True,
+            )
+            return None
+        self._store_block(block, rows)
+        offset = row - block * BLOCK_SIZE
+        return rows[offset] if offset < len(rows) else None
 
     def setData(
         self,
@@ -293,12 +448,10 @@ class SqlTableModel(QAbstractTableModel):
             return False
         row = index.row()
         col = index.column()
-        if (
-            row < 0
-            or row >= len(self._rows)
-            or col < 0
-            or col >= self._base_column_count
-        ):
+        if col < 0 or col >= self._base_column_count:
+            return False
+        row_vals = self.raw_row(row)
+        if row_vals is None:
             return False
 
         col_name = self._headers[col]
@@ -313,11 +466,10 @@ class SqlTableModel(QAbstractTableModel):
             )
             return False
 
-        current = self._rows[row][col]
+        current = row_vals[col]
         if converted == current:
             return True
 
-        row_vals = self._rows[row]
         pk_vals = {
             self._headers[i]: row_vals[i]
             for i in range(len(self._headers))
@@ -339,7 +491,7 @@ class SqlTableModel(QAbstractTableModel):
             )
             return False
 
-        self._rows[row][col] = converted
+        row_vals[col] = converted
         self.dataChanged.emit(index, index, [role])
         return True
 
@@ -438,13 +590,15 @@ class SqlTableModel(QAbstractTableModel):
         limit: int,
         extra_columns: List[Tuple[str, str, str]],
     ) -> None:
-        """Load headers and initial rows into memory, with optional JOINs.
+        """Reflect the table and build the query, with optional JOINs.
+
+        No rows are read here; they come in blocks through fetchMore().
 
         Args:
             engine: SQLAlchemy engine.
             schema: Optional schema.
             table: Table name.
-            limit: Row limit for the preview.
+            limit: Maximum number of rows shown; 0 for no limit.
             extra_columns: List of (fk_column, target_table, target_column).
         """
         # SQLite does not support arbitrary schema names; it only uses None,
@@ -505,17 +659,176 @@ class SqlTableModel(QAbstractTableModel):
         self._column_types.extend([None] * len(extra_headers))
         self._column_nullable.extend([True] * len(extra_headers))
 
-        if limit > 0:
-            stmt = stmt.limit(limit)
-
-        with engine.connect() as conn:
-            rs = conn.execute(stmt)
-            for row in rs:
-                self._rows.append([row[i] for i in range(len(self._headers))])
-
+        self._query = stmt.subquery("rows")
         logger.log(
             VERBOSE,
-            "SqlTableModel: loaded rows=%d cols=%d",
-            len(self._rows),
+            "SqlTableModel: prepared cols=%d",
             len(self._headers),
         )
+
+    def _block_statement(self, block: int) -> Any:
+        """Build the query that reads one block of the current result.
+
+        Args:
+            block: The index of the block.
+
+        Returns:
+            A select with the filters, the sort order and the block window.
+        """
+        q = self._query
+        columns = list(q.c)
+        stmt = select(*columns)
+        for col, text in self._filters.items():
+            if not text or col >= len(columns):
+                continue
+            pattern = (
+                text.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            stmt = stmt.where(
+                cast(columns[col], String).ilike(f"%{pattern}%", escape="\\")
+            )
+
+        # The tiebreaker columns keep the order of equal values stable, so
+        # that the blocks do not overlap or skip rows.
+        order_by = []
+        if self._sort is not None:
+            col, order = self._sort
+            if order == Qt.SortOrder.DescendingOrder:
+                order_by.append(columns[col].desc())
+            else:
+                order_by.append(columns[col].asc())
+        for i in self._tiebreak_columns():
+            if self._sort is None or self._sort[0] != i:
+                order_by.append(columns[i])
+        if order_by:
+            stmt = stmt.order_by(*order_by)
+
+        offset = block * BLOCK_SIZE
+        size = BLOCK_SIZE
+        if self._limit > 0:
+            size = max(0, min(size, self._limit - offset))
+        return stmt.offset(offset).limit(size)
+
+    def _tiebreak_columns(self) -> List[int]:
+        """The columns that give the rows of a result a fixed order.
+
+        The primary key is used when the table has one. Otherwise all the
+        columns are used (except JSON ones, which some databases cannot
+        compare), so only rows that are equal everywhere, and thus look the
+        same, may change places between two queries.
+        """
+        if self._primary_key_names:
+            return [self._headers.index(n) for n in self._primary_key_names]
+        return [
+            i
+            for i, col_type in enumerate(self._column_types)
+            if not isinstance(col_type, JSON)
+        ]
+
+    def _cached_row(
+        self, row: int, request: bool = True
+    ) -> Optional[List[Any]]:
+        """Return a row from the cache.
+
+        Args:
+            row: The row index.
+            request: Whether to request the block (and the ones after it) if
+                it is not in memory.
+
+        Returns:
+            The raw values, or None if the block is not in memory.
+        """
+        block = row // BLOCK_SIZE
+        rows = self._blocks.get(block)
+        if rows is None:
+            if request:
+                # The newest request is served first, so the block needed
+                # now goes last.
+                for i in range(block + READ_AHEAD_BLOCKS, block - 1, -1):
+                    if i * BLOCK_SIZE < self._row_count or not self._at_end:
+                        self._request_block(i)
+            return None
+        self._blocks.move_to_end(block)
+        offset = row - block * BLOCK_SIZE
+        return rows[offset] if offset < len(rows) else None
+
+    def _request_block(self, block: int) -> None:
+        """Ask the background thread for a block, once per generation."""
+        if block in self._pending:
+            return
+        if self._limit > 0 and block * BLOCK_SIZE >= self._limit:
+            return
+        self._pending.add(block)
+        self._fetcher.request(
+            self._generation, block, self._block_statement(block)
+        )
+
+    def _store_block(self, block: int, rows: List[List[Any]]) -> None:
+        """Put a block in the cache, dropping the least recently used ones."""
+        self._blocks[block] = rows
+        self._blocks.move_to_end(block)
+        while len(self._blocks) > MAX_CACHED_BLOCKS:
+            self._blocks.popitem(last=False)
+
+    def _append_block(self, block: int, rows: List[List[Any]]) -> None:
+        """Make the rows of the block that follows the known ones visible."""
+        start = block * BLOCK_SIZE
+        if rows:
+            self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+            self._row_count = start + len(rows)
+            self.endInsertRows()
+        full = BLOCK_SIZE
+        if self._limit > 0:
+            full = min(full, self._limit - start)
+        if len(rows) < full or (
+            self._limit > 0 and self._row_count >= self._limit
+        ):
+            self._at_end = True
+        elif READ_AHEAD_BLOCKS > 0:
+            # Have the next block ready for the next fetchMore().
+            self._request_block(block + 1)
+
+    def _on_block_fetched(
+        self, generation: int, block: int, rows: List[List[Any]]
+    ) -> None:
+        """Store a block that arrived from the background thread."""
+        if generation != self._generation:
+            return
+        self._pending.discard(block)
+        self._store_block(block, rows)
+
+        start = block * BLOCK_SIZE
+        if block == self._fetch_block:
+            self._fetch_block = None
+            self._append_block(block, rows)
+        elif start < self._row_count and rows:
+            end = min(start + len(rows), self._row_count) - 1
+            self.dataChanged.emit(
+                self.index(start, 0),
+                self.index(end, len(self._headers) - 1),
+            )
+
+    def _on_block_failed(self, generation: int, block: int, error: str) -> None:
+        """Forget a block that could not be read, so it can be asked again."""
+        if generation != self._generation:
+            return
+        self._pending.discard(block)
+        logger.error("SqlTableModel: failed to read %s: %s", self._table, error)
+        if block == self._fetch_block:
+            # Do not keep asking for the end of a result that fails.
+            self._fetch_block = None
+            self._at_end = True
+
+    def _restart(self) -> None:
+        """Drop the rows and read the result again from the start."""
+        self.beginResetModel()
+        self._generation += 1
+        self._blocks.clear()
+        self._pending.clear()
+        self._fetch_block = None
+        self._row_count = 0
+        self._at_end = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
@@ -283,6 +283,9 @@ class TableViewer(QWidget, QtUseContext):
         w = self._tabs.widget(idx)
         self._tabs.removeTab(idx)
         # Drop context for this widget
+        for c in self._views:
+            if c.view is w:
+                c.model.close()
         self._views = [c for c in self._views if c.view is not w]
         if w is not None:
             w.deleteLater()
@@ -766,6 +769,7 @@ class TableViewer(QWidget, QtUseContext):
             limit=limit,
             extra_columns=extra_columns if extra_columns else None,
         )
+        ctx.model.close()
         ctx.model = new_model
         ctx.extra_columns = list(extra_columns)
         ctx.proxy.setSourceModel(new_model)
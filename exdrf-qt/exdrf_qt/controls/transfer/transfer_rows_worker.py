@@ -20,6 +20,11 @@ VERBOSE = 1
 class TransferRowsWorker(PythonThread):
     """Worker that inserts a list of provided rows into the destination table.
 
+    The rows are an explicit selection that is inserted as it is. Unlike the
+    sync mode of `TransferWorker` there is no range of keys to compare, so
+    no checksums and no upserts are used: a row that already exists in the
+    destination makes the transfer fail and nothing is written.
+
     Attributes:
         progress: Emitted after each batch with (done, total).
         error: Emitted on failure with the error message.
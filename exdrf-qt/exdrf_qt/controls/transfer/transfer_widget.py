@@ -15,6 +15,7 @@ from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QAbstractItemView,
     QAction,
+    QCheckBox,
     QHBoxLayout,
     QLabel,
     QMenu,
@@ -74,6 +75,8 @@ class TransferWidget(QWidget, QtUseContext):
         _src_view_win: Source TableViewer window if open.
         _dst_view_win: Destination TableViewer window if open.
         _spin_chunk: Spin control holding the current chunk size.
+        _chk_sync: Check box that turns on the synchronization of tables
+            that already exist in the destination.
         _src_db: Source DB chooser.
         _dst_db: Destination DB chooser.
         _src_model: Source tables model.
@@ -91,6 +94,7 @@ class TransferWidget(QWidget, QtUseContext):
     _src_view_win: Optional[TableViewer]
     _dst_view_win: Optional[TableViewer]
     _spin_chunk: "QSpinBox"
+    _chk_sync: "QCheckBox"
     _src_db: "ChooseDb"
     _dst_db: "ChooseDb"
     _btn_settings: "QPushButton"
@@ -135,6 +139,15 @@ class TransferWidget(QWidget, QtUseContext):
         self._spin_chunk.setValue(1000)
         top_bar.addWidget(lbl_chunk)
         top_bar.addWidget(self._spin_chunk)
+        self._chk_sync = QCheckBox(self.t("tr.sync", "Only changes"), self)
+        self._chk_sync.setToolTip(
+            self.t(
+                "tr.sync.tip",
+                "Write only the differences to tables that already exist "
+                "in the destination instead of appending all the rows.",
+            )
+        )
+        top_bar.addWidget(self._chk_sync)
 
         # Settings button opens the DB manager dialog
         self._btn_settings = QPushButton(
@@ -961,15 +974,17 @@ class TransferWidget(QWidget, QtUseContext):
             dst=self._dst_conn,
             tables=tables,
             chunk_size=self._spin_chunk.value(),
+            sync=self._chk_sync.isChecked(),
         )
         worker.error.connect(self._on_transfer_error)
         # Keep a reference so thread is not destroyed while running
         self._full_worker = worker
         logger.log(
             VERBOSE,
-            "TransferWidget: start full transfer tables=%s chunk=%d",
+            "TransferWidget: start full transfer tables=%s chunk=%d sync=%s",
             tables,
             self._spin_chunk.value(),
+            self._chk_sync.isChecked(),
         )
         # Progress UI
         dlg = QProgressDialog(
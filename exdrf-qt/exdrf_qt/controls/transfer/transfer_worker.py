@@ -1,25 +1,80 @@
 """Worker thread that copies full tables from source to destination."""
 
+import hashlib
 import logging
-from typing import TYPE_CHECKING, Dict, List, Optional
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from exdrf_al.connection import DbConn
+from exdrf_al.connection import DbConn, worker_threads_for_pool
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QWidget
-from sqlalchemy import MetaData, Table, func, inspect, select
+from sqlalchemy import (
+    BigInteger,
+    MetaData,
+    Table,
+    Text,
+    and_,
+    bindparam,
+    cast,
+    func,
+    inspect,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import BIT
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from exdrf_qt.utils.native_threads import PythonThread
 
 if TYPE_CHECKING:
-    from sqlalchemy.engine import Engine
+    from sqlalchemy.engine import Connection, Dialect, Engine
 
 logger = logging.getLogger(__name__)
 VERBOSE = 1
 
+# Marks the end of the rows in the queue between the reader and the writer.
+_END = object()
+
+# Number of parts a range that differs is split into when synchronizing by
+# checksum.
+_FANOUT = 16
+
 
 class TransferWorker(PythonThread):
     """Copy data from source tables to destination using SQLAlchemy Core.
 
+    Tables are copied concurrently, each with its own source and destination
+    connections. A table only starts after the selected tables it references
+    through foreign keys are done; tables in a reference cycle are copied in
+    the order they were given.
+
+    Each table is read with a single streaming query ordered by the primary
+    key. A reader thread pushes the chunks into a bounded queue while the
+    writer inserts the previous ones, so reading and writing overlap without
+    buffering the whole table.
+
+    In sync mode tables that already exist in the destination are not copied
+    again; the worker compares the two sides one range of primary keys at a
+    time, by checksum where the databases allow it, and only writes the rows
+    of the ranges that differ.
+
     Attributes:
         table_started: Emitted when a table begins transfer with (table, total).
         progress: Emitted as rows are copied (table, done, total).
@@ -32,6 +87,12 @@ class TransferWorker(PythonThread):
         _dst: The destination connection.
         _tables: List of table names to transfer.
         _chunk: Batch size for inserts.
+        _workers: Maximum number of tables copied at the same time, or None
+            to derive it from the connection pools.
+        _queue_size: Number of chunks that can wait between the reader and
+            the writer of a table.
+        _sync: Synchronize existing destination tables instead of appending
+            all the source rows to them.
     """
 
     # Private attributes
@@ -39,6 +100,9 @@ class TransferWorker(PythonThread):
     _dst: DbConn
     _tables: List[str]
     _chunk: int
+    _workers: Optional[int]
+    _queue_size: int
+    _sync: bool
 
     # table, total rows (may be 0 if unknown)
     table_started = pyqtSignal(str, int)
@@ -54,6 +118,9 @@ class TransferWorker(PythonThread):
         dst: DbConn,
         tables: List[str],
         chunk_size: int = 1000,
+        workers: Optional[int] = None,
+        queue_size: int = 4,
+        sync: bool = False,
         parent: Optional[QWidget] = None,
     ) -> None:
         """Initialize the worker.
@@ -63,6 +130,11 @@ class TransferWorker(PythonThread):
             dst: The destination connection.
             tables: The list of table names to transfer.
             chunk_size: Insert batch size.
+            workers: Maximum number of tables copied at the same time. By
+                default this is derived from the connection pools.
+            queue_size: Number of chunks read ahead for each table.
+            sync: Only write the differences to tables that already exist
+                in the destination. These need a primary key.
             parent: Optional Qt parent.
         """
         super().__init__(parent)
@@ -70,38 +142,131 @@ class TransferWorker(PythonThread):
         self._dst = dst
         self._tables = tables
         self._chunk = max(1, int(chunk_size))
+        self._workers = workers
+        self._queue_size = max(1, int(queue_size))
+        self._sync = sync
         # Name the worker for easier diagnostics
         self.setObjectName("TransferTablesWorker")
 
     def run(self) -> None:  # noqa: D401
-        """Thread entry: process each table sequentially and emit signals."""
+        """Thread entry: copy tables in dependency order and emit signals."""
         try:
             src_engine = self._src.connect()
             dst_engine = self._dst.connect()
             assert src_engine is not None and dst_engine is not None
+            deps = self._table_dependencies(src_engine)
+            workers = self._worker_count(src_engine, dst_engine)
             logger.log(
                 VERBOSE,
-                "TransferWorker: starting run n_tables=%d",
+                "TransferWorker: starting run n_tables=%d workers=%d",
                 len(self._tables),
+                workers,
             )
-            for tbl_name in self._tables:
-                try:
-                    copied = self._copy_table(src_engine, dst_engine, tbl_name)
-                    self.table_done.emit(tbl_name, copied)
-                except Exception as e:  # per-table isolation
-                    logger.error(
-                        "Transfer failed for table %s: %s",
-                        tbl_name,
-                        e,
-                        exc_info=True,
-                    )
-                    self.error.emit(tbl_name, str(e))
-                if self.isInterruptionRequested():
-                    break
+
+            pending = list(self._tables)
+            done: Set[str] = set()
+            running: Dict[Future, str] = {}
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="TransferTable"
+            ) as executor:
+                while pending or running:
+                    if self.isInterruptionRequested():
+                        pending.clear()
+                    ready = [t for t in pending if deps.get(t, set()) <= done]
+                    if pending and not ready and not running:
+                        # A reference cycle; keep the order we were given.
+                        ready = pending[:1]
+                    for tbl_name in ready[: workers - len(running)]:
+                        pending.remove(tbl_name)
+                        future = executor.submit(
+                            self._transfer_table,
+                            src_engine,
+                            dst_engine,
+                            tbl_name,
+                        )
+                        running[future] = tbl_name
+                    if not running:
+                        continue
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done.add(running.pop(future))
         finally:
             logger.log(VERBOSE, "TransferWorker: finished run")
             self.finished_all.emit()
 
+    def _transfer_table(
+        self, src_engine: "Engine", dst_engine: "Engine", table: str
+    ) -> None:
+        """Copy one table and report the outcome through the signals.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            dst_engine: The destination SQLAlchemy engine.
+            table: The table name to transfer.
+        """
+        try:
+            copied = self._copy_table(src_engine, dst_engine, table)
+            self.table_done.emit(table, copied)
+        except Exception as e:  # per-table isolation
+            logger.error(
+                "Transfer failed for table %s: %s",
+                table,
+                e,
+                exc_info=True,
+            )
+            self.error.emit(table, str(e))
+
+    def _table_dependencies(self, src_engine: "Engine") -> Dict[str, Set[str]]:
+        """Find the selected tables that each selected table references.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+
+        Returns:
+            The referenced tables for each table, restricted to the selection
+            and without self references.
+        """
+        selected = set(self._tables)
+        deps: Dict[str, Set[str]] = {t: set() for t in self._tables}
+        src_ins = inspect(src_engine)
+        for table in self._tables:
+            try:
+                fks = src_ins.get_foreign_keys(table, schema=self._src.schema)
+            except Exception as e:
+                logger.log(
+                    VERBOSE,
+                    "TransferWorker: could not get foreign keys of %s: %s",
+                    table,
+                    e,
+                    exc_info=True,
+                )
+                continue
+            for fk in fks:
+                ref = fk.get("referred_table")
+                if ref in selected and ref != table:
+                    deps[table].add(ref)
+        return deps
+
+    def _worker_count(self, src_engine: "Engine", dst_engine: "Engine") -> int:
+        """Compute how many tables can be copied at the same time.
+
+        Each table holds a connection from both pools. SQLite allows a single
+        writer, so a SQLite destination gets one table at a time.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            dst_engine: The destination SQLAlchemy engine.
+        """
+        if dst_engine.dialect.name == "sqlite":
+            return 1
+        workers = min(
+            worker_threads_for_pool(src_engine.pool),
+            worker_threads_for_pool(dst_engine.pool),
+        )
+        if self._workers is not None:
+            workers = min(workers, self._workers)
+        return max(1, min(workers, len(self._tables)))
+
     def _copy_table(
         self, src_engine: "Engine", dst_engine: "Engine", table: str
     ) -> int:
@@ -123,7 +288,8 @@ class TransferWorker(PythonThread):
 
         # Ensure destination table exists; if not, create it based on source.
         dst_ins = inspect(dst_engine)
-        if not dst_ins.has_table(table, schema=self._dst.schema):
+        created = not dst_ins.has_table(table, schema=self._dst.schema)
+        if created:
             # Create compatible table in destination
             # Use tometadata to copy definition, adjusting schema
             try:
@@ -143,6 +309,19 @@ class TransferWorker(PythonThread):
                     *[c.copy() for c in src_t.columns],
                     schema=self._dst.schema,
                 )
+            # The referenced tables were copied first; they must be known to
+            # the metadata for the foreign keys to be created.
+            for fk in src_t.foreign_keys:
+                ref = fk.column.table.name
+                if ref != table and dst_ins.has_table(
+                    ref, schema=self._dst.schema
+                ):
+                    Table(
+                        ref,
+                        dst_meta,
+                        autoload_with=dst_engine,
+                        schema=self._dst.schema,
+                    )
             dst_meta.create_all(dst_engine, tables=[new_t])
 
         dst_t = Table(
@@ -177,31 +356,618 @@ class TransferWorker(PythonThread):
         )
         self.table_started.emit(table, total_rows)
 
-        total_copied = 0
-        offset = 0
-        with src_engine.connect() as s_conn, dst_engine.begin() as d_conn:
-            while True:
-                stmt = (
-                    select(*cols)
-                    .select_from(src_t)
-                    .limit(self._chunk)
-                    .offset(offset)
+        # A single query, streamed from a server-side cursor where the driver
+        # has one; ordering by the primary key keeps the copy deterministic.
+        stmt = select(*cols).select_from(src_t)
+        pk_cols = [c for c in src_t.primary_key.columns]
+        if pk_cols:
+            stmt = stmt.order_by(*pk_cols)
+
+        names = [c.name for c in cols]
+        if self._sync and not created:
+            if not pk_cols or any(c.name not in dst_cols for c in pk_cols):
+                raise ValueError(
+                    "Table %s has no primary key in both databases and "
+                    "can not be synchronized" % table
                 )
-                rows = list(s_conn.execute(stmt))
-                if not rows:
-                    break
-                payload: List[Dict[str, object]] = []
-                for r in rows:
-                    m = r._mapping  # type: ignore[attr-defined]
-                    payload.append({c.name: m[c.name] for c in cols})
-                if payload:
-                    d_conn.execute(dst_t.insert(), payload)
-                total_copied += len(payload)
-                offset += len(payload)
-                self.progress.emit(table, total_copied, total_rows)
-                if self.isInterruptionRequested():
-                    break
+            return self._sync_rows(
+                src_engine,
+                dst_engine,
+                table,
+                stmt,
+                dst_t,
+                names,
+                [c.name for c in pk_cols],
+                total_rows,
+            )
+
+        total_copied = 0
+        with self._stream_chunks(src_engine, stmt, table) as chunks:
+            with dst_engine.begin() as d_conn:
+                insert = dst_t.insert()
+                for chunk in chunks:
+                    d_conn.execute(
+                        insert, [dict(zip(names, row)) for row in chunk]
+                    )
+                    total_copied += len(chunk)
+                    self.progress.emit(table, total_copied, total_rows)
+                    if self.isInterruptionRequested():
+                        break
         logger.log(
             VERBOSE, "TransferWorker: table %s copied=%d", table, total_copied
         )
         return total_copied
+
+    def _sync_rows(
+        self,
+        src_engine: "Engine",
+        dst_engine: "Engine",
+        table: str,
+        stmt: Any,
+        dst_t: Table,
+        names: List[str],
+        pk_names: List[str],
+        total_rows: int,
+    ) -> int:
+        """Bring an existing destination table in line with the source.
+
+        When both databases can compute the checksum of a range of rows (see
+        `_RangeSync.can_checksum()`) the ranges are compared by checksum and
+        only the rows of the ranges that differ are read. Otherwise the
+        source is walked in primary key order and each chunk is compared
+        with the destination rows of the same range.
+
+        Both databases are expected to order the keys in the same way.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            dst_engine: The destination SQLAlchemy engine.
+            table: The table name.
+            stmt: The source select, ordered by the primary key.
+            dst_t: The destination table.
+            names: The names of the selected columns.
+            pk_names: The names of the primary key columns.
+            total_rows: The number of rows in the source, for progress.
+
+        Returns:
+            The number of rows inserted, updated or deleted.
+        """
+        sync = _RangeSync(stmt, dst_t, names, pk_names, dst_engine.dialect)
+        if sync.can_checksum(src_engine.dialect):
+            changed = self._sync_by_checksum(
+                src_engine, dst_engine, table, sync, total_rows
+            )
+        else:
+            changed = self._sync_by_rows(
+                src_engine, dst_engine, table, stmt, sync, total_rows
+            )
+        logger.log(
+            VERBOSE,
+            "TransferWorker: table %s synchronized, changed=%d",
+            table,
+            changed,
+        )
+        return changed
+
+    def _sync_by_rows(
+        self,
+        src_engine: "Engine",
+        dst_engine: "Engine",
+        table: str,
+        stmt: Any,
+        sync: "_RangeSync",
+        total_rows: int,
+    ) -> int:
+        """Compare every range of the source with the destination.
+
+        Each chunk of the source covers the range of keys after the last key
+        of the previous chunk up to its own last key. A last range after the
+        final source key removes the rows that only exist in the
+        destination.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            dst_engine: The destination SQLAlchemy engine.
+            table: The table name.
+            stmt: The source select, ordered by the primary key.
+            sync: The range synchronizer of the table.
+            total_rows: The number of rows in the source, for progress.
+
+        Returns:
+            The number of rows inserted, updated or deleted.
+        """
+        done = changed = 0
+        lower: Optional[Tuple[Any, ...]] = None
+        with self._stream_chunks(src_engine, stmt, table) as chunks:
+            with dst_engine.begin() as d_conn:
+                for chunk in chunks:
+                    upper = sync.key(chunk[-1])
+                    changed += sync.apply(d_conn, chunk, lower, upper)
+                    lower = upper
+                    done += len(chunk)
+                    self.progress.emit(table, done, total_rows)
+                    if self.isInterruptionRequested():
+                        break
+                else:
+                    changed += sync.apply(d_conn, [], lower, None)
+        return changed
+
+    def _sync_by_checksum(
+        self,
+        src_engine: "Engine",
+        dst_engine: "Engine",
+        table: str,
+        sync: "_RangeSync",
+        total_rows: int,
+    ) -> int:
+        """Compare the two sides by checksum, descending into the ranges
+        that differ.
+
+        Only the primary keys of the source are streamed, to cut it into
+        ranges of one chunk. The checksum of the whole table is compared
+        first; a range that differs is split into `_FANOUT` parts that are
+        compared in turn, down to a single chunk whose rows are read and
+        written like in `_sync_by_rows()`.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            dst_engine: The destination SQLAlchemy engine.
+            table: The table name.
+            sync: The range synchronizer of the table.
+            total_rows: The number of rows in the source, for progress.
+
+        Returns:
+            The number of rows inserted, updated or deleted.
+        """
+        by_name = {c.name: c for c in sync.src_stmt.selected_columns}
+        pk_stmt = sync.src_stmt.with_only_columns(
+            *[by_name[n] for n in sync.pk_names]
+        )
+        # The last key and the size of each chunk of the source.
+        leaves: List[Tuple[Tuple[Any, ...], int]] = []
+        with self._stream_chunks(src_engine, pk_stmt, table) as chunks:
+            for chunk in chunks:
+                leaves.append((tuple(chunk[-1]), len(chunk)))
+                if self.isInterruptionRequested():
+                    return 0
+
+        done = 0
+
+        def descend(
+            part: List[Tuple[Tuple[Any, ...], int]],
+            lower: Optional[Tuple[Any, ...]],
+        ) -> int:
+            nonlocal done
+            upper = part[-1][0]
+            if sync.same_checksum(s_conn, d_conn, lower, upper):
+                changed = 0
+            elif len(part) == 1:
+                rows = sync.read(s_conn, lower, upper)
+                changed = sync.apply(d_conn, rows, lower, upper)
+            else:
+                changed = 0
+                step = -(-len(part) // _FANOUT)
+                for i in range(0, len(part), step):
+                    if self.isInterruptionRequested():
+                        return changed
+                    changed += descend(part[i : i + step], lower)
+                    lower = part[i : i + step][-1][0]
+                return changed
+            done += sum(n for _, n in part)
+            self.progress.emit(table, done, total_rows)
+            return changed
+
+        with src_engine.connect() as s_conn, dst_engine.begin() as d_conn:
+            sync.prepare(s_conn)
+            sync.prepare(d_conn)
+            changed = descend(leaves, None) if leaves else 0
+            if not self.isInterruptionRequested():
+                last = leaves[-1][0] if leaves else None
+                changed += sync.apply(d_conn, [], last, None)
+        return changed
+
+    @contextmanager
+    def _stream_chunks(
+        self, src_engine: "Engine", stmt: Any, table: str
+    ) -> Iterator[Iterator[List[Any]]]:
+        """Read the rows of a query in a separate thread.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            stmt: The select statement.
+            table: The table name, used to name the reader thread.
+
+        Yields:
+            An iterator over the chunks of rows, filled ahead by the reader.
+        """
+        chunks: "queue.Queue[Any]" = queue.Queue(maxsize=self._queue_size)
+        stop = threading.Event()
+        reader = threading.Thread(
+            target=self._read_chunks,
+            args=(src_engine, stmt, chunks, stop),
+            name="TransferRead-%s" % table,
+            daemon=True,
+        )
+        reader.start()
+
+        def drain() -> Iterator[List[Any]]:
+            while True:
+                chunk = chunks.get()
+                if chunk is _END:
+                    return
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+
+        try:
+            yield drain()
+        finally:
+            stop.set()
+            reader.join()
+
+    def _read_chunks(
+        self,
+        src_engine: "Engine",
+        stmt: Any,
+        chunks: "queue.Queue[Any]",
+        stop: threading.Event,
+    ) -> None:
+        """Reader thread: stream the rows of a query into a queue.
+
+        The queue receives lists of rows, then either the exception that
+        stopped the reader or `_END`.
+
+        Args:
+            src_engine: The source SQLAlchemy engine.
+            stmt: The select statement.
+            chunks: The bounded queue shared with the writer.
+            stop: Set by the writer when it no longer takes rows.
+        """
+
+        def put(item: Any) -> bool:
+            # Wait for room in the queue unless the writer went away.
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            with src_engine.connect() as s_conn:
+                result = s_conn.execution_options(
+                    stream_results=True, yield_per=self._chunk
+                ).execute(stmt)
+                for part in result.partitions():
+                    if self.isInterruptionRequested() or not put(part):
+                        break
+        except BaseException as e:
+            put(e)
+        finally:
+            put(_END)
+
+
+class _RowHashSum:
+    """SQLite aggregate that adds up the hashes of the rows.
+
+    SQLite has no hash function; the worker registers this one on its
+    connections as `exdrf_row_hash_sum`.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+
+    def step(self, *values: Any) -> None:
+        digest = hashlib.md5(repr(values).encode("utf-8")).digest()
+        self.total += int.from_bytes(digest[:8], "big")
+
+    def finalize(self) -> str:
+        return str(self.total)
+
+
+def _row_hash_sum(dialect: "Dialect", cols: List[Any]) -> Optional[Any]:
+    """Build the aggregate that adds up the hashes of the selected rows.
+
+    The sum does not depend on the order of the rows. Each row is hashed
+    from the text of its values as rendered by the database, so two
+    databases only agree when they are of the same kind.
+
+    Args:
+        dialect: The dialect of the database.
+        cols: The columns of the row.
+
+    Returns:
+        The aggregate, or None if the database has no way to compute it.
+    """
+    if dialect.name == "sqlite":
+        return func.exdrf_row_hash_sum(*cols)
+    if dialect.name == "postgresql":
+        # The first 15 hex digits of the MD5 of the row, as a number.
+        digest = func.substr(func.md5(cast(tuple_(*cols), Text)), 1, 15)
+        return func.sum(cast(cast(literal("x") + digest, BIT(60)), BigInteger))
+    if dialect.name in ("mysql", "mariadb"):
+        text = func.concat_ws(
+            func.char(31), *[func.coalesce(c, func.char(30)) for c in cols]
+        )
+        digest = func.substring(func.md5(text), 1, 15)
+        return func.sum(cast(func.conv(digest, 16, 10), BigInteger))
+    return None
+
+
+def _upsert(table: Table, dialect: "Dialect", pk_names: List[str]) -> Any:
+    """Build an insert that updates the row with the same key, if any.
+
+    Args:
+        table: The destination table.
+        dialect: The dialect of the destination.
+        pk_names: The names of the primary key columns.
+
+    Returns:
+        The statement, or None if the database has no upsert.
+    """
+    others = [c.name for c in table.columns if c.name not in pk_names]
+    if dialect.name in ("sqlite", "postgresql"):
+        ins = (sqlite_insert if dialect.name == "sqlite" else pg_insert)(table)
+        if not others:
+            return ins.on_conflict_do_nothing(index_elements=pk_names)
+        return ins.on_conflict_do_update(
+            index_elements=pk_names,
+            set_={n: ins.excluded[n] for n in others},
+        )
+    if dialect.name in ("mysql", "mariadb"):
+        ins = mysql_insert(table)
+        if not others:
+            return ins.prefix_with("IGNORE")
+        return ins.on_duplicate_key_update({n: ins.inserted[n] for n in others})
+    return None
+
+
+def _normalize(value: Any) -> Any:
+    """Convert a value to the form it is compared in.
+
+    Drivers return the same stored value as different types: a `float` or
+    a `Decimal` for numbers, a naive or an aware `datetime` (taken as UTC
+    when naive), `bytes` or a `memoryview` for binary data.
+    """
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    return value
+
+
+class _RangeSync:
+    """Compare a range of primary keys and fix the destination rows.
+
+    The values of the two sides are normalized (see `_normalize()`) before
+    they are compared. The missing and changed rows are written with a
+    single upsert where the database has one, else with an update and an
+    insert; the extra rows are deleted.
+
+    Attributes:
+        src_stmt: The source select, ordered by the primary key.
+        dst_t: The destination table.
+        names: The names of the compared columns, in row order.
+        pk_names: The names of the primary key columns.
+        pk_idx: The positions of the primary key columns in a row.
+        dialect: The dialect of the destination.
+    """
+
+    src_stmt: Any
+    dst_t: Table
+    names: List[str]
+    pk_names: List[str]
+    pk_idx: List[int]
+    dialect: "Dialect"
+
+    def __init__(
+        self,
+        src_stmt: Any,
+        dst_t: Table,
+        names: List[str],
+        pk_names: List[str],
+        dialect: "Dialect",
+    ) -> None:
+        """Prepare the statements used for the table.
+
+        Args:
+            src_stmt: The source select, ordered by the primary key.
+            dst_t: The destination table.
+            names: The names of the compared columns, in row order.
+            pk_names: The names of the primary key columns.
+            dialect: The dialect of the destination.
+        """
+        self.src_stmt = src_stmt
+        self.dst_t = dst_t
+        self.names = names
+        self.pk_names = pk_names
+        self.pk_idx = [names.index(n) for n in pk_names]
+        self.dialect = dialect
+
+        pk_cols = [dst_t.c[n] for n in pk_names]
+        self._select = select(*[dst_t.c[n] for n in names]).order_by(*pk_cols)
+
+        # The new values are bound by column name, the keys separately.
+        by_key = and_(
+            *[c == bindparam("_pk_%d" % i) for i, c in enumerate(pk_cols)]
+        )
+        self._insert = dst_t.insert()
+        self._update = dst_t.update().where(by_key)
+        self._delete = dst_t.delete().where(by_key)
+        self._upsert = _upsert(dst_t, dialect, pk_names)
+
+    def key(self, row: Any) -> Tuple[Any, ...]:
+        """Get the primary key of a row."""
+        return tuple(row[i] for i in self.pk_idx)
+
+    def can_checksum(self, src_dialect: "Dialect") -> bool:
+        """Tell if ranges of the source and the destination can be compared
+        by checksum.
+
+        Args:
+            src_dialect: The dialect of the source.
+        """
+        return (
+            src_dialect.name == self.dialect.name
+            and _row_hash_sum(self.dialect, [self.dst_t.c[self.names[0]]])
+            is not None
+        )
+
+    def prepare(self, conn: "Connection") -> None:
+        """Make the checksum aggregate available on a connection."""
+        if conn.dialect.name == "sqlite":
+            dbapi_conn = conn.connection.driver_connection
+            assert dbapi_conn is not None
+            dbapi_conn.create_aggregate("exdrf_row_hash_sum", -1, _RowHashSum)
+
+    def same_checksum(
+        self,
+        src_conn: "Connection",
+        dst_conn: "Connection",
+        lower: Optional[Tuple[Any, ...]],
+        upper: Optional[Tuple[Any, ...]],
+    ) -> bool:
+        """Tell if a range holds the same rows on both sides.
+
+        Args:
+            src_conn: The source connection.
+            dst_conn: The destination connection.
+            lower: The exclusive lower bound of the range or None.
+            upper: The inclusive upper bound of the range or None.
+        """
+        src_sum = self._checksum(src_conn, self.src_stmt, lower, upper)
+        dst_sum = self._checksum(dst_conn, self._select, lower, upper)
+        return src_sum == dst_sum
+
+    def read(
+        self,
+        conn: "Connection",
+        lower: Optional[Tuple[Any, ...]],
+        upper: Optional[Tuple[Any, ...]],
+    ) -> List[Any]:
+        """Read the source rows of a range.
+
+        Args:
+            conn: The source connection.
+            lower: The exclusive lower bound of the range or None.
+            upper: The inclusive upper bound of the range or None.
+        """
+        return conn.execute(self._in_range(self.src_stmt, lower, upper)).all()
+
+    def apply(
+        self,
+        conn: "Connection",
+        rows: List[Any],
+        lower: Optional[Tuple[Any, ...]],
+        upper: Optional[Tuple[Any, ...]],
+    ) -> int:
+        """Make the destination range hold the given source rows.
+
+        Args:
+            conn: The destination connection, inside a transaction.
+            rows: The source rows with keys in the range, in key order.
+            lower: The exclusive lower bound of the range or None.
+            upper: The inclusive upper bound of the range or None.
+
+        Returns:
+            The number of rows inserted, updated or deleted.
+        """
+        stmt = self._in_range(self._select, lower, upper)
+        existing = [_normalized(r) for r in conn.execute(stmt)]
+        src_rows = [_normalized(r) for r in rows]
+        if src_rows == existing:
+            return 0
+
+        # The range differs; find out which rows need to change.
+        old = {self.key(r): r for r in existing}
+        inserts: List[Tuple[Any, ...]] = []
+        updates: List[Tuple[Any, ...]] = []
+        for row, norm in zip(rows, src_rows):
+            prev = old.pop(self.key(norm), None)
+            if prev is None:
+                inserts.append(tuple(row))
+            elif prev != norm:
+                updates.append(tuple(row))
+
+        if old:
+            conn.execute(self._delete, [self._key_params(k) for k in old])
+        if self._upsert is not None and (inserts or updates):
+            conn.execute(
+                self._upsert,
+                [dict(zip(self.names, r)) for r in updates + inserts],
+            )
+        else:
+            self._update_insert(conn, updates, inserts)
+        return len(old) + len(updates) + len(inserts)
+
+    def _update_insert(
+        self,
+        conn: "Connection",
+        updates: List[Tuple[Any, ...]],
+        inserts: List[Tuple[Any, ...]],
+    ) -> None:
+        """Write the changed and the missing rows without an upsert."""
+        if updates:
+            conn.execute(
+                self._update,
+                [
+                    {
+                        **{
+                            n: v
+                            for n, v in zip(self.names, row)
+                            if n not in self.pk_names
+                        },
+                        **self._key_params(self.key(row)),
+                    }
+                    for row in updates
+                ],
+            )
+        if inserts:
+            conn.execute(
+                self._insert, [dict(zip(self.names, r)) for r in inserts]
+            )
+
+    def _checksum(
+        self,
+        conn: "Connection",
+        stmt: Any,
+        lower: Optional[Tuple[Any, ...]],
+        upper: Optional[Tuple[Any, ...]],
+    ) -> Tuple[Any, ...]:
+        """Count the rows of a range and add up their hashes."""
+        rows = self._in_range(stmt, lower, upper).order_by(None).subquery()
+        cols = list(rows.c)
+        total = _row_hash_sum(conn.dialect, cols)
+        return tuple(conn.execute(select(func.count(), total)).one())
+
+    def _in_range(
+        self,
+        stmt: Any,
+        lower: Optional[Tuple[Any, ...]],
+        upper: Optional[Tuple[Any, ...]],
+    ) -> Any:
+        """Restrict a select of the table to a range of keys."""
+        by_name = {c.name: c for c in stmt.selected_columns}
+        pk_cols = [by_name[n] for n in self.pk_names]
+        key_expr = pk_cols[0] if len(pk_cols) == 1 else tuple_(*pk_cols)
+        if lower is not None:
+            stmt = stmt.where(key_expr > self._bound(lower))
+        if upper is not None:
+            stmt = stmt.where(key_expr <= self._bound(upper))
+        return stmt
+
+    def _bound(self, key: Tuple[Any, ...]) -> Any:
+        """Get the value a key is compared with in a range condition."""
+        return key[0] if len(key) == 1 else key
+
+    def _key_params(self, key: Tuple[Any, ...]) -> Dict[str, Any]:
+        """Get the parameters that select a row by its key."""
+        return {"_pk_%d" % i: v for i, v in enumerate(key)}
+
+
+def _normalized(row: Any) -> Tuple[Any, ...]:
+    """Normalize the values of a row (see `_normalize()`)."""
+    return tuple(_normalize(v) for v in row)
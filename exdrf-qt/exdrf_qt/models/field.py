@@ -1,10 +1,12 @@
 import logging
+from collections.abc import ItemsView, KeysView, Mapping, ValuesView
 from typing import (
     TYPE_CHECKING,
     Any,
     Callable,
     Dict,
     Generic,
+    Iterator,
     List,
     Optional,
     TypeVar,
@@ -61,6 +63,42 @@ ROLE_MAP = {
 
 NO_EDITOR_VALUE = object()
 
+# The roles that `QtField.expand_value()` provides for every cell.
+EXPANDED_ROLES = (
+    Qt.ItemDataRole.DisplayRole,
+    Qt.ItemDataRole.DecorationRole,
+    Qt.ItemDataRole.EditRole,
+    Qt.ItemDataRole.ToolTipRole,
+    Qt.ItemDataRole.StatusTipRole,
+    Qt.ItemDataRole.WhatsThisRole,
+    Qt.ItemDataRole.FontRole,
+    Qt.ItemDataRole.TextAlignmentRole,
+    Qt.ItemDataRole.BackgroundRole,
+    Qt.ItemDataRole.ForegroundRole,
+    Qt.ItemDataRole.CheckStateRole,
+    Qt.ItemDataRole.AccessibleTextRole,
+    Qt.ItemDataRole.AccessibleDescriptionRole,
+    Qt.ItemDataRole.SizeHintRole,
+)
+_EXPANDED_SET = frozenset(EXPANDED_ROLES)
+
+# The roles that show the value itself when it is not None.
+_VALUE_ROLES = frozenset(
+    (
+        Qt.ItemDataRole.DisplayRole,
+        Qt.ItemDataRole.EditRole,
+        Qt.ItemDataRole.ToolTipRole,
+        Qt.ItemDataRole.StatusTipRole,
+        Qt.ItemDataRole.AccessibleTextRole,
+        Qt.ItemDataRole.AccessibleDescriptionRole,
+    )
+)
+_VALUE_ALIGNMENT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+# Markers for the values stored inside a `CellData`.
+_MISSING = object()
+_REMOVED = object()
+
 regular_font = QFont("Arial", 10, QFont.Normal)
 italic_font = QFont("Arial", 10, QFont.Normal)
 italic_font.setItalic(True)
@@ -330,7 +368,7 @@ class QtField(ExField, QtUseContext, Generic[DBM]):
             Qt.ItemDataRole.ToolTipRole: "NOT IMPLEMENTED",
         }
 
-    def expand_value(self, value: Any, **kwargs) -> Dict[Qt.ItemDataRole, Any]:
+    def expand_value(self, value: Any, **kwargs) -> "CellData":
         """Common way of dealing with values.
 
         In your `values()` method you will usually provide this method with the
@@ -342,6 +380,10 @@ class QtField(ExField, QtUseContext, Generic[DBM]):
         - If the value is None, the display role is set to a translated NULL
             label with italic font and grey foreground.
 
+        The roles are not computed here; the returned cell only keeps the
+        value and the overrides and asks `role_value()` for the data of a
+        role when that role is read.
+
         Args:
             value: The raw value to set.
             **kwargs: Optional role overrides. Keys should be role names from
@@ -351,45 +393,71 @@ class QtField(ExField, QtUseContext, Generic[DBM]):
             A dictionary that maps Qt.ItemDataRole to the appropriate data
             values for all roles.
         """
-        result = {
-            Qt.ItemDataRole.DisplayRole: value,
-            Qt.ItemDataRole.DecorationRole: None,
-            Qt.ItemDataRole.EditRole: value,
-            Qt.ItemDataRole.ToolTipRole: value,
-            Qt.ItemDataRole.StatusTipRole: value,
-            Qt.ItemDataRole.WhatsThisRole: None,
-            Qt.ItemDataRole.FontRole: regular_font,
-            Qt.ItemDataRole.TextAlignmentRole: (
-                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
-            ),
-            Qt.ItemDataRole.BackgroundRole: None,
-            Qt.ItemDataRole.ForegroundRole: None,
-            Qt.ItemDataRole.CheckStateRole: None,
-            Qt.ItemDataRole.AccessibleTextRole: value,
-            Qt.ItemDataRole.AccessibleDescriptionRole: value,
-            Qt.ItemDataRole.SizeHintRole: QSize(self.preferred_width, 24),
-        }
+        return CellData(
+            self,
+            value,
+            {ROLE_MAP[k]: kwargs[k] for k in kwargs} if kwargs else None,
+        )
+
+    def role_value(self, value: Any, role: int) -> Any:
+        """Compute the data of a role for a value expanded by this field.
+
+        The data that only depends on the field (NULL labels, size hints)
+        is computed once per field and shared by all the cells of the column.
+
+        Args:
+            value: The raw value of the cell.
+            role: One of the roles in `EXPANDED_ROLES`.
 
-        # Handle the case where the value is None.
+        Returns:
+            The data for the role.
+        """
         if value is None:
-            label = self.t("cmn.null", "NULL")
-            description = self.t("cmn.null_tip", "The value is not set")
-            result[Qt.ItemDataRole.FontRole] = italic_font
-            result[Qt.ItemDataRole.ForegroundRole] = light_grey
-            result[Qt.ItemDataRole.AccessibleTextRole] = label
-            result[Qt.ItemDataRole.DisplayRole] = label
-            result[Qt.ItemDataRole.ToolTipRole] = description
-            result[Qt.ItemDataRole.StatusTipRole] = description
-            result[Qt.ItemDataRole.TextAlignmentRole] = (
+            null_roles = self.__dict__.get("_null_roles")
+            if null_roles is None:
+                null_roles = self._compute_null_roles()
+                self.__dict__["_null_roles"] = null_roles
+            return null_roles.get(role)
+
+        if role in _VALUE_ROLES:
+            return value
+        if role == Qt.ItemDataRole.FontRole:
+            return regular_font
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _VALUE_ALIGNMENT
+        if role == Qt.ItemDataRole.SizeHintRole:
+            size = self.__dict__.get("_size_hint")
+            if size is None or size.width() != self.preferred_width:
+                size = QSize(self.preferred_width, 24)
+                self.__dict__["_size_hint"] = size
+            return size
+        return None
+
+    def _compute_null_roles(self) -> Dict[int, Any]:
+        """Compute the data of the roles of a cell that has no value."""
+        label = self.t("cmn.null", "NULL")
+        description = self.t("cmn.null_tip", "The value is not set")
+        return {
+            Qt.ItemDataRole.DisplayRole: label,
+            Qt.ItemDataRole.ToolTipRole: description,
+            Qt.ItemDataRole.StatusTipRole: description,
+            Qt.ItemDataRole.FontRole: italic_font,
+            Qt.ItemDataRole.TextAlignmentRole: (
                 Qt.AlignmentFlag.AlignCenter | Qt.AlignmentFlag.AlignVCenter
-            )
-            result[Qt.ItemDataRole.SizeHintRole] = QSize(24, 24)
+            ),
+            Qt.ItemDataRole.ForegroundRole: light_grey,
+            Qt.ItemDataRole.AccessibleTextRole: label,
+            Qt.ItemDataRole.SizeHintRole: QSize(24, 24),
+        }
 
-        # Allow overrides by the user.
-        for k in kwargs:
-            result[ROLE_MAP[k]] = kwargs[k]
+    def clear_role_cache(self) -> None:
+        """Forget the role data shared by the cells of this field.
 
-        return result
+        Call this after changing the language of the application so that
+        the NULL labels are translated again.
+        """
+        self.__dict__.pop("_null_roles", None)
+        self.__dict__.pop("_size_hint", None)
 
     # Comparator/merge extension hooks (used by cmp widgets and adapters).
     # ---------------------------------------------------------------------
@@ -474,3 +542,124 @@ class QtField(ExField, QtUseContext, Generic[DBM]):
     ) -> None:
         """Set in the database record the value of the edit role."""
         setattr(record, self.name, value)
+
+
+class CellData(Dict[Qt.ItemDataRole, Any]):
+    """The data of a cell, computed role by role when it is read.
+
+    The dictionary only stores the roles that were set explicitly (the
+    overrides given to `QtField.expand_value()` and later assignments); the
+    other `EXPANDED_ROLES` are computed by `QtField.role_value()` on access,
+    so the cell of a loaded row costs little more than its raw value until
+    the view asks for it.
+
+    Apart from the laziness it behaves like the dictionary that
+    `expand_value()` used to return: all expanded roles are reported as keys
+    and assignments and deletions work for any role.
+
+    Attributes:
+        field: The field that computes the data of the roles.
+        value: The raw value of the cell.
+    """
+
+    __slots__ = ("field", "value")
+
+    def __init__(
+        self,
+        field: "QtField",
+        value: Any,
+        overrides: Optional[Dict[Qt.ItemDataRole, Any]] = None,
+    ):
+        if overrides:
+            super().__init__(overrides)
+        else:
+            super().__init__()
+        self.field = field
+        self.value = value
+
+    def __getitem__(self, role: Qt.ItemDataRole) -> Any:
+        result = dict.get(self, role, _MISSING)
+        if result is _MISSING:
+            if role not in _EXPANDED_SET:
+                raise KeyError(role)
+            return self.field.role_value(self.value, role)
+        if result is _REMOVED:
+            raise KeyError(role)
+        return result
+
+    def get(self, role: Qt.ItemDataRole, default: Any = None) -> Any:
+        result = dict.get(self, role, _MISSING)
+        if result is _MISSING:
+            if role not in _EXPANDED_SET:
+                return default
+            return self.field.role_value(self.value, role)
+        if result is _REMOVED:
+            return default
+        return result
+
+    def __contains__(self, role: object) -> bool:
+        result = dict.get(self, role, _MISSING)  # type: ignore[call-overload]
+        if result is _MISSING:
+            return role in _EXPANDED_SET
+        return result is not _REMOVED
+
+    def __delitem__(self, role: Qt.ItemDataRole) -> None:
+        if role not in self:
+            raise KeyError(role)
+        if role in _EXPANDED_SET:
+            dict.__setitem__(self, role, _REMOVED)
+        else:
+            dict.__delitem__(self, role)
+
+    def __iter__(self) -> Iterator[Qt.ItemDataRole]:
+        for role in EXPANDED_ROLES:
+            if dict.get(self, role) is not _REMOVED:
+                yield role
+        for role in dict.__iter__(self):
+            if role not in _EXPANDED_SET:
+                yield role
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    def keys(self) -> KeysView[Qt.ItemDataRole]:  # type: ignore[override]
+        return KeysView(self)
+
+    def values(self) -> ValuesView[Any]:  # type: ignore[override]
+        return ValuesView(self)
+
+    def items(  # type: ignore[override]
+        self,
+    ) -> ItemsView[Qt.ItemDataRole, Any]:
+        return ItemsView(self)
+
+    def pop(self, role: Qt.ItemDataRole, *default: Any) -> Any:
+        if role not in self:
+            if default:
+                return default[0]
+            raise KeyError(role)
+        result = self[role]
+        del self[role]
+        return result
+
+    def setdefault(self, role: Qt.ItemDataRole, default: Any = None) -> Any:
+        if role not in self:
+            self[role] = default
+        return self[role]
+
+    def copy(self) -> Dict[Qt.ItemDataRole, Any]:  # type: ignore[override]
+        return dict(self.items())
+
+    __hash__ = None  # type: ignore[assignment]
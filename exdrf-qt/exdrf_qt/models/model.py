@@ -31,6 +31,16 @@ from exdrf.filter import (
     extract_field_filters,
     validate_filter,
 )
+from exdrf_al.counting import CountResult, CountStrategy, ExactCount
+from exdrf_al.keyset import (
+    KeysetAnchors,
+    KeysetKeys,
+    keyset_after_clause,
+    keyset_anchor_statement,
+    keyset_keys_from_order_by,
+    nulls_sort_high,
+)
+from exdrf_al.search_index import find_search_index
 from exdrf_al.utils import DelChoice
 from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt, QTimer, pyqtSignal
 from sqlalchemy import (
@@ -39,7 +49,6 @@ from sqlalchemy import (
     case,
     delete,
     false,
-    func,
     literal_column,
     select,
     tuple_,
@@ -83,10 +92,18 @@ class ModelWork(Work):
     Attributes:
         model: The model that is performing the work.
         cancelled: If True, the work is cancelled.
+        keys: When the model pages by keyset, the sort key expressions
+            to read alongside each row.
+        key_values: The sort key of each loaded row (same order as
+            `result`), filled only when `keys` is set.
     """
 
     model: "QtModel" = field(kw_only=True, repr=False)
     cancelled: bool = field(default=False, init=False)
+    keys: Optional[List[Any]] = field(default=None, kw_only=True, repr=False)
+    key_values: List[Tuple[Any, ...]] = field(
+        factory=list, init=False, repr=False
+    )
 
     def perform(self, session: "Session") -> None:
         """Perform the work."""
@@ -94,7 +111,15 @@ class ModelWork(Work):
         if self.cancelled:
             return
 
-        if self.use_unique:
+        if self.keys:
+            # Read the sort keys with the rows so the model can seek later.
+            k_res = session.execute(self.statement.add_columns(*self.keys))
+            if self.use_unique:
+                k_res = k_res.unique()
+            rows = list(k_res.all())
+            tmp_result = [r[0] for r in rows]
+            self.key_values = [tuple(r[1:]) for r in rows]
+        elif self.use_unique:
             tmp_result = list(session.scalars(self.statement).unique().all())
         else:
             tmp_result = list(session.scalars(self.statement))
@@ -131,6 +156,52 @@ class ModelWork(Work):
         return self.req_id[1].priority
 
 
+@define(slots=True)
+class KeysetAnchorWork(ModelWork):
+    """Collects keyset anchors for a QtModel in one pass over its sort keys.
+
+    The `result` is a list of `(offset, key_values)` tuples.
+    """
+
+    def perform(self, session: "Session") -> None:
+        """Perform the work."""
+        self.result = []
+        if self.cancelled:
+            return
+        for row in session.execute(self.statement):
+            self.result.append((int(row[0]) - 1, tuple(row[1:])))
+
+    def get_priority(self) -> int:
+        """Anchors are only an optimization; page requests go first."""
+        return -1
+
+
+@define(slots=True)
+class CountWork(ModelWork):
+    """Computes the exact total of a QtModel in the background.
+
+    Used when the count strategy of the model produced an approximate
+    total. The `result` is a list with the `CountResult` of the strategy's
+    `refine` as its only item.
+
+    Attributes:
+        strategy: The counting strategy of the model.
+    """
+
+    strategy: CountStrategy = field(kw_only=True, repr=False)
+
+    def perform(self, session: "Session") -> None:
+        """Perform the work."""
+        self.result = []
+        if self.cancelled:
+            return
+        self.result = [self.strategy.refine(session, self.statement)]
+
+    def get_priority(self) -> int:
+        """The approximate total is usable; page requests go first."""
+        return -2
+
+
 class QtModel(
     QtUseContext,
     RecordRequestManager,
@@ -208,6 +279,21 @@ class QtModel(
             filters attribute before computing the filtered selector.
             The intended use is to apply some fixed filters that are not
             user-editable.
+        keyset_paging: If True, the sorting is completed with the primary
+            key columns and pages are loaded by seeking after the sort key
+            of a row that was already loaded (keyset pagination) instead of
+            skipping rows with OFFSET.
+        keyset_anchor_spacing: Distance, in rows, between the anchors that
+            are collected in the background after each reset when keyset
+            paging is enabled, so that random jumps also seek.
+        _anchors: Known sort keys of loaded rows, by cache index.
+        _anchor_work: The pending anchor collection work, if any.
+        count_strategy: Decides how the total count is computed (exact,
+            cached, estimated or deferred). Approximate totals are replaced
+            by the exact value computed in the background when the strategy
+            asks for it.
+        _count_exact: False while the total count is an approximation.
+        _count_work: The pending exact count work, if any.
 
     Signals:
         totalCountChanged: Emitted when a change in the total count is
@@ -248,6 +334,13 @@ class QtModel(
     _save_settings: bool
     _no_dia_map: Dict[str, str]
     allow_top_cache_edit: bool
+    keyset_paging: bool
+    keyset_anchor_spacing: int = 1000
+    _anchors: KeysetAnchors
+    _anchor_work: Optional[KeysetAnchorWork]
+    count_strategy: CountStrategy
+    _count_exact: bool
+    _count_work: Optional[CountWork]
 
     totalCountChanged = pyqtSignal(int)
     checkedChanged = pyqtSignal()
@@ -272,6 +365,8 @@ class QtModel(
         load_settings: bool = True,
         save_settings: bool = True,
         no_dia_map: Optional[Dict[str, str]] = None,
+        keyset_paging: bool = False,
+        count_strategy: Optional[CountStrategy] = None,
     ):
         """Initialize the model.
 
@@ -304,6 +399,11 @@ class QtModel(
             no_dia_map: A dictionary that maps field names to fields that are
                 storing the value of the field without diacritics. This only
                 applies to string fields.
+            keyset_paging: If True, pages are loaded by seeking after the
+                sort key of an already loaded row instead of using OFFSET.
+            count_strategy: How to compute the total count; exact by
+                default. Pass a `CachedCount` shared between models to
+                avoid counting the same selection again.
         """
         # super().__init__(parent=parent)
         QAbstractItemModel.__init__(self, parent=parent)
@@ -319,6 +419,14 @@ class QtModel(
         self._soft_delete_field_name = soft_delete_field_name
         self._del_choice = del_choice
         self.allow_top_cache_edit = False
+        self.keyset_paging = keyset_paging
+        self._anchors = KeysetAnchors()
+        self._anchor_work = None
+        self.count_strategy = (
+            count_strategy if count_strategy is not None else ExactCount()
+        )
+        self._count_exact = True
+        self._count_work = None
         self.db_model = db_model
         self.fields = cast(Any, fields if fields is not None else [])
         self._checked = None
@@ -360,18 +468,24 @@ class QtModel(
         """Return True if the model is partially initialized."""
         return self._total_count == -1
 
-    def reset_model(self, clear_top_cache: bool = False) -> None:
+    def reset_model(
+        self, clear_top_cache: bool = False, keep_total: bool = False
+    ) -> None:
         """Reset the model.
 
         The function clears the cache and resets the total count.
 
         Args:
             clear_top_cache (bool): Whether to clear the top cache.
+            keep_total (bool): The set of records did not change (only its
+                order did), so the known total count is reused instead of
+                counting again.
         """
         logger.log(
             MODEL_LOG_LEVEL, "M: %s Resetting model...", self.exdrf_model_name()
         )
         self.beginResetModel()
+        old_total = self._total_count
 
         # Clear the top cache if requested.
         if clear_top_cache:
@@ -386,9 +500,16 @@ class QtModel(
 
         self.cache.clear()
         self._db_to_row = {}
+        self._anchors.clear()
+        if self._anchor_work is not None:
+            self._anchor_work.cancelled = True
+            self._anchor_work = None
         self._total_count = -1
         self._loaded_count = 0
-        self.recalculate_total_count()
+        if keep_total and old_total != -1:
+            self.total_count = old_total
+        else:
+            self.recalculate_total_count()
         self.endResetModel()
         logger.log(
             MODEL_LOG_LEVEL,
@@ -403,22 +524,94 @@ class QtModel(
         Instead, it counts the items in the query resulted from applying
         filters to the `root_selection`.
 
+        The count is computed by `count_strategy`. If the result is only an
+        approximation the exact count is requested in the background and
+        the total is updated when it arrives.
+
         Returns:
             The total number of items in the selection.
         """
+        if self._count_work is not None:
+            self._count_work.cancelled = True
+            self._count_work = None
+
         with self.ctx.same_session() as session:
-            count_query = select(func.count()).select_from(
-                self.filtered_selection.subquery()
+            result = self.count_strategy.count(session, self.filtered_selection)
+        count = result.value
+        self._count_exact = result.exact
+        self.total_count = count
+        logger.log(
+            MODEL_LOG_LEVEL,
+            "M: %s Total count recalculated: %d%s",
+            self.exdrf_model_name(),
+            count,
+            "" if result.exact else " (approximate)",
+        )
+        if not result.exact and self.count_strategy.refine_in_background:
+            self.request_exact_count()
+        return count
+
+    @property
+    def total_count_exact(self) -> bool:
+        """Return False while the total count is an approximation."""
+        return self._count_exact
+
+    def request_exact_count(self) -> None:
+        """Compute the exact total count in the background."""
+        if self._count_work is not None:
+            self._count_work.cancelled = True
+        self._count_work = CountWork(
+            model=self,
+            strategy=self.count_strategy,
+            statement=self.filtered_selection,
+            callback=self._load_exact_count,  # type: ignore
+            req_id=(id(self), "exact-count", uuid.uuid4().int),
+        )
+        self.ctx.push_work(self._count_work)
+
+    def _load_exact_count(self, work: "CountWork") -> None:
+        """Replace the approximate total with the exact one."""
+        if work is not self._count_work or work.cancelled:
+            return
+        self._count_work = None
+        if work.error or not work.result or self._is_deleted():
+            return
+        result = cast(CountResult, work.result[0])
+        self._count_exact = result.exact
+        old_total = self._total_count
+        new_total = result.value
+        if new_total == old_total:
+            return
+
+        # Rows are added or removed at the end of the database part of
+        # the model, after the top cache.
+        first = len(self.top_cache)
+        if new_total > old_total:
+            self.beginInsertRows(
+                QModelIndex(), first + old_total, first + new_total - 1
             )
-            count = cast(int, session.scalar(count_query))
-            self.total_count = count
-            logger.log(
-                MODEL_LOG_LEVEL,
-                "M: %s Total count recalculated: %d",
-                self.exdrf_model_name(),
-                count,
+            self.total_count = new_total
+            self.endInsertRows()
+        else:
+            self.beginRemoveRows(
+                QModelIndex(), first + new_total, first + old_total - 1
             )
-            return count
+            self._anchors.remove_from(new_total)
+            self.total_count = new_total
+            self._loaded_count = min(self._loaded_count, new_total)
+            self.endRemoveRows()
+
+    def invalidate_count(self) -> None:
+        """Tell the count strategy that the table of the model changed.
+
+        Called after the model writes to the database so that cached
+        counts of this table (in this model or in others sharing the
+        strategy) are computed again.
+        """
+        table = getattr(self.db_model, "__tablename__", None)
+        self.count_strategy.invalidate(
+            [table] if isinstance(table, str) else None
+        )
 
     @property
     def total_count(self) -> int:
@@ -553,13 +746,17 @@ class QtModel(
                     else cast(FilterType, [self._filters])
                 )
                 run_arg = cast(List[FilterType], [fixed_norm, filters_norm])
+            engine = self.ctx.engine
             return (
                 Selector[DBM]
                 .from_qt_model(
                     self,
                     dialect=(
-                        self.ctx.engine.dialect.name
-                        if self.ctx.engine is not None
+                        engine.dialect.name if engine is not None else None
+                    ),
+                    search_index=(
+                        find_search_index(engine, self.db_model)
+                        if engine is not None
                         else None
                     ),
                 )  # type: ignore
@@ -573,6 +770,54 @@ class QtModel(
             )
             return self.selection
 
+    def order_by_clauses(self) -> List[Any]:
+        """Return the ORDER BY clauses for the current sorting state.
+
+        Prioritized IDs come first, followed by the sorting requested in
+        `sort_by`. When keyset paging is enabled the primary key columns are
+        appended as tie-breakers so that the order is total.
+        """
+        order_by_clauses = []
+
+        if self.prioritized_ids:
+            primary_cols = self.get_primary_columns()
+            if isinstance(primary_cols, (list, tuple)):
+                primary_cols = tuple_(*primary_cols)
+            order_by_expression = case(
+                (primary_cols.in_(self.prioritized_ids), 0), else_=1
+            )
+            order_by_clauses.append(order_by_expression)
+
+        sorted_names = set()
+        for field_key, order in self.sort_by:
+            fld = self.get_field(field_key)
+            if fld is None:
+                logger.warning(
+                    "M: %s Sorting field %s not found",
+                    self.exdrf_model_name(),
+                    field_key,
+                )
+                continue
+            if not fld.sortable:
+                logger.warning(
+                    "M: %s Sorting field %s not sortable",
+                    self.exdrf_model_name(),
+                    field_key,
+                )
+                continue
+            tmp = fld.apply_sorting(order == "asc")
+            if tmp is not None:
+                order_by_clauses.append(tmp)
+                sorted_names.add(fld.name)
+
+        if self.keyset_paging:
+            for fld in self.primary_key_fields:
+                if fld.name not in sorted_names:
+                    order_by_clauses.append(
+                        getattr(self.db_model, fld.name).asc()
+                    )
+        return order_by_clauses
+
     @property
     def sorted_selection(self):
         """Return the selection with sorting applied.
@@ -584,49 +829,15 @@ class QtModel(
         The function does not change the internal `selection` attribute.
         """
         try:
-            order_by_clauses = []
-
-            if self.prioritized_ids:
-                primary_cols = self.get_primary_columns()
-                if isinstance(primary_cols, (list, tuple)):
-                    primary_cols = tuple_(*primary_cols)
-                order_by_expression = case(
-                    (primary_cols.in_(self.prioritized_ids), 0), else_=1
+            try:
+                order_by_clauses = self.order_by_clauses()
+            except Exception:
+                logger.error(
+                    "M: %s Error applying sorting",
+                    self.exdrf_model_name(),
+                    exc_info=True,
                 )
-                order_by_clauses.append(order_by_expression)
-
-            if not self.sort_by:
-                if not order_by_clauses:
-                    return self.filtered_selection
-            else:
-                try:
-                    for field_key, order in self.sort_by:
-                        fld = self.get_field(field_key)
-                        if fld is None:
-                            logger.warning(
-                                "M: %s Sorting field %s not found",
-                                self.exdrf_model_name(),
-                                field_key,
-                            )
-                            continue
-                        if not fld.sortable:
-                            logger.warning(
-                                "M: %s Sorting field %s not sortable",
-                                self.exdrf_model_name(),
-                                field_key,
-                            )
-                            continue
-                        tmp = fld.apply_sorting(order == "asc")
-                        if tmp is not None:
-                            order_by_clauses.append(tmp)
-
-                except Exception:
-                    logger.error(
-                        "M: %s Error applying sorting",
-                        self.exdrf_model_name(),
-                        exc_info=True,
-                    )
-                    return self.filtered_selection
+                return self.filtered_selection
 
             if order_by_clauses:
                 return self.filtered_selection.order_by(*order_by_clauses)
@@ -638,6 +849,93 @@ class QtModel(
             )
         return self.filtered_selection
 
+    def keyset_keys(self) -> Optional[KeysetKeys]:
+        """Return the `(expression, descending)` keys used for seeking.
+
+        Returns None when keyset paging is disabled or the current ordering
+        cannot be expressed as a keyset (prioritized IDs, exotic clauses),
+        in which case the model pages with OFFSET.
+        """
+        if not self.keyset_paging or self.prioritized_ids:
+            return None
+        try:
+            keys = keyset_keys_from_order_by(self.order_by_clauses())
+        except Exception:
+            logger.log(
+                MODEL_LOG_LEVEL,
+                "M: %s Ordering not usable for keyset paging",
+                self.exdrf_model_name(),
+                exc_info=True,
+            )
+            return None
+        return keys or None
+
+    def page_statement(
+        self, start: int, count: int
+    ) -> Tuple["Select", Optional[KeysetKeys]]:
+        """Compute the statement that loads `count` items from `start`.
+
+        With keyset paging the statement seeks after the closest loaded (or
+        collected) row before `start` and only skips the rows in between;
+        otherwise it is the sorted selection with OFFSET/LIMIT.
+
+        Args:
+            start: Index of the first item (without the top cache).
+            count: Number of items to load.
+
+        Returns:
+            The statement and the keyset keys (None when not seeking).
+        """
+        stmt = self.sorted_selection
+        keys = self.keyset_keys()
+        skip = start
+        if keys is not None:
+            near = self._anchors.nearest_before(start)
+            if near is not None:
+                engine = self.ctx.engine
+                after = keyset_after_clause(
+                    keys,
+                    near[1],
+                    nulls_sort_high(engine.dialect) if engine else False,
+                )
+                stmt = stmt.where(after)
+                skip = start - near[0] - 1
+        return stmt.offset(skip).limit(count), keys
+
+    def request_keyset_anchors(self) -> None:
+        """Collect keyset anchors in the background.
+
+        One pass over the sort keys records the key of every
+        `keyset_anchor_spacing`-th row, so that jumping anywhere in the
+        model seeks instead of walking the rows before the jump.
+        """
+        keys = self.keyset_keys()
+        if keys is None or self._anchors.complete:
+            return
+        if self._anchor_work is not None:
+            self._anchor_work.cancelled = True
+
+        self._anchor_work = KeysetAnchorWork(
+            model=self,
+            statement=keyset_anchor_statement(
+                self.filtered_selection, keys, self.keyset_anchor_spacing
+            ),
+            callback=self._load_anchors,  # type: ignore
+            req_id=(id(self), "keyset-anchors", uuid.uuid4().int),
+        )
+        self.ctx.push_work(self._anchor_work)
+
+    def _load_anchors(self, work: "KeysetAnchorWork") -> None:
+        """Store the anchors collected by `request_keyset_anchors`."""
+        if work is not self._anchor_work or work.cancelled:
+            return
+        self._anchor_work = None
+        if work.error or self._is_deleted():
+            return
+        for offset, values in work.result:
+            self._anchors.add(offset, values)
+        self._anchors.complete = True
+
     @property
     def is_fully_loaded(self) -> bool:
         """Return True if all items are loaded."""
@@ -778,6 +1076,8 @@ class QtModel(
                 count = min(self.batch_size * 2, new_total)
                 if count > 0:
                     self.request_items(0, count)
+                if new_total > self.keyset_anchor_spacing * 2:
+                    self.request_keyset_anchors()
                 logger.log(
                     MODEL_LOG_LEVEL,
                     "M: %s Requested %d items.",
@@ -871,13 +1171,13 @@ class QtModel(
 
         # Prevent merges into this request.
         req.pushed = True
+        statement, keys = self.page_statement(req.start, req.count)
         req.work = ModelWork(
             model=self,
-            statement=(
-                self.sorted_selection.offset(req.start).limit(req.count)
-            ),
+            statement=statement,
             callback=self._load_items,  # type: ignore
             req_id=(id(self), req),
+            keys=[k for k, _ in keys] if keys else None,
         )
 
         self.ctx.push_work(req.work)
@@ -1006,6 +1306,12 @@ class QtModel(
                 # The row is the index of the item in the cache
                 # without the top cache.
                 self._db_to_row[new_record.db_id] = i
+
+            # The last row of the request anchors the following requests.
+            if 0 < available <= len(work.key_values):
+                self._anchors.add(
+                    req.start + available - 1, work.key_values[available - 1]
+                )
             logger.log(
                 MODEL_LOG_LEVEL,
                 "M: %s Request %s completed. "
@@ -1307,6 +1613,8 @@ class QtModel(
         # But we want to avoid that, so set _filters directly and sort_by
         result._filters = self._filters
         result.sort_by = self.sort_by
+        result.keyset_paging = self.keyset_paging
+        result.count_strategy = self.count_strategy
         # Don't copy top_cache - cloned model should start fresh
         result.top_cache = []
         result._loaded_count = 0
@@ -1811,6 +2119,7 @@ class QtModel(
                 row,
                 column,
             )
+            self.invalidate_count()
             self.recordSaved.emit(db_item, record)
             return True
 
@@ -1854,7 +2163,8 @@ class QtModel(
                 )
             ]
 
-            self.reset_model()
+            # Sorting does not change the number of records.
+            self.reset_model(keep_total=True)
         except Exception as e:
             logger.error(
                 "M: %s Error sorting model: %s",
@@ -2174,7 +2484,8 @@ class QtModel(
         if self._total_count == -1:
             return
 
-        self.reset_model()
+        # Prioritizing only changes the order of the records.
+        self.reset_model(keep_total=True)
 
     def find_qt_record_by_id(
         self, rec_id: RecIdType
@@ -2211,6 +2522,7 @@ class QtModel(
             "M: %s Inserting record into model...",
             self.exdrf_model_name(),
         )
+        self.invalidate_count()
         parent_idx = QModelIndex()
         self.rowsAboutToBeInserted.emit(parent_idx, 0, 0)
         result = self.db_item_to_record(db_item)
@@ -2596,11 +2908,13 @@ class QtModel(
             session.add(new_rec)
             session.commit()
             result = self.db_item_to_record(new_rec)
+        self.invalidate_count()
 
         # We want to place this record right next to the one that was cloned.
         insert_index = self._db_to_row.get(db_id, -1) + 1
         self.beginInsertRows(QModelIndex(), insert_index, insert_index)
         self.cache.insert_rows(insert_index, 1)
+        self._anchors.remove_from(insert_index)
         self._db_to_row = {
             db_id_temp: row_temp + 1 if row_temp >= insert_index else row_temp
             for db_id_temp, row_temp in self._db_to_row.items()
@@ -2660,6 +2974,7 @@ class QtModel(
 
             result = session.execute(stmt)
             session.commit()
+        self.invalidate_count()
 
         # Reset the model to refresh counts and cache.
         self.reset_model(clear_top_cache=True)
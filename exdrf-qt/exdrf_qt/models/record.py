@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING, Any, Dict, List
+from collections.abc import MutableMapping
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Mapping, Optional
 
 from attrs import define, field
 from exdrf.constants import RecIdType
@@ -20,6 +22,97 @@ ERROR_COLOR = QColor("red")
 DEL_BRUSH = QBrush(QColor("lightred"), Qt.BrushStyle.SolidPattern)
 DEL_COLOR = QColor("red")
 
+_EMPTY_CELL: Mapping[Qt.ItemDataRole, Any] = MappingProxyType({})
+
+
+class RecordValues(MutableMapping[int, Dict[Qt.ItemDataRole, Any]]):
+    """The cells of a record, indexed by column.
+
+    The record has one cell for each column but the dictionaries of the
+    cells are only created when a cell is indexed. Roles that apply to the
+    whole row (like the background of a stub) are kept once with
+    `fill_role()` instead of being copied into each cell.
+
+    Reading a cell with `get()` does not create it; a cell that was never
+    assigned is reported as a read-only mapping.
+    """
+
+    __slots__ = ("_cells", "_fill")
+
+    def __init__(self, size: int = 0):
+        self._cells: List[Optional[Dict[Qt.ItemDataRole, Any]]] = [None] * size
+        self._fill: Optional[Dict[Qt.ItemDataRole, Any]] = None
+
+    def _check(self, column: int) -> None:
+        if not isinstance(column, int) or not (0 <= column < len(self._cells)):
+            raise KeyError(column)
+
+    def __getitem__(self, column: int) -> Dict[Qt.ItemDataRole, Any]:
+        self._check(column)
+        cell = self._cells[column]
+        if cell is None:
+            cell = dict(self._fill) if self._fill else {}
+            self._cells[column] = cell
+        return cell
+
+    def get(self, column: int, default: Any = None) -> Any:  # type: ignore
+        if not isinstance(column, int) or not (0 <= column < len(self._cells)):
+            return default
+        cell = self._cells[column]
+        if cell is not None:
+            return cell
+        if self._fill:
+            return MappingProxyType(self._fill)
+        return _EMPTY_CELL
+
+    def __setitem__(
+        self, column: int, cell: Dict[Qt.ItemDataRole, Any]
+    ) -> None:
+        if column < 0:
+            raise KeyError(column)
+        self.reserve(column + 1)
+        self._cells[column] = cell
+
+    def __delitem__(self, column: int) -> None:
+        """Reset the cell to an empty one (the number of cells is fixed)."""
+        self._check(column)
+        self._cells[column] = None
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._cells)))
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, column: object) -> bool:
+        return isinstance(column, int) and 0 <= column < len(self._cells)
+
+    def __repr__(self) -> str:
+        return f"RecordValues({len(self._cells)})"
+
+    def reserve(self, size: int) -> None:
+        """Make sure that there are at least `size` cells.
+
+        Args:
+            size: The number of cells (usually the number of columns).
+        """
+        if size > len(self._cells):
+            self._cells.extend([None] * (size - len(self._cells)))
+
+    def fill_role(self, role: Qt.ItemDataRole, value: Any) -> None:
+        """Set a role in all the cells, including the ones not created yet.
+
+        Args:
+            role: The role to set.
+            value: The data for the role.
+        """
+        if self._fill is None:
+            self._fill = {}
+        self._fill[role] = value
+        for cell in self._cells:
+            if cell is not None:
+                cell[role] = value
+
 
 @define
 class QtRecord:
@@ -30,6 +123,7 @@ class QtRecord:
         db_id: The database ID of the record.
         values: first level contains the column key mapped to column data.
             Column data consists of a dictionary that maps the role to the data.
+            The dictionaries are created on demand (see `RecordValues`).
         loaded: A flag that indicates if the record has been loaded from the
             database or not. Stubs have this flag set to false.
         soft_del: A flag that indicates if the record is a soft deleted record.
@@ -37,9 +131,7 @@ class QtRecord:
 
     model: "QtModel" = field(repr=False)
     db_id: RecIdType = field(default=None)
-    values: Dict[int, Dict[Qt.ItemDataRole, Any]] = field(
-        factory=dict, repr=False
-    )
+    values: RecordValues = field(factory=RecordValues, repr=False)
     flags: Dict[int, Any] = field(factory=dict, repr=False)
     soft_del: bool = field(default=False)
     _loaded: bool = field(default=False)
@@ -48,12 +140,11 @@ class QtRecord:
     def __attrs_post_init__(self) -> None:
         """Post-initialization method to set the loaded flag.
 
-        Initializes empty value dictionaries for each column and sets the
-        loaded flag based on whether db_id is None or -1.
+        Reserves a cell for each column and sets the loaded flag based on
+        whether db_id is None or -1.
         """
-        # Create records for each column.
-        for i in range(len(self.model.column_fields)):
-            self.values[i] = {}
+        # Reserve the cells for each column; they are created when used.
+        self.values.reserve(len(self.model.column_fields))
 
         # Mark it as loaded if it has a db_id.
         if self.db_id is None or self.db_id == -1:
@@ -76,9 +167,9 @@ class QtRecord:
 
         return ", ".join(
             str(
-                self.values[i].get(
+                self.values.get(i, {}).get(
                     Qt.ItemDataRole.DisplayRole,
-                    self.values[i].get(
+                    self.values.get(i, {}).get(
                         Qt.ItemDataRole.EditRole,
                         self.model.t("cmn.null", "NULL"),
                     ),
@@ -157,8 +248,7 @@ class QtRecord:
         self._loaded = value
         if not value:
             # Indicate that this is a stub record.
-            for i in range(len(self.model.column_fields)):
-                self.values[i][Qt.ItemDataRole.BackgroundRole] = LOADING_BRUSH
+            self.values.fill_role(Qt.ItemDataRole.BackgroundRole, LOADING_BRUSH)
 
     @property
     def error(self) -> bool:
@@ -181,8 +271,7 @@ class QtRecord:
         self._error = value
         if value:
             # Indicate that this record has an error.
-            for i in range(len(self.model.column_fields)):
-                self.values[i][Qt.ItemDataRole.BackgroundRole] = ERROR_BRUSH
+            self.values.fill_role(Qt.ItemDataRole.BackgroundRole, ERROR_BRUSH)
 
     def cell_index(self, col: int) -> "QModelIndex":
         """Return the index for the given column.
@@ -4,8 +4,10 @@ from typing import (
     Any,
     Dict,
     Generic,
+    Iterator,
     List,
     Optional,
+    Tuple,
     Type,
     TypeVar,
     Union,
@@ -16,8 +18,10 @@ from attrs import define, field
 from exdrf.filter import FieldFilter, FilterType
 from exdrf_al.utils import DelChoice
 from sqlalchemy import ColumnElement, and_, not_, or_
+from unidecode import unidecode
 
 if TYPE_CHECKING:
+    from exdrf_al.search_index import SearchIndex  # noqa: F401
     from sqlalchemy import Select  # noqa: F401
 
     from exdrf_qt.models.field import QtField  # noqa: F401
@@ -46,6 +50,9 @@ class Selector(Generic[DBM]):
         dialect: The SQLAlchemy dialect to use for the selection.
             This should be the engine.dialect.name value or None if the engine
             is not set.
+        search_index: The quick search index of the table, if it has one.
+            Quick searches are narrowed through it before their conditions
+            are evaluated.
     """
 
     db_model: Type[DBM] = field(repr=False)
@@ -56,6 +63,7 @@ class Selector(Generic[DBM]):
     qt_model: Optional["QtModel"] = field(default=None, repr=False)
     dialect: Optional[str] = field(default=None)
     no_dia_map: Dict[str, str] = field(factory=dict, repr=False)
+    search_index: Optional["SearchIndex"] = field(default=None, repr=False)
 
     def _single_def(self, definition: Any) -> Optional[ColumnElement]:
         """Process a single filter definition.
@@ -314,6 +322,7 @@ class Selector(Generic[DBM]):
         if not components:
             # No filters to apply.
             return base
+        components = self.search_prefilters(filters) + components
 
         # Apply the joins to the base selection.
         for join in self.joins:
@@ -331,6 +340,97 @@ class Selector(Generic[DBM]):
         # Apply the filters to the base selection.
         return base.where(*components)
 
+    def search_prefilters(self, filters: Any) -> List[ColumnElement]:
+        """Look the quick searches in the filters up in the search index.
+
+        A quick search is a condition that has to hold for the whole filter
+        (it is not under an "or" or a "not") and that is either an ``ilike``
+        field filter or an "or" group of them. Each condition that the index
+        can answer gets a pre-filter that selects a superset of its rows;
+        ANDed with the filters, the pre-filters leave the result unchanged.
+
+        Args:
+            filters: The filters, as given to `run`.
+
+        Returns:
+            The pre-filters; empty if the table has no index.
+        """
+        if self.search_index is None:
+            return []
+
+        result: List[ColumnElement] = []
+        for conjunct in self._conjuncts(filters):
+            pairs = self._search_pairs(conjunct)
+            if not pairs:
+                continue
+            prefilter = self.search_index.prefilter(pairs)
+            if prefilter is not None:
+                result.append(prefilter)
+        return result
+
+    def _conjuncts(self, definition: Any) -> Iterator[Any]:
+        """Yield the parts of a definition that must all hold."""
+        if not isinstance(definition, (list, tuple)):
+            yield definition
+        elif len(definition) == 2 and isinstance(definition[0], str):
+            if definition[0].lower() == "and" and isinstance(
+                definition[1], list
+            ):
+                for item in definition[1]:
+                    yield from self._conjuncts(item)
+            else:
+                yield definition
+        else:
+            for item in definition:
+                yield from self._conjuncts(item)
+
+    def _search_pairs(self, definition: Any) -> List[Tuple[str, str]]:
+        """Get the (field, pattern) pairs of a quick search.
+
+        Args:
+            definition: An ``ilike`` field filter or an "or" group of them.
+
+        Returns:
+            One pair for each column the search looks at, including the
+            columns without diacritics, or an empty list if the definition
+            is not a quick search.
+        """
+        if isinstance(definition, (list, tuple)):
+            if (
+                len(definition) != 2
+                or not isinstance(definition[0], str)
+                or definition[0].lower() != "or"
+                or not isinstance(definition[1], list)
+            ):
+                return []
+            items = definition[1]
+        else:
+            items = [definition]
+
+        pairs: List[Tuple[str, str]] = []
+        for item in items:
+            if isinstance(item, FieldFilter):
+                f_item = item
+            elif isinstance(item, dict):
+                try:
+                    f_item = FieldFilter(**item)
+                except Exception:
+                    return []
+            else:
+                return []
+            if (
+                f_item.op != "ilike"
+                or not isinstance(f_item.vl, str)
+                or f_item.fld not in self.fields
+            ):
+                return []
+
+            pairs.append((f_item.fld, f_item.vl))
+            no_dia = self.no_dia_map.get(f_item.fld)
+            if no_dia:
+                pairs.append((no_dia, unidecode(f_item.vl)))
+        return pairs
+
     @classmethod
     def from_qt_model(
         cls, qt_model: "QtModel[DBM]", **kwargs: Any
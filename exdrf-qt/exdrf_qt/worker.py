@@ -3,6 +3,7 @@ import logging
 import threading
 import time
 from collections import deque
+from contextlib import ExitStack
 from queue import Empty
 from typing import (
     TYPE_CHECKING,
@@ -19,6 +20,7 @@ from uuid import uuid4
 
 import sqlparse
 from attrs import define, field
+from exdrf_al.connection import DEFAULT_WORKER_THREADS
 from PyQt5.QtCore import QObject, pyqtSignal
 from sqlalchemy import Select
 
@@ -219,7 +221,12 @@ class WorkerStats:
 
 
 class WorkQueue:
-    """A queue of work to be done by the worker thread."""
+    """A queue of work to be done by the worker thread.
+
+    Threads blocked in `get()` are woken up as soon as work is added, or
+    when `wake_all()` is called (for example to let them notice that they
+    should stop).
+    """
 
     heaps: Dict[Hashable, List[tuple[float, int, "Work"]]]
     active: Deque[Hashable]
@@ -227,6 +234,7 @@ class WorkQueue:
     seq: int
     lock: threading.Lock
     not_empty: threading.Condition
+    wakeups: int
 
     def __init__(self) -> None:
         self.heaps = {}
@@ -235,6 +243,7 @@ class WorkQueue:
         self.seq = 0
         self.lock = threading.Lock()
         self.not_empty = threading.Condition(self.lock)
+        self.wakeups = 0
 
     def __len__(self) -> int:
         with self.lock:
@@ -264,14 +273,27 @@ class WorkQueue:
 
             self.not_empty.notify()
 
+    def wake_all(self) -> None:
+        """Wake up all threads waiting in `get()`.
+
+        Threads that find no work raise `Empty`.
+        """
+        with self.not_empty:
+            self.wakeups += 1
+            self.not_empty.notify_all()
+
     def get(self, block: bool = True, timeout: float | None = None) -> "Work":
         with self.not_empty:
             if not block:
                 if not self.active:
                     raise Empty("get from empty WorkQueue")
             else:
+                wakeups = self.wakeups
                 if not self.not_empty.wait_for(
-                    predicate=lambda: bool(self.active), timeout=timeout
+                    predicate=lambda: (
+                        bool(self.active) or self.wakeups != wakeups
+                    ),
+                    timeout=timeout,
                 ):
                     raise TimeoutError("Timed out waiting for item")
 
@@ -355,8 +377,20 @@ class Work:
 class Relay(QObject):
     """A class that lives in the main thread and is informed about the
     completion of the worker thread.
+
+    Attributes:
+        cn: The database connection used by the workers.
+        threads_count: The number of worker threads requested by the
+            caller. If None, the `threads_count` of the connection is used;
+            that is only known after the connection is established, so
+            workers are added later when the first ones connect.
+        workers: The worker threads; they are started on demand.
+        data: The work that was pushed and has no result yet, by ID.
+        queue: The queue shared by all workers.
     """
 
+    cn: "DbConn"
+    threads_count: Optional[int]
     workers: List["Worker"]
     data: Dict[Any, Work]
     queue: WorkQueue
@@ -364,17 +398,38 @@ class Relay(QObject):
     def __init__(
         self,
         cn: "DbConn",
-        threads_count: int = 4,
+        threads_count: Optional[int] = None,
         parent: Optional[QObject] = None,
     ):
         super().__init__(parent)
+        self.cn = cn
+        self.threads_count = threads_count
         self.data = {}
         self.queue = WorkQueue()
         self.workers = []
-        for i in range(threads_count):
-            worker = Worker(queue=self.queue, cn=cn, parent=self, my_id=str(i))
-            worker.haveResult.connect(self.handle_result)
-            self.workers.append(worker)
+        for _ in range(self.max_threads()):
+            self.add_worker()
+
+    def max_threads(self) -> int:
+        """The number of worker threads this relay should use."""
+        if self.threads_count is not None:
+            return max(1, self.threads_count)
+        from_conn = getattr(self.cn, "threads_count", None)
+        if isinstance(from_conn, int) and from_conn > 0:
+            return from_conn
+        return DEFAULT_WORKER_THREADS
+
+    def add_worker(self) -> "Worker":
+        """Create a new (not started) worker thread."""
+        worker = Worker(
+            queue=self.queue,
+            cn=self.cn,
+            parent=self,
+            my_id=str(len(self.workers)),
+        )
+        worker.haveResult.connect(self.handle_result)
+        self.workers.append(worker)
+        return worker
 
     def handle_result(self, work_id: Any):
         """Handle the result from the worker thread.
@@ -412,6 +467,7 @@ class Relay(QObject):
             if worker.isRunning():
                 worker.should_stop = True
                 worker.quit()
+        self.queue.wake_all()
         for worker in self.workers:
             if worker.isRunning():
                 worker.wait()
@@ -481,10 +537,15 @@ class Relay(QObject):
                 provided, a new one will be generated.
             use_unique: Whether to use unique() on the result.
         """
-        for worker in self.workers:
+        # Once connected, the connection may allow more or fewer workers.
+        max_threads = self.max_threads()
+        for worker in self.workers[:max_threads]:
             if not worker.isRunning():
                 worker.start()
                 break
+        else:
+            if len(self.workers) < max_threads:
+                self.add_worker().start()
 
         # Handle the case where a Work object is passed directly.
         if isinstance(statement_or_work, Work):
@@ -516,11 +577,26 @@ class Worker(PythonThread):
     The worker implements a priority queue to process the work in the order
     of priority among their classes.
 
+    The worker waits on the queue until work arrives, so new work starts
+    as soon as it is pushed. All work runs in one session that the worker
+    keeps for its whole life, bound to its own pooled connection; between
+    two units of work the session is emptied and its transaction rolled
+    back. After an error, or when no work arrived for
+    `session_idle_release` seconds, the session is closed and a new one
+    is opened for the next work.
+
     Attributes:
         queue: The queue to read from.
         should_stop: A flag to indicate if the worker should stop. It is set
             by the relay through the `stop()` method.
         cn: The database connection to use.
+        idle_timeout: How long to wait for work before checking again if
+            the worker should stop.
+        session_idle_release: Idle time, in seconds, after which the session
+            (and its connection) is given back.
+        _session_stack: Holds the open session, if any.
+        _session: The long-lived session of this worker.
+        _session_used_at: Monotonic time of the last use of the session.
 
     Signals:
         haveResult: Emitted when the worker has a result to send to the relay.
@@ -531,7 +607,12 @@ class Worker(PythonThread):
     cn: "DbConn"
     my_id: str
     work: Optional["Work"]
+    idle_timeout: float = 5.0
+    session_idle_release: float = 300.0
     _stats: WorkerStats
+    _session_stack: ExitStack
+    _session: Optional["Session"]
+    _session_used_at: float
 
     haveResult = pyqtSignal(object)
 
@@ -549,10 +630,42 @@ class Worker(PythonThread):
         self.queue = queue
         self.cn = cn
         self.setObjectName(f"ExdrfWorkerThread{my_id}")
+        self._session_stack = ExitStack()
+        self._session = None
+        self._session_used_at = 0.0
 
         # Maintain worker thread statistics for UI/debugging.
         self._stats = WorkerStats(max_history=10)
 
+    def get_session(self) -> "Session":
+        """Return the session of this worker, opening it if needed."""
+        if self._session is None:
+            self._session = self._session_stack.enter_context(
+                self.cn.session(add_to_stack=False, own_connection=True)
+            )
+        self._session_used_at = time.monotonic()
+        return self._session
+
+    def reset_session(self) -> None:
+        """Prepare the session for the next unit of work.
+
+        Loaded objects are detached (the results keep working in the main
+        thread) and the transaction is rolled back, so no locks or snapshots
+        are held while the worker is idle.
+        """
+        if self._session is None:
+            return
+        self._session.expunge_all()
+        self._session.rollback()
+
+    def close_session(self) -> None:
+        """Close the session and give its connection back to the pool."""
+        self._session = None
+        try:
+            self._session_stack.close()
+        except Exception as e:
+            logger.debug("Error while closing the worker session: %s", e)
+
     def get_stats_snapshot(self) -> dict[str, Any]:
         """Return a thread-safe snapshot of the worker statistics.
 
@@ -564,13 +677,25 @@ class Worker(PythonThread):
     def run(self) -> None:
         """The main function of the worker thread."""
         threading.current_thread().name = f"ExdrfWorkerThread{self.my_id}"
+        try:
+            self._run_loop()
+        finally:
+            self.close_session()
+
+    def _run_loop(self) -> None:
+        """Execute work until asked to stop."""
         while not self.should_stop:
             self.work = None
             try:
-                work: "Work" = self.queue.get(timeout=0.5)
+                work: "Work" = self.queue.get(timeout=self.idle_timeout)
                 self.work = work
             except (TimeoutError, Empty):
-                time.sleep(0.25)
+                if (
+                    self._session is not None
+                    and time.monotonic() - self._session_used_at
+                    > self.session_idle_release
+                ):
+                    self.close_session()
                 continue
 
             # Record that the work has started.
@@ -579,8 +704,8 @@ class Worker(PythonThread):
 
             # Execute the work against the DB.
             try:
-                with self.cn.session() as session:
-                    work.perform(session)
+                work.perform(self.get_session())
+                self.reset_session()
                 logger.log(
                     VERBOSE,
                     "\n\nWork with ID %s completed in worker thread, "
@@ -602,6 +727,10 @@ class Worker(PythonThread):
                 )
                 work.error = e
 
+                # The session may be unusable (lost connection, failed
+                # transaction); start over with a new one.
+                self.close_session()
+
             # Record completion statistics (even on error).
             duration_s = time.perf_counter() - work_started
             self._stats.record_finished(
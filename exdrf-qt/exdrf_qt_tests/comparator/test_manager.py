@@ -1,7 +1,7 @@
 from typing import Optional, cast
 
 from exdrf_qt.comparator.logic.manager import ComparatorManager
-from exdrf_qt.comparator.logic.nodes import LeafNode, ParentNode
+from exdrf_qt.comparator.logic.nodes import LeafNode, ParentNode, ngram_tokens
 
 
 def _find_child_by_key(
@@ -47,3 +47,66 @@ def test_compare_merges_children_and_values(manager_factory):
     nested_missing = _find_child_by_key(grp, "nested_missing")
     assert isinstance(nested_missing, LeafNode)
     assert [v.exists for v in nested_missing.values] == [False, True, False]
+
+
+class _CountingParent(ParentNode):
+    """Scores the trigrams shared by labels; counts the compare() calls."""
+
+    calls = 0
+
+    def compare(self, first, second) -> int:
+        _CountingParent.calls += 1
+        if first.key == second.key:
+            return -1
+        return len(ngram_tokens(first.label) & ngram_tokens(second.label))
+
+    def match_tokens(self, node):
+        return ngram_tokens(node.label)
+
+
+def _parent(mgr, keys_labels):
+    root = _CountingParent(manager=mgr, key="root")
+    for key, label in keys_labels:
+        root.add_child(LeafNode(manager=mgr, key=key, label=label, parent=root))
+    return root
+
+
+def test_match_children_pairs_keys_without_scoring():
+    mgr = ComparatorManager()
+    count = 2000
+    first = _parent(mgr, [("k%d" % i, "L%d" % i) for i in range(count)])
+    second = _parent(
+        mgr, [("k%d" % i, "L%d" % i) for i in reversed(range(count))]
+    )
+
+    _CountingParent.calls = 0
+    matched = mgr.match_children(second, list(first.children))
+    assert _CountingParent.calls == 0
+    assert matched == {r: count - 1 - r for r in range(count)}
+
+
+def test_match_children_scores_only_shared_tokens():
+    mgr = ComparatorManager()
+    first = _parent(
+        mgr, [("a", "alpha"), ("b", "bravo"), ("c", "charlie"), ("d", "x")]
+    )
+    second = _parent(mgr, [("c2", "charlie"), ("a2", "alpha"), ("z", "zulu")])
+
+    _CountingParent.calls = 0
+    matched = mgr.match_children(second, list(first.children))
+    assert matched == {0: 2, 1: 0}
+    # Only the pairs that share a trigram were scored.
+    assert _CountingParent.calls == 2
+
+
+def test_match_children_takes_best_scores_first():
+    mgr = ComparatorManager()
+    first = _parent(mgr, [("a", "abcdef"), ("b", "abcxyz"), ("k", "q")])
+    second = _parent(
+        mgr, [("x", "abcdeq"), ("k", "w"), ("y", "abcdef"), ("z", "klm")]
+    )
+
+    # The key pair needs no score; "abcdef" is the best pair of the rest,
+    # so the first child gets the node left over.
+    matched = mgr.match_children(second, list(first.children))
+    assert matched == {1: 2, 2: 0, 0: 1}
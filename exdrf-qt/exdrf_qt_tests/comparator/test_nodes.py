@@ -4,6 +4,7 @@ from exdrf_qt.comparator.logic.nodes import (
     LeafNode,
     ParentNode,
     Value,
+    ngram_tokens,
 )
 
 
@@ -49,3 +50,9 @@ def test_leaf_equality_similarity_and_html_diff():
     # html_diff marks replaces with spans
     left_html, right_html = tmp.html_diff("foo", "f0o")
     assert 'class="del"' in left_html or 'class="ins"' in right_html
+
+
+def test_ngram_tokens():
+    assert ngram_tokens("Abcd") == {"abc", "bcd"}
+    assert ngram_tokens("ab") == {"ab"}
+    assert ngram_tokens("") == set()
@@ -0,0 +1,215 @@
+"""Tests for the persistent check worker pool."""
+
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+
+import pytest
+from exdrf_util.check import (
+    Check,
+    ResultState,
+    exdrf_check_impl,
+    exdrf_checks_pm,
+)
+from exdrf_util.task import TaskParameter
+
+from exdrf_qt.controls.checks.mp_executor import CheckWorkerPool
+
+RECORDS = 10
+
+
+class _ParityCheck(Check[int]):
+    """Flags the records that are multiples of three."""
+
+    def prepare_check(self, ctx):
+        return {"records": list(range(RECORDS))}
+
+    def get_record_to_check(self, step, data):
+        return data["records"][step]
+
+    def get_record_id(self, step, data, item):
+        return str(item)
+
+    def execute(self, ctx, item, result=None):
+        assert result is not None
+        result.state = ResultState.PASSED if item % 3 else ResultState.NOT_FIXED
+        result.params["pid"] = os.getpid()
+        result.params["step"] = self.parameters["step"].value
+        return result
+
+
+class _Plugin:
+    @exdrf_check_impl
+    def exdrf_checks(self, ctx, for_gui):
+        step = TaskParameter(name="step", type_name="int", value=1)
+        return [
+            _ParityCheck(
+                check_id="parity", title="Parity", parameters={"step": step}
+            )
+        ]
+
+
+def register_checks() -> None:
+    """Bootstrap callable for the workers."""
+    exdrf_checks_pm.register(_Plugin())
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """A pool of two workers with the test check registered."""
+    # Keep the settings the workers write out of the user's profile.
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    (tmp_path / "migrations").mkdir()
+    monkeypatch.setenv("EXDRF_DB_MIGRATIONS_DIR", str(tmp_path / "migrations"))
+    result = CheckWorkerPool(
+        mp.get_context("spawn"),
+        2,
+        bootstrap_callables=[f"{__name__}.register_checks"],
+    )
+    yield result
+    result.shutdown()
+
+
+def _job(db, shard=0, shards=1):
+    return {
+        "check_id": "parity",
+        "shard": shard,
+        "shards": shards,
+        "db": db,
+        "param_values": {},
+        "bootstrap_imports": [],
+    }
+
+
+def _collect(pool, jobs, timeout=120.0):
+    """Wait for the `done` message of each job and return all messages."""
+    messages = []
+    deadline = time.monotonic() + timeout
+    while sum(m["type"] == "done" for m in messages) < jobs:
+        try:
+            messages.append(pool.get_message(timeout=1.0))
+        except queue.Empty:
+            assert time.monotonic() < deadline, messages
+    return messages
+
+
+def _results(messages):
+    return {
+        m["shard"]: m["results"] for m in messages if m["type"] == "results"
+    }
+
+
+class TestCheckWorkerPool:
+    """Tests for CheckWorkerPool and the worker loop."""
+
+    def test_workers_are_reused(self, pool, tmp_path):
+        """Later runs are served by the processes of the first one."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        pids = []
+        for _run in range(2):
+            for _ in range(3):
+                pool.submit(_job(db))
+            messages = _collect(pool, 3)
+            assert not [m for m in messages if m["type"] == "error"]
+            pids.append({m["pid"] for m in messages if m["type"] == "started"})
+
+        assert len(pool.pids) == 2
+        assert pids[0] | pids[1] <= set(pool.pids)
+
+    def test_shards_cover_the_records_in_order(self, pool, tmp_path):
+        """The shards of a check split its records in consecutive slices."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        for shard in range(3):
+            pool.submit(_job(db, shard, 3))
+        by_shard = _results(_collect(pool, 3))
+
+        merged = [r for s in sorted(by_shard) for r in by_shard[s]]
+        assert [r["params"]["id"] for r in merged] == [
+            str(i) for i in range(RECORDS)
+        ]
+        assert [len(by_shard[s]) for s in range(3)] == [3, 3, 4]
+        assert [r["state"] for r in merged[:4]] == [
+            "not_fixed",
+            "passed",
+            "passed",
+            "not_fixed",
+        ]
+
+    def test_dead_workers_are_reaped(self, pool, tmp_path):
+        """A killed idle worker is forgotten and replaced on demand."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        pool.submit(_job(db))
+        _collect(pool, 1)
+        (pid,) = pool.pids
+
+        os.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + 10
+        while pool.pids and time.monotonic() < deadline:
+            assert pool.reap() == []
+        assert pool.pids == []
+
+        pool.submit(_job(db))
+        messages = _collect(pool, 1)
+        assert not [m for m in messages if m["type"] == "error"]
+        assert len(pool.pids) == 1 and pool.pids != [pid]
+
+    def test_worker_killed_during_startup(self, pool, tmp_path):
+        """The job of a worker that dies before it starts it is lost."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        pool.submit(_job(db))
+        (pid,) = pool.pids
+
+        # The worker is still importing modules and cannot report anything.
+        os.kill(pid, signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        lost = []
+        while not lost and time.monotonic() < deadline:
+            lost = pool.reap()
+        assert lost == [("parity", 0)]
+        assert pool.reap() == []
+        assert pool.out_q.empty()
+
+        # The next job gets a new worker.
+        pool.submit(_job(db))
+        messages = _collect(pool, 1)
+        assert [m["type"] for m in messages][0] == "started"
+        assert pool.pids != [pid]
+
+    def test_unknown_check_reports_an_error(self, pool, tmp_path):
+        """Each job ends with `done`, even when it fails."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        job = _job(db)
+        job["check_id"] = "missing"
+        pool.submit(job)
+        messages = _collect(pool, 1)
+
+        assert [m["type"] for m in messages] == ["started", "error", "done"]
+        assert "missing" in messages[1]["error"]
+
+    def test_parameters_do_not_leak_between_jobs(self, pool, tmp_path):
+        """A worker puts the parameters of a check back after a job."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        job = _job(db)
+        job["param_values"] = {"step": 5}
+        pool.submit(job)
+        first = _results(_collect(pool, 1))[0]
+        pool.submit(_job(db))
+        second = _results(_collect(pool, 1))[0]
+
+        assert len(pool.pids) == 1
+        assert {r["params"]["step"] for r in first} == {5}
+        assert {r["params"]["step"] for r in second} == {1}
+
+    def test_list_records_are_not_split(self, pool, tmp_path):
+        """The first shard checks all the records it cannot split."""
+        db = {"c_string": f"sqlite:///{tmp_path / 'db.sqlite'}"}
+        job = _job(db, 0, 3)
+        job["split"] = True
+        pool.submit(job)
+        messages = _collect(pool, 1)
+
+        splits = [m for m in messages if m["type"] == "split"]
+        assert [m["bounds"] for m in splits] == [None]
+        assert len(_results(messages)[0]) == RECORDS
@@ -0,0 +1,173 @@
+"""Tests for the pixmap and render caches of the PDF viewer."""
+
+import os
+import shutil
+import time
+
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QImage, QPixmap
+
+from exdrf_qt.controls.pdf_viewer.pdf_image_viewer import PdfImageViewer
+from exdrf_qt.controls.pdf_viewer.pdf_render_worker import PdfRenderService
+from exdrf_qt.controls.pdf_viewer.render_cache import (
+    PixmapCache,
+    RenderCache,
+    file_digest,
+)
+
+fitz = pytest.importorskip("fitz")
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """A small PDF with a different text on each page."""
+    doc = fitz.open()
+    for i in range(6):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 40 + i * 30), f"Page {i + 1}", fontsize=18)
+    path = str(tmp_path / "doc.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _image(color, width=10, height=10):
+    image = QImage(width, height, QImage.Format_RGB888)
+    image.fill(QColor(color))
+    return image
+
+
+def _wait(condition, timeout=60.0, app=None):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        if app is not None:
+            app.processEvents()
+        time.sleep(0.01)
+
+
+class TestPixmapCache:
+    """Tests for the in-memory pixmap cache."""
+
+    def test_least_recently_used_outside_window_go(self, qt_app):
+        """Eviction follows use but spares the protected pages."""
+        evicted = []
+        one = QPixmap(10, 10)
+        size = one.width() * one.height() * one.depth() // 8
+        cache = PixmapCache(3 * size, on_evict=evicted.append)
+
+        for i in range(3):
+            cache[i] = QPixmap(10, 10)
+        assert cache.get(0) is not None
+        cache.protect([1])
+        cache[3] = QPixmap(10, 10)
+
+        # 0 was used recently and 1 is protected, so 2 goes.
+        assert evicted == [2]
+        assert sorted(i for i in range(4) if i in cache) == [0, 1, 3]
+        assert cache.size == 3 * size
+
+        # Protected pages may exceed the budget.
+        cache.protect([0, 1, 3, 4])
+        cache[4] = QPixmap(10, 10)
+        assert len(cache) == 4 and evicted == [2]
+
+
+class TestRenderCache:
+    """Tests for the persistent render cache."""
+
+    def test_pages_round_trip_by_content(self, qt_app, tmp_path, pdf_path):
+        """A page is found again for a copy of the same document."""
+        cache = RenderCache(str(tmp_path / "cache"), 1 << 20)
+        image = _image("red", 7, 5)
+        cache.put(file_digest(pdf_path), 2, 72, 0, image)
+
+        copy = str(tmp_path / "copy.pdf")
+        shutil.copyfile(pdf_path, copy)
+        other = RenderCache(str(tmp_path / "cache"), 1 << 20)
+        assert other.get(file_digest(copy), 2, 72) == image
+        assert other.get(file_digest(copy), 2, 96) is None
+        assert other.get(file_digest(copy), 2, 72, rotation=90) is None
+
+    def test_size_is_capped(self, qt_app, tmp_path):
+        """The least recently used pages are removed from the disk."""
+        page = _image("blue")
+        cache = RenderCache(str(tmp_path / "cache"), 1 << 20)
+        cache.put("doc", 0, 72, 0, page)
+        (entry,) = os.listdir(tmp_path / "cache")
+        one = os.path.getsize(tmp_path / "cache" / entry)
+
+        cache = RenderCache(str(tmp_path / "cache"), 3 * one)
+        for i in range(1, 3):
+            cache.put("doc", i, 72, 0, page)
+            time.sleep(0.02)
+        assert cache.get("doc", 0, 72) is not None
+        cache.put("doc", 3, 72, 0, page)
+
+        assert cache.get("doc", 1, 72) is None
+        assert all(cache.get("doc", i, 72) is not None for i in (0, 2, 3))
+        assert len(os.listdir(tmp_path / "cache")) == 3
+
+    def test_service_reads_the_cache(self, qt_app, tmp_path, pdf_path):
+        """A second renderer finds every page and renders none."""
+        cache = RenderCache(str(tmp_path / "cache"), 1 << 26)
+        first = {}
+        service = PdfRenderService(
+            pdf_path, str(tmp_path), 72, processes=1, cache=cache
+        )
+        service.imageRendered.connect(
+            lambda i, img: first.__setitem__(i, img), Qt.DirectConnection
+        )
+        try:
+            service.submit_pages(list(range(6)))
+            _wait(lambda: len(first) == 6)
+        finally:
+            service.stop()
+
+        out_dir = tmp_path / "png"
+        out_dir.mkdir()
+        second = {}
+        service = PdfRenderService(pdf_path, str(out_dir), 72, cache=cache)
+        service.imageRendered.connect(
+            lambda i, img: second.__setitem__(i, img), Qt.DirectConnection
+        )
+        try:
+            service.submit_pages(list(range(6)))
+            _wait(lambda: len(second) == 6)
+        finally:
+            service.stop()
+
+        assert os.listdir(out_dir) == []
+        assert all(second[i] == first[i] for i in range(6))
+
+
+class TestPdfImageViewerCache:
+    """Tests for the caches as used by the viewer."""
+
+    def test_evicted_pages_come_back(
+        self, mock_ctx, qt_app, pdf_path, tmp_path, monkeypatch
+    ):
+        """Memory stays within the window; pages left behind reload."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        viewer = PdfImageViewer(ctx=mock_ctx)
+        viewer._pix_cache.budget = 0
+        try:
+            viewer.set_pdf(pdf_path, dpi=72, lookahead=1, processes=1)
+            _wait(lambda: viewer.get_cached_pixmap(1) is not None, app=qt_app)
+            for _ in range(4):
+                viewer.next_page()
+            _wait(lambda: viewer.get_cached_pixmap(5) is not None, app=qt_app)
+
+            # Only the view window around page 5 is kept.
+            assert all(
+                i in range(3, 6) for i in range(6) if i in viewer._pix_cache
+            )
+            assert 0 not in viewer._rendered_pages
+
+            for _ in range(4):
+                viewer.prev_page()
+            _wait(lambda: viewer.get_cached_pixmap(1) is not None, app=qt_app)
+            assert os.listdir(tmp_path / "xdg" / "exdrf" / "pdf-pages")
+        finally:
+            viewer._cleanup_temp_dir()
@@ -0,0 +1,228 @@
+"""Tests for the process pool of PdfRenderService."""
+
+import os
+import time
+
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+from exdrf_qt.controls.pdf_viewer.pdf_image_viewer import PdfImageViewer
+from exdrf_qt.controls.pdf_viewer.pdf_render_worker import (
+    PRIORITY_LOOKAHEAD,
+    PRIORITY_VISIBLE,
+    PdfRenderService,
+    TileKey,
+)
+
+fitz = pytest.importorskip("fitz")
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    """A small PDF with a different text on each page."""
+    doc = fitz.open()
+    for i in range(6):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 40 + i * 30), f"Page {i + 1}", fontsize=18)
+    path = str(tmp_path / "doc.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _wait(condition, timeout=60.0, app=None):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        if app is not None:
+            app.processEvents()
+        time.sleep(0.01)
+
+
+class TestPdfRenderService:
+    """Tests for the renderer service."""
+
+    def test_pool_matches_thread_rendering(self, pdf_path, tmp_path):
+        """Pages from the processes equal the ones rendered to PNG files."""
+        images = {}
+        paths = {}
+        pool = PdfRenderService(pdf_path, str(tmp_path), 72, processes=2)
+        pool.imageRendered.connect(
+            lambda i, img: images.__setitem__(i, img), Qt.DirectConnection
+        )
+        thread = PdfRenderService(pdf_path, str(tmp_path), 72)
+        thread.pageRendered.connect(
+            lambda i, p: paths.__setitem__(i, p), Qt.DirectConnection
+        )
+        try:
+            pool.submit_pages([0, 1, 2, 3, 4, 5])
+            thread.submit_pages([0, 1, 2, 3, 4, 5])
+            _wait(lambda: len(images) == 6 and len(paths) == 6)
+        finally:
+            pool.stop()
+            thread.stop()
+
+        for i in range(6):
+            expected = QImage(paths[i]).convertToFormat(QImage.Format_RGB888)
+            assert images[i].size() == expected.size()
+            assert images[i] == expected
+        # Only the thread mode wrote files.
+        assert sorted(os.listdir(tmp_path)) == ["doc.pdf"] + [
+            f"page-{i:04d}.png" for i in range(1, 7)
+        ]
+
+    def test_visible_pages_go_first(self, tmp_path):
+        """Visible pages jump ahead; newer requests beat older ones."""
+        # The service gives up on a missing file, leaving the queue to us.
+        service = PdfRenderService(str(tmp_path / "missing.pdf"), "", 72)
+        assert service._thread is not None
+        service._thread.join(timeout=10)
+
+        service.submit_pages([0, 1, 2, 3])
+        service.submit_pages([3, 4, 5])
+        service.submit_pages([2], PRIORITY_VISIBLE)
+        service.submit_pages([9], PRIORITY_VISIBLE)
+        service.submit_pages([9], PRIORITY_LOOKAHEAD)
+        assert service._take_jobs(0)
+
+        order = []
+        while (page := service._pop()) is not None:
+            order.append(page)
+        assert order == [9, 2, 3, 4, 5, 0, 1]
+
+    @pytest.mark.parametrize("processes", [0, 2])
+    def test_tiles_cover_the_page(self, pdf_path, tmp_path, processes):
+        """Tiles are rendered at their scale and clipped at the edges."""
+        tiles = {}
+        service = PdfRenderService(
+            pdf_path, str(tmp_path), 72, processes=processes
+        )
+        service.tileRendered.connect(
+            lambda k, img: tiles.__setitem__(k, img), Qt.DirectConnection
+        )
+        keys = [TileKey(1, 4, col, row) for row in range(3) for col in range(2)]
+        try:
+            service.submit_tiles(keys)
+            _wait(lambda: len(tiles) == 6)
+        finally:
+            service.stop()
+
+        # The page is 200 x 300 points, so 800 x 1200 pixels at 4 x 72 dpi.
+        sizes = {
+            (k.col, k.row): (img.width(), img.height())
+            for k, img in tiles.items()
+        }
+        assert sizes == {
+            (0, 0): (512, 512),
+            (1, 0): (288, 512),
+            (0, 1): (512, 512),
+            (1, 1): (288, 512),
+            (0, 2): (512, 176),
+            (1, 2): (288, 176),
+        }
+        # Tiles do not end up in the temp dir.
+        assert os.listdir(tmp_path) == ["doc.pdf"]
+
+    def test_new_tiles_replace_waiting_ones(self, tmp_path):
+        """Waiting tiles are dropped by a newer request; pages are kept."""
+        service = PdfRenderService(str(tmp_path / "missing.pdf"), "", 72)
+        assert service._thread is not None
+        service._thread.join(timeout=10)
+
+        a, b, c = (TileKey(0, 2, col, 0) for col in range(3))
+        service.submit_pages([0, 1])
+        service.submit_tiles([a, b])
+        service.submit_tiles([b, c])
+        service.submit_pages([5], PRIORITY_VISIBLE)
+        assert service._take_jobs(0)
+
+        order = []
+        while (key := service._pop()) is not None:
+            order.append(key)
+        assert order == [5, b, c, 0, 1]
+
+    def test_lost_keys_are_retried_once(self, tmp_path):
+        """A key lost by a dead worker goes first, then is reported."""
+        service = PdfRenderService(str(tmp_path / "missing.pdf"), "", 72)
+        assert service._thread is not None
+        service._thread.join(timeout=10)
+        failed = []
+        service.renderFailed.connect(failed.append, Qt.DirectConnection)
+
+        tile = TileKey(1, 2, 0, 0)
+        service.submit_pages([0, 1, 2])
+        assert service._take_jobs(0)
+        service._in_flight.update([2, tile])
+        service._on_lost(2)
+        service._on_lost(tile)
+        assert failed == []
+        assert service._in_flight == set()
+
+        order = []
+        while (key := service._pop()) is not None:
+            order.append(key)
+        assert order == [2, tile, 0, 1]
+
+        service._on_lost(2)
+        assert failed == [2]
+        assert service._pop() is None
+
+
+class TestPdfImageViewerPool:
+    """Tests for the viewer fed by the process pool."""
+
+    def test_pages_arrive_without_files(self, mock_ctx, qt_app, pdf_path):
+        """The viewer shows pool pages and leaves its temp dir empty."""
+        viewer = PdfImageViewer(ctx=mock_ctx)
+        try:
+            viewer.set_pdf(pdf_path, dpi=72, lookahead=2, processes=2)
+            _wait(
+                lambda: all(
+                    viewer.get_cached_pixmap(n) is not None for n in (1, 2, 3)
+                ),
+                app=qt_app,
+            )
+            assert viewer.get_cached_pixmap(1).width() == 200
+            assert viewer._pix_items
+            assert viewer._temp_dir is not None
+            assert os.listdir(viewer._temp_dir) == []
+        finally:
+            viewer._cleanup_temp_dir()
+
+    def test_failed_page_is_no_longer_queued(self, mock_ctx, qt_app, pdf_path):
+        """A page the worker gives up on can be requested again."""
+        viewer = PdfImageViewer(ctx=mock_ctx)
+        try:
+            viewer.set_pdf(pdf_path, dpi=72, lookahead=2, processes=0)
+            viewer._queued_pages.add(4)
+            viewer._on_render_failed(TileKey(4, 2, 0, 0))
+            assert 4 in viewer._queued_pages
+            viewer._on_render_failed(4)
+            assert 4 not in viewer._queued_pages
+        finally:
+            viewer._cleanup_temp_dir()
+
+    def test_zoom_shows_tiles(self, mock_ctx, qt_app, pdf_path):
+        """Zooming in covers the visible part of the page with tiles."""
+        viewer = PdfImageViewer(ctx=mock_ctx)
+        viewer.resize(400, 400)
+        viewer.show()
+        try:
+            viewer.set_pdf(pdf_path, dpi=72, lookahead=0, processes=2)
+            _wait(lambda: 0 in viewer._page_items, app=qt_app)
+
+            viewer._view.reset_zoom(3.0)
+            _wait(lambda: viewer._tile_items, app=qt_app)
+            assert viewer._tile_scale == 4
+            for key, item in viewer._tile_items.items():
+                assert (key.page, key.scale) == (0, 4)
+                assert item.parentItem() is viewer._page_items[0]
+
+            # Back to 100% the page alone is sharp enough.
+            viewer._view.reset_zoom(1.0)
+            viewer._update_tiles()
+            assert viewer._tile_scale == 1
+            assert not viewer._tile_items
+        finally:
+            viewer.close()
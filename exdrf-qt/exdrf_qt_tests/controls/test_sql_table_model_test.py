@@ -0,0 +1,188 @@
+"""Tests for the block-fetching SqlTableModel."""
+
+import time
+
+import pytest
+from PyQt5.QtCore import QModelIndex, Qt
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from exdrf_qt.controls.table_viewer import sql_table_model
+from exdrf_qt.controls.table_viewer.column_filter_proxy import ColumnFilterProxy
+from exdrf_qt.controls.table_viewer.sql_table_model import (
+    BLOCK_SIZE,
+    SqlTableModel,
+)
+
+ROWS = BLOCK_SIZE * 3 + 10
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """A SQLite database with one table of ROWS rows."""
+    eng = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    meta = MetaData()
+    items = Table(
+        "items",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50)),
+        Column("size", Integer),
+    )
+    meta.create_all(eng)
+    with eng.begin() as conn:
+        conn.execute(
+            items.insert(),
+            [
+                {"id": i, "name": f"item {i:04d}", "size": i % 7}
+                for i in range(1, ROWS + 1)
+            ],
+        )
+    yield eng
+    eng.dispose()
+
+
+def _wait(app, condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def _fetch_all(app, model):
+    while model.canFetchMore(QModelIndex()):
+        before = model.rowCount()
+        model.fetchMore(QModelIndex())
+        _wait(
+            app,
+            lambda: (
+                model.rowCount() > before
+                or not model.canFetchMore(QModelIndex())
+            ),
+        )
+
+
+def _ids(model):
+    return [model.raw_row(r)[0] for r in range(model.rowCount())]
+
+
+class TestSqlTableModel:
+    """Tests for the windowed model."""
+
+    def test_rows_arrive_in_blocks(self, qt_app, engine):
+        """The model starts with one block and grows on fetchMore."""
+        model = SqlTableModel(engine=engine, schema=None, table="items")
+        try:
+            assert model.rowCount() == 0
+            _wait(qt_app, lambda: model.rowCount() == BLOCK_SIZE)
+            assert model.canFetchMore(QModelIndex())
+
+            _fetch_all(qt_app, model)
+            assert model.rowCount() == ROWS
+            assert _ids(model) == list(range(1, ROWS + 1))
+            assert model.data(model.index(3, 1)) == "item 0004"
+        finally:
+            model.close()
+
+    def test_filter_and_sort_run_in_sql(self, qt_app, engine):
+        """The proxy passes the filter and the sort to the model."""
+        model = SqlTableModel(engine=engine, schema=None, table="items")
+        proxy = ColumnFilterProxy()
+        proxy.setSourceModel(model)
+        try:
+            proxy.set_filter(2, "3")
+            proxy.sort(1, Qt.SortOrder.DescendingOrder)
+            _wait(qt_app, lambda: model.rowCount() > 0)
+            _fetch_all(qt_app, model)
+
+            expected = [i for i in range(ROWS, 0, -1) if i % 7 == 3]
+            assert _ids(model) == expected
+            assert proxy.rowCount() == len(expected)
+            first = proxy.index(0, 0)
+            assert proxy.mapToSource(first).row() == 0
+
+            # Underscores and percents are matched literally.
+            proxy.set_filter(2, "")
+            proxy.set_filter(1, "m_0")
+            _wait(qt_app, lambda: not model.canFetchMore(QModelIndex()))
+            assert model.rowCount() == 0
+        finally:
+            model.close()
+
+    def test_cache_is_bounded(self, qt_app, engine, monkeypatch):
+        """Dropped blocks are read again when they are needed."""
+        monkeypatch.setattr(sql_table_model, "MAX_CACHED_BLOCKS", 2)
+        model = SqlTableModel(engine=engine, schema=None, table="items")
+        try:
+            _fetch_all(qt_app, model)
+            assert len(model._blocks) <= 2
+            assert 0 not in model._blocks
+
+            # The view asks for the first rows again.
+            assert model.data(model.index(0, 0)) == ""
+            _wait(qt_app, lambda: 0 in model._blocks)
+            assert model.data(model.index(0, 0)) == "1"
+            assert len(model._blocks) <= 2
+        finally:
+            model.close()
+
+    def test_table_without_primary_key(self, qt_app, engine):
+        """All the columns break the ties, so no row is lost or repeated."""
+        meta = MetaData()
+        loose = Table(
+            "loose",
+            meta,
+            Column("name", String(50)),
+            Column("size", Integer),
+        )
+        meta.create_all(engine)
+        rows = [(f"item {i % 50:04d}", i % 3) for i in range(ROWS)]
+        with engine.begin() as conn:
+            conn.execute(
+                loose.insert(), [{"name": n, "size": z} for n, z in rows]
+            )
+
+        model = SqlTableModel(engine=engine, schema=None, table="loose")
+        try:
+            model.sort(1, Qt.SortOrder.AscendingOrder)
+            statement = str(model._block_statement(1))
+            assert "ORDER BY rows.size ASC, rows.name" in statement
+
+            _wait(qt_app, lambda: model.rowCount() > 0)
+            _fetch_all(qt_app, model)
+            got = [tuple(model.raw_row(r)) for r in range(model.rowCount())]
+            assert got == sorted(rows, key=lambda r: (r[1], r[0]))
+        finally:
+            model.close()
+
+    def test_no_reads_after_close(self, qt_app, engine):
+        """A closed model does not start the fetcher again."""
+        model = SqlTableModel(engine=engine, schema=None, table="items")
+        _wait(qt_app, lambda: model.rowCount() == BLOCK_SIZE)
+        model.close()
+        _wait(qt_app, lambda: not model._fetcher.isRunning())
+
+        model._blocks.clear()
+        assert model.data(model.index(0, 0)) == ""
+        assert not model._fetcher.isRunning()
+
+    def test_limit_and_edit(self, qt_app, engine):
+        """The limit caps the rows and edits reach the database."""
+        model = SqlTableModel(
+            engine=engine, schema=None, table="items", limit=BLOCK_SIZE + 5
+        )
+        try:
+            _fetch_all(qt_app, model)
+            assert model.rowCount() == BLOCK_SIZE + 5
+
+            index = model.index(BLOCK_SIZE + 1, 1)
+            assert model.setData(index, "renamed")
+            assert model.data(index) == "renamed"
+        finally:
+            model.close()
+
+        with engine.connect() as conn:
+            name = conn.exec_driver_sql(
+                "SELECT name FROM items WHERE id = ?", (BLOCK_SIZE + 2,)
+            ).scalar()
+        assert name == "renamed"
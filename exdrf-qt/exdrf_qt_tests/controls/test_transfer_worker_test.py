@@ -0,0 +1,291 @@
+"""Tests for TransferWorker."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from exdrf_al.connection import DbConn
+from PyQt5.QtCore import Qt
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    delete,
+    event,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.pool import QueuePool
+
+from exdrf_qt.controls.transfer.transfer_worker import (
+    TransferWorker,
+    _normalize,
+    _RangeSync,
+)
+
+
+@pytest.fixture
+def databases(tmp_path):
+    """A source with related tables and an empty destination."""
+    meta = MetaData()
+    parent = Table(
+        "parent",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("name", String),
+    )
+    child = Table(
+        "child",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("parent_id", ForeignKey("parent.id")),
+    )
+    big = Table(
+        "big",
+        meta,
+        Column("id", Integer, primary_key=True),
+        Column("value", String),
+    )
+
+    src = create_engine(f"sqlite:///{tmp_path / 'src.db'}", poolclass=QueuePool)
+    dst = create_engine(f"sqlite:///{tmp_path / 'dst.db'}", poolclass=QueuePool)
+    meta.create_all(src)
+    with src.begin() as conn:
+        conn.execute(
+            insert(parent), [{"id": i, "name": f"p{i}"} for i in range(1, 11)]
+        )
+        conn.execute(
+            insert(child),
+            [{"id": i, "parent_id": i % 10 + 1} for i in range(1, 31)],
+        )
+        # Inserted in reverse so the copy has to order by the primary key.
+        conn.execute(
+            insert(big),
+            [{"id": i, "value": f"v{i}"} for i in range(2500, 0, -1)],
+        )
+
+    yield (
+        DbConn(c_string=str(src.url), engine=src, schema="main"),
+        DbConn(c_string=str(dst.url), engine=dst, schema="main"),
+        {"parent": parent, "child": child, "big": big},
+    )
+    src.dispose()
+    dst.dispose()
+
+
+def _make_worker(src, dst, tables, **kwargs):
+    worker = TransferWorker(src=src, dst=dst, tables=tables, **kwargs)
+    events = []
+    worker.table_started.connect(
+        lambda t, n: events.append(("start", t, n)), Qt.DirectConnection
+    )
+    worker.table_done.connect(
+        lambda t, n: events.append(("done", t, n)), Qt.DirectConnection
+    )
+    worker.error.connect(
+        lambda t, e: events.append(("error", t, e)), Qt.DirectConnection
+    )
+    return worker, events
+
+
+class TestTransferWorker:
+    """Tests for the table copy engine."""
+
+    def test_copies_in_dependency_order(self, databases):
+        """Referenced tables are copied first; rows keep their order."""
+        src, dst, tables = databases
+        worker, events = _make_worker(
+            src, dst, ["child", "big", "parent"], chunk_size=100, queue_size=2
+        )
+        worker.run()
+
+        assert [e for e in events if e[0] == "done"] == [
+            ("done", "big", 2500),
+            ("done", "parent", 10),
+            ("done", "child", 30),
+        ]
+        with dst.engine.connect() as conn:
+            rows = conn.execute(select(tables["big"])).all()
+        assert [r.id for r in rows] == list(range(1, 2501))
+        assert rows[0].value == "v1"
+
+    def test_independent_tables_overlap(self, databases, monkeypatch):
+        """Tables without a dependency between them run at the same time."""
+        src, dst, _tables = databases
+        worker, events = _make_worker(src, dst, ["child", "big", "parent"])
+        monkeypatch.setattr(worker, "_worker_count", lambda *_: 2)
+
+        lock = threading.Lock()
+        spans = {}
+
+        def fake_copy(_src, _dst, table):
+            start = time.monotonic()
+            time.sleep(0.2)
+            with lock:
+                spans[table] = (start, time.monotonic())
+            return 0
+
+        monkeypatch.setattr(worker, "_copy_table", fake_copy)
+        worker.run()
+
+        assert spans["child"][0] >= spans["parent"][1]
+        assert spans["big"][0] < spans["parent"][1]
+        assert len([e for e in events if e[0] == "done"]) == 3
+
+    def test_errors_are_isolated(self, databases):
+        """A failing table is reported and the others are still copied."""
+        src, dst, _tables = databases
+        worker, events = _make_worker(src, dst, ["missing", "parent"])
+        worker.run()
+
+        assert events[0][:2] == ("error", "missing")
+        assert ("done", "parent", 10) in events
+
+    def test_sqlite_destination_is_serialized(self, databases):
+        """A SQLite destination accepts a single writer."""
+        src, dst, _tables = databases
+        worker, _events = _make_worker(src, dst, ["child", "big", "parent"])
+        assert worker._worker_count(src.engine, dst.engine) == 1
+        assert worker._worker_count(src.engine, src.engine) == 1
+
+
+class TestTransferWorkerSync:
+    """Tests for the delta synchronization mode."""
+
+    def _statements(self, engine):
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda _c, _cu, stmt, *_a, **_k: statements.append(stmt),
+        )
+        return statements
+
+    @pytest.mark.parametrize("checksum", [True, False])
+    def test_only_changed_ranges_are_written(
+        self, databases, monkeypatch, checksum
+    ):
+        """Inserts, updates and deletes reach the destination, nothing else."""
+        src, dst, tables = databases
+        if not checksum:
+            monkeypatch.setattr(_RangeSync, "can_checksum", lambda *_: False)
+        reads = []
+        read = _RangeSync.read
+        monkeypatch.setattr(
+            _RangeSync,
+            "read",
+            lambda sync, *args: reads.append(args[1:]) or read(sync, *args),
+        )
+        TransferWorker(src=src, dst=dst, tables=["big"]).run()
+
+        big = tables["big"]
+        with src.engine.begin() as conn:
+            conn.execute(
+                update(big).where(big.c.id == 1200).values(value="changed")
+            )
+            conn.execute(delete(big).where(big.c.id.in_([10, 2500])))
+            conn.execute(insert(big), [{"id": 3000, "value": "new"}])
+        with dst.engine.begin() as conn:
+            conn.execute(insert(big), [{"id": 2800, "value": "extra"}])
+
+        statements = self._statements(dst.engine)
+        worker, events = _make_worker(
+            src, dst, ["big"], chunk_size=500, sync=True
+        )
+        worker.run()
+
+        assert ("done", "big", 5) in events
+        with src.engine.connect() as conn:
+            expected = conn.execute(select(big).order_by(big.c.id)).all()
+        with dst.engine.connect() as conn:
+            actual = conn.execute(select(big).order_by(big.c.id)).all()
+        assert actual == expected
+
+        writes = [
+            s.split()[0]
+            for s in statements
+            if s.startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+        # Ranges 1-501, 1002-1501 and 2002-3000 differ. Changed and new rows
+        # are written with an upsert.
+        assert sorted(writes) == ["DELETE", "DELETE", "INSERT", "INSERT"]
+        if checksum:
+            assert reads == [
+                (None, (501,)),
+                ((1001,), (1501,)),
+                ((2001,), (3000,)),
+            ]
+        else:
+            assert reads == []
+
+    def test_unchanged_table_is_not_written(self, databases):
+        """A second sync of the same data writes nothing."""
+        src, dst, _tables = databases
+        TransferWorker(src=src, dst=dst, tables=["parent", "child"]).run()
+
+        statements = self._statements(dst.engine)
+        worker, events = _make_worker(
+            src, dst, ["parent", "child"], chunk_size=7, sync=True
+        )
+        worker.run()
+
+        assert ("done", "parent", 0) in events
+        assert ("done", "child", 0) in events
+        assert not [
+            s
+            for s in statements
+            if s.startswith(("INSERT", "UPDATE", "DELETE"))
+        ]
+
+    def test_table_without_primary_key(self, databases):
+        """Tables without a primary key can not be synchronized."""
+        src, dst, _tables = databases
+        meta = MetaData()
+        Table("plain", meta, Column("value", String))
+        meta.create_all(src.engine)
+        meta.create_all(dst.engine)
+
+        worker, events = _make_worker(src, dst, ["plain"], sync=True)
+        worker.run()
+
+        assert events[-1][:2] == ("error", "plain")
+        assert "primary key" in events[-1][2]
+
+    def test_checksum_reads_only_changed_ranges(self, databases, monkeypatch):
+        """Ranges with the same checksum are not read."""
+        src, dst, tables = databases
+        TransferWorker(src=src, dst=dst, tables=["big"]).run()
+        big = tables["big"]
+        with src.engine.begin() as conn:
+            conn.execute(
+                update(big).where(big.c.id == 1700).values(value="changed")
+            )
+
+        statements = self._statements(src.engine)
+        worker, events = _make_worker(
+            src, dst, ["big"], chunk_size=100, sync=True
+        )
+        worker.run()
+
+        assert ("done", "big", 1) in events
+        # Only the rows of the range with the change are selected.
+        row_reads = [
+            s
+            for s in statements
+            if "big.value" in s and "WHERE" in s and "count(" not in s
+        ]
+        assert len(row_reads) == 1
+
+    def test_values_are_normalized(self):
+        """The same value read by different drivers compares equal."""
+        assert _normalize(1.5) == _normalize(Decimal("1.50"))
+        aware = datetime(2024, 1, 1, 12, tzinfo=timezone(timedelta(hours=2)))
+        assert _normalize(aware) == datetime(2024, 1, 1, 10)
+        assert _normalize(memoryview(b"ab")) == b"ab"
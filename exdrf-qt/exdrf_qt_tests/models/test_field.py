@@ -14,6 +14,7 @@ from PyQt5.QtCore import QSize, Qt
 from PyQt5.QtGui import QBrush, QColor, QFont
 
 from exdrf_qt.models.field import (
+    EXPANDED_ROLES,
     QtField,
     italic_font,
     light_grey,
@@ -277,5 +278,63 @@ class TestQtFieldExpandValue(unittest.TestCase):
         self.assertEqual(result[Qt.ItemDataRole.SizeHintRole], QSize(200, 24))
 
 
+class TestQtFieldLazyExpandValue(unittest.TestCase):
+    """The roles of an expanded value are computed when they are read."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.field: QtField[Any] = QtField(
+            ctx=cast("QtContext", MagicMock()),
+            resource=cast("QtModel[Any]", MagicMock()),
+        )
+
+    def test_only_overrides_are_stored(self) -> None:
+        """The cell stores the overrides and reports all expanded roles."""
+        result = self.field.expand_value("x", DecorationRole="icon")
+
+        self.assertEqual(dict.__len__(result), 1)
+        self.assertEqual(set(result.keys()), set(EXPANDED_ROLES))
+        self.assertEqual(result[Qt.ItemDataRole.DecorationRole], "icon")
+        self.assertEqual(result.get(Qt.ItemDataRole.UserRole, 5), 5)
+        self.assertNotIn(Qt.ItemDataRole.UserRole, result)
+        self.assertEqual(
+            result,
+            {
+                **{r: self.field.role_value("x", r) for r in EXPANDED_ROLES},
+                Qt.ItemDataRole.DecorationRole: "icon",
+            },
+        )
+
+    def test_null_roles_are_shared_by_the_column(self) -> None:
+        """The NULL label is translated once per field."""
+        with patch.object(self.field, "t") as mock_t:
+            mock_t.side_effect = lambda key, default: default
+            for _ in range(3):
+                result = self.field.expand_value(None)
+                self.assertEqual(result[Qt.ItemDataRole.DisplayRole], "NULL")
+            self.assertEqual(mock_t.call_count, 2)
+
+            self.field.clear_role_cache()
+            self.field.expand_value(None)[Qt.ItemDataRole.ToolTipRole]
+            self.assertEqual(mock_t.call_count, 4)
+
+    def test_assign_and_delete_roles(self) -> None:
+        """Computed roles can be replaced and removed like stored ones."""
+        result = self.field.expand_value(1)
+        result[Qt.ItemDataRole.DisplayRole] = "one"
+        result[Qt.ItemDataRole.UserRole] = 7
+        del result[Qt.ItemDataRole.FontRole]
+
+        self.assertEqual(result[Qt.ItemDataRole.DisplayRole], "one")
+        self.assertEqual(result[Qt.ItemDataRole.EditRole], 1)
+        self.assertEqual(result.get(Qt.ItemDataRole.UserRole), 7)
+        self.assertNotIn(Qt.ItemDataRole.FontRole, result)
+        self.assertIsNone(result.get(Qt.ItemDataRole.FontRole))
+        with self.assertRaises(KeyError):
+            result[Qt.ItemDataRole.FontRole]
+        self.assertEqual(len(result), len(EXPANDED_ROLES))
+        self.assertEqual(dict(result)[Qt.ItemDataRole.UserRole], 7)
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
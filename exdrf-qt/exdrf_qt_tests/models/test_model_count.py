@@ -0,0 +1,169 @@
+"""Tests for the count strategies of QtModel."""
+
+import unittest
+from contextlib import contextmanager
+from typing import Any, List, Optional
+from unittest.mock import MagicMock
+
+from attrs import define
+from exdrf_al.counting import CachedCount, CountStrategy, DeferredCount
+from PyQt5.QtCore import Qt
+from sqlalchemy import Integer, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from exdrf_qt.models.field import QtField
+from exdrf_qt.models.model import CountWork, QtModel
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Item(_Base):
+    __tablename__ = "count_qt_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    grp: Mapped[int] = mapped_column(Integer)
+
+
+@define
+class _PlainField(QtField):
+    """Column field that shows the raw value."""
+
+    def values(self, item: Any) -> Any:
+        return self.expand_value(getattr(item, self.name))
+
+
+class TestQtModelCountStrategy(unittest.TestCase):
+    """The total count is computed through the count strategy."""
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        _Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            session.add_all(_Item(id=i, grp=i % 3) for i in range(1, 101))
+            session.commit()
+
+        self.counts = 0
+
+        def on_exec(_conn, _cursor, statement, *_args, **_kwargs):
+            if "count(" in statement:
+                self.counts += 1
+
+        event.listen(self.engine, "before_cursor_execute", on_exec)
+
+        @contextmanager
+        def same_session(*_args, **_kwargs):
+            with Session(self.engine) as session:
+                yield session
+
+        self.held: List[CountWork] = []
+
+        def push_work(work):
+            # Exact counts wait in `held`; everything else runs now, like
+            # the worker thread would.
+            if isinstance(work, CountWork):
+                self.held.append(work)
+                return work
+            self.run_work(work)
+            return work
+
+        self.ctx = MagicMock()
+        self.ctx.same_session = same_session
+        self.ctx.push_work = push_work
+
+    def run_work(self, work) -> None:
+        with Session(self.engine) as session:
+            work.perform(session)
+        work.callback(work)
+
+    def make_model(
+        self, strategy: Optional[CountStrategy] = None
+    ) -> QtModel[Any]:
+        model: QtModel[Any] = QtModel(
+            ctx=self.ctx,
+            db_model=_Item,
+            prevent_total_count=True,
+            load_settings=False,
+            wait_before_request=0,
+            count_strategy=strategy,
+        )
+        model.fields = [
+            _PlainField(
+                ctx=self.ctx,
+                resource=model,
+                name="id",
+                primary=True,
+                sortable=True,
+            ),
+            _PlainField(
+                ctx=self.ctx, resource=model, name="grp", sortable=True
+            ),
+        ]
+        return model
+
+    def test_sorting_does_not_count(self) -> None:
+        """Changing the order reuses the known total."""
+        model = self.make_model()
+        model.recalculate_total_count()
+        self.assertEqual(self.counts, 1)
+
+        model.sort(1, Qt.SortOrder.DescendingOrder)
+        model.set_prioritized_ids([5])
+        self.assertEqual(self.counts, 1)
+        self.assertEqual(model.total_count, 100)
+        self.assertEqual(model.cache[0].db_id, 5)
+        self.assertEqual(model.loaded_count, model.batch_size * 2)
+
+        model.reset_model()
+        self.assertEqual(self.counts, 2)
+
+    def test_deferred_total_is_refined(self) -> None:
+        """An "at least" total grows when the exact count arrives."""
+        model = self.make_model(DeferredCount(probe=20))
+        inserted: List[Any] = []
+        model.rowsInserted.connect(lambda *args: inserted.append(args[1:]))
+
+        model.recalculate_total_count()
+        self.assertEqual(model.total_count, 20)
+        self.assertFalse(model.total_count_exact)
+        self.assertEqual(len(self.held), 1)
+
+        self.run_work(self.held.pop())
+        self.assertTrue(model.total_count_exact)
+        self.assertEqual(model.total_count, 100)
+        self.assertEqual(model.rowCount(), 100)
+        self.assertEqual(inserted, [(20, 99)])
+
+    def test_stale_refinement_is_ignored(self) -> None:
+        """Changing filters cancels the pending exact count."""
+        model = self.make_model(DeferredCount(probe=20))
+        model.recalculate_total_count()
+        stale = self.held.pop()
+
+        model.apply_filter([{"fld": "grp", "op": "eq", "vl": 1}])
+        self.assertEqual(len(self.held), 1)
+        self.run_work(stale)
+        self.assertEqual(model.total_count, 20)
+
+        self.run_work(self.held.pop())
+        self.assertEqual(model.total_count, 34)
+
+    def test_cached_count_is_invalidated_by_writes(self) -> None:
+        """A shared cache is reused until the model writes to the table."""
+        shared = CachedCount()
+        first = self.make_model(shared)
+        second = self.make_model(shared)
+        first.recalculate_total_count()
+        second.recalculate_total_count()
+        self.assertEqual(self.counts, 1)
+
+        first.clone_record(3)
+        self.assertEqual(first.total_count, 101)
+        second.reset_model()
+        self.assertEqual(self.counts, 2)
+        self.assertEqual(second.total_count, 101)
+
+
+if __name__ == "__main__":
+    unittest.main()
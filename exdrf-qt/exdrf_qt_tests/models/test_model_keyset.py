@@ -0,0 +1,203 @@
+"""Tests for keyset paging in QtModel."""
+
+import unittest
+from contextlib import contextmanager
+from typing import Any, List, Optional
+from unittest.mock import MagicMock
+
+from attrs import define
+from sqlalchemy import Integer, create_engine, event, select, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from exdrf_qt.models.field import QtField
+from exdrf_qt.models.model import QtModel
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Item(_Base):
+    __tablename__ = "keyset_qt_items"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    grp: Mapped[Optional[int]] = mapped_column(Integer)
+
+
+@define
+class _PlainField(QtField):
+    """Column field that shows the raw value."""
+
+    def values(self, item: Any) -> Any:
+        return self.expand_value(getattr(item, self.name))
+
+
+class TestQtModelKeysetPaging(unittest.TestCase):
+    """Pages loaded by seeking match the OFFSET pages."""
+
+    def setUp(self) -> None:
+        self.engine = create_engine("sqlite://")
+        _Base.metadata.create_all(self.engine)
+        with Session(self.engine) as session:
+            session.add_all(_Item(id=i, grp=(i * 7) % 4) for i in range(1, 101))
+            session.commit()
+
+        self.statements: List[str] = []
+
+        def on_exec(_conn, _cursor, statement, *_args, **_kwargs):
+            self.statements.append(statement)
+
+        event.listen(self.engine, "before_cursor_execute", on_exec)
+
+        @contextmanager
+        def same_session(*_args, **_kwargs):
+            with Session(self.engine) as session:
+                yield session
+
+        def push_work(work):
+            # Run the work synchronously, like the worker thread would.
+            with Session(self.engine) as session:
+                work.perform(session)
+            work.callback(work)
+            return work
+
+        self.ctx = MagicMock()
+        self.ctx.engine = self.engine
+        self.ctx.same_session = same_session
+        self.ctx.push_work = push_work
+
+    def make_model(self, keyset_paging: bool = True) -> QtModel[Any]:
+        model: QtModel[Any] = QtModel(
+            ctx=self.ctx,
+            db_model=_Item,
+            prevent_total_count=True,
+            load_settings=False,
+            wait_before_request=0,
+            keyset_paging=keyset_paging,
+        )
+        model.fields = [
+            _PlainField(
+                ctx=self.ctx,
+                resource=model,
+                name="id",
+                primary=True,
+                sortable=True,
+            ),
+            _PlainField(
+                ctx=self.ctx, resource=model, name="grp", sortable=True
+            ),
+        ]
+        model.sort_by = [("grp", "desc")]
+        return model
+
+    def expected_ids(self) -> List[int]:
+        with Session(self.engine) as session:
+            return list(
+                session.scalars(
+                    select(_Item.id).order_by(_Item.grp.desc(), _Item.id)
+                )
+            )
+
+    def test_sorting_gets_pk_tie_breaker(self) -> None:
+        """Keyset mode completes the ordering with the primary key."""
+        model = self.make_model()
+        keys = model.keyset_keys()
+        assert keys is not None
+        self.assertEqual([d for _k, d in keys], [True, False])
+
+        plain = self.make_model(keyset_paging=False)
+        self.assertIsNone(plain.keyset_keys())
+        self.assertEqual(len(plain.order_by_clauses()), 1)
+
+        model.prioritized_ids = [3]
+        self.assertIsNone(model.keyset_keys())
+
+    def test_sequential_requests_seek(self) -> None:
+        """A request following a loaded one seeks instead of skipping."""
+        model = self.make_model()
+        model.keyset_anchor_spacing = 1000
+        model.recalculate_total_count()
+        self.assertEqual(model.loaded_count, model.batch_size * 2)
+
+        self.statements.clear()
+        model.request_items(model.batch_size * 2, 10)
+        self.assertIn("keyset_qt_items.grp <", self.statements[-1])
+
+        expected = self.expected_ids()
+        loaded = [
+            model.cache[i].db_id for i in range(model.batch_size * 2 + 10)
+        ]
+        self.assertEqual(loaded, expected[: len(loaded)])
+
+    def test_anchor_scan_serves_random_jumps(self) -> None:
+        """Collected anchors make deep jumps seek and stay correct."""
+        model = self.make_model()
+        model.keyset_anchor_spacing = 10
+        model.recalculate_total_count()
+        self.assertTrue(model._anchors.complete)
+
+        expected = self.expected_ids()
+        for start in (75, 41, 90, 20):
+            self.statements.clear()
+            model.request_items(start, 5)
+            self.assertIn("keyset_qt_items.grp <", self.statements[-1])
+            self.assertEqual(
+                [model.cache[i].db_id for i in range(start, start + 5)],
+                expected[start : start + 5],
+            )
+
+    def test_reset_forgets_anchors(self) -> None:
+        """Resetting the model drops anchors of the previous ordering."""
+        model = self.make_model()
+        model.keyset_anchor_spacing = 10
+        model.recalculate_total_count()
+        self.assertGreater(len(model._anchors), 0)
+
+        model.sort_by = [("grp", "asc")]
+        model.keyset_anchor_spacing = 1000
+        model.reset_model()
+        self.assertFalse(model._anchors.complete)
+        model.request_items(50, 5)
+        with Session(self.engine) as session:
+            expected = list(
+                session.scalars(
+                    select(_Item.id).order_by(_Item.grp.asc(), _Item.id)
+                )
+            )
+        self.assertEqual(
+            [model.cache[i].db_id for i in range(50, 55)], expected[50:55]
+        )
+
+    def test_null_sort_keys_are_kept(self) -> None:
+        """Seeking after a row does not skip the rows with a NULL key."""
+        with Session(self.engine) as session:
+            session.execute(
+                update(_Item).where(_Item.id % 3 == 0).values(grp=None)
+            )
+            session.commit()
+
+        model = self.make_model()
+        model.keyset_anchor_spacing = 10
+        model.recalculate_total_count()
+        self.assertTrue(model._anchors.complete)
+
+        expected = self.expected_ids()
+        for start in (95, 70, 60, 30):
+            model.request_items(start, 5)
+            self.assertEqual(
+                [model.cache[i].db_id for i in range(start, start + 5)],
+                expected[start : start + 5],
+            )
+
+    def test_offset_mode_unchanged(self) -> None:
+        """Without keyset paging requests keep using OFFSET only."""
+        model = self.make_model(keyset_paging=False)
+        model.recalculate_total_count()
+        self.statements.clear()
+        model.request_items(40, 5)
+        self.assertNotIn("keyset_qt_items.grp <", self.statements[-1])
+        self.assertEqual(len(model._anchors), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from exdrf_qt.models.record import (
     ERROR_COLOR,
     LOADING_BRUSH,
     QtRecord,
+    RecordValues,
 )
 
 
@@ -426,5 +427,61 @@ class TestQtRecordGetRowData(unittest.TestCase):
         self.assertIsNone(result[2])
 
 
+class TestRecordValues(unittest.TestCase):
+    """Test cases for the cells of a record."""
+
+    def test_cells_are_created_on_demand(self):
+        """Reading with get() does not create the cell."""
+        values = RecordValues(3)
+
+        self.assertEqual(len(values), 3)
+        self.assertEqual(values.get(1), {})
+        self.assertIsNone(values._cells[1])
+        self.assertIsNone(values.get(3))
+
+        values[1][Qt.ItemDataRole.DisplayRole] = "x"
+        self.assertEqual(values.get(1), {Qt.ItemDataRole.DisplayRole: "x"})
+        with self.assertRaises(KeyError):
+            values[3]
+
+    def test_fill_role_applies_to_all_cells(self):
+        """Filled roles reach existing cells and the ones created later."""
+        values = RecordValues(2)
+        values[0] = {Qt.ItemDataRole.DisplayRole: "a"}
+        values.fill_role(Qt.ItemDataRole.BackgroundRole, LOADING_BRUSH)
+
+        self.assertEqual(
+            values[0][Qt.ItemDataRole.BackgroundRole], LOADING_BRUSH
+        )
+        self.assertEqual(
+            values.get(1)[Qt.ItemDataRole.BackgroundRole], LOADING_BRUSH
+        )
+        self.assertIsNone(values._cells[1])
+        self.assertEqual(
+            values[1], {Qt.ItemDataRole.BackgroundRole: LOADING_BRUSH}
+        )
+
+    def test_assignment_grows(self):
+        """Assigning past the end adds cells."""
+        values = RecordValues(1)
+        values[3] = {Qt.ItemDataRole.DisplayRole: "d"}
+
+        self.assertEqual(list(values.keys()), [0, 1, 2, 3])
+        del values[3]
+        self.assertEqual(values[3], {})
+
+    def test_stub_record_does_not_create_cells(self):
+        """A stub record keeps the loading brush once."""
+        model = MagicMock(name="MockModel")
+        model.column_fields = [MagicMock() for _ in range(50)]
+        record = QtRecord(model=model, db_id=None)
+
+        self.assertEqual(record.values._cells, [None] * 50)
+        self.assertEqual(
+            record.get_row_data(Qt.ItemDataRole.BackgroundRole),
+            [LOADING_BRUSH] * 50,
+        )
+
+
 if __name__ == "__main__":
     unittest.main(argv=["first-arg-is-ignored"], exit=False)
@@ -464,6 +464,59 @@ class TestSelectorApplySubsetAndRun(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestSelectorSearchPrefilters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.search_index = MagicMock(name="SearchIndex")
+        self.search_index.prefilter.return_value = MockColumnElement(
+            name="Prefilter"
+        )
+        self.selector = Selector(
+            db_model=MagicMock(name="DBModel"),  # type: ignore
+            base=MockSelect(name="BaseSelect"),
+            fields={"name": MockQtField(), "note": MockQtField()},
+            no_dia_map={"name": "ua_name"},
+            search_index=self.search_index,
+        )
+
+    def test_quick_search_group(self) -> None:
+        """An "or" group of ilike filters is looked up at once."""
+        filters: FilterType = [
+            FieldFilter(fld="note", op="==", vl="x"),
+            [
+                "OR",
+                [
+                    FieldFilter(fld="name", op="ilike", vl="%Ștef%"),
+                    {"fld": "note", "op": "ilike", "vl": "%ștef%"},
+                ],
+            ],
+        ]  # type: ignore
+
+        result = self.selector.search_prefilters(filters)
+
+        self.assertEqual(result, [self.search_index.prefilter.return_value])
+        self.search_index.prefilter.assert_called_once_with(
+            [
+                ("name", "%Ștef%"),
+                ("ua_name", "%Stef%"),
+                ("note", "%ștef%"),
+            ]
+        )
+
+    def test_other_filters_are_not_looked_up(self) -> None:
+        """Negated, mixed and unknown-field searches are left alone."""
+        ilike = FieldFilter(fld="note", op="ilike", vl="%abc%")
+        for filters in (
+            ["not", ilike],
+            ["or", [ilike, FieldFilter(fld="note", op="==", vl="abc")]],
+            [FieldFilter(fld="other", op="ilike", vl="%abc%")],
+        ):
+            self.assertEqual(self.selector.search_prefilters(filters), [])
+        self.search_index.prefilter.assert_not_called()
+
+        self.selector.search_index = None
+        self.assertEqual(self.selector.search_prefilters([ilike]), [])
+
+
 class TestSelectorFromQtModel(unittest.TestCase):
     def test_from_qt_model(self) -> None:
         """Test class method from_qt_model."""
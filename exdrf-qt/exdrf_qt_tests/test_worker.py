@@ -1,11 +1,13 @@
 import logging
+import threading
+import time
 from queue import Queue
 from unittest.mock import MagicMock, patch
 
 import pytest
 from sqlalchemy import select
 
-from exdrf_qt.worker import Relay, Work, Worker
+from exdrf_qt.worker import Relay, Work, Worker, WorkQueue
 
 
 @pytest.fixture
@@ -23,7 +25,9 @@ def mock_db_conn():
 @pytest.fixture
 def relay(mock_db_conn):
     """Fixture to create a Relay instance."""
-    return Relay(cn=mock_db_conn)
+    relay = Relay(cn=mock_db_conn)
+    yield relay
+    relay.stop()
 
 
 def test_relay_push_work_starts_worker(relay):
@@ -105,3 +109,86 @@ def test_relay_stop_stops_worker(relay):
 
     relay.stop()
     assert not first.isRunning()
+
+
+def test_worker_reuses_one_session(mock_db_conn):
+    """All work of a worker runs in one session, reset between works."""
+    queue = Queue()
+    worker = Worker(queue=queue, cn=mock_db_conn)
+    works = [
+        Work(statement=MagicMock(spec=select), callback=MagicMock(), req_id=i)
+        for i in range(3)
+    ]
+    for work in works:
+        queue.put(work)
+    session = mock_db_conn.session.return_value.__enter__.return_value
+
+    with patch.object(worker, "haveResult") as mock_signal:
+        mock_signal.emit.side_effect = lambda req_id: setattr(
+            worker, "should_stop", req_id == 2
+        )
+        worker.run()
+
+    assert [w.result for w in works] == [[1, 2, 3]] * 3
+    mock_db_conn.session.assert_called_once_with(
+        add_to_stack=False, own_connection=True
+    )
+    assert session.rollback.call_count == 3
+    mock_db_conn.session.return_value.__exit__.assert_called_once()
+
+
+def test_worker_replaces_session_after_error(mock_db_conn):
+    """A failed work closes the session; the next work opens a new one."""
+    queue = Queue()
+    worker = Worker(queue=queue, cn=mock_db_conn)
+    session = mock_db_conn.session.return_value.__enter__.return_value
+    session.scalars.side_effect = [Exception("lost connection"), [4]]
+    works = [
+        Work(statement=MagicMock(spec=select), callback=MagicMock(), req_id=i)
+        for i in range(2)
+    ]
+    for work in works:
+        queue.put(work)
+
+    with patch.object(worker, "haveResult") as mock_signal:
+        mock_signal.emit.side_effect = lambda req_id: setattr(
+            worker, "should_stop", req_id == 1
+        )
+        worker.run()
+
+    assert works[0].error is not None
+    assert works[1].result == [4]
+    assert mock_db_conn.session.call_count == 2
+
+
+def test_work_queue_wake_all_releases_waiters():
+    """Blocked consumers return as soon as they are woken up."""
+    queue = WorkQueue()
+    outcome = []
+
+    def consume():
+        started = time.perf_counter()
+        try:
+            queue.get(timeout=10)
+        except Exception as e:
+            outcome.append((type(e).__name__, time.perf_counter() - started))
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    time.sleep(0.05)
+    queue.wake_all()
+    thread.join(timeout=5)
+
+    assert outcome and outcome[0][0] == "Empty"
+    assert outcome[0][1] < 5
+
+
+def test_relay_threads_count(mock_db_conn):
+    """The number of workers follows the connection unless overridden."""
+    mock_db_conn.threads_count = 2
+    assert len(Relay(cn=mock_db_conn).workers) == 2
+    assert len(Relay(cn=mock_db_conn, threads_count=3).workers) == 3
+
+    mock_db_conn.threads_count = None
+    relay = Relay(cn=mock_db_conn)
+    assert relay.max_threads() == 4
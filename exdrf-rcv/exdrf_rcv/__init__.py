@@ -9,10 +9,13 @@ from exdrf_rcv.models import RcvField, RcvPlan, RcvResourceDataAccess
 from exdrf_rcv.plan_resolve import (
     RcvPlanCache,
     RcvPlanCacheKey,
+    RcvPlanJson,
     clear_rcv_plan_overrides,
     default_rcv_plan_cache,
+    rcv_etag_matches,
     register_rcv_plan_override,
     resolve_rcv_plan,
+    resolve_rcv_plan_json,
     unregister_rcv_plan_override,
 )
 
@@ -22,9 +25,12 @@ __all__ = [
     "RcvResourceDataAccess",
     "RcvPlanCache",
     "RcvPlanCacheKey",
+    "RcvPlanJson",
     "clear_rcv_plan_overrides",
     "default_rcv_plan_cache",
+    "rcv_etag_matches",
     "register_rcv_plan_override",
     "resolve_rcv_plan",
+    "resolve_rcv_plan_json",
     "unregister_rcv_plan_override",
 ]
@@ -3,6 +3,10 @@
 ``kind`` values mirror ``FIELD_TYPE_*`` in ``exdrf.constants``; ``data`` carries
 type-specific options aligned with ``exdrf.field_types`` ``*Field`` /
 ``*Info`` shapes.
+
+The models are frozen and hold tuples instead of lists: resolved plans are
+cached and shared between requests, so changes are made with
+``model_copy(update=...)`` instead of assignment.
 """
 
 from __future__ import annotations
@@ -60,7 +64,7 @@ class RcvFieldBase(BaseModel):
         derived: Optional ``(derivation_kind, source_field_name)`` tuple.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     name: str
     title: str | None = None
@@ -84,13 +88,13 @@ class RcvFieldBase(BaseModel):
 class RcvEmptyData(BaseModel):
     """Placeholder ``data`` for field kinds without extra options."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class RcvBlobFieldData(BaseModel):
     """Options for ``FIELD_TYPE_BLOB`` (see ``BlobInfo``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     mime_type: str | None = None
 
@@ -98,7 +102,7 @@ class RcvBlobFieldData(BaseModel):
 class RcvBoolFieldData(BaseModel):
     """Options for ``FIELD_TYPE_BOOL`` (see ``BoolInfo``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     true_str: str | None = None
     false_str: str | None = None
@@ -107,12 +111,12 @@ class RcvBoolFieldData(BaseModel):
 class RcvStringFieldData(BaseModel):
     """Options for string-like kinds (see ``StrInfo`` / ``StrListInfo``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     multiline: bool | None = None
     min_length: int | None = None
     max_length: int | None = None
-    enum_values: list[tuple[str, str]] = Field(default_factory=list)
+    enum_values: tuple[tuple[str, str], ...] = ()
     no_dia_field: str | None = None
 
 
@@ -125,19 +129,19 @@ class RcvFormattedFieldData(RcvStringFieldData):
 class RcvIntFieldData(BaseModel):
     """Options for ``FIELD_TYPE_INTEGER`` / ``FIELD_TYPE_INT_LIST``."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: int | None = None
     max: int | None = None
     unit: str | None = None
     unit_symbol: str | None = None
-    enum_values: list[tuple[int, str]] = Field(default_factory=list)
+    enum_values: tuple[tuple[int, str], ...] = ()
 
 
 class RcvFloatFieldData(BaseModel):
     """Options for ``FIELD_TYPE_FLOAT`` / ``FIELD_TYPE_FLOAT_LIST``."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: float | None = None
     max: float | None = None
@@ -145,13 +149,13 @@ class RcvFloatFieldData(BaseModel):
     scale: int | None = None
     unit: str | None = None
     unit_symbol: str | None = None
-    enum_values: list[tuple[float, str]] = Field(default_factory=list)
+    enum_values: tuple[tuple[float, str], ...] = ()
 
 
 class RcvDateFieldData(BaseModel):
     """Options for ``FIELD_TYPE_DATE`` (see ``DateInfo`` + ``DateField``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: date | None = None
     max: date | None = None
@@ -161,7 +165,7 @@ class RcvDateFieldData(BaseModel):
 class RcvDateTimeFieldData(BaseModel):
     """Options for ``FIELD_TYPE_DT`` (``DateTimeInfo`` / ``DateTimeField``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: datetime | None = None
     max: datetime | None = None
@@ -171,7 +175,7 @@ class RcvDateTimeFieldData(BaseModel):
 class RcvTimeFieldData(BaseModel):
     """Options for ``FIELD_TYPE_TIME`` (see ``TimeInfo`` + ``TimeField``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: time | None = None
     max: time | None = None
@@ -181,7 +185,7 @@ class RcvTimeFieldData(BaseModel):
 class RcvDurationFieldData(BaseModel):
     """Options for ``FIELD_TYPE_DURATION`` (see ``DurationInfo``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     min: float | None = None
     max: float | None = None
@@ -190,22 +194,22 @@ class RcvDurationFieldData(BaseModel):
 class RcvEnumFieldData(BaseModel):
     """Options for ``FIELD_TYPE_ENUM`` (see ``EnumInfo`` / ``EnumField``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
-    enum_values: list[str] = Field(default_factory=list)
+    enum_values: tuple[str, ...] = ()
 
 
 class RcvRefFieldData(BaseModel):
     """Options for relation kinds (see ``RelExtraInfo`` / ``RefBaseField``)."""
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     ref: str
     direction: RelType | None = None
     subordinate: bool | None = None
     expect_lots: bool | None = None
-    provides: list[str] = Field(default_factory=list)
-    depends_on: list[tuple[str, str]] = Field(default_factory=list)
+    provides: tuple[str, ...] = ()
+    depends_on: tuple[tuple[str, str], ...] = ()
     bridge: str | None = None
 
 
@@ -395,7 +399,7 @@ class RcvResourceDataAccess(BaseModel):
             parameter when calling ``url_pattern``.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     url_pattern: str
     requires_org_id: bool = False
@@ -424,12 +428,12 @@ class RcvPlan(BaseModel):
             does not define ``RCV_RESOURCE_DATA_ACCESS``.
     """
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     category: str | None = None
     resource: str | None = None
     record_id: int | None = None
     view_type: str | None = None
     render_type: str
-    fields: list[RcvField]
+    fields: tuple[RcvField, ...]
     resource_data_access: RcvResourceDataAccess | None = None
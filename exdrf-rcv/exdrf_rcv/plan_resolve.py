@@ -4,6 +4,7 @@ overrides.
 
 from __future__ import annotations
 
+import hashlib
 import importlib
 import re
 import threading
@@ -60,33 +61,96 @@ class RcvPlanCacheKey:
     view_type: str
 
 
+@dataclass(frozen=True)
+class RcvPlanJson:
+    """A cached plan serialized once for every response that serves it.
+
+    ``record_id`` is the only part of a plan that changes between requests,
+    so the body leaves it out and :meth:`render` puts it back in front.
+
+    Attributes:
+        body: UTF-8 JSON object of the plan without ``record_id``.
+        digest: Hex hash of ``body``, the base of the ``ETag``.
+    """
+
+    body: bytes
+    digest: str
+
+    @classmethod
+    def from_plan(cls, plan: RcvPlan) -> "RcvPlanJson":
+        """Serialize ``plan`` (without its ``record_id``)."""
+
+        body = plan.model_dump_json(exclude={"record_id"}).encode("utf-8")
+        return cls(
+            body=body,
+            digest=hashlib.blake2b(body, digest_size=16).hexdigest(),
+        )
+
+    def render(self, record_id: int | None) -> bytes:
+        """The JSON response for ``record_id``."""
+
+        # The body always has ``render_type`` and ``fields`` after the brace.
+        value = b"null" if record_id is None else b"%d" % (record_id,)
+        return b'{"record_id":' + value + b"," + self.body[1:]
+
+    def etag(self, record_id: int | None) -> str:
+        """The strong ``ETag`` of :meth:`render` for ``record_id``."""
+
+        return '"%s-%s"' % (
+            self.digest,
+            "none" if record_id is None else record_id,
+        )
+
+
 class RcvPlanCache:
-    """Thread-safe in-memory cache of resolved ``RcvPlan`` instances."""
+    """Thread-safe in-memory cache of resolved ``RcvPlan`` instances.
+
+    Plans are frozen, so the cache keeps the instance it is given and hands
+    the same one to every reader. The JSON form of a plan is built on first
+    use and kept next to it.
+    """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._data: dict[RcvPlanCacheKey, RcvPlan] = {}
+        self._json: dict[RcvPlanCacheKey, RcvPlanJson] = {}
 
     def get(self, key: RcvPlanCacheKey) -> RcvPlan | None:
-        """Return a cached plan copy or ``None``."""
+        """Return the shared cached plan or ``None``."""
 
         with self._lock:
-            hit = self._data.get(key)
-        if hit is None:
-            return None
-        return hit.model_copy(deep=True)
+            return self._data.get(key)
 
     def set(self, key: RcvPlanCacheKey, plan: RcvPlan) -> None:
-        """Store a deep copy of ``plan``."""
+        """Store ``plan``, which is shared from now on."""
+
+        with self._lock:
+            self._data[key] = plan
+            self._json.pop(key, None)
+
+    def get_json(self, key: RcvPlanCacheKey) -> RcvPlanJson | None:
+        """Return the serialized cached plan or ``None``."""
 
         with self._lock:
-            self._data[key] = plan.model_copy(deep=True)
+            hit = self._json.get(key)
+            plan = self._data.get(key)
+        if hit is not None or plan is None:
+            return hit
+
+        # Serialize outside the lock; keep the result only if the plan was
+        # not replaced in the meantime.
+        dumped = RcvPlanJson.from_plan(plan)
+        with self._lock:
+            if self._data.get(key) is plan:
+                return self._json.setdefault(key, dumped)
+        return dumped
 
     def clear(self) -> None:
         """Drop every cached entry."""
 
         with self._lock:
             self._data.clear()
+            self._json.clear()
 
 
 _default_cache = RcvPlanCache()
@@ -108,6 +172,10 @@ def register_rcv_plan_override(
 
     Clears the default cache so stale merged plans are not served.
 
+    Plans are frozen, so an override returns a new layer built with
+    ``model_copy(update=...)``; the parts it does not replace stay shared
+    with the plan it received. The plan it sees has no ``record_id``.
+
     Args:
         key: Same dimensions as :class:`RcvPlanCacheKey`.
         fn: Receives and returns an ``RcvPlan``.
@@ -173,32 +241,17 @@ def _rcv_paths_module_name(
     return ".".join(segments)
 
 
-def resolve_rcv_plan(
-    *,
+def _plan_key(
     import_root: str,
     category: str,
     resource: str,
-    record_id: int | None,
     view_type: str,
-    cache: RcvPlanCache | None = None,
-) -> RcvPlan:
-    """Import generated ``get_def``, parse fields, apply overrides, cache.
-
-    Args:
-        import_root: Dotted package path (e.g.
-            ``resi_fapi.routes.al2rcv_generated``).
-        category: Dot-separated category or empty string when uncategorized.
-        resource: Resource snake name.
-        record_id: Optional record id echoed on the plan.
-        view_type: View discriminator (part of cache key).
-        cache: Cache to use; defaults to :func:`default_rcv_plan_cache`.
-
-    Returns:
-        Validated ``RcvPlan``.
+) -> RcvPlanCacheKey:
+    """Normalize and validate request parameters into a cache key.
 
     Raises:
-        ValueError: For invalid ``category`` / ``resource`` segments.
-        ModuleNotFoundError: If the generated module is missing.
+        ValueError: For empty or invalid ``category`` / ``resource`` /
+            ``view_type`` values.
     """
 
     # Normalize string query parameters for consistent cache keys and imports.
@@ -215,23 +268,27 @@ def resolve_rcv_plan(
     # Ensure dotted category and resource segments are safe for dynamic import.
     _validate_segments(c, r)
 
-    # Build the cache key (static plan body; ``record_id`` is applied later).
-    key = RcvPlanCacheKey(
+    # The plan body does not depend on ``record_id``; it is applied later.
+    return RcvPlanCacheKey(
         import_root=import_root.strip(),
         category=c,
         resource=r,
         view_type=vt,
     )
 
-    # Return a cached plan when present, refreshing only the
-    # request ``record_id``.
-    store = cache if cache is not None else _default_cache
+
+def _cached_plan(key: RcvPlanCacheKey, store: RcvPlanCache) -> RcvPlan:
+    """Return the shared plan for ``key``, building and storing it on a miss.
+
+    The plan has no ``record_id``.
+    """
+
     cached = store.get(key)
     if cached is not None:
-        return cached.model_copy(update={"record_id": record_id})
+        return cached
 
     # Load the generated ``{resource}_rcv_paths`` module and its ``get_def``.
-    mod_name = _rcv_paths_module_name(import_root, c, r)
+    mod_name = _rcv_paths_module_name(key.import_root, key.category, key.resource)
     mod = importlib.import_module(mod_name)
     get_def = getattr(mod, "get_def", None)
     if not callable(get_def):
@@ -262,21 +319,20 @@ def resolve_rcv_plan(
     # "unset" so list/new/detail map to distinct render hints.
     render_type = getattr(mod, "RCV_RENDER_TYPE", None)
     if not isinstance(render_type, str) or not render_type.strip():
-        render_type = vt
+        render_type = key.view_type
     elif render_type.strip().lower() == "default":
-        render_type = vt
+        render_type = key.view_type
 
     # Optional HTTP row-access metadata from the generated module.
     resource_data_access = _resource_data_access_from_module(mod)
 
     # Assemble the base plan from request metadata and parsed fields.
     plan = RcvPlan(
-        category=c or None,
-        resource=r,
-        record_id=record_id,
-        view_type=vt,
+        category=key.category or None,
+        resource=key.resource,
+        view_type=key.view_type,
         render_type=render_type,
-        fields=fields,
+        fields=tuple(fields),
         resource_data_access=resource_data_access,
     )
 
@@ -286,6 +342,106 @@ def resolve_rcv_plan(
     for fn in fns:
         plan = fn(plan)
 
-    # Store the final plan for future hits and return an independent deep copy.
+    # Store the final plan; it is shared by every later hit.
     store.set(key, plan)
-    return plan.model_copy(deep=True)
+    return plan
+
+
+def resolve_rcv_plan(
+    *,
+    import_root: str,
+    category: str,
+    resource: str,
+    record_id: int | None,
+    view_type: str,
+    cache: RcvPlanCache | None = None,
+) -> RcvPlan:
+    """Import generated ``get_def``, parse fields, apply overrides, cache.
+
+    The returned plan is frozen and shares its fields with the cached one.
+
+    Args:
+        import_root: Dotted package path (e.g.
+            ``resi_fapi.routes.al2rcv_generated``).
+        category: Dot-separated category or empty string when uncategorized.
+        resource: Resource snake name.
+        record_id: Optional record id echoed on the plan.
+        view_type: View discriminator (part of cache key).
+        cache: Cache to use; defaults to :func:`default_rcv_plan_cache`.
+
+    Returns:
+        Validated ``RcvPlan``.
+
+    Raises:
+        ValueError: For invalid ``category`` / ``resource`` segments.
+        ModuleNotFoundError: If the generated module is missing.
+    """
+
+    key = _plan_key(import_root, category, resource, view_type)
+    store = cache if cache is not None else _default_cache
+    plan = _cached_plan(key, store)
+    if record_id is None:
+        return plan
+
+    # A shallow copy: only ``record_id`` differs from the cached plan.
+    return plan.model_copy(update={"record_id": record_id})
+
+
+def resolve_rcv_plan_json(
+    *,
+    import_root: str,
+    category: str,
+    resource: str,
+    record_id: int | None,
+    view_type: str,
+    cache: RcvPlanCache | None = None,
+) -> tuple[bytes, str]:
+    """Like :func:`resolve_rcv_plan`, but return the plan as JSON.
+
+    The plan is serialized once per cache entry, so a hit costs no model
+    copy and no serialization.
+
+    Args:
+        import_root: Dotted package path (e.g.
+            ``resi_fapi.routes.al2rcv_generated``).
+        category: Dot-separated category or empty string when uncategorized.
+        resource: Resource snake name.
+        record_id: Optional record id echoed on the plan.
+        view_type: View discriminator (part of cache key).
+        cache: Cache to use; defaults to :func:`default_rcv_plan_cache`.
+
+    Returns:
+        The UTF-8 JSON body and its ``ETag`` header value.
+
+    Raises:
+        ValueError: For invalid ``category`` / ``resource`` segments.
+        ModuleNotFoundError: If the generated module is missing.
+    """
+
+    key = _plan_key(import_root, category, resource, view_type)
+    store = cache if cache is not None else _default_cache
+    plan = _cached_plan(key, store)
+
+    # The entry may be gone if the cache was cleared after the lookup.
+    dumped = store.get_json(key) or RcvPlanJson.from_plan(plan)
+    return dumped.render(record_id), dumped.etag(record_id)
+
+
+def rcv_etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Tell if an ``If-None-Match`` header value accepts ``etag``.
+
+    Args:
+        if_none_match: The raw header value, if any.
+        etag: The current ``ETag`` of the response.
+
+    Returns:
+        ``True`` when the client copy is current (reply with 304).
+    """
+
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
@@ -115,6 +115,12 @@ class TestRCVPlanAcceptsAllFieldKinds:
         again = RcvPlan.model_validate(dumped)
         kinds = {f.kind for f in again.fields}
         assert kinds == {f["kind"] for f in fields}
+
+        # Lists on the wire become tuples, so a shared plan cannot change.
+        assert isinstance(dumped["fields"], list)
+        assert isinstance(again.fields, tuple)
+        enum = next(f for f in again.fields if f.kind == FIELD_TYPE_ENUM)
+        assert enum.data.enum_values == ("a",)
         assert again.resource_data_access is not None
         assert again.resource_data_access.url_pattern == "/classic/c/r/"
         assert again.resource_data_access.requires_org_id is True
@@ -12,10 +12,13 @@ def test_exdrf_rcv_importable() -> None:
         "RcvResourceDataAccess",
         "RcvPlanCache",
         "RcvPlanCacheKey",
+        "RcvPlanJson",
         "clear_rcv_plan_overrides",
         "default_rcv_plan_cache",
+        "rcv_etag_matches",
         "register_rcv_plan_override",
         "resolve_rcv_plan",
+        "resolve_rcv_plan_json",
         "unregister_rcv_plan_override",
     ):
         assert name in exdrf_rcv.__all__
@@ -1,5 +1,6 @@
 """Tests for ``resolve_rcv_plan``, cache, and overrides."""
 
+import json
 import shutil
 import sys
 import textwrap
@@ -7,6 +8,7 @@ from collections.abc import Generator
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
 from exdrf_rcv.models import RcvPlan
 from exdrf_rcv.plan_resolve import (
@@ -14,8 +16,10 @@ from exdrf_rcv.plan_resolve import (
     RcvPlanCacheKey,
     clear_rcv_plan_overrides,
     default_rcv_plan_cache,
+    rcv_etag_matches,
     register_rcv_plan_override,
     resolve_rcv_plan,
+    resolve_rcv_plan_json,
     unregister_rcv_plan_override,
 )
 
@@ -166,6 +170,78 @@ class TestResolveRcvPlan:
             sys.path.remove(str(tmp_path))
 
 
+class TestSharedPlans:
+    """Cached plans are frozen and shared instead of copied."""
+
+    def test_hits_share_the_cached_plan(self, tmp_rcv_pkg: Path) -> None:
+        """Hits return the cached instance or a shallow ``record_id`` copy."""
+
+        cache = RcvPlanCache()
+        args = dict(
+            import_root="dyn_rcv_pkg",
+            category="cat",
+            resource="res",
+            view_type="detail",
+            cache=cache,
+        )
+        first = resolve_rcv_plan(record_id=None, **args)
+        assert resolve_rcv_plan(record_id=None, **args) is first
+
+        other = resolve_rcv_plan(record_id=3, **args)
+        assert other.record_id == 3
+        assert other.fields is first.fields
+        assert first.record_id is None
+
+        with pytest.raises(ValidationError):
+            first.render_type = "x"  # type: ignore[misc]
+        with pytest.raises(ValidationError):
+            first.fields[0].title = "x"  # type: ignore[misc]
+        assert isinstance(first.fields, tuple)
+        with pytest.raises(TypeError):
+            first.fields[0] = first.fields[0]  # type: ignore[index]
+
+    def test_json_matches_the_model(self, tmp_rcv_pkg: Path) -> None:
+        """The cached JSON equals the serialized plan for each record."""
+
+        cache = RcvPlanCache()
+        args = dict(
+            import_root="dyn_rcv_pkg",
+            category="cat",
+            resource="res",
+            view_type="detail",
+            cache=cache,
+        )
+        for record_id in (None, 5, 12):
+            body, etag = resolve_rcv_plan_json(record_id=record_id, **args)
+            plan = resolve_rcv_plan(record_id=record_id, **args)
+            assert json.loads(body) == json.loads(plan.model_dump_json())
+            assert etag.startswith('"') and etag.endswith('"')
+
+        key = RcvPlanCacheKey(
+            import_root="dyn_rcv_pkg",
+            category="cat",
+            resource="res",
+            view_type="detail",
+        )
+        dumped = cache.get_json(key)
+        assert dumped is not None and cache.get_json(key) is dumped
+
+        _, etag_5 = resolve_rcv_plan_json(record_id=5, **args)
+        _, etag_6 = resolve_rcv_plan_json(record_id=6, **args)
+        assert etag_5 != etag_6
+        assert rcv_etag_matches(etag_5, etag_5)
+        assert rcv_etag_matches('"x", W/%s' % etag_5, etag_5)
+        assert rcv_etag_matches("*", etag_5)
+        assert not rcv_etag_matches(etag_6, etag_5)
+        assert not rcv_etag_matches(None, etag_5)
+
+        # A new plan for the key drops the old JSON.
+        cache.set(key, cache.get(key).model_copy(update={"render_type": "z"}))
+        body, etag = resolve_rcv_plan_json(record_id=5, **args)
+        assert json.loads(body)["render_type"] == "z"
+        assert etag != etag_5
+
+
 class TestRcvPlanOverrides:
     """Override registry clears cache and mutates plans."""
 
@@ -183,7 +259,7 @@ class TestRcvPlanOverrides:
 
         def bump_title(p: RcvPlan) -> RcvPlan:
             f0 = p.fields[0].model_copy(update={"title": "T"})
-            return p.model_copy(update={"fields": [f0, *p.fields[1:]]})
+            return p.model_copy(update={"fields": (f0, *p.fields[1:])})
 
         register_rcv_plan_override(key, bump_title)
         try:
@@ -4,11 +4,13 @@ from enum import StrEnum
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     Generic,
     List,
     Literal,
     Optional,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -17,9 +19,12 @@ from typing import (
 import pluggy
 from attrs import define, field
 
+from .check_store import check_version_key, result_from_dict
+from .record_source import RecordCursor, RecordSource
 from .task import Task, TaskParameter
 
 if TYPE_CHECKING:
+    from exdrf_util.check_store import CheckResultStore
     from exdrf_util.typedefs import HasBasicContext, HasTranslate
 
 # T represents the type of the item that the check is being performed on
@@ -92,10 +97,48 @@ class CheckResult:
 
 @define(slots=True, kw_only=True)
 class CheckTask(Task, Generic[T]):
-    """A task that executes a check."""
+    """A task that executes a check.
+
+    Attributes:
+        check: The check to execute.
+        results: The results collected so far.
+        shard: When set, a (index, count) pair that restricts the task to
+            one of `count` consecutive slices of the prepared records, so
+            that several tasks can share a large check. The results of the
+            shards, taken in index order, are those of the whole check.
+        key_range: When set, a (lower, upper] range of keys that restricts
+            the task to the records of a `RecordSource` with a key in it
+            (see `RecordSource.key_range()`).
+        on_split: When set along with `shard`, the task splits the records
+            of the check once in `count` ranges of keys (see
+            `RecordSource.split()`), reports the keys that end the ranges
+            through this callable and checks the first range. Other tasks
+            check the other ranges through their `key_range`. Records that
+            cannot be split are reported as None and all of them are
+            checked.
+        store: When set, the results of previous runs are reused for the
+            records whose fingerprint did not change (see
+            `Check.compute_fingerprint`) and the new results are saved.
+            The records are then checked in batches of `store.batch_size`:
+            the steps collect them and the stored results of a batch are
+            looked up together before the check runs on the changed ones.
+        reused: The number of results that were taken from the store.
+    """
 
     check: "Check"
     results: List[CheckResult] = field(factory=list)
+    shard: Optional[Tuple[int, int]] = field(default=None)
+    key_range: Optional[Tuple[Any, Any]] = field(default=None)
+    on_split: Optional[Callable[[Optional[List[Any]]], None]] = field(
+        default=None, repr=False
+    )
+    store: Optional["CheckResultStore"] = field(default=None, repr=False)
+    reused: int = field(default=0, repr=False)
+    _version: str = field(default="", init=False, repr=False)
+    _batch: List[Tuple[int, Any, str, str]] = field(
+        factory=list, init=False, repr=False
+    )
+    _seen: Set[str] = field(factory=set, init=False, repr=False)
 
     def __attrs_post_init__(self):
         if self.title == "":
@@ -250,14 +293,72 @@ class CheckTask(Task, Generic[T]):
                 self.data[k] = v.value
 
             # If the result has a records member, we assume its length to be
-            # the number of records to check.
+            # the number of records to check. A record source is replaced
+            # by a cursor that reads the records as the steps advance.
             if "records" in result:
-                self.max_steps = len(result["records"])
+                records = result["records"]
+                if isinstance(records, RecordSource):
+                    self.data["records"] = self._source_cursor(records)
+                elif self.on_split is not None:
+                    # A list is only built by this task; check all of it.
+                    self.on_split(None)
+                elif self.shard is not None:
+                    index, count = self.shard
+                    size = len(records)
+                    self.data["records"] = records[
+                        size * index // count : size * (index + 1) // count
+                    ]
+                self.max_steps = len(self.data["records"])
+
+            # Results are stored under the version and the parameters.
+            if self.store is not None and not self.check.is_global:
+                self._version = check_version_key(
+                    self.check.version,
+                    {k: v.value for k, v in self.check.parameters.items()},
+                )
             return True
         return False
 
+    def _source_cursor(self, records: RecordSource) -> RecordCursor:
+        """Create the cursor over the records of a source this task checks."""
+        if self.key_range is not None:
+            return records.key_range(*self.key_range).cursor()
+        if self.shard is None:
+            return records.cursor()
+
+        index, count = self.shard
+        if self.on_split is not None:
+            bounds = records.split(count)
+            self.on_split(bounds)
+            if bounds is None:
+                return records.cursor()
+            self.key_range = (None, bounds[0])
+            return records.key_range(*self.key_range).cursor()
+
+        size = records.count()
+        return records.cursor(
+            size * index // count, size * (index + 1) // count
+        )
+
     def cleanup_task(self, ctx: "HasBasicContext") -> bool:  # type: ignore
         """Cleanup the task."""
+        records = self.data.get("records")
+        if isinstance(records, RecordCursor):
+            records.close()
+
+        if self.store is not None and not self.check.is_global:
+            self._check_batch(ctx)
+            self.store.flush()
+
+            # A complete run knows all the records; forget the others.
+            if not self.should_stop and self.shard is None:
+                self.store.prune(self.check.check_id, self._seen)
+            logger.debug(
+                "Check %s reused %d of %d results",
+                self.check.check_id,
+                self.reused,
+                len(self.results),
+            )
         return self.check.cleanup_check(ctx)
 
     def get_failed_message(self, ctx: "HasTranslate") -> str:
@@ -277,8 +378,14 @@ class CheckTask(Task, Generic[T]):
         if stage in ("prepare", "cleanup"):
             return super().handle_exception(ctx, e, stage)
 
+        self._set_failed(ctx, self.results[-1], e)
+        return True
+
+    def _set_failed(
+        self, ctx: "HasTranslate", result: CheckResult, e: Exception
+    ) -> None:
+        """Mark a result as failed because of an exception."""
         t_key = "check.failed.exception"
-        result = self.results[-1]
         result.check_id = self.check.check_id
         result.state = ResultState.FAILED
         result.params["exception"] = str(e)
@@ -288,7 +395,6 @@ class CheckTask(Task, Generic[T]):
             "The check failed to execute: {exception} ({e_class}).",
             **result.params,
         )
-        return True
 
     def execute_step(self, ctx: "HasBasicContext") -> None:  # type: ignore
         """Execute one step in the task."""
@@ -297,8 +403,65 @@ class CheckTask(Task, Generic[T]):
         record_id = self.check.get_record_id(self.step, self.data, item)
         result.params["id"] = record_id
         result.issue_hash = self.check.compute_hash(self.step, self.data, item)
-        result = self.check.execute(ctx, item, result)
-        self.results[-1] = result
+
+        if self.store is None or self.check.is_global:
+            self.results[-1] = self.check.execute(ctx, item, result)
+            return
+
+        # Records with a fingerprint wait for the rest of their batch.
+        self._seen.add(record_id)
+        fingerprint = self.check.compute_fingerprint(self.step, self.data, item)
+        if fingerprint is None:
+            self.results[-1] = self.check.execute(ctx, item, result)
+            return
+        self._batch.append(
+            (len(self.results) - 1, item, record_id, fingerprint)
+        )
+        if (
+            len(self._batch) >= self.store.batch_size
+            or self.step + 1 >= self.max_steps > -1
+        ):
+            self._check_batch(ctx)
+
+    def _check_batch(self, ctx: "HasBasicContext") -> None:
+        """Check the records collected by the steps.
+
+        The stored results of the batch are looked up together; a record
+        whose fingerprint did not change reuses its result and the others
+        are checked and their results saved.
+        """
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        assert self.store is not None
+        check_id = self.check.check_id
+        stored = self.store.lookup(
+            check_id, self._version, [b[2] for b in batch]
+        )
+        for index, item, record_id, fingerprint in batch:
+            previous = stored.get(record_id)
+            if previous is not None and previous[0] == fingerprint:
+                self.results[index] = result_from_dict(check_id, previous[1])
+                self.reused += 1
+                continue
+
+            try:
+                result = self.check.execute(ctx, item, self.results[index])
+            except Exception as e:
+                logger.error(
+                    "Error checking record %s of task %s: %s",
+                    record_id,
+                    self.title,
+                    e,
+                    exc_info=True,
+                )
+                self._set_failed(ctx, self.results[index], e)
+                continue
+            self.results[index] = result
+            if result.state != ResultState.FAILED:
+                self.store.put(
+                    check_id, self._version, record_id, fingerprint, result
+                )
 
 
 @define(slots=True, frozen=True, kw_only=True)
@@ -322,6 +485,9 @@ class Check(Generic[T]):
             fixed or not will be reflected in the result.
         parameters: Definition of the parameters that the check accepts
             and their values.
+        version: The version of the check logic. Change it when the check
+            changes, so that stored results produced by the old logic are
+            not reused.
     """
 
     check_id: str
@@ -335,6 +501,7 @@ class Check(Generic[T]):
     parameters: Dict[str, "TaskParameter"] = field(
         factory=OrderedDict, repr=False
     )
+    version: str = field(default="", repr=False)
 
     def prepare_check(self, ctx: "HasBasicContext") -> Optional[Dict[str, Any]]:
         """Prepare the check.
@@ -343,7 +510,10 @@ class Check(Generic[T]):
         the check needs to store between the prepare and cleanup steps.
 
         This is the best place to obtain and store the list of records that
-        will be checked.
+        will be checked. The records can be placed in the `records` member
+        either as a list or, for large sets, as a `RecordSource` (like a
+        `QueryRecordSource`) that the task reads in chunks; in both cases
+        `get_record_to_check` can index `data["records"]` with the step.
 
         If the result is None this indicates that the preparation step failed.
         The check will be aborted and the user will be notified.
@@ -377,6 +547,22 @@ class Check(Generic[T]):
         del step, data, item
         return ""
 
+    def compute_fingerprint(
+        self, step: int, data: Dict[str, Any], item: T
+    ) -> Optional[str]:
+        """Compute a fingerprint of the content of the item that is checked.
+
+        When the fingerprint of a record is the same as in a previous run
+        (for the same check version and parameters) the stored result is
+        reused instead of executing the check again. A good fingerprint
+        covers everything the check reads: a row version, a modification
+        time or a hash of the relevant fields.
+
+        The default returns None, which always executes the check.
+        """
+        del step, data, item
+        return None
+
     def execute(
         self,
         ctx: "HasBasicContext",
@@ -0,0 +1,225 @@
+"""Keep the results of check runs between runs.
+
+A `CheckResultStore` saves, for each check and record, the result of the
+last run in a small SQLite file, together with the fingerprint of the record
+and a key of the check version and parameters. `CheckTask` uses it to skip
+the records that did not change since they were last checked.
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    from exdrf_util.check import CheckResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS check_results (
+    check_id TEXT NOT NULL,
+    record_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (check_id, record_id)
+)
+"""
+
+# The most record IDs that are looked up by a single statement; SQLite
+# limits the number of parameters of a statement.
+LOOKUP_CHUNK = 500
+
+
+def check_version_key(version: str, param_values: Dict[str, Any]) -> str:
+    """Combine the version of a check with the values of its parameters.
+
+    A stored result is only valid for the same check logic and the same
+    parameters, so both are part of the key the results are stored under.
+
+    Args:
+        version: The version of the check.
+        param_values: The parameter values keyed by parameter name.
+
+    Returns:
+        A short string that changes when any of the inputs change.
+    """
+    payload = json.dumps(
+        [version, sorted(param_values.items())], default=str, sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def result_to_dict(result: "CheckResult") -> Dict[str, Any]:
+    """Convert a check result to plain JSON-compatible data."""
+    return {
+        "state": str(result.state),
+        "issue_hash": result.issue_hash,
+        "t_key": result.t_key,
+        "params": dict(result.params),
+        "description": result.description,
+        "links": [list(link) for link in result.links],
+    }
+
+
+def result_from_dict(check_id: str, data: Dict[str, Any]) -> "CheckResult":
+    """Recreate a check result from the output of `result_to_dict`."""
+    from exdrf_util.check import CheckResult, ResultState
+
+    return CheckResult(
+        check_id=check_id,
+        state=ResultState(data["state"]),
+        issue_hash=data.get("issue_hash"),
+        t_key=data.get("t_key", ""),
+        params=dict(data.get("params") or {}),
+        description=data.get("description", ""),
+        links=[tuple(link) for link in data.get("links") or []],
+    )
+
+
+class CheckResultStore:
+    """Results of previous check runs, kept in a local SQLite file.
+
+    For each check and record the store keeps the result together with the
+    fingerprint of the record and the version key of the check (see
+    `check_version_key`) that produced it. A later run can reuse the result
+    when neither changed.
+
+    Several processes can use the same file; writes are batched and each
+    batch is a short transaction.
+
+    Attributes:
+        path: The path of the SQLite file.
+        batch_size: Number of pending writes that triggers a flush. It is
+            also the number of records whose stored results a check task
+            looks up together.
+    """
+
+    path: str
+    batch_size: int
+    _conn: sqlite3.Connection
+    _pending: List[Tuple[str, str, str, str, str]]
+
+    def __init__(self, path: str, batch_size: int = 1000) -> None:
+        """Open (and create if needed) the store.
+
+        Args:
+            path: The path of the SQLite file.
+            batch_size: Number of pending writes that triggers a flush.
+        """
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self._pending = []
+        self._conn = sqlite3.connect(path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(SCHEMA)
+
+    def lookup(
+        self, check_id: str, version: str, record_ids: Iterable[str]
+    ) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Get the stored results of some records that are still valid.
+
+        Only the requested records are read, so the memory used depends on
+        the number of IDs and not on the size of the store.
+
+        Args:
+            check_id: The ID of the check.
+            version: The version key of the check.
+            record_ids: The IDs of the records.
+
+        Returns:
+            The fingerprint and the result data, keyed by record ID, for
+            the records that have a result for this version.
+        """
+        ids = list(dict.fromkeys(record_ids))
+        found: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for i in range(0, len(ids), LOOKUP_CHUNK):
+            chunk = ids[i : i + LOOKUP_CHUNK]
+            rows = self._conn.execute(
+                "SELECT record_id, fingerprint, result FROM check_results "
+                "WHERE check_id = ? AND version = ? AND record_id IN (%s)"
+                % ", ".join("?" * len(chunk)),
+                (check_id, version, *chunk),
+            )
+            for r in rows:
+                found[r[0]] = (r[1], json.loads(r[2]))
+        return found
+
+    def put(
+        self,
+        check_id: str,
+        version: str,
+        record_id: str,
+        fingerprint: str,
+        result: "CheckResult",
+    ) -> None:
+        """Remember the result of a check for a record.
+
+        Args:
+            check_id: The ID of the check.
+            version: The version key of the check.
+            record_id: The ID of the record.
+            fingerprint: The fingerprint of the record.
+            result: The result to store.
+        """
+        self._pending.append(
+            (
+                check_id,
+                record_id,
+                version,
+                fingerprint,
+                json.dumps(result_to_dict(result), default=str),
+            )
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending results."""
+        if not self._pending:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO check_results "
+                "(check_id, record_id, version, fingerprint, result) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def prune(self, check_id: str, keep: Iterable[str]) -> int:
+        """Forget the results of a check for records that no longer exist.
+
+        Args:
+            check_id: The ID of the check.
+            keep: The IDs of the records that were seen by the last run.
+
+        Returns:
+            The number of results that were removed.
+        """
+        self.flush()
+        keep_set = set(keep)
+        stored = [
+            r[0]
+            for r in self._conn.execute(
+                "SELECT record_id FROM check_results WHERE check_id = ?",
+                (check_id,),
+            )
+        ]
+        gone = [(check_id, r) for r in stored if r not in keep_set]
+        if gone:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM check_results "
+                    "WHERE check_id = ? AND record_id = ?",
+                    gone,
+                )
+        return len(gone)
+
+    def close(self) -> None:
+        """Write the pending results and close the file."""
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
@@ -1,10 +1,402 @@
+"""Merge and split PDF files.
+
+The output is written page by page. Pages that are copied as they are go
+straight from the source document; pages whose image is adjusted are
+rendered, converted and rotated by a pool of processes, a few pages ahead
+of the writer, so that merging many scanned files uses all the cores while
+only a bounded number of pages waits in memory.
+
+Runs of consecutive pages of a file are copied together, so that the
+objects they share are copied once. The output is saved once, in full, to
+a temporary file next to the target that replaces the target once
+complete.
+"""
+
+import logging
+import multiprocessing
 import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
 from io import BytesIO
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+# Reports the number of pages written and the total number of pages.
+ProgressCallback = Callable[[int, int], None]
+
+# Tells if the work should stop.
+StopCallback = Callable[[], bool]
+
+
+class OutputPage(NamedTuple):
+    """A page of an output file.
+
+    Attributes:
+        path: The source PDF file.
+        page: The zero-based index of the page in the source.
+        rotation: The rotation of the output page in degrees, or -1 to keep
+            the one of the source page.
+        adjust_image: Replace the page with a grayscale image of it.
+    """
+
+    path: str
+    page: int
+    rotation: int = -1
+    adjust_image: bool = False
+
+
+def default_merge_processes() -> int:
+    """The number of processes used to adjust page images by default."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# The last document opened by a pool process, reused by the next pages.
+_worker_doc: Optional[Tuple[str, Any]] = None
+
+
+def adjust_page_image(page: OutputPage) -> bytes:
+    """Create a one-page PDF with a grayscale image of a page.
+
+    This runs in the processes of the pool. The source document stays open
+    between calls, as consecutive pages usually come from the same file.
+
+    Args:
+        page: The page to convert.
+
+    Returns:
+        The content of the new PDF.
+    """
+    global _worker_doc
+    import fitz  # type: ignore[import-untyped]
+    from PIL import Image, ImageOps
+
+    if _worker_doc is None or _worker_doc[0] != page.path:
+        if _worker_doc is not None:
+            _worker_doc[1].close()
+        _worker_doc = (page.path, fitz.open(page.path))
+    src = _worker_doc[1][page.page]
+
+    # The document is shared with the next pages, so the rotation of the
+    # source page is put back once the page is rendered.
+    original = src.rotation
+    if page.rotation >= 0:
+        src.set_rotation(page.rotation)
+    try:
+        pix = src.get_pixmap(matrix=fitz.Matrix(1.0, 1.0))
+    finally:
+        if src.rotation != original:
+            src.set_rotation(original)
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    image_file = BytesIO()
+    ImageOps.grayscale(img).save(image_file, format="png")
+
+    # Wrap the image in a page of its size.
+    img_doc = fitz.open(stream=image_file, filetype="png")
+    img_pdf = fitz.open("pdf", img_doc.convert_to_pdf())
+    img_doc.close()
+    out = fitz.open()
+    out_page = out.new_page(width=pix.width, height=pix.height)
+    out_page.show_pdf_page(fitz.Rect(0, 0, pix.width, pix.height), img_pdf)
+    img_pdf.close()
+    data = out.tobytes()
+    out.close()
+    return data
+
+
+class _PdfWriter:
+    """Writes the pages of an output file.
+
+    Consecutive pages of a source document that keep the same rotation are
+    collected and copied by a single `insert_pdf` call. The output stays
+    open until it is complete and is then saved once, in full, without the
+    unused objects and with compressed streams.
+
+    Attributes:
+        out_path: The file to create.
+        flush_every: The most pages that are copied by a single call.
+    """
+
+    out_path: str
+    flush_every: int
+    _fitz: Any
+    _tmp_path: str
+    _doc: Any
+    _range: Optional[Tuple[str, int, int, int]]
+    _src: Optional[Tuple[str, Any]]
+
+    def __init__(
+        self,
+        out_path: str,
+        flush_every: int,
+        metadata: Optional[Dict[str, str]] = None,
+    ):
+        import fitz  # type: ignore[import-untyped]
+
+        self._fitz = fitz
+        self.out_path = out_path
+        self.flush_every = max(1, flush_every)
+        self._tmp_path = out_path + ".part"
+        self._doc = fitz.open()
+        if metadata:
+            self._doc.set_metadata(metadata)
+        self._range = None
+        self._src = None
+
+    def copy_page(self, page: OutputPage) -> None:
+        """Copy a page from its source document.
+
+        The page extends the range of pages waiting to be copied when it
+        follows it, in either direction.
+        """
+        if self._range is not None:
+            path, first, last, rotation = self._range
+            if (
+                path == page.path
+                and rotation == page.rotation
+                and abs(last - first) + 1 < self.flush_every
+                and (
+                    (page.page == last + 1 and last >= first)
+                    or (page.page == last - 1 and last <= first)
+                )
+            ):
+                self._range = (path, first, page.page, rotation)
+                return
+            self._flush()
+        self._range = (page.path, page.page, page.page, page.rotation)
+
+    def add_pdf(self, data: bytes) -> None:
+        """Append the pages of a PDF held in memory."""
+        self._flush()
+        src = self._fitz.open("pdf", data)
+        try:
+            self._doc.insert_pdf(src)
+        finally:
+            src.close()
+
+    def finish(self, toc: Optional[List[list]] = None) -> None:
+        """Copy the last pages, save the file and move it in place."""
+        self._flush()
+        self._close_source()
+        if toc:
+            self._doc.set_toc(toc)
+        self._doc.save(self._tmp_path, garbage=3, deflate=True)
+        self._doc.close()
+        self._doc = None
+        os.replace(self._tmp_path, self.out_path)
+
+    def abort(self) -> None:
+        """Close everything and remove the partial file."""
+        self._range = None
+        self._close_source()
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def _flush(self) -> None:
+        """Copy the range of pages waiting to be copied."""
+        if self._range is None:
+            return
+        path, first, last, rotation = self._range
+        self._range = None
+        if self._src is None or self._src[0] != path:
+            self._close_source()
+            self._src = (path, self._fitz.open(path))
+        self._doc.insert_pdf(
+            self._src[1],
+            from_page=first,
+            to_page=last,
+            rotate=rotation,
+        )
+
+    def _close_source(self) -> None:
+        if self._src is not None:
+            self._src[1].close()
+            self._src = None
+
+
+def write_pdf_pages(
+    pages: Sequence[OutputPage],
+    out_path: str,
+    *,
+    toc: Optional[List[list]] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    processes: Optional[int] = None,
+    flush_every: int = 50,
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[StopCallback] = None,
+) -> bool:
+    """Create a PDF file out of pages of other files.
+
+    Args:
+        pages: The pages of the output, in order.
+        out_path: The file to create.
+        toc: The table of contents of the output, as for `Document.set_toc`.
+        metadata: The metadata of the output.
+        processes: The number of processes that adjust page images. They
+            are only started if some page needs it; by default a few less
+            than the number of CPUs.
+        flush_every: The most pages of a source that are copied together.
+        progress: Called after each page with the number of pages written
+            and the total.
+        should_stop: Checked before each page; the work stops and the
+            partial output is removed when it returns True.
+
+    Returns:
+        True if the file was created, False if the work was stopped.
+    """
+    total = len(pages)
+    writer = _PdfWriter(out_path, flush_every, metadata)
+    pool: Optional[ProcessPoolExecutor] = None
+    try:
+        # Adjusted pages are converted by the pool, a few pages ahead.
+        adjusted = [p for p in pages if p.adjust_image]
+        window: Deque["Future[bytes]"] = deque()
+        workers = processes or default_merge_processes()
+        if adjusted:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        ahead = iter(adjusted)
+
+        def fill() -> None:
+            assert pool is not None
+            while len(window) < 2 * workers:
+                page = next(ahead, None)
+                if page is None:
+                    return
+                window.append(pool.submit(adjust_page_image, page))
+
+        for done, page in enumerate(pages, start=1):
+            if should_stop is not None and should_stop():
+                writer.abort()
+                return False
+            if page.adjust_image:
+                fill()
+                future = window.popleft()
+                while not future.done():
+                    if should_stop is not None and should_stop():
+                        writer.abort()
+                        return False
+                    wait([future], timeout=0.1, return_when=FIRST_COMPLETED)
+                writer.add_pdf(future.result())
+            else:
+                writer.copy_page(page)
+            if progress is not None:
+                progress(done, total)
+
+        writer.finish(toc)
+        return True
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _write_part(out_path: str, pages: Sequence[OutputPage]) -> str:
+    """Write one output of `split_pdf_file` in a pool process."""
+    write_pdf_pages(pages, out_path, processes=1)
+    return out_path
+
+
+def split_pdf_file(
+    parts: Sequence[Tuple[str, Sequence[OutputPage]]],
+    *,
+    processes: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[StopCallback] = None,
+) -> List[str]:
+    """Create several PDF files at the same time.
+
+    The files are written by a pool of processes, each process writing one
+    file at a time.
+
+    Args:
+        parts: The path and the pages of each file.
+        processes: The number of processes; by default a few less than the
+            number of CPUs, and never more than the number of files.
+        progress: Called after each file with the number of pages written
+            and the total.
+        should_stop: Checked before starting each file; the files that
+            were not started are skipped when it returns True.
+
+    Returns:
+        The paths of the files that were created, in the order of `parts`;
+        the parts without pages are skipped.
+    """
+    todo = [(path, pages) for path, pages in parts if pages]
+    if not todo:
+        return []
+    total = sum(len(pages) for _, pages in todo)
+    workers = min(len(todo), processes or default_merge_processes())
+
+    # A single file needs no pool.
+    if len(todo) == 1:
+        path, pages = todo[0]
+        done = write_pdf_pages(
+            pages,
+            path,
+            processes=1,
+            progress=progress,
+            should_stop=should_stop,
+        )
+        return [path] if done else []
+
+    created: Dict[str, int] = {}
+    written = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as pool:
+        # Keep each process busy with one file, starting the next ones as
+        # the files are done.
+        waiting = iter(enumerate(todo))
+        running: Dict["Future[str]", Tuple[int, int]] = {}
+        while True:
+            stop = should_stop is not None and should_stop()
+            while not stop and len(running) < workers:
+                nxt = next(waiting, None)
+                if nxt is None:
+                    break
+                index, (path, pages) = nxt
+                future = pool.submit(_write_part, path, pages)
+                running[future] = (index, len(pages))
+            if not running:
+                break
+            finished, _ = wait(
+                running, timeout=0.1, return_when=FIRST_COMPLETED
+            )
+            for future in finished:
+                index, count = running.pop(future)
+                created[future.result()] = index
+                written += count
+                if progress is not None:
+                    progress(written, total)
+    return sorted(created, key=created.__getitem__)
 
 
 def merge_pdf_files(
-    file_list: List[str],
+    file_list: Sequence[Any],
     out_path: str,
     no_toc: bool = False,
     creator: str = "",
@@ -14,36 +406,60 @@ def merge_pdf_files(
     subject: str = "",
     keywords: str = "",
     adjust_image: bool = False,
-):
+    processes: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    should_stop: Optional[StopCallback] = None,
+) -> bool:
+    """Merge PDF files into one, with a bookmark for each file.
+
+    Args:
+        file_list: The files to merge. An item is either a path or a tuple
+            of path, first page, last page (zero-based; first > last
+            reverses the pages), rotation and bookmark title.
+        out_path: The file to create.
+        no_toc: Do not create bookmarks.
+        creator: The creator in the metadata.
+        producer: The producer in the metadata.
+        title: The title in the metadata.
+        author: The author in the metadata.
+        subject: The subject in the metadata.
+        keywords: The keywords in the metadata.
+        adjust_image: Replace the pages with grayscale images of them.
+        processes: The number of processes that adjust the images.
+        progress: Called after each page with the number of pages written
+            and the total.
+        should_stop: Checked before each page; the merge stops and the
+            partial output is removed when it returns True.
+
+    Returns:
+        True if the file was created, False if the merge was stopped.
+    """
     import fitz  # type: ignore[import-untyped]
-    from PIL import Image, ImageOps
 
     c_date = fitz.get_pdf_now()
-    pdf_out: fitz.Document = fitz.open()  # empty new PDF document
-    aus_nr = 0  # current page number in output
-    pdf_out.set_metadata(
-        {
-            "creator": creator,
-            "producer": producer,
-            "creationDate": c_date,
-            "modDate": c_date,
-            "title": title,
-            "author": author,
-            "subject": subject,
-            "keywords": keywords,
-        }
-    )  # put in meta data
-    total_toc = []  # initialize TOC
-
-    for file_path in file_list:
-        # Open the document and see how many pages it has.
-        doc: fitz.Document = fitz.open(file_path)
-        doc_len = len(doc)
+    metadata = {
+        "creator": creator,
+        "producer": producer,
+        "creationDate": c_date,
+        "modDate": c_date,
+        "title": title,
+        "author": author,
+        "subject": subject,
+        "keywords": keywords,
+    }
+    pages: List[OutputPage] = []
+    total_toc: List[list] = []  # initialize TOC
 
+    for item in file_list:
         # The input list can also contain page interval (0 based) and rotation
         # angle. first > last means reversing the order of pages
-        if isinstance(file_path, (list, tuple)):
-            file_path, first, last, rot, bookmark = file_path
+        file_path = item[0] if isinstance(item, (list, tuple)) else item
+
+        # Only the page count and the outline are read here.
+        doc: fitz.Document = fitz.open(file_path)
+        doc_len = len(doc)
+        if isinstance(item, (list, tuple)):
+            _, first, last, rot, bookmark = item
         else:
             first, last, rot, bookmark = (
                 0,
@@ -57,44 +473,6 @@ def merge_pdf_files(
         last = min(max(0, last), doc_len - 1)
         rot = int(rot)
 
-        if adjust_image:
-            zoom = 1.0
-            mat = fitz.Matrix(zoom, zoom)
-            for i, page in enumerate(doc):
-                if i < first or i > last:
-                    continue
-                pix = page.get_pixmap(matrix=mat)
-                img = Image.frombytes(
-                    "RGB",
-                    (pix.width, pix.height),
-                    pix.samples,
-                )
-                gray_image = ImageOps.grayscale(img)
-                imagefile = BytesIO()
-                gray_image.save(imagefile, format="png")
-                # gray_image.save(imagefile, format='jpeg')
-
-                # open it as a PyMuPDF document
-                img_pdf = fitz.open(stream=imagefile, filetype="png")
-                pdfbytes = img_pdf.convert_to_pdf()
-                img_pdf.close()
-                # open stream as PDF
-                img_pdf = fitz.open("pdf", pdfbytes)
-
-                page = pdf_out.new_page(
-                    width=pix.width,
-                    height=pix.height,  # new page with ...
-                )  # pic dimension
-                r1 = fitz.Rect(0, 0, img.width, img.height)
-                page.show_pdf_page(r1, img_pdf)  # image fills the page
-        else:
-            # now copy the page range
-            pdf_out.insert_pdf(doc, from_page=first, to_page=last, rotate=rot)
-
-        # no ToC wanted - get next file
-        if no_toc:
-            continue
-
         # standard increment for page range
         incr = 1
         if last < first:
@@ -102,12 +480,22 @@ def merge_pdf_files(
 
         # list of page numbers in range
         pno_range = list(range(first, last + incr, incr))
+        aus_nr = len(pages)  # current page number in output
+        pages.extend(
+            OutputPage(file_path, pno, rot, adjust_image) for pno in pno_range
+        )
+
+        # no ToC wanted - get next file
+        if no_toc:
+            doc.close()
+            continue
 
         # insert standard bookmark ahead of any page range
         total_toc.append([1, bookmark, aus_nr + 1])
 
         # get file's TOC
         toc = doc.get_toc(simple=False)
+        doc.close()
 
         # immunize against hierarchy gaps
         last_lvl = 1
@@ -128,11 +516,12 @@ def merge_pdf_files(
             t[2] = pno
             total_toc.append(t)
 
-        aus_nr += len(pno_range)  # increase output counter
-        doc.close()
-        doc = None
-
-    if total_toc:
-        pdf_out.set_toc(total_toc)
-    pdf_out.save(out_path)
-    pdf_out.close()
+    return write_pdf_pages(
+        pages,
+        out_path,
+        toc=total_toc,
+        metadata=metadata,
+        processes=processes,
+        progress=progress,
+        should_stop=should_stop,
+    )
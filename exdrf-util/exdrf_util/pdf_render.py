@@ -0,0 +1,198 @@
+"""Render PDF pages to raw pixel buffers in worker processes.
+
+The functions in this module run inside the processes of a render pool.
+They import only PyMuPDF so that starting a worker stays cheap. Each
+worker opens the document once and then renders the pages it receives,
+writing the pixels into a shared memory block owned by the parent, so
+that no image encoding is involved in moving a page between processes.
+
+Besides whole pages a worker renders tiles: square parts of a page at a
+multiple of the resolution of the pool, used by the viewer to stay sharp
+when zoomed in without rendering the whole page at a huge resolution.
+"""
+
+import logging
+from multiprocessing import shared_memory
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# The size of a tile in pixels; tiles at the right and bottom edges of a page
+# are smaller.
+TILE_SIZE = 512
+
+
+class RenderJob(NamedTuple):
+    """A request to render one page.
+
+    Attributes:
+        page: The zero-based index of the page.
+        slot: The name of the shared memory block to write the pixels to.
+        slot_size: The size of the shared memory block in bytes.
+        tile: The scale, column and row of the tile to render (see
+            `pixmap_args`), or None for the whole page.
+    """
+
+    page: int
+    slot: str
+    slot_size: int
+    tile: Optional[Tuple[int, int, int]] = None
+
+
+class RenderResult(NamedTuple):
+    """The outcome of a `RenderJob`.
+
+    The pixels are packed rows of `stride` bytes with `channels` bytes per
+    pixel (3 for RGB, 1 for grey). When they fit in the slot of the job
+    they are written there and `data` is None; otherwise `data` holds them.
+
+    Attributes:
+        worker: The index of the worker that rendered the page.
+        page: The zero-based index of the page.
+        width: The width of the image in pixels.
+        height: The height of the image in pixels.
+        stride: The number of bytes in a row.
+        channels: The number of bytes in a pixel.
+        size: The number of bytes of the image.
+        data: The pixels, when they did not fit in the slot.
+        error: The error message, if the page could not be rendered.
+        tile: The tile of the job, if any.
+    """
+
+    worker: int
+    page: int
+    width: int = 0
+    height: int = 0
+    stride: int = 0
+    channels: int = 0
+    size: int = 0
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+    tile: Optional[Tuple[int, int, int]] = None
+
+
+def pixmap_args(
+    fitz: Any, dpi: int, tile: Optional[Tuple[int, int, int]] = None
+) -> Dict[str, Any]:
+    """Compute the arguments of `Page.get_pixmap` for a page or a tile.
+
+    A tile `(scale, col, row)` is the square of `TILE_SIZE` pixels at
+    column `col` and row `row` of the page rendered at `dpi * scale`. In
+    the pixels of the page rendered at `dpi` it starts at
+    `(col, row) * TILE_SIZE / scale`.
+
+    Args:
+        fitz: The PyMuPDF module.
+        dpi: The resolution of the whole page.
+        tile: The tile to render, if any.
+
+    Returns:
+        The keyword arguments for `get_pixmap`.
+    """
+    if tile is None:
+        return {"matrix": fitz.Matrix(dpi / 72.0, dpi / 72.0), "alpha": False}
+    scale, col, row = tile
+    zoom = dpi * scale / 72.0
+    step = TILE_SIZE / zoom
+    return {
+        "matrix": fitz.Matrix(zoom, zoom),
+        "clip": fitz.Rect(
+            col * step, row * step, (col + 1) * step, (row + 1) * step
+        ),
+        "alpha": False,
+    }
+
+
+def attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Open an existing shared memory block without taking ownership.
+
+    The parent creates and unlinks the blocks; a worker only maps them.
+    Python 3.13 can be told not to track such blocks; older versions
+    register them with the resource tracker of the parent process, which
+    the parent unregisters when it unlinks the block.
+    """
+    try:
+        return shared_memory.SharedMemory(
+            name=name,
+            track=False,  # type: ignore[call-arg]
+        )
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def render_pages_process(
+    worker: int, pdf_path: str, dpi: int, task_q: Any, out_q: Any
+) -> None:
+    """Entry point of a render worker process.
+
+    Reads `RenderJob`s from `task_q` until it receives None and posts a
+    `RenderResult` to `out_q` for each of them.
+
+    Args:
+        worker: The index of this worker in the pool.
+        pdf_path: The path of the PDF file.
+        dpi: The resolution of the rendered pages.
+        task_q: The queue with the jobs for this worker.
+        out_q: The queue shared by all the workers for the results.
+    """
+    import fitz  # type: ignore[import-untyped]
+
+    doc = fitz.open(pdf_path)
+    slots: Dict[str, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            job = task_q.get()
+            if job is None:
+                return
+            out_q.put(_render_job(worker, fitz, doc, dpi, job, slots))
+    finally:
+        for slot in slots.values():
+            slot.close()
+        doc.close()
+
+
+def _render_job(
+    worker: int,
+    fitz: Any,
+    doc: Any,
+    dpi: int,
+    job: RenderJob,
+    slots: Dict[str, shared_memory.SharedMemory],
+) -> RenderResult:
+    """Render one page or tile into the slot of the job."""
+    try:
+        page = doc.load_page(job.page)
+        pix = page.get_pixmap(**pixmap_args(fitz, dpi, job.tile))
+        samples = getattr(pix, "samples_mv", None)
+        if samples is None:
+            samples = pix.samples
+        size = len(samples)
+        data = None
+        if size <= job.slot_size:
+            slot = slots.get(job.slot)
+            if slot is None:
+                # The parent replaces a slot that is too small; forget the
+                # old ones of this worker.
+                for old in slots.values():
+                    old.close()
+                slots.clear()
+                slot = slots[job.slot] = attach_shared_memory(job.slot)
+            slot.buf[:size] = samples
+        else:
+            data = bytes(samples)
+        return RenderResult(
+            worker=worker,
+            page=job.page,
+            width=pix.width,
+            height=pix.height,
+            stride=pix.stride,
+            channels=pix.n,
+            size=size,
+            data=data,
+            tile=job.tile,
+        )
+    except Exception as e:
+        logger.error("Error rendering page %d: %s", job.page, e)
+        return RenderResult(
+            worker=worker, page=job.page, error=str(e), tile=job.tile
+        )
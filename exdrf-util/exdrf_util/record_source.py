@@ -0,0 +1,243 @@
+"""Sources that let a check read a large set of records in chunks.
+
+Instead of a list, `Check.prepare_check` can put a `RecordSource` in the
+`records` member of its data. The task then reads the records through a
+`RecordCursor`. The `QueryRecordSource` streams the rows of a SQLAlchemy
+select out of the database in chunks.
+"""
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from attrs import define, evolve, field
+from sqlalchemy import Select, func, select
+
+if TYPE_CHECKING:
+    from exdrf_util.typedefs import HasBasicContext
+
+T = TypeVar("T")
+
+
+@define(slots=True, kw_only=True)
+class RecordSource(Generic[T]):
+    """Records that are produced on demand instead of being held in a list.
+
+    A check can return a record source as the `records` member of the data
+    prepared by `Check.prepare_check`. The task asks the source for the
+    number of records (to report the progress) and then reads them one by
+    one through a `RecordCursor`, so only a small window of records is
+    kept in memory at any time.
+    """
+
+    def count(self) -> int:
+        """Get the number of records the source produces."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def iter_range(self, start: int, stop: int) -> Iterator[T]:
+        """Produce the records with an index in the [start, stop) range.
+
+        The iterator may hold resources (like a database cursor) until it
+        is exhausted or closed.
+        """
+        raise NotImplementedError("Subclasses must implement this method.")
+
+    def cursor(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> "RecordCursor[T]":
+        """Create a cursor over the records in the [start, stop) range.
+
+        Args:
+            start: The index of the first record.
+            stop: The index after the last record. When None the cursor
+                covers all the records (this requires a `count()`).
+        """
+        if stop is None:
+            stop = self.count()
+        return RecordCursor(source=self, start=start, stop=max(start, stop))
+
+    def split(self, count: int) -> Optional[List[Any]]:
+        """Find the keys that cut the records in consecutive ranges.
+
+        The ranges have about the same size and can be read with
+        `key_range()`, so that several tasks can share the records without
+        each of them reading the ones before its range.
+
+        Args:
+            count: The number of ranges.
+
+        Returns:
+            The last key of each range but the last one, or None if the
+            source cannot be split by key, which is the default.
+        """
+        del count
+        return None
+
+    def key_range(self, lower: Any, upper: Any) -> "RecordSource[T]":
+        """Get a source with the records that have a key in a range.
+
+        Args:
+            lower: The exclusive lower bound, or None for no bound.
+            upper: The inclusive upper bound, or None for no bound.
+        """
+        raise NotImplementedError("The source cannot be split by key.")
+
+
+@define(slots=True, kw_only=True)
+class RecordCursor(Generic[T]):
+    """A forward-only view over a range of the records of a source.
+
+    The cursor can be indexed like the list it replaces, as long as the
+    indices are increasing: `cursor[i]` for the current index returns the
+    same record again, a larger index skips the records in between and a
+    smaller one raises an error. An index past the end raises `IndexError`,
+    which ends the execution loop of a task.
+
+    Attributes:
+        source: The source of the records.
+        start: The index in the source of the first record.
+        stop: The index in the source after the last record.
+    """
+
+    source: RecordSource[T]
+    start: int
+    stop: int
+    _iter: Optional[Iterator[T]] = field(default=None, init=False)
+    _index: int = field(default=-1, init=False)
+    _current: Any = field(default=None, init=False)
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index: int) -> T:
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+        if index == self._index:
+            return self._current
+        if index < self._index:
+            raise ValueError(
+                f"Record {index} was already consumed; the cursor is at "
+                f"{self._index} and can only move forward."
+            )
+        if self._iter is None:
+            self._iter = self.source.iter_range(self.start, self.stop)
+        while self._index < index:
+            try:
+                self._current = next(self._iter)
+            except StopIteration:
+                # The source has less records than it reported.
+                self.close()
+                raise IndexError(index) from None
+            self._index += 1
+        return self._current
+
+    def close(self) -> None:
+        """Release the resources held by the underlying iterator."""
+        it, self._iter = self._iter, None
+        self._current = None
+        close = getattr(it, "close", None)
+        if close is not None:
+            close()
+
+
+@define(slots=True, kw_only=True)
+class QueryRecordSource(RecordSource[T]):
+    """Records that are streamed out of the database by a select statement.
+
+    The records are read through a server-side cursor, `chunk_size` rows
+    at a time, in a session of their own so that the commits done by the
+    check do not interfere with the cursor.
+
+    The statement should have an `order_by` clause when the source is
+    split in shards, as each shard reads its range with `OFFSET/LIMIT`,
+    unless a `key` is given: the shards then read their range with a
+    condition on the key.
+
+    Attributes:
+        ctx: The context that provides the database sessions.
+        stmt: The statement that selects the records. Statements that
+            select a single entity or column produce scalars, others
+            produce rows.
+        chunk_size: The number of rows fetched from the database at once.
+        count_stmt: An optional statement that returns the number of
+            records. By default the count is computed by wrapping `stmt`
+            into a sub-query; a cheaper statement (like a count over the
+            table without joins) can be provided here.
+        key: An optional unique column that `stmt` is ordered by. It lets
+            the source be split in ranges of keys (see `split()`).
+    """
+
+    ctx: "HasBasicContext" = field(repr=False)
+    stmt: Select
+    chunk_size: int = field(default=1000)
+    count_stmt: Optional[Select] = field(default=None)
+    key: Optional[Any] = field(default=None)
+
+    def count(self) -> int:
+        stmt = self.count_stmt
+        if stmt is None:
+            stmt = select(func.count()).select_from(
+                self.stmt.order_by(None).subquery()
+            )
+        with self.ctx.same_session() as session:
+            return int(session.scalar(stmt) or 0)
+
+    def split(self, count: int) -> Optional[List[Any]]:
+        if self.key is None or count < 2:
+            return None
+        size = self.count()
+        rows = sorted({size * i // count for i in range(1, count)} - {0})
+        if len(rows) != count - 1:
+            return None
+
+        # A single query numbers the keys and picks the last of each range.
+        numbered = (
+            self.stmt.with_only_columns(
+                self.key.label("key"),
+                func.row_number().over(order_by=self.key).label("row"),
+            )
+            .order_by(None)
+            .subquery()
+        )
+        stmt = (
+            select(numbered.c.key)
+            .where(numbered.c.row.in_(rows))
+            .order_by(numbered.c.row)
+        )
+        with self.ctx.same_session() as session:
+            keys = list(session.scalars(stmt))
+        return keys if len(keys) == count - 1 else None
+
+    def key_range(self, lower: Any, upper: Any) -> "QueryRecordSource[T]":
+        if self.key is None:
+            raise NotImplementedError("The source has no key.")
+        stmt = self.stmt
+        if lower is not None:
+            stmt = stmt.where(self.key > lower)
+        if upper is not None:
+            stmt = stmt.where(self.key <= upper)
+        return evolve(self, stmt=stmt, count_stmt=None)
+
+    def iter_range(self, start: int, stop: int) -> Iterator[T]:
+        stmt = self.stmt
+        if start > 0:
+            stmt = stmt.offset(start)
+        stmt = stmt.limit(stop - start).execution_options(
+            yield_per=self.chunk_size
+        )
+
+        with self.ctx.session(add_to_stack=False) as session:
+            result = session.execute(stmt)
+            try:
+                if len(self.stmt.column_descriptions) == 1:
+                    yield from result.scalars()
+                else:
+                    yield from result
+            finally:
+                result.close()
@@ -0,0 +1,193 @@
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from attrs import define, field
+
+from exdrf_util.check import Check, CheckResult, ResultState
+from exdrf_util.check_store import CheckResultStore
+from exdrf_util.task import TaskParameter
+
+
+class _Session:
+    def commit(self):
+        pass
+
+
+class _Ctx:
+    @contextmanager
+    def same_session(self):
+        yield _Session()
+
+    def t(self, key, default, **kwargs):
+        return default.format(**kwargs)
+
+
+@define(slots=True, frozen=True, kw_only=True)
+class _EvenCheck(Check[Dict[str, Any]]):
+    """Flags the records with an odd value."""
+
+    records: List[Dict[str, Any]] = field(factory=list)
+    executed: List[int] = field(factory=list)
+
+    def prepare_check(self, ctx):
+        return {"records": list(self.records)}
+
+    def get_record_to_check(self, step, data):
+        return data["records"][step]
+
+    def get_record_id(self, step, data, item):
+        return str(item["id"])
+
+    def compute_fingerprint(self, step, data, item):
+        return str(item["value"])
+
+    def execute(self, ctx, item, result=None):
+        assert result is not None
+        self.executed.append(item["id"])
+        if item["value"] % 2:
+            result.state = ResultState.NOT_FIXED
+            result.params["value"] = item["value"]
+        else:
+            result.state = ResultState.PASSED
+        return result
+
+
+def _run(check: Check, store: CheckResultStore):
+    task = check.create_task()
+    task.store = store
+    task.execute(_Ctx())
+    return task
+
+
+def _summary(results: List[CheckResult]):
+    return [
+        (r.params["id"], str(r.state), r.params.get("value")) for r in results
+    ]
+
+
+class TestCheckResultStore:
+    def test_only_changed_records_are_checked(self, tmp_path):
+        records = [{"id": i, "value": i} for i in range(6)]
+        check = _EvenCheck(check_id="even", records=records)
+        store = CheckResultStore(str(tmp_path / "results.sqlite"))
+
+        first = _run(check, store)
+        assert check.executed == list(range(6))
+        assert first.reused == 0
+
+        # One record changes, one is removed and one is added.
+        records[1]["value"] = 10
+        del records[4]
+        records.append({"id": 9, "value": 9})
+        check.executed.clear()
+        second = _run(check, store)
+
+        assert check.executed == [1, 9]
+        assert second.reused == 4
+        assert _summary(second.results) == [
+            ("0", "passed", None),
+            ("1", "passed", None),
+            ("2", "passed", None),
+            ("3", "not_fixed", 3),
+            ("5", "not_fixed", 5),
+            ("9", "not_fixed", 9),
+        ]
+        ids = [str(i) for i in range(10)]
+        assert sorted(store.lookup("even", second._version, ids)) == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "5",
+            "9",
+        ]
+
+    def test_version_and_parameters_invalidate_results(self, tmp_path):
+        path = str(tmp_path / "results.sqlite")
+        records = [{"id": i, "value": i} for i in range(3)]
+        param = TaskParameter(name="limit", type_name="int", value=1)
+        check = _EvenCheck(
+            check_id="even", records=records, parameters={"limit": param}
+        )
+        _run(check, CheckResultStore(path))
+
+        # Another process opens the same file.
+        check.executed.clear()
+        _run(check, CheckResultStore(path))
+        assert check.executed == []
+
+        param.value = 2
+        _run(check, CheckResultStore(path))
+        assert check.executed == [0, 1, 2]
+
+        check.executed.clear()
+        newer = _EvenCheck(
+            check_id="even",
+            records=records,
+            parameters={"limit": param},
+            version="2",
+            executed=check.executed,
+        )
+        _run(newer, CheckResultStore(path))
+        assert check.executed == [0, 1, 2]
+
+    def test_shards_do_not_prune(self, tmp_path):
+        records = [{"id": i, "value": i} for i in range(4)]
+        check = _EvenCheck(check_id="even", records=records)
+        store = CheckResultStore(str(tmp_path / "results.sqlite"))
+        _run(check, store)
+
+        task = check.create_task()
+        task.store = store
+        task.shard = (0, 2)
+        task.execute(_Ctx())
+
+        assert task.reused == 2
+        ids = [str(i) for i in range(4)]
+        assert len(store.lookup("even", task._version, ids)) == 4
+
+    def test_stored_results_are_looked_up_by_batch(self, tmp_path):
+        records = [{"id": i, "value": i} for i in range(5)]
+        check = _EvenCheck(check_id="even", records=records)
+        path = str(tmp_path / "results.sqlite")
+        _run(check, CheckResultStore(path))
+
+        lookups: List[List[str]] = []
+
+        class _Store(CheckResultStore):
+            def lookup(self, check_id, version, record_ids):
+                lookups.append(list(record_ids))
+                return super().lookup(check_id, version, record_ids)
+
+        records[3]["value"] = 4
+        check.executed.clear()
+        task = _run(check, _Store(path, batch_size=2))
+
+        assert lookups == [["0", "1"], ["2", "3"], ["4"]]
+        assert check.executed == [3]
+        assert task.reused == 4
+        assert [r.params["id"] for r in task.results] == [
+            "0",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        assert str(task.results[3].state) == "passed"
+
+    def test_failure_in_batch_marks_its_record(self, tmp_path):
+        records = [{"id": i, "value": i} for i in range(3)]
+        check = _EvenCheck(check_id="even", records=records)
+        store = CheckResultStore(str(tmp_path / "results.sqlite"))
+        records[1]["value"] = None
+
+        task = _run(check, store)
+
+        assert [str(r.state) for r in task.results] == [
+            "passed",
+            "failed",
+            "passed",
+        ]
+        assert task.results[1].params["e_class"] == "TypeError"
+        ids = ["0", "1", "2"]
+        assert sorted(store.lookup("even", task._version, ids)) == ["0", "2"]
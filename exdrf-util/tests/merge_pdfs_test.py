@@ -0,0 +1,191 @@
+import os
+
+import pytest
+
+from exdrf_util.merge_pdfs import (
+    OutputPage,
+    adjust_page_image,
+    merge_pdf_files,
+    split_pdf_file,
+    write_pdf_pages,
+)
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("PIL")
+
+
+def _make_pdf(path, count, label):
+    doc = fitz.open()
+    for i in range(count):
+        page = doc.new_page(width=200, height=300)
+        page.insert_text((20, 40), f"{label} {i + 1}", fontsize=18)
+    doc.set_toc([[1, f"{label} start", 1]])
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def _texts(path):
+    with fitz.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    return [
+        _make_pdf(tmp_path / "a.pdf", 3, "A"),
+        _make_pdf(tmp_path / "b.pdf", 2, "B"),
+    ]
+
+
+class TestAdjustPageImage:
+    def test_rotation_does_not_leak_to_next_page(self, sources):
+        def size(data):
+            with fitz.open("pdf", data) as doc:
+                return (doc[0].rect.width, doc[0].rect.height)
+
+        assert size(adjust_page_image(OutputPage(sources[0], 0, 90))) == (
+            300,
+            200,
+        )
+        # The same page, from the document kept open, is not rotated.
+        assert size(adjust_page_image(OutputPage(sources[0], 0))) == (200, 300)
+
+
+class TestMergePdfFiles:
+    def test_merge_keeps_order_and_bookmarks(self, sources, tmp_path):
+        out = str(tmp_path / "out.pdf")
+        seen = []
+
+        assert merge_pdf_files(
+            sources + [(sources[0], 2, 0, 90, "A reversed")],
+            out,
+            title="Merged",
+            progress=lambda done, total: seen.append((done, total)),
+        )
+
+        assert _texts(out) == ["A 1", "A 2", "A 3", "B 1", "B 2"] + [
+            "A 3",
+            "A 2",
+            "A 1",
+        ]
+        with fitz.open(out) as doc:
+            assert doc.metadata["title"] == "Merged"
+            assert [p.rotation for p in doc][-3:] == [90, 90, 90]
+            assert [(t[1], t[2]) for t in doc.get_toc()] == [
+                ("a", 1),
+                ("A start", 1),
+                ("b", 4),
+                ("B start", 4),
+                ("A reversed", 6),
+                ("A start", 8),
+            ]
+        assert seen == [(i, 8) for i in range(1, 9)]
+        assert not os.path.exists(out + ".part")
+
+    def test_adjusted_pages_are_rendered_in_processes(self, sources, tmp_path):
+        out = str(tmp_path / "out.pdf")
+
+        assert merge_pdf_files(
+            sources, out, no_toc=True, adjust_image=True, processes=2
+        )
+
+        with fitz.open(out) as doc:
+            assert doc.page_count == 5
+            for page in doc:
+                # The text became an image.
+                assert page.get_text().strip() == ""
+                assert len(page.get_images()) == 1
+                assert (page.rect.width, page.rect.height) == (200, 300)
+
+    def test_stop_removes_partial_output(self, sources, tmp_path):
+        out = str(tmp_path / "out.pdf")
+        pages = [OutputPage(sources[0], i % 3) for i in range(10)]
+        seen = []
+
+        assert not write_pdf_pages(
+            pages,
+            out,
+            flush_every=2,
+            progress=lambda done, total: seen.append(done),
+            should_stop=lambda: len(seen) >= 5,
+        )
+
+        assert seen == [1, 2, 3, 4, 5]
+        assert sorted(os.listdir(tmp_path)) == ["a.pdf", "b.pdf"]
+
+    def test_flushed_output_is_complete(self, sources, tmp_path):
+        out = str(tmp_path / "out.pdf")
+        pages = [OutputPage(sources[1], i % 2) for i in range(7)]
+
+        assert write_pdf_pages(pages, out, flush_every=3)
+
+        assert _texts(out) == ["B 1", "B 2"] * 3 + ["B 1"]
+
+    def test_page_runs_are_copied_together(
+        self, sources, tmp_path, monkeypatch
+    ):
+        out = str(tmp_path / "out.pdf")
+        calls = []
+        insert_pdf = fitz.Document.insert_pdf
+
+        def spy(self, src, *args, **kwargs):
+            calls.append((kwargs.get("from_page"), kwargs.get("to_page")))
+            return insert_pdf(self, src, *args, **kwargs)
+
+        monkeypatch.setattr(fitz.Document, "insert_pdf", spy)
+        a, b = sources
+        pages = [
+            OutputPage(a, 0),
+            OutputPage(a, 1),
+            OutputPage(a, 2),
+            OutputPage(b, 1),
+            OutputPage(b, 0),
+            OutputPage(a, 2, 90),
+            OutputPage(a, 0, 90),
+        ]
+
+        assert write_pdf_pages(pages, out)
+
+        assert calls == [(0, 2), (1, 0), (2, 2), (0, 0)]
+        assert _texts(out) == ["A 1", "A 2", "A 3", "B 2", "B 1", "A 3", "A 1"]
+        with fitz.open(out) as doc:
+            assert [page.rotation for page in doc][-2:] == [90, 90]
+
+
+class TestSplitPdfFile:
+    def test_parts_are_written_in_parallel(self, sources, tmp_path):
+        parts = [
+            (
+                str(tmp_path / f"part{i}.pdf"),
+                [OutputPage(sources[0], i), OutputPage(sources[1], 0, 180)],
+            )
+            for i in range(3)
+        ]
+        parts.append((str(tmp_path / "empty.pdf"), []))
+        seen = []
+
+        created = split_pdf_file(
+            parts,
+            processes=2,
+            progress=lambda done, total: seen.append((done, total)),
+        )
+
+        assert created == [path for path, _ in parts[:3]]
+        for i, path in enumerate(created):
+            assert _texts(path) == [f"A {i + 1}", "B 1"]
+            with fitz.open(path) as doc:
+                assert [p.rotation for p in doc] == [0, 180]
+        assert seen == [(2, 6), (4, 6), (6, 6)]
+        assert not os.path.exists(tmp_path / "empty.pdf")
+
+    def test_stopped_split_skips_remaining_parts(self, sources, tmp_path):
+        parts = [
+            (str(tmp_path / f"part{i}.pdf"), [OutputPage(sources[0], 0)])
+            for i in range(4)
+        ]
+
+        created = split_pdf_file(parts, processes=2, should_stop=lambda: True)
+
+        assert created == []
+        assert sorted(os.listdir(tmp_path)) == ["a.pdf", "b.pdf"]
@@ -0,0 +1,233 @@
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from attrs import define, field
+from sqlalchemy import Integer, String, create_engine, insert, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from exdrf_util.check import Check, ResultState
+from exdrf_util.record_source import (
+    QueryRecordSource,
+    RecordCursor,
+    RecordSource,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Item(_Base):
+    __tablename__ = "item"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String)
+
+
+class _Ctx:
+    def __init__(self, engine):
+        self.engine = engine
+        self.stack: List[Session] = []
+        self.opened = 0
+        self.closed = 0
+
+    @contextmanager
+    def session(self, auto_commit=False, add_to_stack=True):
+        self.opened += 1
+        session = Session(self.engine)
+        if add_to_stack:
+            self.stack.append(session)
+        try:
+            yield session
+        finally:
+            session.close()
+            self.closed += 1
+            if add_to_stack:
+                self.stack.pop()
+
+    @contextmanager
+    def same_session(self, auto_commit=False):
+        if self.stack:
+            yield self.stack[-1]
+        else:
+            with self.session() as session:
+                yield session
+
+    def t(self, key, default, **kwargs):
+        return default.format(**kwargs)
+
+
+@pytest.fixture
+def ctx(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    _Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(_Item), [{"id": i, "name": f"n{i}"} for i in range(1, 251)]
+        )
+    yield _Ctx(engine)
+    engine.dispose()
+
+
+@define(slots=True, frozen=True, kw_only=True)
+class _NameCheck(Check[Any]):
+    """Flags the items with an id that is a multiple of ten."""
+
+    source: Any = None
+
+    def prepare_check(self, ctx):
+        return {"records": self.source}
+
+    def get_record_to_check(self, step, data):
+        return data["records"][step]
+
+    def execute(self, ctx, item, result=None):
+        assert result is not None
+        assert item.name == f"n{item.id}"
+        result.state = (
+            ResultState.NOT_FIXED if item.id % 10 == 0 else ResultState.PASSED
+        )
+        return result
+
+
+@define(slots=True, kw_only=True)
+class _CountingSource(RecordSource[int]):
+    """Numbers that remember how many of them were produced."""
+
+    size: int
+    produced: List[int] = field(factory=list)
+
+    def count(self) -> int:
+        return self.size
+
+    def iter_range(self, start: int, stop: int) -> Iterator[int]:
+        for i in range(start, stop):
+            self.produced.append(i)
+            yield i
+
+
+def _run(check: Check, ctx: _Ctx, shard=None):
+    task = check.create_task()
+    task.shard = shard
+    progress: List[int] = []
+    task.on_progress_changed.append(lambda _t, p: progress.append(p))
+    task.execute(ctx)
+    return task, progress
+
+
+class TestRecordSource:
+    def test_query_source_streams_all_records(self, ctx):
+        source = QueryRecordSource(
+            ctx=ctx, stmt=select(_Item).order_by(_Item.id), chunk_size=16
+        )
+        task, progress = _run(_NameCheck(check_id="c", source=source), ctx)
+
+        assert task.max_steps == 250
+        assert [r.params["id"] for r in task.results] == [
+            str(i) for i in range(1, 251)
+        ]
+        assert len(task.results_by_type()[ResultState.NOT_FIXED]) == 25
+        assert progress == sorted(progress) and progress[-1] == 100
+        assert 50 in progress
+
+        # The stream used a session of its own, which is now closed.
+        assert ctx.opened == ctx.closed == 2
+        assert isinstance(task.data["records"], RecordCursor)
+
+    def test_shards_split_the_query(self, ctx):
+        source = QueryRecordSource(
+            ctx=ctx, stmt=select(_Item).order_by(_Item.id), chunk_size=7
+        )
+        ids: List[str] = []
+        for shard in range(3):
+            task, _progress = _run(
+                _NameCheck(check_id="c", source=source), ctx, (shard, 3)
+            )
+            ids.extend(r.params["id"] for r in task.results)
+        assert ids == [str(i) for i in range(1, 251)]
+
+    def test_shards_split_by_key(self, ctx):
+        source = QueryRecordSource(
+            ctx=ctx,
+            stmt=select(_Item).where(_Item.id > 10).order_by(_Item.id),
+            chunk_size=7,
+            key=_Item.id,
+        )
+        splits: List[Any] = []
+        task = _NameCheck(check_id="c", source=source).create_task()
+        task.shard = (0, 3)
+        task.on_split = splits.append
+        task.execute(ctx)
+
+        # The first shard found the ranges once and checked the first one.
+        assert splits == [[90, 170]]
+        assert task.key_range == (None, 90)
+        ids = [r.params["id"] for r in task.results]
+        for key_range in [(90, 170), (170, None)]:
+            task = _NameCheck(check_id="c", source=source).create_task()
+            task.shard = (1, 3)
+            task.key_range = key_range
+            task.execute(ctx)
+            ids.extend(r.params["id"] for r in task.results)
+        assert ids == [str(i) for i in range(11, 251)]
+
+    def test_list_records_are_not_split(self, ctx):
+        @define(slots=True, frozen=True, kw_only=True)
+        class _List(Check[int]):
+            def prepare_check(self, ctx):
+                return {"records": list(range(5))}
+
+            def get_record_to_check(self, step, data):
+                return data["records"][step]
+
+            def get_record_id(self, step, data, item):
+                return str(item)
+
+            def execute(self, ctx, item, result=None):
+                assert result is not None
+                result.state = ResultState.PASSED
+                return result
+
+        splits: List[Any] = []
+        task = _List(check_id="list").create_task()
+        task.shard = (0, 2)
+        task.on_split = splits.append
+        task.execute(ctx)
+        assert splits == [None]
+        assert len(task.results) == 5
+
+    def test_records_are_read_as_the_steps_advance(self, ctx):
+        source = _CountingSource(size=5)
+        seen: Dict[int, int] = {}
+
+        @define(slots=True, frozen=True, kw_only=True)
+        class _Lazy(Check[int]):
+            def prepare_check(self, ctx):
+                return {"records": source}
+
+            def get_record_to_check(self, step, data):
+                return data["records"][step]
+
+            def get_record_id(self, step, data, item):
+                # Asking again for the current step does not advance.
+                assert data["records"][step] == item
+                return str(item)
+
+            def execute(self, ctx, item, result=None):
+                assert result is not None
+                seen[item] = len(source.produced)
+                result.state = ResultState.PASSED
+                return result
+
+        _run(_Lazy(check_id="lazy"), ctx)
+        assert seen == {0: 1, 1: 2, 2: 3, 3: 4, 4: 5}
+
+    def test_cursor_is_forward_only(self):
+        cursor = _CountingSource(size=4).cursor()
+        assert len(cursor) == 4
+        assert cursor[2] == 2
+        with pytest.raises(ValueError):
+            cursor[1]
+        with pytest.raises(IndexError):
+            cursor[4]
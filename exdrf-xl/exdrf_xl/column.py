@@ -101,17 +101,19 @@ class XlColumn(Generic[T, DB]):
         """
         raise NotImplementedError("Subclasses must implement this method")
 
-    def write_to_sheet(self, sheet: Any, row_index: int, record: DB):
-        """Writes the column to the sheet.
+    def cell_value(self, record: DB) -> Any:
+        """Returns the value of the cell as it is stored in the sheet.
+
+        The value from `value_from_record()` is converted to something
+        Excel can hold: lists and dictionaries become JSON and the unknown
+        date-time sentinel becomes `"x"`.
 
         Args:
-            sheet: Target worksheet.
-            row_index: 0-based index of the data row in the table.
             record: Source record.
         """
         value = self.value_from_record(record)
         if value is None:
-            return
+            return None
         if isinstance(value, (list, dict)):
             value = json.dumps(value)
 
@@ -128,6 +130,19 @@ class XlColumn(Generic[T, DB]):
             and value.second == 6
         ):
             value = "x"
+        return value
+
+    def write_to_sheet(self, sheet: Any, row_index: int, record: DB):
+        """Writes the column to the sheet.
+
+        Args:
+            sheet: Target worksheet.
+            row_index: 0-based index of the data row in the table.
+            record: Source record.
+        """
+        value = self.cell_value(record)
+        if value is None:
+            return
         col = self.table.get_column_index(self)
         if col == -1:
             logger.warning(
@@ -152,7 +167,8 @@ class XlColumn(Generic[T, DB]):
         """Called after the table is created.
 
         Args:
-            ws: Target worksheet.
+            ws: Target worksheet. In write-only exports this is a
+                `WriteOnlyWorksheet`, so the cells can no longer be changed.
             table_obj: The Excel structured table object created for the sheet.
             row_count: the number of rows written in the sheet.
         """
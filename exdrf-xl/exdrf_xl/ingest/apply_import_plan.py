@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import logging
+from itertools import groupby
 from typing import TYPE_CHECKING, Any, Callable
 
 from attrs import define, field
+from sqlalchemy import insert, inspect, update
 from sqlalchemy.exc import IntegrityError
 
 from exdrf_xl.ingest.apply_result import ApplyResult
@@ -15,6 +17,7 @@ from exdrf_xl.ingest.row_diff import RowDiff, XlRecord
 from exdrf_xl.ingest.tools import (
     build_import_table_ref_map,
     default_is_db_pk,
+    iter_chunks,
 )
 from exdrf_xl.utils.toposort import toposort_tables
 
@@ -29,6 +32,12 @@ else:
 
 logger = logging.getLogger(__name__)
 
+# A new row that is ready for a bulk insert: the row, the record built from
+# it, the id placeholder, the deferred updates and the values to insert.
+PreparedInsert = tuple[
+    RowDiff, Any, "str | None", list[PendingUpdate], dict[str, Any]
+]
+
 
 class PlaceholderToIdDict(dict[tuple[str, str], int]):
     """Dictionary that normalizes placeholder keys to lowercase.
@@ -78,12 +87,25 @@ class ImportPlanApplier:
     Handles placeholder resolution, foreign key dependencies, and deferred
     updates for unresolved placeholders.
 
+    In bulk mode the rows of each table are written in batches: new rows with
+    a single executemany `INSERT ... RETURNING` and modified rows with an
+    update by primary key. When a batch fails, its rows are applied one by
+    one in their own savepoints so only the failing rows are skipped. Rows
+    whose records cannot be expressed as plain column values (relationships
+    set by the table hooks, tables or columns with a custom
+    `apply_xl_to_db()`) always go through the per-row path, and so do new
+    rows when the database cannot return the keys of an executemany
+    `INSERT`. Records of the session that are updated in bulk are expired so
+    they are reloaded with the new values.
+
     Attributes:
         db: Database connection used to create a session for import.
         plan: Import plan previously created by `plan_import_from_file()`.
         accept_new: Whether to insert new rows.
         accept_modified: Whether to apply modifications to existing rows.
         is_db_pk: Predicate used to determine DB IDs.
+        bulk: Whether to write the rows in batches.
+        batch_size: Number of rows in a batch in bulk mode.
         result: Result object to accumulate counts.
         placeholder_to_id: Map from (table_name, placeholder) to integer ID.
         pending_updates: List of deferred placeholder updates.
@@ -98,6 +120,8 @@ class ImportPlanApplier:
         default=default_is_db_pk,
         converter=lambda x: default_is_db_pk if x is None else x,
     )
+    bulk: bool = False
+    batch_size: int = 1000
     result: ApplyResult = field(factory=ApplyResult, init=False)
     placeholder_to_id: PlaceholderToIdDict = field(
         factory=PlaceholderToIdDict, init=False
@@ -106,6 +130,9 @@ class ImportPlanApplier:
     table_fk_cols: dict[str, set[str]] = field(factory=dict, init=False)
     _deps: dict[str, set[str]] = field(factory=dict, init=False, repr=False)
     _import_tables: list[Any] = field(factory=list, init=False, repr=False)
+    _custom_cols: dict[str, set[str]] = field(
+        factory=dict, init=False, repr=False
+    )
 
     def __call__(self) -> ApplyResult:
         """Apply the import plan and return results.
@@ -121,8 +148,12 @@ class ImportPlanApplier:
         to_insert = self._sort_by_dependencies(to_insert)
 
         with self.db.same_session() as session:
-            self._insert_rows(session, to_insert)
-            self._update_rows(session, to_update)
+            if self.bulk:
+                self._bulk_insert_rows(session, to_insert)
+                self._bulk_update_rows(session, to_update)
+            else:
+                self._insert_rows(session, to_insert)
+                self._update_rows(session, to_update)
             self._resolve_deferred_updates(session)
             session.commit()
 
@@ -323,13 +354,326 @@ class ImportPlanApplier:
             self.result.updated += 1
             session.add(row.db_rec)
 
+    def _bulk_insert_rows(
+        self, session: Any, to_insert: list[tuple[XlTableAny, RowDiff]]
+    ) -> None:
+        """Insert new rows in batches, one table at a time.
+
+        The worklist is sorted by dependency order, so the placeholders of a
+        table are known before the tables that refer to them are prepared.
+
+        Args:
+            session: Database session.
+            to_insert: List of (table, row) tuples to insert.
+        """
+        transformer = RecordTransformer(
+            self.table_fk_cols, self.placeholder_to_id, self.is_db_pk
+        )
+
+        insert_queue = list(to_insert)
+        inserted_this_round = True
+
+        while insert_queue and inserted_this_round:
+            inserted_before = self.result.inserted
+            remaining: list[tuple[XlTableAny, RowDiff]] = []
+
+            for _, group in groupby(insert_queue, key=lambda x: id(x[0])):
+                pairs = list(group)
+                table = pairs[0][0]
+                ready: list[PreparedInsert] = []
+                for _, row in pairs:
+                    prepared = self._prepare_insert(
+                        session, table, row, transformer
+                    )
+                    if prepared is False:
+                        remaining.append((table, row))
+                    elif prepared is not True:
+                        ready.append(prepared)
+
+                # Batch the rows by record class; a table normally creates a
+                # single class.
+                for _, same_class in groupby(ready, key=lambda x: type(x[1])):
+                    for chunk in iter_chunks(list(same_class), self.batch_size):
+                        failed = self._insert_chunk(
+                            session, table, chunk, transformer
+                        )
+                        remaining.extend((table, row) for row in failed)
+
+            inserted_this_round = self.result.inserted > inserted_before
+            insert_queue = remaining
+
+        if insert_queue:
+            unresolved = [(t.xl_name, r.pk) for (t, r) in insert_queue]
+            raise ValueError(
+                "Unresolved placeholders prevent inserting %d rows: %r"
+                % (len(unresolved), unresolved)
+            )
+
+    def _prepare_insert(
+        self,
+        session: Any,
+        table: XlTableAny,
+        row: RowDiff,
+        transformer: "RecordTransformer",
+    ) -> "PreparedInsert | bool":
+        """Build the record of a new row and the values to bulk insert.
+
+        Rows that cannot be bulk inserted are inserted right away by the
+        per-row path.
+
+        Args:
+            session: Database session.
+            table: Table to insert into.
+            row: Row to insert.
+            transformer: Record transformer for placeholder resolution.
+
+        Returns:
+            The prepared row, or the result of `_try_insert_row()`: `True` if
+            the row was inserted and `False` if it has to be retried.
+        """
+        transformed, id_placeholder, unresolved_pk, row_pending = (
+            transformer.transform_for_apply(
+                table, row.xl_row, allow_defer_fk=True
+            )
+        )
+        if unresolved_pk:
+            return False
+
+        values = None
+        if not self._needs_orm(table, transformed):
+            db_rec = table.create_new_db_record(session, transformed)
+            table.apply_xl_to_db(session, db_rec, transformed)
+            values = _plain_values(db_rec)
+            if values is None and inspect(db_rec).session is not None:
+                # A relationship cascade attached the record to the session.
+                session.expunge(db_rec)
+
+        if values is None:
+            return self._try_insert_row(session, table, row, transformer)
+        return row, db_rec, id_placeholder, row_pending, values
+
+    def _insert_chunk(
+        self,
+        session: Any,
+        table: XlTableAny,
+        chunk: list[PreparedInsert],
+        transformer: "RecordTransformer",
+    ) -> list[RowDiff]:
+        """Insert a batch of prepared rows with a single statement.
+
+        Args:
+            session: Database session.
+            table: Table to insert into.
+            chunk: Prepared rows that create records of the same class.
+            transformer: Record transformer used by the per-row fallback.
+
+        Returns:
+            The rows that could not be inserted.
+        """
+        mapper = inspect(chunk[0][1]).mapper
+        dialect = session.get_bind(mapper=mapper).dialect
+        if not dialect.insert_executemany_returning:
+            # The new keys cannot be read back from a batch (e.g. MySQL).
+            return [
+                row
+                for row, *_ in chunk
+                if not self._try_insert_row(session, table, row, transformer)
+            ]
+
+        pk_keys = _pk_keys(mapper)
+        stmt = insert(mapper.class_).returning(
+            *(getattr(mapper.class_, k) for k in pk_keys),
+            sort_by_parameter_order=True,
+        )
+        try:
+            with session.begin_nested():
+                pks = session.execute(stmt, [p[4] for p in chunk]).all()
+        except IntegrityError:
+            logger.debug(
+                "Batch insert into %s failed; inserting row by row",
+                table.xl_name,
+                exc_info=True,
+            )
+            return [
+                row
+                for row, *_ in chunk
+                if not self._try_insert_row(session, table, row, transformer)
+            ]
+
+        for (_, db_rec, id_placeholder, row_pending, _), pk in zip(chunk, pks):
+            # The record stays transient; it only carries its new primary key
+            # for the deferred updates.
+            for key, value in zip(pk_keys, pk):
+                setattr(db_rec, key, value)
+            for pu in row_pending:
+                pu.db_rec = db_rec
+            self.pending_updates.extend(row_pending)
+
+            if id_placeholder is not None:
+                new_id = db_rec.id
+                assert new_id is not None
+                placeholder_key = (table.xl_name, id_placeholder)
+                self.placeholder_to_id[placeholder_key] = new_id
+
+        self.result.inserted += len(chunk)
+        return []
+
+    def _bulk_update_rows(
+        self, session: Any, to_update: list[tuple[XlTableAny, RowDiff]]
+    ) -> None:
+        """Update existing rows in batches by primary key.
+
+        Args:
+            session: Database session.
+            to_update: List of (table, row) tuples to update.
+        """
+        transformer = RecordTransformer(
+            self.table_fk_cols, self.placeholder_to_id, self.is_db_pk
+        )
+
+        for _, group in groupby(to_update, key=lambda x: id(x[0])):
+            pairs = list(group)
+            table = pairs[0][0]
+            ready: list[tuple[Any, RowDiff, dict[str, Any]]] = []
+            for _, row in pairs:
+                assert row.db_rec is not None
+                transformed, _, _, row_pending = (
+                    transformer.transform_for_apply(
+                        table, row.xl_row, allow_defer_fk=True
+                    )
+                )
+
+                for pu in row_pending:
+                    pu.db_rec = row.db_rec
+                self.pending_updates.extend(row_pending)
+
+                # Deferred updates are applied to the record by the ORM, which
+                # needs to see the whole change to flush it.
+                values = None
+                if not row_pending and not self._needs_orm(table, transformed):
+                    values = self._update_values(table, row.db_rec, transformed)
+                if values is None:
+                    table.apply_xl_to_db(session, row.db_rec, transformed)
+                    self.result.updated += 1
+                    session.add(row.db_rec)
+                    continue
+                ready.append((inspect(row.db_rec).mapper, row, values))
+
+            for mapper, same_class in groupby(ready, key=lambda x: x[0]):
+                for chunk in iter_chunks(list(same_class), self.batch_size):
+                    self._update_chunk(session, table, mapper, chunk)
+
+    def _update_values(
+        self, table: XlTableAny, db_rec: Any, transformed: XlRecord
+    ) -> dict[str, Any] | None:
+        """Compute the values of a bulk update by primary key.
+
+        Args:
+            table: Table the record belongs to.
+            db_rec: Database record to update.
+            transformed: Transformed Excel record.
+
+        Returns:
+            The column values keyed by attribute name, including the primary
+            key, or `None` if a value does not map to a column attribute.
+        """
+        table.derive_unaccented_values(transformed)
+        mapper = inspect(db_rec).mapper
+        col_attrs = mapper.column_attrs
+        col_by_name = {c.xl_name: c for c in table.columns}
+
+        values: dict[str, Any] = {}
+        for col_name, value in transformed.items():
+            c = col_by_name.get(col_name)
+            if c is None or c.read_only:
+                continue
+            if col_name not in col_attrs:
+                return None
+            values[col_name] = value
+
+        # The primary key identifies the row; it is never changed.
+        for key in _pk_keys(mapper):
+            values[key] = getattr(db_rec, key)
+        return values
+
+    def _update_chunk(
+        self,
+        session: Any,
+        table: XlTableAny,
+        mapper: Any,
+        chunk: list[tuple[Any, RowDiff, dict[str, Any]]],
+    ) -> None:
+        """Update a batch of rows with a single statement.
+
+        Args:
+            session: Database session.
+            table: Table the rows belong to.
+            mapper: Mapper of the updated records.
+            chunk: Rows and their values, as built by `_update_values()`.
+        """
+        stmt = update(mapper.class_)
+        try:
+            with session.begin_nested():
+                session.execute(stmt, [values for _, _, values in chunk])
+            self.result.updated += len(chunk)
+            for _, row, _ in chunk:
+                _expire(session, row.db_rec)
+            return
+        except IntegrityError:
+            logger.debug(
+                "Batch update of %s failed; updating row by row",
+                table.xl_name,
+                exc_info=True,
+            )
+
+        for _, row, values in chunk:
+            try:
+                with session.begin_nested():
+                    session.execute(stmt, [values])
+            except IntegrityError:
+                logger.error("Failed to update record", exc_info=True)
+                continue
+            self.result.updated += 1
+            _expire(session, row.db_rec)
+
+    def _needs_orm(self, table: XlTableAny, transformed: XlRecord) -> bool:
+        """Tell if a record has to be applied by `apply_xl_to_db()`.
+
+        That is the case when the table customizes `apply_xl_to_db()` or the
+        record sets columns that customize it.
+
+        Args:
+            table: Table the record belongs to.
+            transformed: Transformed Excel record.
+        """
+        from exdrf_xl.column import XlColumn
+        from exdrf_xl.table import XlTable
+
+        if type(table).apply_xl_to_db is not XlTable.apply_xl_to_db:
+            return True
+
+        custom = self._custom_cols.get(table.xl_name)
+        if custom is None:
+            custom = {
+                c.xl_name
+                for c in table.columns
+                if not c.read_only
+                and type(c).apply_xl_to_db is not XlColumn.apply_xl_to_db
+            }
+            self._custom_cols[table.xl_name] = custom
+        return not custom.isdisjoint(transformed)
+
     def _resolve_deferred_updates(self, session: Any) -> None:
         """Resolve deferred foreign key updates now that all inserts ran.
 
+        Records that were bulk inserted are not part of the session; they are
+        updated by primary key instead.
+
         Args:
             session: Database session.
         """
         applied_deferred = 0
+        by_pk: dict[int, tuple[Any, dict[str, Any]]] = {}
         for pu in self.pending_updates:
             if pu.db_rec is None:
                 continue
@@ -340,14 +684,68 @@ class ImportPlanApplier:
             if mapped is None:
                 continue
 
-            setattr(pu.db_rec, pu.column_name, mapped)
             applied_deferred += 1
+            state = inspect(pu.db_rec)
+            if not state.transient:
+                setattr(pu.db_rec, pu.column_name, mapped)
+                continue
+
+            entry = by_pk.get(id(pu.db_rec))
+            if entry is None:
+                values = {k: getattr(pu.db_rec, k) for k in _pk_keys(state)}
+                entry = by_pk[id(pu.db_rec)] = (state.mapper, values)
+            entry[1][pu.column_name] = mapped
+
+        for mapper, group in groupby(by_pk.values(), key=lambda x: x[0]):
+            session.execute(
+                update(mapper.class_), [values for _, values in group]
+            )
 
         if applied_deferred:
             self.result.deferred = applied_deferred
             session.flush()
 
 
+def _pk_keys(mapper: Any) -> list[str]:
+    """Return the attribute names of the primary key of a mapper."""
+    mapper = getattr(mapper, "mapper", mapper)
+    return [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+
+
+def _expire(session: Any, db_rec: Any) -> None:
+    """Expire a record updated behind the back of the session, if it is in
+    the session, so its attributes are loaded again."""
+    if db_rec in session:
+        session.expire(db_rec)
+
+
+def _plain_values(db_rec: Any) -> dict[str, Any] | None:
+    """Return the column values set on a new record.
+
+    Args:
+        db_rec: Transient record.
+
+    Returns:
+        The values keyed by attribute name, or `None` if the record cannot be
+        inserted from its column values alone because a relationship was set
+        or the record is already part of a session.
+    """
+    state = inspect(db_rec)
+    if not state.transient:
+        return None
+
+    mapper = state.mapper
+    for rel in mapper.relationships:
+        if state.dict.get(rel.key):
+            return None
+
+    return {
+        prop.key: state.dict[prop.key]
+        for prop in mapper.column_attrs
+        if prop.key in state.dict
+    }
+
+
 @define
 class RecordTransformer:
     """Transforms Excel records for database application.
@@ -600,6 +998,7 @@ def apply_import_plan(
     accept_new: bool,
     accept_modified: bool,
     is_db_pk: Callable[[Any], bool] | None = None,
+    bulk: bool = False,
 ) -> ApplyResult:
     """Apply a previously computed `ImportPlan` to the database.
 
@@ -622,6 +1021,7 @@ def apply_import_plan(
         accept_modified: Whether to apply modifications to existing rows.
         is_db_pk: Predicate used to determine DB IDs. Defaults to
             `default_is_db_pk`.
+        bulk: Write the rows in batches (see `ImportPlanApplier`).
 
     Returns:
         An `ApplyResult` with counts.
@@ -632,5 +1032,6 @@ def apply_import_plan(
         accept_new=accept_new,
         accept_modified=accept_modified,
         is_db_pk=is_db_pk,
+        bulk=bulk,
     )
     return applier()
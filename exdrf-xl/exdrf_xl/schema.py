@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import logging
 import os.path
-from typing import Any, Callable, TypeAlias, cast
+from typing import TYPE_CHECKING, Any, Callable, TypeAlias, cast
 
 from attrs import define, field
 from exdrf_util.rotate_backups import rotate_backups
-from openpyxl import Workbook, load_workbook  # type: ignore[import]
+from openpyxl import Workbook  # type: ignore[import]
 from openpyxl.worksheet.worksheet import Worksheet  # type: ignore[import]
 from sqlalchemy.orm import Session
 
@@ -16,10 +16,15 @@ from exdrf_xl.ingest.plan_import_from_file import plan_import_from_file
 from exdrf_xl.ingest.update_excel_with_allocated_ids import (
     update_excel_with_allocated_ids,
 )
-from exdrf_xl.utils.col_widths import read_column_widths_from_existing_file
+from exdrf_xl.utils.col_widths import read_column_widths_from_path
 
 from .table import XlTable
 
+if TYPE_CHECKING:
+    from openpyxl.worksheet._write_only import (  # type: ignore[import]
+        WriteOnlyWorksheet,
+    )
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,18 +46,32 @@ class XlSchema:
 
     tables: list["XlTable"] = field(factory=list, repr=False)
 
-    def export_to_file(self, db: Any, path: str, max_backups: int = 10):
+    def export_to_file(
+        self,
+        db: Any,
+        path: str,
+        max_backups: int = 10,
+        write_only: bool = False,
+    ):
         """Exports the content of the selected tables to an Excel file.
 
+        In write-only mode the rows are streamed to the file as they are
+        read from the database, which keeps the memory use flat for large
+        tables. The workbook and sheets passed to the hooks can then only be
+        appended to (see `XlTable.stream_to_sheet()`).
+
         Args:
             db: Database connection used to create a session for exporting.
             path: Output `.xlsx` file path.
+            max_backups: Number of backups of the previous file to keep.
+            write_only: Create a write-only workbook and stream the rows.
         """
         widths_map = {}
         if os.path.exists(path):
             try:
-                wb = load_workbook(path, data_only=True)
-                widths_map = read_column_widths_from_existing_file(wb)
+                widths_map = read_column_widths_from_path(
+                    path, read_only=write_only
+                )
             except Exception:
                 logger.error(
                     "Failed to retrieve information from previous version",
@@ -60,11 +79,18 @@ class XlSchema:
                 )
             rotate_backups(path, max_backups=max_backups)
 
-        wb = Workbook()
+        wb = Workbook(write_only=write_only)
         with db.same_session() as session:
             self.before_export(wb, session)
             for table in self.tables:
                 sheet = wb.create_sheet(title=table.sheet_name[0:31])
+                if write_only:
+                    table.stream_to_sheet(
+                        cast("WriteOnlyWorksheet", sheet),
+                        session,
+                        col_widths=widths_map.get(table.xl_name, {}),
+                    )
+                    continue
                 table.write_to_sheet(
                     cast(Worksheet, sheet),
                     session,
@@ -82,6 +108,7 @@ class XlSchema:
         accept_new: bool = True,
         accept_modified: bool = True,
         is_db_pk: Callable[[Any], bool] | None = None,
+        bulk: bool = False,
     ):
         """Import data from an Excel file into the database.
 
@@ -95,6 +122,7 @@ class XlSchema:
             accept_modified: Whether to apply modifications to existing rows.
             is_db_pk: Optional predicate used during planning. Defaults to
                 `default_is_db_pk`.
+            bulk: Write the rows in batches instead of one at a time.
         """
         plan = plan_import_from_file(self, db, path, is_db_pk=is_db_pk)
         apply_import_plan(
@@ -103,6 +131,7 @@ class XlSchema:
             accept_new=accept_new,
             accept_modified=accept_modified,
             is_db_pk=is_db_pk,
+            bulk=bulk,
         )
 
     def has_table(self, name: str) -> bool:
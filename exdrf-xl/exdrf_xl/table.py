@@ -1,4 +1,5 @@
 import logging
+import warnings
 from copy import copy
 from datetime import datetime
 from typing import (
@@ -16,8 +17,10 @@ from typing import (
 from attrs import define, field
 from exdrf.constants import FIELD_TYPE_DT  # type: ignore[import]
 from exdrf.field_types.date_time import UNKNOWN_DATETIME
+from openpyxl.cell import WriteOnlyCell  # type: ignore[import]
 from openpyxl.formatting.rule import Rule  # type: ignore[import]
 from openpyxl.styles import (  # type: ignore[import]
+    DEFAULT_FONT,
     Alignment,
     Font,
     PatternFill,
@@ -44,6 +47,7 @@ from exdrf_xl.utils.write_cell import install_custom_lxml_writer
 
 if TYPE_CHECKING:
     from openpyxl.cell import Cell
+    from openpyxl.worksheet._write_only import WriteOnlyWorksheet
     from openpyxl.worksheet.worksheet import Worksheet
     from sqlalchemy.orm import Session
 
@@ -71,6 +75,8 @@ class XlTable(Generic[T]):
               written.
             - Column formatting (widths, alignments, optional font/fill colors)
               is applied to data rows (starting at row 2), not the header row.
+        yield_per: Number of records loaded from the database at a time by
+            `get_rows()`.
         _included_columns_cache: Cached list of included columns (those where
             `XlColumn.is_included()` is `True`). This is an internal cache.
         _included_index_by_name_cache: Cached mapping from column name
@@ -85,6 +91,7 @@ class XlTable(Generic[T]):
     sheet_name: str
     xl_name: str
     columns: list["XlColumn"] = field(factory=list, repr=False)
+    yield_per: int = field(default=1000, repr=False)
     pk_columns: tuple[str, ...] = field(default=None, init=False, repr=False)
     _included_columns_cache: list[Any] | None = field(
         default=None, init=False, repr=False
@@ -238,10 +245,16 @@ class XlTable(Generic[T]):
     def get_rows(self, session: "Session") -> Generator[T, None, None]:
         """Returns the rows of the table from a database session.
 
+        The records are fetched in batches of `yield_per` so that large tables
+        are never loaded into memory all at once.
+
         Args:
             session: SQLAlchemy session used to execute the selector.
         """
-        for row in session.scalars(self.get_selector()):
+        selector = self.get_selector().execution_options(
+            yield_per=self.yield_per
+        )
+        for row in session.scalars(selector):
             yield row
 
     def get_rows_count(self, session: "Session") -> int:
@@ -312,6 +325,114 @@ class XlTable(Generic[T]):
         for column in included:
             column.post_table_created(sheet, table_obj, row_count)
 
+    def stream_to_sheet(
+        self,
+        sheet: "WriteOnlyWorksheet",
+        session: "Session",
+        col_widths: Mapping[str, float | None],
+    ):
+        """Creates the table in a write-only sheet.
+
+        This is the streaming counterpart of `write_to_sheet()`. Rows are
+        appended as they arrive from `get_rows()` and the column styles are
+        applied while each cell is written, so only the current row is kept in
+        memory. The cell values come from `XlColumn.cell_value()`;
+        `XlColumn.write_to_sheet()` is not used.
+
+        Write-only sheets cannot be read back, so `post_table_created()` hooks
+        can only add sheet-level objects (like conditional formatting), not
+        change the cells that were written.
+
+        Args:
+            sheet: Target write-only worksheet.
+            session: SQLAlchemy session used to load rows for export.
+            col_widths: Saved column widths, by column name.
+        """
+        if len(self.columns) == 0:
+            logger.warning("Table %s has no columns", self.xl_name)
+
+        included = self.get_included_columns()
+
+        # Column dimensions must be set before the first row is written.
+        self.apply_column_widths(sheet, widths=col_widths)
+
+        # Format header row.
+        sheet.row_dimensions[1].height = 30
+        header_align = Alignment(
+            wrap_text=False,
+            horizontal="center",
+            vertical="top",
+        )
+        header = []
+        for column in included:
+            cell = WriteOnlyCell(sheet, value=column.xl_name)
+            cell.alignment = header_align
+            header.append(cell)
+        sheet.append(header)
+
+        # The sheet serializes each row as it is appended, so a single styled
+        # cell per column is reused for all the rows.
+        cells = [self.create_data_cell(sheet, column) for column in included]
+        row = list(zip(cells, included))
+
+        # Generate data rows.
+        row_count = 0
+        for record in self.get_rows(session):
+            row_count += 1
+            for cell, column in row:
+                cell.value = column.cell_value(record)
+            sheet.append(cells)
+
+        table_obj = self.create_excel_table(row_count)
+        assert table_obj
+        with warnings.catch_warnings():
+            # openpyxl always warns that the table columns must be added
+            # manually in write-only mode; `create_excel_table()` did that.
+            warnings.simplefilter("ignore", UserWarning)
+            sheet.add_table(table_obj)
+
+        self.apply_duplicate_id_conditional_formatting(sheet, row_count)
+
+        for column in included:
+            column.post_table_created(sheet, table_obj, row_count)
+
+    def create_data_cell(
+        self, sheet: "WriteOnlyWorksheet", col_def: "XlColumn"
+    ) -> "Cell":
+        """Create a write-only cell styled like the data cells of a column.
+
+        The cell carries the same alignment, font color, fill and number
+        format that `apply_alignments()`, `apply_cell_styles()` and
+        `XlColumn.write_to_sheet()` apply in a regular sheet.
+
+        Args:
+            sheet: Target write-only worksheet.
+            col_def: Column definition.
+
+        Returns:
+            A cell without a value.
+        """
+        cell = WriteOnlyCell(sheet)
+        cell.alignment = Alignment(
+            wrap_text=col_def.wrap_text,
+            horizontal=col_def.h_align,
+            vertical=col_def.v_align,
+        )
+        if col_def.font_color is not None:
+            font = cast(Font, copy(DEFAULT_FONT))
+            font.color = Color(rgb=normalize_rgb_color(col_def.font_color))
+            cell.font = font
+        if col_def.bg_color is not None:
+            rgb = normalize_rgb_color(col_def.bg_color)
+            cell.fill = PatternFill(
+                fill_type="solid",
+                start_color=rgb,
+                end_color=rgb,
+            )
+        if col_def.number_format is not None:
+            cell.number_format = col_def.number_format
+        return cell
+
     def create_excel_table(self, row_count: int) -> "Table":
         """Create the Excel structured table object.
 
@@ -345,7 +466,9 @@ class XlTable(Generic[T]):
         return table_obj
 
     def apply_column_widths(
-        self, ws: "Worksheet", widths: Mapping[str, float | None]
+        self,
+        ws: "Worksheet | WriteOnlyWorksheet",
+        widths: Mapping[str, float | None],
     ):
         """Apply saved column widths from previous export.
 
@@ -433,7 +556,7 @@ class XlTable(Generic[T]):
                     cell.fill = fill
 
     def apply_duplicate_id_conditional_formatting(
-        self, ws: "Worksheet", row_count: int
+        self, ws: "Worksheet | WriteOnlyWorksheet", row_count: int
     ):
         """Highlight duplicate values in columns named `id`.
 
@@ -455,7 +578,7 @@ class XlTable(Generic[T]):
 
     def apply_duplicate_values_conditional_formatting(
         self,
-        ws: "Worksheet",
+        ws: "Worksheet | WriteOnlyWorksheet",
         row_count: int,
         predicate: Callable[[Any], bool],
         fill_color: str,
@@ -785,9 +908,31 @@ class XlTable(Generic[T]):
             db_rec: Database record to update.
             xl_rec: Excel row dictionary mapping column names to values.
         """
-        # Derive `ua_*` values from the corresponding base column when both are
-        # present. These fields are used for diacritics-insensitive searching
-        # and should not be user-authored.
+        self.derive_unaccented_values(xl_rec)
+
+        # Build lookup map from column name to column object for efficient
+        # access.
+        col_by_name = {c.xl_name: c for c in self.columns}
+
+        # Only process columns that are actually present in the Excel record.
+        for col_name in xl_rec:
+            c = col_by_name.get(col_name)
+            if c is None:
+                continue
+            if c.read_only:
+                continue
+            c.apply_xl_to_db(session, db_rec, xl_rec[col_name])
+
+    def derive_unaccented_values(self, xl_rec: Dict[str, Any]):
+        """Derive the `ua_*` values of an Excel row from their base columns.
+
+        The `ua_*` fields are used for diacritics-insensitive searching and
+        should not be user-authored. They are only computed when both `ua_xxx`
+        and `xxx` exist in the table definition and `unidecode` is installed.
+
+        Args:
+            xl_rec: Excel row dictionary, updated in place.
+        """
         try:
             from unidecode import unidecode  # type: ignore[import]
         except Exception:
@@ -809,16 +954,3 @@ class XlTable(Generic[T]):
                     xl_rec[name] = unidecode(base_val)
                 else:
                     xl_rec[name] = unidecode(str(base_val))
-
-        # Build lookup map from column name to column object for efficient
-        # access.
-        col_by_name = {c.xl_name: c for c in self.columns}
-
-        # Only process columns that are actually present in the Excel record.
-        for col_name in xl_rec:
-            c = col_by_name.get(col_name)
-            if c is None:
-                continue
-            if c.read_only:
-                continue
-            c.apply_xl_to_db(session, db_rec, xl_rec[col_name])
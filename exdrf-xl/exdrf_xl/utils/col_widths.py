@@ -1,10 +1,15 @@
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, Iterator, cast
 
+import openpyxl
+from openpyxl import load_workbook
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
 from openpyxl.utils import get_column_letter
 from openpyxl.utils.cell import range_boundaries
 from openpyxl.worksheet.table import Table as OpenpyxlTable
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.xml.constants import SHEET_MAIN_NS
+from openpyxl.xml.functions import fromstring, iterparse
 
 if TYPE_CHECKING:
     from openpyxl import Workbook
@@ -13,35 +18,122 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 VERBOSE = 1
 
+# Reading the layout of a read-only workbook relies on openpyxl internals
+# (the archive of the workbook, the path of the worksheet in it and the
+# relationship type of the tables), which are only known to work with the
+# 3.x series. Other versions, or a 3.x release that changes them, fall back
+# to loading the whole workbook.
+try:
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
 
-def read_column_widths_from_existing_file(
-    wb: "Workbook",
-) -> dict[str, dict[str, float]]:
-    """Read column widths from existing Excel file.
+    READ_ONLY_LAYOUT = openpyxl.__version__.split(".")[0] == "3"
+except ImportError:  # pragma: no cover
+    ReadOnlyWorksheet = None
+    READ_ONLY_LAYOUT = False
+
+
+def _read_only_sheet_layout(
+    ws: Any,
+) -> tuple[dict[str, Any], dict[str, float | None]]:
+    """Read the tables and column widths of a read-only worksheet.
+
+    Read-only worksheets expose neither `tables` nor `column_dimensions`,
+    so both are read from the package: the tables through the sheet
+    relationships and the widths from the `<cols>` element, which precedes
+    the cell data. The cells themselves are never parsed.
+
+    Only called when `READ_ONLY_LAYOUT` is set; raises `AttributeError` if
+    the openpyxl internals it uses are missing.
 
     Args:
-        wb: The workbook to read column widths from.
+        ws: Worksheet of a workbook loaded with `read_only=True`.
 
     Returns:
-        Dictionary mapping table names to dictionaries of column names to
-        widths.
+        The tables by name and the widths by column letter.
     """
-    column_widths: dict[str, dict[str, float]] = {}
+    archive = ws.parent._archive
+    sheet_path = ws._worksheet_path
+    rel_type = OpenpyxlTable._rel_type
+    names = set(archive.namelist())
+
+    tables: dict[str, Any] = {}
+    rels_path = get_rels_path(sheet_path)
+    if rels_path in names:
+        rels = get_dependents(archive, rels_path)
+        for rel in rels.find(rel_type):
+            table = OpenpyxlTable.from_tree(
+                fromstring(archive.read(rel.Target))
+            )
+            tables[table.name] = table
+
+    widths: dict[str, float | None] = {}
+    col_tag = "{%s}col" % SHEET_MAIN_NS
+    data_tag = "{%s}sheetData" % SHEET_MAIN_NS
+    with archive.open(sheet_path) as src:
+        for event, element in iterparse(src, events=("start", "end")):
+            if element.tag == data_tag:
+                break
+            if event != "end" or element.tag != col_tag:
+                continue
+            width = element.get("width")
+            first = int(element.get("min"))
+            last = int(element.get("max", first))
+            for col_idx in range(first, last + 1):
+                widths[get_column_letter(col_idx)] = (
+                    float(width) if width else None
+                )
+    return tables, widths
+
+
+def _iter_sheet_layouts(
+    wb: "Workbook",
+) -> Iterator[tuple[dict[str, Any], dict[str, float | None]]]:
+    """Yield the tables and column widths of each worksheet in a workbook.
 
+    Read-only workbooks are only supported when `READ_ONLY_LAYOUT` is set.
+    """
     for ws_name in wb.sheetnames:
         ws = wb[ws_name]
 
+        if ReadOnlyWorksheet is not None and isinstance(ws, ReadOnlyWorksheet):
+            yield _read_only_sheet_layout(ws)
+            continue
+
         if not isinstance(ws, Worksheet):
             continue
 
-        # For each table in the worksheet.
-        #
         # Depending on openpyxl version, iterating `ws.tables.items()` may
         # return values that are not `Table` objects (for example table range
         # strings). Resolve the object by key access to keep compatibility.
-        for table_name in ws.tables.keys():
+        tables = {name: ws.tables[name] for name in ws.tables.keys()}
+        widths = {
+            letter: dim.width for letter, dim in ws.column_dimensions.items()
+        }
+        yield tables, widths
+
+
+def read_column_widths_from_existing_file(
+    wb: "Workbook",
+) -> dict[str, dict[str, float]]:
+    """Read column widths from existing Excel file.
+
+    The workbook can be loaded with `read_only=True` when `READ_ONLY_LAYOUT`
+    is set, in which case the cell data is not loaded at all. Prefer
+    `read_column_widths_from_path()`, which falls back to a regular load.
+
+    Args:
+        wb: The workbook to read column widths from.
+
+    Returns:
+        Dictionary mapping table names to dictionaries of column names to
+        widths.
+    """
+    column_widths: dict[str, dict[str, float]] = {}
+
+    for tables, widths in _iter_sheet_layouts(wb):
+        # For each table in the worksheet.
+        for table_name, table in tables.items():
             table_widths: dict[str, float] = {}
-            table = ws.tables[table_name]
             if not isinstance(table, OpenpyxlTable):
                 logger.log(
                     VERBOSE,
@@ -94,11 +186,10 @@ def read_column_widths_from_existing_file(
 
                 # Get column letter and width
                 col_letter = get_column_letter(ws_col_idx)
-                col_dim = ws.column_dimensions.get(col_letter)
-
-                if col_dim:
-                    if col_dim.width:
-                        table_widths[col_name] = col_dim.width
+                if col_letter in widths:
+                    width = widths[col_letter]
+                    if width:
+                        table_widths[col_name] = width
                     else:
                         logger.debug("Width missing in column %s", col_letter)
                 else:
@@ -107,3 +198,35 @@ def read_column_widths_from_existing_file(
             column_widths[table_name] = table_widths
 
     return column_widths
+
+
+def read_column_widths_from_path(
+    path: str, read_only: bool = False
+) -> dict[str, dict[str, float]]:
+    """Read column widths from an Excel file on disk.
+
+    Args:
+        path: The `.xlsx` file to read.
+        read_only: Try to read only the layout of the sheets, without the
+            cell data. This uses openpyxl internals, so when they are not
+            available the workbook is loaded in full instead.
+
+    Returns:
+        Dictionary mapping table names to dictionaries of column names to
+        widths.
+    """
+    if read_only and READ_ONLY_LAYOUT:
+        wb = load_workbook(path, read_only=True)
+        try:
+            return read_column_widths_from_existing_file(wb)
+        except AttributeError:
+            logger.warning(
+                "Unsupported openpyxl %s; loading the whole workbook",
+                openpyxl.__version__,
+                exc_info=True,
+            )
+        finally:
+            wb.close()
+
+    wb = load_workbook(path, data_only=True)
+    return read_column_widths_from_existing_file(wb)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from attrs import define
+from sqlalchemy import ForeignKey, Integer, String, create_engine, event, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from exdrf_xl.column import XlColumn
+from exdrf_xl.ingest.apply_import_plan import apply_import_plan
+from exdrf_xl.ingest.import_plan import ImportPlan
+from exdrf_xl.ingest.row_diff import RowDiff
+from exdrf_xl.ingest.table_diff import TableDiff
+from exdrf_xl.schema import XlSchema
+from exdrf_xl.table import XlTable
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _DbParent(_Base):
+    __tablename__ = "bulk_parent"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String, unique=True)
+
+
+class _DbChild(_Base):
+    __tablename__ = "bulk_child"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    parent_id: Mapped[int] = mapped_column(ForeignKey("bulk_parent.id"))
+    name: Mapped[str] = mapped_column(String)
+
+
+@define(slots=True, kw_only=True)
+class _Col(XlColumn[Any, Any]):
+    def value_from_record(self, record: Any) -> Any:
+        return getattr(record, self.xl_name)
+
+
+@define(slots=True, kw_only=True)
+class _UpperCol(_Col):
+    def apply_xl_to_db(self, session: Any, db_rec: Any, xl_value: Any):
+        setattr(db_rec, self.xl_name, xl_value.upper())
+
+
+@define
+class _Table(XlTable[Any]):
+    model: Any = None
+
+    def get_db_model_class(self) -> Any:
+        return self.model
+
+    def create_new_db_record(self, session: Any, xl_rec: Any) -> Any:
+        return self.model()
+
+
+def _make_tables(upper: bool = False) -> tuple[_Table, _Table]:
+    schema = XlSchema()
+    parent = _Table(
+        schema,
+        "parent",
+        "parent",
+        [
+            _Col(xl_name="id", primary=True),
+            (_UpperCol if upper else _Col)(xl_name="name"),
+        ],
+        model=_DbParent,
+    )
+    fk = _Col(xl_name="parent_id")
+    fk.fk_table = "parent"
+    child = _Table(
+        schema,
+        "child",
+        "child",
+        [_Col(xl_name="id", primary=True), fk, _Col(xl_name="name")],
+        model=_DbChild,
+    )
+    schema.tables.extend([parent, child])
+    return parent, child
+
+
+def _new(table: _Table, **xl_row: Any) -> RowDiff:
+    return RowDiff(
+        table_name=table.xl_name,
+        is_new=True,
+        pk={"id": xl_row["id"]},
+        xl_row=xl_row,
+        db_rec=None,
+        diffs=(),
+    )
+
+
+class _Db:
+    def __init__(self):
+        self.engine = create_engine("sqlite://")
+        _Base.metadata.create_all(self.engine)
+        self.statements: list[str] = []
+        event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda _c, _cu, stmt, *_a, **_k: self.statements.append(stmt),
+        )
+        self.session = Session(self.engine)
+
+    @contextmanager
+    def same_session(self):
+        yield self.session
+
+    def rows(self, model: Any) -> list[tuple[Any, ...]]:
+        with Session(self.engine) as session:
+            return [
+                tuple(getattr(r, c.key) for c in model.__table__.columns)
+                for r in session.scalars(select(model).order_by(model.id))
+            ]
+
+
+def _plan(parent: _Table, child: _Table, count: int) -> ImportPlan:
+    parents = [_new(parent, id=f"p{i}", name=f"n{i}") for i in range(count)]
+    children = [
+        _new(child, id=f"c{i}", parent_id=f"p{i % count}", name=f"c{i}")
+        for i in range(count * 2)
+    ]
+    # Children come first in the plan; dependency order fixes that.
+    return ImportPlan(
+        source_path="t.xlsx",
+        tables=[
+            TableDiff(child, tuple(children), (), 0, len(children)),
+            TableDiff(parent, tuple(parents), (), 0, len(parents)),
+        ],
+    )
+
+
+class TestBulkApply:
+    @pytest.mark.parametrize("upper", [False, True])
+    def test_bulk_matches_row_by_row(self, upper):
+        results = []
+        for bulk in (False, True):
+            db = _Db()
+            parent, child = _make_tables(upper)
+            result = apply_import_plan(
+                db,
+                _plan(parent, child, 50),
+                accept_new=True,
+                accept_modified=False,
+                bulk=bulk,
+            )
+            assert result.inserted == 150
+            results.append(
+                (
+                    db.rows(_DbParent),
+                    db.rows(_DbChild),
+                    dict(result.placeholder_to_id),
+                )
+            )
+            # Each batch runs in a single savepoint. SQLite still sends the
+            # rows one by one to keep the RETURNING order.
+            savepoints = [s for s in db.statements if s.startswith("SAVEPOINT")]
+            # Parents with a custom column are inserted one at a time.
+            if not bulk:
+                assert len(savepoints) == 150
+            else:
+                assert len(savepoints) == (51 if upper else 2)
+        assert results[0] == results[1]
+        assert results[1][1][3] == (4, 4, "c3")
+
+    def test_failing_rows_fall_back(self):
+        db = _Db()
+        parent, child = _make_tables()
+        rows = [_new(parent, id=f"p{i}", name=f"n{i % 3}") for i in range(5)]
+        plan = ImportPlan(
+            source_path="t.xlsx",
+            tables=[TableDiff(parent, tuple(rows), (), 0, 5)],
+        )
+
+        # The batch fails; the rows with duplicated names are then retried
+        # alone and reported, the others are inserted.
+        with pytest.raises(ValueError, match="2 rows"):
+            apply_import_plan(
+                db, plan, accept_new=True, accept_modified=False, bulk=True
+            )
+        names = db.session.scalars(select(_DbParent.name).order_by("id"))
+        assert list(names) == ["n0", "n1", "n2"]
+
+    def test_bulk_update(self):
+        db = _Db()
+        parent, child = _make_tables()
+        apply_import_plan(
+            db, _plan(parent, child, 3), accept_new=True, accept_modified=False
+        )
+
+        session = db.session
+        modified = []
+        for rec in session.scalars(select(_DbParent)):
+            modified.append(
+                RowDiff(
+                    table_name="parent",
+                    is_new=False,
+                    pk={"id": rec.id},
+                    xl_row={"id": rec.id, "name": f"m{rec.id}"},
+                    db_rec=rec,
+                    diffs=(),
+                )
+            )
+        plan = ImportPlan(
+            source_path="t.xlsx",
+            tables=[TableDiff(parent, (), tuple(modified), 3, 3)],
+        )
+        db.statements.clear()
+        result = apply_import_plan(
+            db, plan, accept_new=False, accept_modified=True, bulk=True
+        )
+
+        assert result.updated == 3
+        assert db.rows(_DbParent) == [(1, "m1"), (2, "m2"), (3, "m3")]
+        assert len([s for s in db.statements if s.startswith("UPDATE")]) == 1
+        # The records of the session see the new values.
+        assert [r.db_rec.name for r in modified] == ["m1", "m2", "m3"]
+
+    def test_custom_table_uses_orm(self):
+        class _HookTable(_Table):
+            def apply_xl_to_db(self, session, db_rec, xl_rec):
+                super().apply_xl_to_db(session, db_rec, xl_rec)
+                db_rec.name = db_rec.name + "!"
+
+        db = _Db()
+        schema = XlSchema()
+        parent = _HookTable(
+            schema,
+            "parent",
+            "parent",
+            [_Col(xl_name="id", primary=True), _Col(xl_name="name")],
+            model=_DbParent,
+        )
+        schema.tables.append(parent)
+        rows = [_new(parent, id=f"p{i}", name=f"n{i}") for i in range(3)]
+        plan = ImportPlan(
+            source_path="t.xlsx",
+            tables=[TableDiff(parent, tuple(rows), (), 0, 3)],
+        )
+        apply_import_plan(
+            db, plan, accept_new=True, accept_modified=False, bulk=True
+        )
+
+        rec = db.session.get(_DbParent, 1)
+        modified = RowDiff(
+            table_name="parent",
+            is_new=False,
+            pk={"id": 1},
+            xl_row={"id": 1, "name": "m"},
+            db_rec=rec,
+            diffs=(),
+        )
+        plan = ImportPlan(
+            source_path="t.xlsx",
+            tables=[TableDiff(parent, (), (modified,), 1, 1)],
+        )
+        apply_import_plan(
+            db, plan, accept_new=False, accept_modified=True, bulk=True
+        )
+        assert db.rows(_DbParent) == [(1, "m!"), (2, "n1!"), (3, "n2!")]
+
+    def test_no_executemany_returning(self, monkeypatch):
+        db = _Db()
+        monkeypatch.setattr(
+            db.engine.dialect, "insert_executemany_returning", False
+        )
+        parent, child = _make_tables()
+        result = apply_import_plan(
+            db,
+            _plan(parent, child, 5),
+            accept_new=True,
+            accept_modified=False,
+            bulk=True,
+        )
+
+        assert result.inserted == 15
+        assert not [s for s in db.statements if "RETURNING" in s]
+        assert db.rows(_DbChild)[3] == (4, 4, "c3")
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Generator
+
+import pytest
+from attrs import define
+from openpyxl import load_workbook
+
+from exdrf_xl.column import XlColumn
+from exdrf_xl.schema import XlSchema
+from exdrf_xl.table import XlTable
+from exdrf_xl.utils import col_widths
+from exdrf_xl.utils.col_widths import (
+    read_column_widths_from_existing_file,
+    read_column_widths_from_path,
+)
+
+
+@define(slots=True, kw_only=True)
+class _Col(XlColumn["_Table", dict[str, Any]]):
+    key: str
+
+    def value_from_record(self, record: dict[str, Any]) -> Any:
+        return record.get(self.key)
+
+
+@define(slots=True, kw_only=True)
+class _Table(XlTable[dict[str, Any]]):
+    count: int = 0
+
+    def get_selector(self):  # pragma: no cover
+        raise NotImplementedError
+
+    def get_rows(self, session) -> Generator[dict[str, Any], None, None]:
+        for i in range(self.count):
+            yield {"id": i + 1, "a": f"v{i}" if i % 2 else None, "b": [i]}
+
+
+class _Db:
+    @contextmanager
+    def same_session(self):
+        yield None
+
+
+def _make_schema(count: int) -> XlSchema:
+    schema = XlSchema()
+    schema.tables.append(
+        _Table(
+            schema=schema,
+            sheet_name="Sheet1",
+            xl_name="T1",
+            count=count,
+            columns=[
+                _Col(xl_name="id", key="id", number_format="0"),
+                _Col(
+                    xl_name="A",
+                    key="a",
+                    col_width=33.0,
+                    wrap_text=True,
+                    h_align="center",
+                    v_align="top",
+                    font_color="FF0000",
+                    bg_color="00FF00",
+                ),
+                _Col(xl_name="B", key="b", hidden=True),
+            ],
+        )
+    )
+    return schema
+
+
+class TestWriteOnlyExport:
+    @pytest.mark.parametrize("write_only", [False, True])
+    def test_modes_write_the_same_sheet(self, tmp_path, write_only):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(5).export_to_file(_Db(), path, write_only=write_only)
+
+        wb = load_workbook(path)
+        ws = wb["Sheet1"]
+        assert [c.value for c in ws[1]] == ["id", "A", "B"]
+        assert ws.row_dimensions[1].height == pytest.approx(30)
+        assert ws["A1"].alignment.horizontal == "center"
+        assert [c.value for c in ws[3]] == [2, "v1", "[1]"]
+        assert ws["B2"].value is None
+        assert ws.tables["T1"].ref == "A1:C6"
+
+        assert ws["A2"].number_format == "0"
+        assert ws["B3"].alignment.wrap_text is True
+        assert ws["B3"].alignment.vertical == "top"
+        assert ws["B3"].font.color.rgb == "FFFF0000"
+        assert ws["B3"].fill.start_color.rgb == "FF00FF00"
+        assert ws["C3"].alignment.vertical == "center"
+
+        assert ws.column_dimensions["B"].width == pytest.approx(33.0)
+        assert ws.column_dimensions["C"].hidden is True
+        assert ws.conditional_formatting["A2:A6"][0].type == "duplicateValues"
+
+    def test_previous_widths_are_kept(self, tmp_path):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(3).export_to_file(_Db(), path, write_only=True)
+
+        wb = load_workbook(path)
+        wb["Sheet1"].column_dimensions["B"].width = 50
+        wb.save(path)
+
+        _make_schema(1000).export_to_file(_Db(), path, write_only=True)
+        wb = load_workbook(path)
+        assert wb["Sheet1"].column_dimensions["B"].width == pytest.approx(50)
+        assert wb["Sheet1"].max_row == 1001
+
+    def test_read_only_widths_match(self, tmp_path):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(2).export_to_file(_Db(), path)
+
+        expected = read_column_widths_from_existing_file(load_workbook(path))
+        wb = load_workbook(path, read_only=True)
+        try:
+            actual = read_column_widths_from_existing_file(wb)
+        finally:
+            wb.close()
+
+        assert actual == expected
+        assert actual["T1"]["A"] == pytest.approx(33.0)
+
+    def test_read_only_falls_back_without_layout(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(2).export_to_file(_Db(), path)
+        expected = read_column_widths_from_path(path)
+
+        monkeypatch.setattr(col_widths, "READ_ONLY_LAYOUT", False)
+        assert read_column_widths_from_path(path, read_only=True) == expected
+
+    def test_read_only_falls_back_on_missing_internals(
+        self, tmp_path, monkeypatch
+    ):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(2).export_to_file(_Db(), path)
+        expected = read_column_widths_from_path(path)
+
+        def broken(ws):
+            raise AttributeError("_archive")
+
+        monkeypatch.setattr(col_widths, "_read_only_sheet_layout", broken)
+        assert read_column_widths_from_path(path, read_only=True) == expected
+        assert expected["T1"]["A"] == pytest.approx(33.0)
+
+    def test_regular_export_loads_the_full_workbook(
+        self, tmp_path, monkeypatch
+    ):
+        path = str(tmp_path / "out.xlsx")
+        _make_schema(2).export_to_file(_Db(), path)
+
+        modes = []
+        load = col_widths.load_workbook
+
+        def spy(*args, **kwargs):
+            modes.append(kwargs.get("read_only", False))
+            return load(*args, **kwargs)
+
+        monkeypatch.setattr(col_widths, "load_workbook", spy)
+        _make_schema(2).export_to_file(_Db(), path)
+        assert modes == [False]
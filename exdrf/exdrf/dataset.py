@@ -13,6 +13,7 @@ from typing import (
 
 from attrs import define, field
 
+from exdrf.named_list import NamedList, to_named_list
 from exdrf.resource import ExResource
 
 if TYPE_CHECKING:
@@ -36,9 +37,12 @@ class ExDataset:
     """
 
     name: str = field(default="Dataset")
-    resources: List["ExResource"] = field(factory=list, repr=False)
+    resources: NamedList["ExResource"] = field(
+        factory=NamedList, converter=to_named_list, repr=False
+    )
     category_map: dict = field(factory=OrderedDict, repr=False)
     res_class: Type["ExResource"] = field(default=ExResource, repr=False, kw_only=True)
+    _dep_cache: Dict[bool, Any] = field(factory=dict, init=False, repr=False, eq=False)
 
     def __hash__(self):
         return hash(self.name)
@@ -49,9 +53,9 @@ class ExDataset:
             return self.resources[key]
 
         # If the key is not an index, treat it as a name.
-        for m in self.resources:
-            if m.name == key:
-                return m
+        m = self.resources.find(key)
+        if m is not None:
+            return m
 
         raise KeyError(
             f"No resource found for key: {key}; valid indices are "
@@ -61,10 +65,7 @@ class ExDataset:
 
     def __contains__(self, key: str) -> bool:
         """Check if a resource is in the dataset."""
-        for m in self.resources:
-            if m.name == key:
-                return True
-        return False
+        return self.resources.find(key) is not None
 
     def add_resource(self, resource: "ExResource") -> None:
         """Add a resource to the dataset.
@@ -78,6 +79,7 @@ class ExDataset:
             )
         self.resources.append(resource)
         resource.dataset = self  # type: ignore
+        self.clear_dependency_cache()
 
         # Place the resource in the category map.
         crt = self.category_map
@@ -148,16 +150,68 @@ class ExDataset:
             result.append((ctg, models))
         return result
 
+    def clear_dependency_cache(self) -> None:
+        """Forget the dependency maps computed by `dependency_map()`.
+
+        Adding resources and fields through `add_resource()` and
+        `ExResource.add_field()` calls this automatically.
+        """
+        self._dep_cache.clear()
+
+    def _dependency_maps(
+        self, fk_only: bool
+    ) -> Tuple[Dict[str, List["ExResource"]], Dict[str, List["ExResource"]]]:
+        """Compute (or reuse) the direct and reverse dependency maps."""
+        key = (
+            id(self.resources),
+            len(self.resources),
+            sum(len(getattr(r, "fields", ())) for r in self.resources),
+        )
+        cached = self._dep_cache.get(fk_only)
+        if cached is not None and cached[0] == key:
+            return cached[1], cached[2]
+
+        deps: Dict[str, List["ExResource"]] = {}
+        dependents: Dict[str, List["ExResource"]] = {}
+        for resource in self.resources:
+            crt = list(resource.get_dependencies(fk_only=fk_only))
+            deps[resource.name] = crt
+            dependents.setdefault(resource.name, [])
+            for dep in crt:
+                dependents.setdefault(dep.name, []).append(resource)
+        self._dep_cache[fk_only] = (key, deps, dependents)
+        return deps, dependents
+
+    def dependency_map(self, fk_only: bool = False) -> Dict[str, List["ExResource"]]:
+        """Map each resource name to the resources it depends on.
+
+        The map is computed once and reused until the resources or their
+        fields change. Do not modify the returned dictionary.
+
+        Args:
+            fk_only: See `ExResource.get_dependencies()`.
+        """
+        return self._dependency_maps(fk_only)[0]
+
+    def dependents_map(self, fk_only: bool = False) -> Dict[str, List["ExResource"]]:
+        """Map each resource name to the resources that depend on it.
+
+        This is the reverse of `dependency_map()`. Do not modify the returned
+        dictionary.
+
+        Args:
+            fk_only: See `ExResource.get_dependencies()`.
+        """
+        return self._dependency_maps(fk_only)[1]
+
     def sorted_by_deps(self) -> List["ExResource"]:
         # Build a dependency map where key is the resource name and value is a
         # set of names of resources it depends on.
-        deps: Dict[str, List["ExResource"]] = {}
-        short_deps: Dict[str, List["ExResource"]] = {}
-        name_to_resource: Dict[str, "ExResource"] = {}
-        for resource in self.resources:
-            deps[resource.name] = list(resource.get_dependencies())
-            short_deps[resource.name] = list(resource.get_dependencies(fk_only=True))
-            name_to_resource[resource.name] = resource
+        deps = self.dependency_map()
+        short_deps = self.dependency_map(fk_only=True)
+        name_to_resource: Dict[str, "ExResource"] = {
+            resource.name: resource for resource in self.resources
+        }
 
         # Start with those that have no dependencies.
         result = OrderedDict(
@@ -20,6 +20,7 @@ from exdrf.constants import (
     FIELD_TYPE_STRING,
     FIELD_TYPE_STRING_LIST,
 )
+from exdrf.named_list import name_setter
 from exdrf.utils import doc_lines, inflect_e
 
 if TYPE_CHECKING:
@@ -45,7 +46,7 @@ class ExFieldBase:
         nullable: Whether the field is nullable.
     """
 
-    name: str = field(default="")
+    name: str = field(default="", on_setattr=name_setter("resource", "fields"))
     title: str = field(default="")
     description: str = field(default="")
     category: str = field(default="")
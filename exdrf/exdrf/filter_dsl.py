@@ -1,5 +1,5 @@
 import re
-from bisect import bisect_right
+from bisect import bisect_left, bisect_right
 from collections import namedtuple
 from enum import StrEnum
 from typing import (
@@ -9,6 +9,7 @@ from typing import (
     Optional,
     Protocol,
     Sequence,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -241,10 +242,34 @@ class ParsedLogicNot(ParsedLogic):
     item: ParsedFieldFilter
 
 
+# A top level element of a parsed filter.
+ParsedItem = Union[ParsedFieldFilter, ParsedLogic]
+
+
+# The tokens that a regular expression can describe, in the order in which
+# they are tried. A lone quote starts an unterminated string and a bracket
+# starts a list, which is scanned separately because lists can nest.
+_TOKEN_RE = re.compile(
+    r"(?P<punct>[(),])"
+    r"|(?P<string>'[^'\\]*(?:\\.[^'\\]*)*')"
+    r"|(?P<quote>')"
+    r"|(?P<bracket>\[)"
+    r"|(?P<word>[A-Za-z_][A-Za-z0-9_.]*)"
+    r"|(?P<number>\d+(?:\.\d+)?)"
+    r"|(?P<op>==|!=|>=|<=|>|<)",
+    re.DOTALL,
+)
+_SPACE_RE = re.compile(r"\s+")
+_BRACKETS_RE = re.compile(r"[\[\]]")
+
+
 @define
 class DSLTokenizer:
     """A tokenizer for the DSL.
 
+    Tokens are matched in place with precompiled expressions, so the text is
+    scanned once.
+
     Attributes:
         text: The text to tokenize.
         pos: The current position in the text.
@@ -263,35 +288,37 @@ class DSLTokenizer:
         Args:
             count: The number of characters to advance.
         """
-
-        for _ in range(count):
-            if self.pos < len(self.text):
-                if self.text[self.pos] == "\n":
-                    self.line += 1
-                    self.col = 1
-                else:
-                    self.col += 1
-                self.pos += 1
-
-    def _match(self, pattern: str) -> Optional[re.Match]:
-        """Match a pattern at the current position.
-
-        Args:
-            pattern: The pattern to match.
-
-        Returns:
-            The match if found, otherwise None.
-        """
-        return re.match(pattern, self.text[self.pos :])  # noqa: E203
+        end = min(self.pos + count, len(self.text))
+        newlines = self.text.count("\n", self.pos, end)
+        if newlines:
+            self.line += newlines
+            self.col = end - self.text.rfind("\n", self.pos, end)
+        else:
+            self.col += end - self.pos
+        self.pos = end
 
     def _skip_whitespace(self):
         """Skip whitespace at the current position.
 
         This is a helper method for the `next_token` method.
         """
+        match = _SPACE_RE.match(self.text, self.pos)
+        if match:
+            self._advance(match.end() - self.pos)
 
-        while self.pos < len(self.text) and self.text[self.pos].isspace():
-            self._advance()
+    def _bracket_end(self) -> int:
+        """Find the end of the list that starts at the current position.
+
+        Returns:
+            The index after the closing bracket, or -1 if the brackets are
+            not balanced.
+        """
+        level = 0
+        for match in _BRACKETS_RE.finditer(self.text, self.pos):
+            level += 1 if match.group() == "[" else -1
+            if level == 0:
+                return match.end()
+        return -1
 
     def next_token(self) -> Optional[Token]:
         """Get the next token from the text.
@@ -307,51 +334,38 @@ class DSLTokenizer:
         if self.pos >= len(self.text):
             return None
 
-        # Get the current character
-        ch = self.text[self.pos]
         start_line, start_col = self.line, self.col
+        match = _TOKEN_RE.match(self.text, self.pos)
+        if match is None:
+            ch = self.text[self.pos]
+            raise FltSyntaxError(
+                msg=(
+                    f"Unexpected character '{ch}' at line {start_line} col {start_col}"
+                ),
+                code=FltErrCode.UNEXPECTED_CHAR,
+                text=self.text,
+                lineno=start_line,
+                column=start_col,
+                offset=self.pos,
+                value=ch,
+            )
 
-        # If the current character is a parenthesis or comma, return a token
-        if ch in "(),":
-            self._advance()
-            return Token(ch, start_line, start_col, self.pos)
-
-        # If the current character is a single quote, return a string token
-        if ch == "'":
-            end_pos = self.pos + 1
-            while end_pos < len(self.text) and self.text[end_pos] != "'":
-                if self.text[end_pos] == "\\" and end_pos + 1 < len(self.text):
-                    end_pos += 2
-                else:
-                    end_pos += 1
-            if end_pos >= len(self.text) or self.text[end_pos] != "'":
-                raise FltSyntaxError(
-                    msg=(f"Unterminated string at line {start_line} col {start_col}"),
-                    code=FltErrCode.UNTERMINATED_STRING,
-                    text=self.text,
-                    lineno=start_line,
-                    column=start_col,
-                    offset=self.pos,
-                    end_offset=end_pos,
-                    value=self.text[self.pos : end_pos + 1],  # noqa: E203
-                )
-            token_value = self.text[self.pos : end_pos + 1]  # noqa: E203
-            self._advance(len(token_value))
-            return Token(token_value, start_line, start_col, self.pos)
-
-        # If the current character is a bracket, return a bracket token.
-        if ch == "[":
-            end_pos = self.pos
-            bracket_level = 0
-            while end_pos < len(self.text):
-                if self.text[end_pos] == "[":
-                    bracket_level += 1
-                elif self.text[end_pos] == "]":
-                    bracket_level -= 1
-                    if bracket_level == 0:
-                        break
-                end_pos += 1
-            if bracket_level != 0:
+        kind = match.lastgroup
+        if kind == "quote":
+            raise FltSyntaxError(
+                msg=(f"Unterminated string at line {start_line} col {start_col}"),
+                code=FltErrCode.UNTERMINATED_STRING,
+                text=self.text,
+                lineno=start_line,
+                column=start_col,
+                offset=self.pos,
+                end_offset=len(self.text),
+                value=self.text[self.pos :],  # noqa: E203
+            )
+
+        if kind == "bracket":
+            end_pos = self._bracket_end()
+            if end_pos == -1:
                 raise FltSyntaxError(
                     msg=(f"Unmatched brackets at line {start_line} col {start_col}"),
                     code=FltErrCode.UNMATCHED_BRACKETS,
@@ -359,44 +373,15 @@ class DSLTokenizer:
                     lineno=start_line,
                     column=start_col,
                     offset=self.pos,
-                    end_offset=end_pos,
-                    value=self.text[self.pos : end_pos + 1],  # noqa: E203
+                    end_offset=len(self.text),
+                    value=self.text[self.pos :],  # noqa: E203
                 )
-            token_value = self.text[self.pos : end_pos + 1]  # noqa: E203
-            self._advance(len(token_value))
-            return Token(token_value, start_line, start_col, self.pos)
-
-        # If the current character is a letter, number, or underscore, return a
-        # word token.
-        match = self._match(r"[A-Za-z_][A-Za-z0-9_.]*")
-        if match:
-            token_value = match.group(0)
-            self._advance(len(token_value))
-            return Token(token_value, start_line, start_col, self.pos)
-
-        # If the current character is a number, return a number token
-        match = self._match(r"\d+(\.\d+)?")
-        if match:
-            token_value = match.group(0)
-            self._advance(len(token_value))
-            return Token(token_value, start_line, start_col, self.pos)
-
-        # See if this is an operation
-        match = self._match(r"==|!=|>=|<=|>|<")
-        if match:
-            token_value = match.group(0)
-            self._advance(len(token_value))
-            return Token(token_value, start_line, start_col, self.pos)
+        else:
+            end_pos = match.end()
 
-        raise FltSyntaxError(
-            msg=(f"Unexpected character '{ch}' at line {start_line} col {start_col}"),
-            code=FltErrCode.UNEXPECTED_CHAR,
-            text=self.text,
-            lineno=start_line,
-            column=start_col,
-            offset=self.pos,
-            value=ch,
-        )
+        token_value = self.text[self.pos : end_pos]  # noqa: E203
+        self._advance(len(token_value))
+        return Token(token_value, start_line, start_col, self.pos)
 
     def tokenize(self) -> List[Token]:
         """Tokenize the text.
@@ -514,15 +499,26 @@ class FieldValidator(Generic[DBM, CTX]):
 class DSLParser:
     """Parse the DSL.
 
+    After a successful `parse` the parser remembers the top level elements
+    and the tokens they span, so that `reparse` can parse an edited version
+    of the text again without going through the parts that did not change.
+
     Attributes:
+        src_text: The text the tokens come from.
         tokens: The tokens to parse.
         index: The current index in the tokens.
+        last_error: The error of the last parse, if it failed.
+        elements: The top level elements of the last successful parse.
+        spans: For each of the `elements`, the range of its tokens,
+            including the comma that follows it.
     """
 
     src_text: str
     tokens: List[Token]
     index: int
     last_error: Optional[FltSyntaxError] = field(default=None, init=False)
+    elements: List[ParsedItem] = field(factory=list, init=False)
+    spans: List[Tuple[int, int]] = field(factory=list, init=False)
 
     @property
     def last_token(self) -> Optional[Token]:
@@ -616,9 +612,26 @@ class DSLParser:
             The parsed filter.
         """
         self.last_error = None  # Clear previous error
+        self.elements = []
+        self.spans = []
+        result, spans = self._parse_top_level()
+        self.elements = result
+        self.spans = spans
+        return result
+
+    def _parse_top_level(
+        self,
+    ) -> Tuple[List[ParsedItem], List[Tuple[int, int]]]:
+        """Parse the top level elements from the current token to the end.
+
+        Returns:
+            The elements and the ranges of their tokens.
+        """
         result = []
+        spans = []
         tok = self.current()
         while tok:
+            start = self.index
             try:
                 result.extend(self.parse_expression())
             except FltSyntaxError as e:
@@ -627,7 +640,153 @@ class DSLParser:
             tok = self.current()
             if tok and tok.value == ",":
                 self.index += 1
-        return result
+                tok = self.current()
+            spans.append((start, self.index))
+        return result, spans
+
+    def parse_text(self, text: str) -> List[ParsedItem]:
+        """Tokenize and parse a new text.
+
+        Args:
+            text: The text to parse.
+
+        Returns:
+            The parsed filter.
+        """
+        self.src_text = text
+        self.tokens = []
+        self.index = 0
+        self.spans = []
+        try:
+            self.tokens = DSLTokenizer(text).tokenize()
+        except FltSyntaxError as e:
+            self.last_error = e
+            raise e
+        return self.parse()
+
+    def reparse(
+        self, text: str, start: int, removed: int, added: int
+    ) -> List[ParsedItem]:
+        """Parse an edited version of the text.
+
+        The new text is the current one with `removed` characters at `start`
+        replaced by `added` characters. Only the top level elements that the
+        edit touches are tokenized and parsed again. The ones before it are
+        kept as they are and the ones after it are kept with their tokens
+        moved in place. When the previous parse failed, or when the edit
+        changes how the following elements are read, the whole text is
+        parsed again.
+
+        Args:
+            text: The new text.
+            start: Where the edit starts.
+            removed: The number of characters the edit removed.
+            added: The number of characters the edit added.
+
+        Returns:
+            The parsed filter.
+        """
+        old_text = self.src_text
+        end = start + removed
+        delta = added - removed
+        if (
+            self.last_error is not None
+            or not self.spans
+            or start < 0
+            or end > len(old_text)
+            or len(text) != len(old_text) + delta
+        ):
+            return self.parse_text(text)
+
+        tokens = self.tokens
+        spans = self.spans
+
+        # The elements in [first, last) touch the edit. An element that is
+        # not followed by a comma also takes the one the edit may add.
+        first = bisect_left(spans, start, key=lambda s: tokens[s[1] - 1].index)
+        if first and tokens[spans[first - 1][1] - 1].value != ",":
+            first -= 1
+        last = bisect_right(spans, end, key=lambda s: tokens[s[0]].start_index)
+        t_first = spans[first][0] if first < len(spans) else len(tokens)
+        t_last = spans[last][0] if last < len(spans) else len(tokens)
+        tail = tokens[t_last:]
+        if tail and tail[0].value == ",":
+            return self.parse_text(text)
+
+        # Read the tokens of the edited region, up to the (moved) start of
+        # the tail, which has to come out of the tokenizer unchanged.
+        if t_first:
+            prev = tokens[t_first - 1]
+            newlines = prev.value.count("\n")
+            tokenizer = DSLTokenizer(
+                text,
+                pos=prev.index,
+                line=prev.line + newlines,
+                col=(
+                    len(prev.value) - prev.value.rfind("\n")
+                    if newlines
+                    else prev.column + len(prev.value)
+                ),
+            )
+        else:
+            tokenizer = DSLTokenizer(text)
+        stop = tail[0].start_index + delta if tail else len(text)
+        region: List[Token] = []
+        try:
+            while True:
+                tok = tokenizer.next_token()
+                if tok is None or tok.start_index >= stop:
+                    break
+                region.append(tok)
+        except FltSyntaxError as e:
+            if tail:
+                return self.parse_text(text)
+            self.src_text = text
+            self.last_error = e
+            self.spans = []
+            raise e
+        if tail and (
+            tok is None or tok.start_index != stop or tok.value != tail[0].value
+        ):
+            return self.parse_text(text)
+
+        # Parse the region on its own; the tail must not be needed for that.
+        self.src_text = text
+        self.tokens = tokens[:t_first] + region
+        self.index = t_first
+        self.last_error = None
+        try:
+            middle, middle_spans = self._parse_top_level()
+        except FltSyntaxError:
+            if tail:
+                return self.parse_text(text)
+            self.spans = []
+            raise
+
+        # Move the tail to its new place. Only the tokens on the line where
+        # the edit ends can change their column.
+        if tail:
+            edit_line = tail[0].line - old_text.count("\n", end, tail[0].start_index)
+            lines = text.count("\n", start, start + added) - old_text.count(
+                "\n", start, end
+            )
+            for tok in tail:
+                if tok.line == edit_line:
+                    new_start = tok.start_index + delta
+                    tok.column = new_start - text.rfind("\n", 0, new_start)
+                tok.line += lines
+                tok.index += delta
+
+        moved = len(region) - (t_last - t_first)
+        self.tokens.extend(tail)
+        self.index = len(self.tokens)
+        self.elements = self.elements[:first] + middle + self.elements[last:]
+        self.spans = (
+            spans[:first]
+            + middle_spans
+            + [(a + moved, b + moved) for a, b in spans[last:]]
+        )
+        return self.elements
 
     def parse_expression(self) -> List[Union[ParsedFieldFilter, ParsedLogic]]:
         """Parse an expression.
@@ -19,8 +19,10 @@ Examples:
 ```
 """
 
+import keyword
 import re
-from typing import Any, Dict, List, Literal, Union, cast
+import threading
+from typing import Any, Callable, Dict, List, Literal, Union, cast
 
 from attrs import define, field
 
@@ -640,6 +642,92 @@ def generate_python_code(ast_node: ASTNode) -> Any:
             raise ValueError(f"Unsupported operator: {op}")
 
 
+# Functions created by `compile_label()`, keyed by their source code.
+_compiled_labels: Dict[str, Callable[[Any], Any]] = {}
+_compiled_lock = threading.Lock()
+
+
+def _compile_source(ast_node: ASTNode) -> str:
+    """Generate the Python expression used by `compile_label()`.
+
+    This is `generate_python_code()` with three differences: literals are
+    written with `repr()` so that any string survives, identifier parts that
+    are not valid Python names are read with `getattr()` and operators
+    that cannot generate Python code are called through their `evaluate()`.
+
+    Args:
+        ast_node: The parsed AST node.
+
+    Returns:
+        A Python expression that reads the values from `record`.
+    """
+    if isinstance(ast_node, ParsedLiteral):
+        return repr(ast_node.raw_value)
+
+    elif isinstance(ast_node, ParsedIdentifier):
+        code = "record"
+        for part in ast_node.value.split("."):
+            if part.isidentifier() and not keyword.iskeyword(part):
+                code = f"{code}.{part}"
+            else:
+                code = f"getattr({code}, {part!r})"
+        return code
+
+    elif isinstance(ast_node, list):
+        op = cast(ParsedOp, ast_node[0])
+        assert isinstance(op, ParsedOp), "First element must be an operator"
+        if op.value not in ops:
+            raise ValueError(f"Unknown operator: {op}")
+        args = [_compile_source(arg) for arg in ast_node[1:]]
+        try:
+            return ops[op.value].to_python(*args)
+        except NotImplementedError:
+            return f"_ops[{op.value!r}].evaluate({', '.join(args)})"
+
+    raise ValueError(f"Unsupported node: {ast_node!r}")
+
+
+def compile_label(ast_node: ASTNode) -> Callable[[Any], Any]:
+    """Turn a parsed label into a Python function.
+
+    The function gives the same result as `evaluate()` but the expression is
+    translated to Python once, so computing the label of a record costs a
+    single function call instead of a walk of the AST. Functions are cached
+    by their source, so compiling the same label again is cheap.
+
+    Dictionaries passed to the function are evaluated with `evaluate()`,
+    which knows how to read their keys.
+
+    Args:
+        ast_node: The parsed AST node.
+
+    Returns:
+        A function that receives a record and returns its label.
+    """
+    source = _compile_source(ast_node)
+    result = _compiled_labels.get(source)
+    if result is not None:
+        return result
+
+    code = (
+        "def label(record):\n"
+        "    if isinstance(record, dict):\n"
+        "        return _evaluate(_ast, record)\n"
+        f"    return {source}\n"
+    )
+    namespace: Dict[str, Any] = {
+        "_ast": ast_node,
+        "_evaluate": evaluate,
+        "_ops": ops,
+    }
+    exec(compile(code, "<label>", "exec"), namespace)
+    result = namespace["label"]
+    result.__doc__ = source
+
+    with _compiled_lock:
+        return _compiled_labels.setdefault(source, result)
+
+
 def generate_typescript_code(ast_node: ASTNode) -> Any:
     """Generate TypeScript code from the AST.
 
@@ -0,0 +1,95 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from attrs import Attribute
+
+T = TypeVar("T")
+
+# The list methods that change the items or their order.
+_MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+)
+
+
+class NamedList(List[T]):
+    """A list of items that have a `name`, with an index of the names.
+
+    The index is built on the first lookup by name and is trusted until the
+    list changes: every method that changes the list drops it, so lookups,
+    including those for names that are not in the list, cost O(1) while the
+    list stays the same. An item that is renamed while in the list must
+    call `invalidate()`; `ExField` and `ExResource` do this through their
+    `name` attribute (see `name_setter()`).
+
+    When several items have the same name the first one is found.
+    """
+
+    _index: Optional[Dict[str, T]] = None
+
+    def find(self, name: str) -> Optional[T]:
+        """Get the first item with the given name, if any."""
+        index = self._index
+        if index is None:
+            index = {}
+            for item in self:
+                index.setdefault(getattr(item, "name"), item)
+            self._index = index
+        return index.get(name)
+
+    def invalidate(self) -> None:
+        """Drop the index; the next lookup builds it again."""
+        self._index = None
+
+
+def _mutator(name: str) -> Callable[..., Any]:
+    method = getattr(list, name)
+
+    def wrapper(self: NamedList, *args: Any, **kwargs: Any) -> Any:
+        self._index = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in _MUTATORS:
+    setattr(NamedList, _name, _mutator(_name))
+
+
+def to_named_list(items: Iterable[T]) -> NamedList[T]:
+    """Converter for attrs fields that hold a `NamedList`."""
+    if isinstance(items, NamedList):
+        return items
+    return NamedList(items)
+
+
+def name_setter(owner_attr: str, list_attr: str) -> Callable[..., Any]:
+    """Create an attrs `on_setattr` hook for the `name` of a list item.
+
+    When the name changes the `NamedList` that holds the item in its owner
+    drops its index.
+
+    Args:
+        owner_attr: The attribute of the item that points to its owner.
+        list_attr: The attribute of the owner that holds the items.
+    """
+
+    def hook(instance: Any, attribute: "Attribute[Any]", value: Any) -> Any:
+        owner = getattr(instance, owner_attr, None)
+        items = getattr(owner, list_attr, None)
+        if isinstance(items, NamedList):
+            items.invalidate()
+        return value
+
+    return hook
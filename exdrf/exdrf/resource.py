@@ -5,6 +5,7 @@ from functools import cached_property
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Dict,
     List,
     Optional,
@@ -20,11 +21,13 @@ from pydantic import BaseModel, Field, field_validator
 
 from exdrf.constants import FIELD_TYPE_INTEGER, FIELD_TYPE_REF_ONE_TO_MANY
 from exdrf.label_dsl import (
+    compile_label,
     generate_python_code,
     generate_typescript_code,
     get_used_fields,
     parse_expr,
 )
+from exdrf.named_list import NamedList, name_setter, to_named_list
 from exdrf.utils import doc_lines, inflect_e
 
 if TYPE_CHECKING:
@@ -61,9 +64,9 @@ class ExResource:
         depends_on: The concepts that the resource depends on.
     """
 
-    name: str
+    name: str = field(on_setattr=name_setter("dataset", "resources"))
     dataset: "ExDataset" = field(default=None, repr=False)
-    fields: List["ExField"] = field(factory=list)
+    fields: NamedList["ExField"] = field(factory=NamedList, converter=to_named_list)
     categories: List[str] = field(factory=list)
     description: str = ""
     src: Any = field(default=None)
@@ -92,7 +95,7 @@ class ExResource:
     def __contains__(self, key: Union[int, str]) -> bool:
         if isinstance(key, int):
             return 0 <= key < len(self.fields)
-        return any(f.name == key for f in self.fields)
+        return self.fields.find(key) is not None
 
     def __iter__(self):
         """Make the resource iterable over its fields."""
@@ -113,7 +116,7 @@ class ExResource:
         """
         if isinstance(key, int):
             return key < len(self.fields)
-        return any(f.name == key for f in self.fields)
+        return self.fields.find(key) is not None
 
     def __getitem__(self, key: Union[int, str]) -> "ExField":
         # If it is an index, return the field at that index.
@@ -121,9 +124,9 @@ class ExResource:
             return self.fields[key]
 
         # Locate the field by name.
-        for m in self.fields:
-            if m.name == key:
-                return m
+        fld = self.fields.find(key)
+        if fld is not None:
+            return fld
 
         # If the field is not found, raise an error.
         raise KeyError(f"No field found for key `{key}` in model `{self.name}`")
@@ -244,6 +247,8 @@ class ExResource:
 
         self.fields.append(fld)
         fld.resource = self  # type: ignore
+        if self.dataset is not None:
+            self.dataset.clear_dependency_cache()
 
         if not fld.category:
             fld.category = self.get_default_field_category(fld)
@@ -815,6 +820,17 @@ class ExResource:
         """Convert a label to python code."""
         return generate_python_code(self.label_ast)
 
+    @cached_property
+    def label_function(self) -> Callable[[Any], Any]:
+        """The label of the resource as a Python function.
+
+        The function receives a record and returns its label; it is built
+        from `label_ast` the first time it is needed.
+        """
+        if self.label_ast is None:
+            raise ValueError(f"Resource `{self.name}` has no label")
+        return compile_label(self.label_ast)
+
     def label_to_typescript(self) -> str:
         """Convert a label to typescript code."""
         return generate_typescript_code(self.label_ast)
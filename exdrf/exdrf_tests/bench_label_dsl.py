@@ -0,0 +1,55 @@
+"""Compare the label interpreter with compiled labels.
+
+Run with `python -m exdrf_tests.bench_label_dsl [count]` from the `exdrf`
+directory. The module is not collected by pytest.
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from exdrf.label_dsl import compile_label, evaluate, parse_expr
+
+EXPRESSIONS = [
+    "name",
+    '(concat first_name " " last_name)',
+    '(concat (upper last_name) ", " first_name " (" (int_str count) ")")',
+    '(is_none nick (date_str born "%Y-%m-%d") nick)',
+]
+
+
+class Record:
+    def __init__(self, i: int):
+        self.name = f"name {i}"
+        self.first_name = f"First{i}"
+        self.last_name = f"Last{i}"
+        self.count = i * 37
+        self.nick = None if i % 3 == 0 else f"nick{i}"
+        self.born = datetime(2000, 1, 1 + i % 28)
+
+
+def main(count: int = 100_000) -> None:
+    records = [Record(i) for i in range(count)]
+    for expr in EXPRESSIONS:
+        ast = parse_expr(expr)
+
+        start = time.perf_counter()
+        expected = [evaluate(ast, r) for r in records]
+        interpreted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        label = compile_label(ast)
+        result = [label(r) for r in records]
+        compiled = time.perf_counter() - start
+
+        assert result == expected
+        print(
+            f"{expr}\n"
+            f"    evaluate: {count / interpreted:12,.0f} records/s\n"
+            f"    compiled: {count / compiled:12,.0f} records/s "
+            f"({interpreted / compiled:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
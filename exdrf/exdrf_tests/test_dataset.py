@@ -1,6 +1,7 @@
 import pytest
 
 from exdrf.dataset import ExDataset
+from exdrf.resource import ExResource
 
 
 def test_exdataset_hash():
@@ -63,6 +64,46 @@ class TestExDatasetGetItem:
         with pytest.raises(KeyError, match="No resource found for key: InvalidName"):
             _ = dataset["InvalidName"]
 
+    def test_index_follows_list_changes(self):
+        mock_resource1 = type("MockResource", (), {"name": "Resource1"})()
+        mock_resource2 = type("MockResource", (), {"name": "Resource2"})()
+
+        dataset = ExDataset()
+        dataset.resources.append(mock_resource1)
+        assert dataset["Resource1"] == mock_resource1
+        assert "Resource2" not in dataset
+
+        # Names that are not there are answered by the index.
+        index = dataset.resources._index
+        assert "Resource3" not in dataset
+        assert dataset.resources._index is index
+
+        dataset.resources.append(mock_resource2)
+        assert dataset["Resource2"] == mock_resource2
+
+    def test_index_follows_rename_and_replace(self):
+        resource1 = ExResource(name="X")
+        resource2 = ExResource(name="Z")
+
+        dataset = ExDataset()
+        dataset.add_resource(resource1)
+        dataset.add_resource(resource2)
+        assert dataset["X"] == resource1
+
+        # A renamed resource is found under its new name only.
+        resource1.name = "Y"
+        assert "Y" in dataset
+        assert dataset["Y"] == resource1
+        assert "X" not in dataset
+
+        # Resources replaced in place are found under their names.
+        replacement = ExResource(name="Y")
+        dataset.resources[0] = replacement
+        assert dataset["Y"] == replacement
+        dataset.resources[1] = ExResource(name="W")
+        assert "W" in dataset
+        assert "Z" not in dataset
+
 
 class TestExDatasetAddResource:
     def test_add_valid_resource(self):
@@ -420,3 +461,35 @@ class TestExDatasetSortedByDeps:
 
         # Assert that the resources are sorted correctly
         assert sorted_resources == [mock_resource1, mock_resource2]
+
+    def test_dependency_maps(self):
+        calls = []
+
+        def make(name, deps):
+            def get_dependencies(self, fk_only=False):
+                calls.append((name, fk_only))
+                return deps
+
+            return type(
+                "MockResource",
+                (),
+                {"name": name, "get_dependencies": get_dependencies},
+            )()
+
+        base = make("Base", [])
+        left = make("Left", [base])
+        right = make("Right", [base, left])
+
+        dataset = ExDataset()
+        dataset.resources.extend([right, left, base])
+
+        assert dataset.dependency_map()["Right"] == [base, left]
+        assert dataset.dependents_map()["Base"] == [right, left]
+        assert dataset.dependents_map()["Left"] == [right]
+        assert dataset.dependents_map()["Right"] == []
+        assert dataset.sorted_by_deps() == [base, left, right]
+        assert len(calls) == 6
+
+        dataset.clear_dependency_cache()
+        dataset.dependency_map()
+        assert len(calls) == 9
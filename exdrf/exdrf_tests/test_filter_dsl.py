@@ -554,3 +554,98 @@ class TestRawFilterToText:
             raw_filter_to_text(filter_data_or)
         expected = "logic operator list expects two elements. Got ['or']"
         assert expected in str(exc_info_or.value)
+
+
+class TestTokenizer:
+    """Tests for DSLTokenizer."""
+
+    def test_positions(self) -> None:
+        """Lines and columns follow the newlines inside and between tokens."""
+        text = "a == 'x\ny',\n  b in [1, [2]]"
+        tokens = DSLTokenizer(text).tokenize()
+        assert [(t.value, t.line, t.column, t.index) for t in tokens] == [
+            ("a", 1, 1, 1),
+            ("==", 1, 3, 4),
+            ("'x\ny'", 1, 6, 10),
+            (",", 2, 3, 11),
+            ("b", 3, 3, 15),
+            ("in", 3, 5, 18),
+            ("[1, [2]]", 3, 8, 27),
+        ]
+
+    def test_errors(self) -> None:
+        """Unterminated strings and lists are reported where they start."""
+        with pytest.raises(FltSyntaxError) as exc_info:
+            DSLTokenizer("a == 'x\\'").tokenize()
+        assert exc_info.value.offset == 5
+        assert exc_info.value.value == "'x\\'"
+
+        with pytest.raises(FltSyntaxError) as exc_info:
+            DSLTokenizer("a in [1, [2]").tokenize()
+        assert exc_info.value.offset == 5
+        assert exc_info.value.end_offset == 12
+
+
+class TestReparse:
+    """Tests for DSLParser.reparse()."""
+
+    @staticmethod
+    def _full(text: str) -> DSLParser:
+        p = DSLParser(src_text="", tokens=[], index=0)
+        p.parse_text(text)
+        return p
+
+    @staticmethod
+    def _edit(p: DSLParser, start: int, end: int, new: str) -> str:
+        text = p.src_text[:start] + new + p.src_text[end:]
+        p.reparse(text, start, end - start, len(new))
+        return text
+
+    @staticmethod
+    def _tokens(p: DSLParser) -> list:
+        return [(t.value, t.line, t.column, t.index) for t in p.tokens]
+
+    def test_unchanged_elements_are_kept(self) -> None:
+        """Only the edited element is parsed again."""
+        p = self._full("a == 1,\nAND (b == 2, c == 3),\nd == 'x'")
+        before = list(p.elements)
+
+        text = self._edit(p, 5, 6, "10\n")
+
+        assert p.elements[1] is before[1]
+        assert p.elements[2] is before[2]
+        assert p.elements[0] is not before[0]
+        assert serialize_filter(p.elements) == serialize_filter(
+            self._full(text).elements
+        )
+        assert self._tokens(p) == self._tokens(self._full(text))
+
+    def test_edits_that_change_the_structure(self) -> None:
+        """Commas and brackets added or removed by an edit are honoured."""
+        p = self._full("a == 1,\nb == 2\nc == 3")
+        for old, new in (
+            ("1,", "1"),
+            ("2", "2,"),
+            ("a == 1", "OR (a == 1, x == 'y')"),
+            ("y')", "y'), z == 4"),
+        ):
+            start = p.src_text.index(old)
+            text = self._edit(p, start, start + len(old), new)
+            full = self._full(text)
+            assert serialize_filter(p.elements) == serialize_filter(full.elements)
+            assert p.spans == full.spans
+            assert self._tokens(p) == self._tokens(full)
+
+    def test_errors_are_reported(self) -> None:
+        """A failed parse is followed by a full one."""
+        p = self._full("a == 1, b == 2")
+        with pytest.raises(FltSyntaxError):
+            self._edit(p, 5, 6, "")
+        assert p.last_error is not None
+
+        self._edit(p, 5, 5, "3")
+        assert p.last_error is None
+        assert serialize_filter(p.elements) == [
+            {"fld": "a", "op": "==", "vl": 3},
+            {"fld": "b", "op": "==", "vl": 2},
+        ]
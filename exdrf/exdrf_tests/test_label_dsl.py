@@ -6,6 +6,7 @@ from exdrf.label_dsl import (
     ParsedIdentifier,
     ParsedLiteral,
     ParsedOp,
+    compile_label,
     evaluate,
     generate_python_code,
     generate_typescript_code,
@@ -230,5 +231,46 @@ def test_date_str():
     assert 'record.date.strftime("%Y-%m-%d")' in ts_code
 
 
+@pytest.mark.parametrize(
+    "expr",
+    [
+        '(concat first_name " " last_name)',
+        '(if (upper name) "Yes" "No")',
+        "(concat (upper name.first) (lower name.last))",
+        '(is_none attrib "Is none" "Is not none")',
+        '(= name "test" "Yes" "No")',
+        '(concat (float_str price 2) " " (int_str count))',
+        '(date_str date "%Y-%m-%d")',
+        '(concat "back\\slash " name)',
+        "title",
+    ],
+)
+def test_compile_label_matches_evaluate(expr):
+    context = DummyContext(
+        first_name="John",
+        last_name="Doe",
+        name=DummyContext(first="Ann", last="Lee"),
+        attrib=None,
+        price=3.14159,
+        count=1234567,
+        date=datetime(2023, 10, 1),
+        title="Title",
+    )
+    ast = parse_expr(expr)
+    assert compile_label(ast)(context) == evaluate(ast, context)
+
+
+def test_compile_label_is_cached():
+    first = compile_label(parse_expr("(upper name)"))
+    assert compile_label(parse_expr("(upper  name)")) is first
+    assert first(DummyContext(name="x")) == "X"
+    assert first({"name": "y"}) == "Y"
+
+
+def test_compile_label_unknown_operator():
+    with pytest.raises(ValueError):
+        compile_label(parse_expr("(nope name)"))
+
+
 if __name__ == "__main__":
     pytest.main()
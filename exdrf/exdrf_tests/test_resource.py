@@ -2,6 +2,8 @@ from unittest.mock import Mock
 
 import pytest
 
+from exdrf.field_types.str_field import StrField
+from exdrf.label_dsl import parse_expr
 from exdrf.resource import ExResource
 
 
@@ -15,6 +17,17 @@ def test_exresource_initialization():
     assert resource.label_ast is None
 
 
+def test_exresource_label_function():
+    resource = ExResource(
+        name="TestResource", label_ast=parse_expr('(concat "#" code)')
+    )
+    assert resource.label_function is resource.label_function
+    assert resource.label_function(Mock(code=5)) == "#5"
+
+    with pytest.raises(ValueError):
+        ExResource(name="NoLabel").label_function
+
+
 def test_exresource_repr():
     resource = ExResource(name="TestResource")
     assert repr(resource) == "<Resource TestResource (0 fields)>"
@@ -56,6 +69,47 @@ def test_exresource_getitem_by_name():
     assert resource["test_field"] == mock_field
 
 
+def test_exresource_field_index():
+    first, second, duplicate = (StrField(name=n) for n in ("a", "b", "a"))
+    resource = ExResource(name="TestResource", fields=[first])
+    resource.add_field(second)
+    resource.add_field(duplicate)
+    assert resource["a"] is first
+    assert resource["b"] is second
+    assert "b" in resource
+
+    # Names that are not there are answered by the index.
+    index = resource.fields._index
+    assert "c" not in resource
+    assert resource.fields._index is index
+
+    # Changes made directly to the list are picked up.
+    third = StrField(name="c")
+    resource.fields.append(third)
+    assert resource["c"] is third
+
+
+def test_exresource_field_index_rename_and_replace():
+    first, second = StrField(name="a"), StrField(name="x")
+    resource = ExResource(name="TestResource", fields=[first, second])
+    assert resource["a"] is first
+
+    # A renamed field is found under its new name only.
+    first.name = "b"
+    assert "b" in resource
+    assert resource["b"] is first
+    assert "a" not in resource
+
+    # A field replaced in place is found under its name.
+    replacement = StrField(name="b")
+    resource.fields[0] = replacement
+    assert resource["b"] is replacement
+    other = StrField(name="c")
+    resource.fields[1] = other
+    assert resource["c"] is other
+    assert "x" not in resource
+
+
 def test_exresource_getitem_keyerror():
     resource = ExResource(name="TestResource")
     with pytest.raises(KeyError):